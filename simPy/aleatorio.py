@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+FLUJOS ALEATORIOS POR AGENTE
+============================
+
+Responsabilidades:
+1. Derivar de UNA semilla raiz un generador independiente por agente y otro
+   para el campo (SeedSequence de NumPy con clave de derivacion por flujo)
+2. Hacer reproducible la jornada: los numeros de cada agente dependen solo
+   de la semilla raiz y de su id, no del intercalado de los hilos
+3. Evitar el generador global compartido (`random.uniform` desde todos los
+   hilos): cada hilo usa su propio generador
+4. Guardar y restaurar el estado de todos los flujos (checkpoints)
+
+La clave de cada flujo es fija ((AGENTE, id), (CAMPO,)...), asi que agregar
+agentes no cambia los numeros de los que ya existian.
+"""
+
+import random
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# Primer elemento de la clave de derivacion de cada flujo
+FLUJO_AGENTE = 0
+FLUJO_CAMPO = 1
+
+# Subclave de campo() de cada modelo vectorizado del huerto
+CAMPO_SINTETICO = 0
+MODELO_PLAGAS = 1
+
+
+class FlujosAleatorios:
+    """
+    Registro de generadores derivados de una semilla raiz
+
+    Args:
+        semilla: Semilla raiz; None = se toma de la entropia del sistema
+                 (y queda en `semilla` para repetir la jornada)
+    """
+
+    def __init__(self, semilla: Optional[int] = None):
+        if semilla is None:
+            semilla = np.random.SeedSequence().entropy
+        self.semilla = int(semilla)
+        self._flujos: Dict[Tuple[int, ...], random.Random] = {}
+        self._lock = Lock()
+
+    def _secuencia(self, clave: Tuple[int, ...]) -> np.random.SeedSequence:
+        return np.random.SeedSequence(self.semilla, spawn_key=clave)
+
+    def _flujo(self, *clave: int) -> random.Random:
+        with self._lock:
+            rng = self._flujos.get(clave)
+            if rng is None:
+                # 128 bits de estado inicial por flujo
+                estado = self._secuencia(clave).generate_state(4)
+                rng = random.Random(int.from_bytes(estado.tobytes(), 'little'))
+                self._flujos[clave] = rng
+            return rng
+
+    # ========================================================================
+    # FLUJOS
+    # ========================================================================
+
+    def agente(self, agente_id: int) -> random.Random:
+        """Generador propio de un agente (misma API que el modulo random)"""
+        return self._flujo(FLUJO_AGENTE, agente_id)
+
+    def campo(self, *clave: int) -> np.random.Generator:
+        """
+        Generador NumPy del campo (modelos del huerto que no dependen de un
+        agente, p. ej. campo(MODELO_PLAGAS)); su estado lo guarda el modelo
+        """
+        return np.random.default_rng(self._secuencia((FLUJO_CAMPO,) + clave))
+
+    # ========================================================================
+    # ESTADO (CHECKPOINTS)
+    # ========================================================================
+
+    def estado(self) -> Dict:
+        """Semilla raiz y estado de cada flujo creado"""
+        with self._lock:
+            return {
+                'semilla': self.semilla,
+                'flujos': {clave: rng.getstate() for clave, rng in self._flujos.items()},
+            }
+
+    def restaurar(self, estado: Dict):
+        """
+        Vuelve los flujos al estado guardado
+
+        Los generadores ya entregados a los agentes se actualizan en su lugar.
+        """
+        self.semilla = estado['semilla']
+        for clave, rng_estado in estado['flujos'].items():
+            self._flujo(*clave).setstate(rng_estado)
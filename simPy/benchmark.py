@@ -0,0 +1,599 @@
+# -*- coding: utf-8 -*-
+"""
+SUITE DE BENCHMARKS - MANAGER, CAPATAZ, AGENTES Y UI
+====================================================
+
+Mide los caminos calientes del sistema de forma reproducible:
+
+MICRO (una llamada = una operacion):
+    - manager.recibir_datos
+    - manager._evaluar_riesgo
+    - manager._calcular_metricas
+    - AgenteCapataz.actualizar_estado_agente
+    - AgenteCapataz._evaluar_agentes_cercanos
+    - riesgo_lote: reglas escalares vs evaluacion vectorizada por lotes
+    - nucleos: cada nucleo en NumPy y en Numba (la razon entre ambas filas
+      es la aceleracion; `python nucleos.py` la imprime directamente)
+
+UI:
+    - Un frame completo de AgenteUI dibujado en una superficie fuera de pantalla
+
+MACRO (una jornada completa sin las pausas de simulacion):
+    - Grids 10x10, 100x100 y 500x500 con 3 a 512 agentes
+    - Un tick del motor lockstep con 10000 agentes en 1000x1000
+
+Cada resultado reporta ops/s, latencia p50/p99 (microsegundos) y memoria pico.
+Los benchmarks cuyo codigo objetivo no se puede importar se reportan como
+'omitido' con el motivo, en lugar de abortar la suite.
+
+USO:
+    python benchmark.py --salida resultados.json
+    python benchmark.py --grupo micro --repeticiones 5000
+    python benchmark.py --rapido
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from threading import Thread
+from typing import Callable, Dict, List, Optional
+
+
+# ========================================================================
+# REGISTRO DE BENCHMARKS
+# ========================================================================
+
+class Omitido(Exception):
+    """El benchmark no puede ejecutarse en este arbol (falta codigo o dependencia)"""
+
+
+@dataclass
+class Benchmark:
+    nombre: str
+    grupo: str
+    preparar: Callable  # (rng, params) -> Callable[[], int]
+    params: Dict = field(default_factory=dict)
+    repeticiones: Optional[int] = None  # None = usar la de la suite
+
+
+@dataclass
+class ResultadoBenchmark:
+    """Resultado de un benchmark (una fila del JSON)"""
+    nombre: str
+    grupo: str
+    estado: str = "ok"  # 'ok' | 'omitido' | 'error'
+    motivo: str = ""
+    ops_por_segundo: float = 0.0
+    p50_us: float = 0.0
+    p99_us: float = 0.0
+    media_us: float = 0.0
+    operaciones: int = 0
+    memoria_pico_kb: float = 0.0
+    params: Dict = field(default_factory=dict)
+    extra: Dict = field(default_factory=dict)
+
+
+BENCHMARKS: List[Benchmark] = []
+
+
+def benchmark(nombre: str, grupo: str, repeticiones: Optional[int] = None, **params):
+    """Decorador que registra una funcion de preparacion"""
+    def registrar(preparar):
+        BENCHMARKS.append(Benchmark(nombre, grupo, preparar, params, repeticiones))
+        return preparar
+    return registrar
+
+
+# ========================================================================
+# FABRICAS DE OBJETOS DEL SISTEMA
+# ========================================================================
+
+@contextlib.contextmanager
+def silencio():
+    """Descarta los print() del sistema mientras se mide"""
+    with open(os.devnull, 'w', encoding='utf-8') as nulo, contextlib.redirect_stdout(nulo):
+        yield
+
+
+def _importar(modulo: str):
+    try:
+        with silencio():
+            return __import__(modulo)
+    except Exception as e:  # SyntaxError/ImportError: arbol incompleto
+        raise Omitido(f"no se pudo importar {modulo}: {type(e).__name__}: {e}")
+
+
+def crear_manager(filas: int, columnas: int, num_agentes: int):
+    """Crea el Capataz de manager.py con sus agentes y el trabajo repartido"""
+    manager = _importar('manager')
+    with silencio():
+        m = manager.AgenteCapataz(grid_filas=filas, grid_columnas=columnas, num_agentes=num_agentes)
+        m.crear_agentes_fisicos()
+        m.distribuir_trabajo()
+    return m
+
+
+def generar_lecturas(rng: random.Random, n: int, filas: int, columnas: int, num_agentes: int = 3) -> List:
+    """Lecturas sinteticas con las mismas distribuciones que fisico.py"""
+    DatosExploracion = _importar('manager').DatosExploracion
+    lecturas = []
+    for i in range(n):
+        maduracion = rng.uniform(0, 10)
+        plagas = 9.5 if rng.random() < 0.05 else rng.uniform(0, 10)
+        lecturas.append(DatosExploracion(
+            x=rng.randrange(filas), y=rng.randrange(columnas),
+            temperatura=rng.uniform(18.0, 32.0),
+            humedad=rng.uniform(30.0, 85.0),
+            nivel_plagas=plagas,
+            nivel_nutrientes=rng.uniform(2.0, 9.0),
+            nivel_maduracion=maduracion,
+            frutos_disponibles=rng.randint(0, 5) if maduracion > 4 else 0,
+            agente_id=1 + i % num_agentes
+        ))
+    return lecturas
+
+
+def crear_capataz(num_agentes: int):
+    capataz = _importar('capataz')
+    with silencio():
+        return capataz.AgenteCapataz(posicion_observacion=(0, 0), num_agentes=num_agentes)
+
+
+def _ciclo(elementos: List) -> Callable:
+    """Devuelve una funcion que entrega los elementos en ciclo"""
+    estado = {'i': 0}
+    n = len(elementos)
+
+    def siguiente():
+        i = estado['i']
+        estado['i'] = i + 1
+        return elementos[i % n]
+    return siguiente
+
+
+# ========================================================================
+# MICRO BENCHMARKS
+# ========================================================================
+
+@benchmark("manager.ingesta", "micro", filas=10, columnas=10, agentes=3)
+def _bench_ingesta(rng, p):
+    m = crear_manager(p['filas'], p['columnas'], p['agentes'])
+    recibir = m.recibir_datos
+    siguiente = _ciclo(generar_lecturas(rng, 1000, p['filas'], p['columnas'], p['agentes']))
+
+    def op():
+        recibir(siguiente())
+    return op
+
+
+@benchmark("manager._evaluar_riesgo", "micro", filas=10, columnas=10, agentes=3)
+def _bench_evaluar_riesgo(rng, p):
+    m = crear_manager(p['filas'], p['columnas'], p['agentes'])
+    evaluar = m._evaluar_riesgo
+    siguiente = _ciclo(generar_lecturas(rng, 1000, p['filas'], p['columnas'], p['agentes']))
+
+    def op():
+        evaluar(siguiente())
+    return op
+
+
+@benchmark("manager._calcular_metricas", "micro", filas=100, columnas=100, agentes=8)
+def _bench_calcular_metricas(rng, p):
+    m = crear_manager(p['filas'], p['columnas'], p['agentes'])
+    calcular = m._calcular_metricas
+    recibir = m.recibir_datos
+    with silencio():
+        for lectura in generar_lecturas(rng, p['filas'] * p['columnas'], p['filas'], p['columnas']):
+            recibir(lectura)
+    return calcular
+
+
+@benchmark("capataz.actualizar_estado_agente", "micro", agentes=8)
+def _bench_actualizar_estado(rng, p):
+    capataz = crear_capataz(p['agentes'])
+    estados = [
+        dict(
+            agente_id=1 + i % p['agentes'],
+            posicion=(rng.randrange(10), rng.randrange(10)),
+            bateria=rng.uniform(20.0, 100.0),
+            frutos_cargados=rng.randint(0, 40),
+            estado='recolectando',
+            celdas_exploradas=rng.randint(0, 20),
+            cosechas_completadas=rng.randint(0, 10)
+        )
+        for i in range(1000)
+    ]
+    siguiente = _ciclo(estados)
+
+    def op():
+        capataz.actualizar_estado_agente(**siguiente())
+    return op
+
+
+@benchmark("capataz._evaluar_agentes_cercanos", "micro", agentes=64)
+def _bench_agentes_cercanos(rng, p):
+    capataz = crear_capataz(p['agentes'])
+    with silencio():
+        for i in range(1, p['agentes'] + 1):
+            capataz.actualizar_estado_agente(
+                agente_id=i, posicion=(rng.randrange(100), rng.randrange(100)),
+                bateria=80.0, frutos_cargados=0, estado='recolectando',
+                celdas_exploradas=0, cosechas_completadas=0
+            )
+    siguiente = _ciclo([(rng.randrange(100), rng.randrange(100)) for _ in range(1000)])
+
+    def op():
+        capataz._evaluar_agentes_cercanos(siguiente())
+    return op
+
+
+@benchmark("capataz.evaluar_flota", "micro", repeticiones=200, agentes=512)
+def _bench_evaluar_flota(rng, p):
+    capataz = crear_capataz(p['agentes'])
+    with silencio():
+        for i in range(1, p['agentes'] + 1):
+            capataz.actualizar_estado_agente(
+                agente_id=i, posicion=(rng.randrange(100), rng.randrange(100)),
+                bateria=rng.uniform(20.0, 100.0), frutos_cargados=rng.randint(0, 40),
+                estado='recolectando', celdas_exploradas=rng.randint(0, 20),
+                cosechas_completadas=0
+            )
+
+    def op():
+        capataz.evaluar_flota()
+        return p['agentes']
+    return op
+
+
+@benchmark("riesgo.escalar", "micro", repeticiones=200, lecturas=1000)
+def _bench_riesgo_escalar(rng, p):
+    riesgo_lote = _importar('riesgo_lote')
+    columnas = _columnas_riesgo(rng, p['lecturas'])
+    filas = list(zip(*columnas))
+
+    def op():
+        for fila in filas:
+            riesgo_lote.evaluar_lectura(*fila)
+        return len(filas)
+    return op
+
+
+@benchmark("riesgo.lote", "micro", repeticiones=200, lecturas=1000)
+def _bench_riesgo_lote(rng, p):
+    riesgo_lote = _importar('riesgo_lote')
+    np = _importar('numpy')
+    columnas = [np.asarray(c) for c in _columnas_riesgo(rng, p['lecturas'])]
+
+    def op():
+        riesgo_lote.evaluar_lote(*columnas)
+        return p['lecturas']
+    return op
+
+
+def _columnas_riesgo(rng: random.Random, n: int) -> List[List[float]]:
+    """temperatura, humedad, plagas, nutrientes, maduracion, frutos"""
+    return [
+        [rng.uniform(10.0, 35.0) for _ in range(n)],
+        [rng.uniform(30.0, 90.0) for _ in range(n)],
+        [rng.uniform(0.0, 10.0) for _ in range(n)],
+        [rng.uniform(2.0, 9.0) for _ in range(n)],
+        [rng.uniform(0.0, 10.0) for _ in range(n)],
+        [rng.randint(0, 5) for _ in range(n)],
+    ]
+
+
+# ========================================================================
+# UI
+# ========================================================================
+
+@benchmark("ui.frame", "ui", repeticiones=300, filas=10, columnas=10, agentes=3)
+def _bench_frame(rng, p):
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    pygame = _importar('pygame')
+    ui_mod = _importar('ui')
+    m = crear_manager(p['filas'], p['columnas'], p['agentes'])
+
+    ui = ui_mod.AgenteUI(p['filas'], p['columnas'])
+    with silencio():
+        ui.inicializar_pygame()
+    # Superficie fuera de pantalla: mide solo el dibujo, no el refresco de ventana
+    ui.screen = pygame.Surface(ui.screen.get_size())
+
+    m.registrar_agente_ui(ui.actualizar)
+    recibir = m.recibir_datos
+    with silencio():
+        for lectura in generar_lecturas(rng, p['filas'] * p['columnas'], p['filas'], p['columnas'], p['agentes']):
+            recibir(lectura)
+
+    def op():
+        ui.screen.fill((30, 30, 30))
+        ui._dibujar_capataz()
+        ui._dibujar_grid()
+        ui._dibujar_agentes()
+        ui._dibujar_panel()
+    return op
+
+
+# ========================================================================
+# MACRO BENCHMARKS (JORNADA COMPLETA)
+# ========================================================================
+
+def _preparar_jornada(rng, p):
+    """
+    Jornada completa: cada agente recorre sus celdas en su propio hilo y
+    entrega lecturas y estado por su telemetria (lotes a entrada_lote, que
+    pasan por la ingesta del Manager hasta el supervisor), igual que en
+    fisico.py pero sin las pausas time.sleep() que solo marcan el ritmo visual.
+    """
+    filas, columnas, num_agentes = p['filas'], p['columnas'], p['agentes']
+    DatosExploracion = _importar('manager').DatosExploracion
+    presupuesto = p.get('presupuesto_s', 60.0)
+
+    def op():
+        m = crear_manager(filas, columnas, num_agentes)
+        # Como en la jornada real, los hilos de los agentes solo encolan
+        with silencio():
+            m.activar_ingesta()
+        procesadas = [0] * num_agentes
+        limite = time.perf_counter() + presupuesto
+        semilla = rng.randrange(2 ** 32)
+
+        def trabajar(indice, agente):
+            generador = random.Random(semilla + indice)
+            telemetria = agente.telemetria
+            for n, (x, y) in enumerate(agente.celdas_asignadas):
+                if n % 64 == 0 and time.perf_counter() > limite:
+                    break
+                maduracion = generador.uniform(0, 10)
+                telemetria.agregar_lectura(DatosExploracion(
+                    x=x, y=y, temperatura=25.0, humedad=60.0,
+                    nivel_plagas=9.5 if generador.random() < 0.05 else generador.uniform(0, 10),
+                    nivel_nutrientes=5.0, nivel_maduracion=maduracion,
+                    frutos_disponibles=generador.randint(0, 5) if maduracion > 4 else 0,
+                    agente_id=agente.agente_id
+                ))
+                telemetria.actualizar_estado(
+                    agente_id=agente.agente_id, posicion=(x, y), bateria=agente.bateria,
+                    frutos_cargados=agente.frutos_cargados, estado='recolectando',
+                    celdas_exploradas=n + 1, cosechas_completadas=0
+                )
+                procesadas[indice] += 1
+            telemetria.vaciar()
+
+        hilos = [Thread(target=trabajar, args=(i, a)) for i, a in enumerate(m.agentes_fisicos)]
+        for h in hilos:
+            h.start()
+        for h in hilos:
+            h.join()
+        with silencio():
+            m.detener_ingesta()
+        return sum(procesadas)
+    return op
+
+
+for _filas, _agentes in [(10, 3), (100, 64), (500, 512)]:
+    benchmark(f"jornada.{_filas}x{_filas}.{_agentes}ag", "macro", repeticiones=3,
+              filas=_filas, columnas=_filas, agentes=_agentes)(_preparar_jornada)
+
+
+@benchmark("lockstep.1000x1000.10000ag.tick", "macro", repeticiones=200,
+           filas=1000, columnas=1000, agentes=10000)
+def _bench_lockstep(rng, p):
+    """Un tick del motor lockstep (toda la flota avanza un paso)"""
+    np = _importar('numpy')
+    motor_lockstep = _importar('motor_lockstep')
+    motor = motor_lockstep.MotorLockstep(p['filas'], p['columnas'], p['agentes'],
+                                         rng=np.random.default_rng(rng.randrange(2 ** 32)))
+
+    def op():
+        if not motor.paso():
+            motor.asignar_rutas(motor._rutas_serpentina())
+        return 1
+    return op
+
+
+@benchmark("modelo_plagas.1000x1000.paso", "micro", repeticiones=50, filas=1000, columnas=1000)
+def _bench_modelo_plagas(rng, p):
+    """Un paso del automata de plagas en todo el huerto"""
+    np = _importar('numpy')
+    modelo_plagas = _importar('modelo_plagas')
+    modelo = modelo_plagas.ModeloPlagas(p['filas'], p['columnas'], rng=np.random.default_rng(rng.randrange(2 ** 32)))
+
+    def op():
+        modelo.paso()
+    return op
+
+
+@benchmark("modelo_clima.1000x1000.paso", "micro", repeticiones=50, filas=1000, columnas=1000)
+def _bench_modelo_clima(rng, p):
+    """Un paso de difusion del microclima en todo el huerto"""
+    modelo_clima = _importar('modelo_clima')
+    modelo = modelo_clima.ModeloClima(p['filas'], p['columnas'])
+
+    def op():
+        modelo.avanzar_a(modelo.hora + modelo.dt)
+    return op
+
+
+def _preparar_nucleo(rng, p):
+    """Un nucleo de nucleos.py con la version pedida ('numpy' o 'numba')"""
+    np = _importar('numpy')
+    nucleos = _importar('nucleos')
+    if p['version'] == 'numba' and not nucleos.NUMBA_DISPONIBLE:
+        raise Omitido("numba no esta instalado")
+    preparar, con_numpy, con_numba = nucleos._casos(np.random.default_rng(rng.randrange(2 ** 32)))[p['nucleo']]
+    funcion = con_numba if p['version'] == 'numba' else con_numpy
+    args = preparar()
+
+    def op():
+        funcion(*args)
+    return op
+
+
+for _nucleo in ('paso_manhattan', 'contar_vecinos'):
+    for _version in ('numpy', 'numba'):
+        benchmark(f"nucleo.{_nucleo}.{_version}", "micro", repeticiones=50,
+                  nucleo=_nucleo, version=_version)(_preparar_nucleo)
+
+
+# ========================================================================
+# MEDICION
+# ========================================================================
+
+def _percentil(ordenados: List[float], q: float) -> float:
+    if not ordenados:
+        return 0.0
+    k = min(len(ordenados) - 1, max(0, int(round(q * (len(ordenados) - 1)))))
+    return ordenados[k]
+
+
+def medir(op: Callable, repeticiones: int, calentamiento: int = 10) -> Dict:
+    """
+    Ejecuta `op` repetidamente midiendo cada llamada
+
+    Si `op` retorna un entero se interpreta como el numero de operaciones
+    que realizo (p. ej. lecturas procesadas en una jornada).
+    """
+    with silencio():
+        for _ in range(min(calentamiento, repeticiones)):
+            op()
+
+    tiempos = []
+    operaciones = 0
+    reloj = time.perf_counter
+    gc_activo = gc.isenabled()
+    gc.disable()
+    try:
+        with silencio():
+            for _ in range(repeticiones):
+                inicio = reloj()
+                hechas = op()
+                tiempos.append(reloj() - inicio)
+                operaciones += hechas if isinstance(hechas, int) else 1
+    finally:
+        if gc_activo:
+            gc.enable()
+
+    total = sum(tiempos)
+    por_op = [t / max(1, operaciones / repeticiones) for t in tiempos]
+    por_op.sort()
+    return {
+        'ops_por_segundo': operaciones / total if total > 0 else 0.0,
+        'p50_us': _percentil(por_op, 0.50) * 1e6,
+        'p99_us': _percentil(por_op, 0.99) * 1e6,
+        'media_us': total / max(1, operaciones) * 1e6,
+        'operaciones': operaciones,
+    }
+
+
+def medir_memoria(op: Callable, repeticiones: int) -> float:
+    """Memoria pico (KB) de una tanda corta, separada de la medicion de tiempo"""
+    tracemalloc.start()
+    try:
+        with silencio():
+            for _ in range(repeticiones):
+                op()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico / 1024.0
+
+
+def ejecutar_benchmark(b: Benchmark, repeticiones: int, semilla: int, rapido: bool = False) -> ResultadoBenchmark:
+    """Prepara, mide y empaqueta un benchmark"""
+    params = dict(b.params)
+    if rapido and b.grupo == "macro":
+        params['presupuesto_s'] = 2.0
+    resultado = ResultadoBenchmark(nombre=b.nombre, grupo=b.grupo, params=params)
+    reps = b.repeticiones or repeticiones
+    if rapido:
+        reps = max(1, reps // 10)
+
+    try:
+        rng = random.Random(semilla)
+        random.seed(semilla)
+        op = b.preparar(rng, params)
+        calentamiento = 0 if b.grupo == "macro" else 10
+        resultado.__dict__.update(medir(op, reps, calentamiento))
+        resultado.memoria_pico_kb = medir_memoria(op, 1 if b.grupo == "macro" else min(reps, 100))
+    except Omitido as e:
+        resultado.estado, resultado.motivo = "omitido", str(e)
+    except Exception as e:
+        resultado.estado, resultado.motivo = "error", f"{type(e).__name__}: {e}"
+    return resultado
+
+
+def ejecutar_suite(
+    grupos: Optional[List[str]] = None,
+    repeticiones: int = 2000,
+    semilla: int = 42,
+    filtro: Optional[str] = None,
+    rapido: bool = False
+) -> Dict:
+    """
+    Ejecuta la suite y retorna el documento JSON de resultados
+
+    Args:
+        grupos: 'micro', 'ui', 'macro' (None = todos)
+        repeticiones: Repeticiones por defecto de los micro benchmarks
+        semilla: Semilla de los datos sinteticos
+        filtro: Subcadena que debe contener el nombre del benchmark
+        rapido: Menos repeticiones y jornadas con presupuesto de 2 s
+    """
+    resultados = []
+    for b in BENCHMARKS:
+        if grupos and b.grupo not in grupos:
+            continue
+        if filtro and filtro not in b.nombre:
+            continue
+        r = ejecutar_benchmark(b, repeticiones, semilla, rapido)
+        resultados.append(r)
+        if r.estado == "ok":
+            print(f"[BENCH] {r.nombre:<36} {r.ops_por_segundo:>12.1f} ops/s  "
+                  f"p50 {r.p50_us:>9.1f}us  p99 {r.p99_us:>9.1f}us  {r.memoria_pico_kb:>9.1f}KB")
+        else:
+            print(f"[BENCH] {r.nombre:<36} {r.estado.upper()}: {r.motivo}")
+
+    return {
+        'metadatos': {
+            'fecha': datetime.now().isoformat(),
+            'python': sys.version.split()[0],
+            'plataforma': platform.platform(),
+            'semilla': semilla,
+            'repeticiones': repeticiones,
+            'rapido': rapido,
+        },
+        'resultados': [asdict(r) for r in resultados],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmarks del sistema multi-agente")
+    parser.add_argument('--grupo', action='append', choices=['micro', 'ui', 'macro'],
+                        help="Grupo a ejecutar (se puede repetir; por defecto todos)")
+    parser.add_argument('--filtro', help="Solo benchmarks cuyo nombre contenga este texto")
+    parser.add_argument('--repeticiones', type=int, default=2000)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--rapido', action='store_true', help="Ejecucion corta para pruebas")
+    parser.add_argument('--salida', help="Archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    documento = ejecutar_suite(args.grupo, args.repeticiones, args.semilla, args.filtro, args.rapido)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(documento, f, indent=2)
+        print(f"\n[OK] Resultados guardados en {args.salida}")
+    return documento
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+BITACORA DE REPETICION - KEYFRAMES + DELTAS + INDICE
+====================================================
+
+Responsabilidades:
+1. Grabar la jornada como una secuencia de eventos (celdas, agentes, metricas)
+2. Insertar keyframes periodicos con el estado completo
+3. Mantener un archivo indice (tiempo de simulacion -> offset del keyframe)
+4. Buscar un tiempo arbitrario en O(log n) + un segmento de deltas
+5. Avanzar evento por evento para el visor de repeticion
+
+Formato en disco:
+    <ruta>        JSON Lines. Cada linea es un keyframe o un evento:
+                  {"t": 12.5, "k": "K", "estado": {...}}
+                  {"t": 12.6, "k": "celda", "id": "3,4", "v": {...}}
+    <ruta>.idx    JSON con la lista [[t, offset_bytes, num_evento], ...]
+                  de cada keyframe (se reconstruye si falta) y los
+                  metadatos de la corrida (p. ej. la semilla raiz)
+"""
+
+import bisect
+import json
+import time
+from dataclasses import is_dataclass, fields
+from datetime import datetime
+from enum import Enum
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+# TIPOS DE EVENTO
+
+KEYFRAME = "K"
+EVENTO_CELDA = "celda"
+EVENTO_AGENTE = "agente"
+EVENTO_METRICAS = "metricas"
+
+
+def _serializar(valor: Any) -> Any:
+    """Convierte dataclasses, enums y fechas a tipos compatibles con JSON"""
+    if isinstance(valor, Enum):
+        return valor.name
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if is_dataclass(valor):
+        return {f.name: _serializar(getattr(valor, f.name)) for f in fields(valor)}
+    if isinstance(valor, dict):
+        return {str(k): _serializar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_serializar(v) for v in valor]
+    return valor
+
+
+def clave_celda(x: int, y: int) -> str:
+    """Clave JSON de una celda"""
+    return f"{x},{y}"
+
+
+def estado_vacio() -> Dict[str, Dict]:
+    """Estado completo vacio: celdas, agentes y metricas"""
+    return {'celdas': {}, 'agentes': {}, 'metricas': {}}
+
+
+def aplicar_evento(estado: Dict[str, Dict], evento: Dict):
+    """Aplica un evento delta sobre un estado completo (in-place)"""
+    tipo = evento['k']
+    if tipo == EVENTO_CELDA:
+        estado['celdas'][evento['id']] = evento['v']
+    elif tipo == EVENTO_AGENTE:
+        estado['agentes'][str(evento['id'])] = evento['v']
+    elif tipo == EVENTO_METRICAS:
+        estado['metricas'] = evento['v']
+
+
+# ========================================================================
+# GRABACION
+# ========================================================================
+
+class GrabadorBitacora:
+    """
+    Escribe la bitacora de una jornada
+
+    Cada evento se agrega como delta. Cada `intervalo_keyframe` segundos de
+    simulacion (o cada `max_eventos_segmento` eventos) se escribe un keyframe
+    con el estado completo, de modo que ningun segmento de deltas crece sin
+    limite y la busqueda siempre reproduce como maximo un segmento.
+    """
+
+    def __init__(
+        self,
+        ruta: str,
+        intervalo_keyframe: float = 30.0,
+        max_eventos_segmento: int = 2000,
+        reloj: Optional[Callable[[], float]] = None,
+        metadatos: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Args:
+            ruta: Archivo de la bitacora (el indice se guarda en ruta + '.idx')
+            intervalo_keyframe: Segundos de simulacion entre keyframes
+            max_eventos_segmento: Maximo de deltas entre dos keyframes
+            reloj: Funcion que devuelve el tiempo de simulacion actual
+            metadatos: Datos de la corrida que se guardan en el indice
+                       (semilla raiz, grid, numero de agentes...)
+        """
+        self.ruta = ruta
+        self.ruta_indice = ruta + ".idx"
+        self.intervalo_keyframe = intervalo_keyframe
+        self.max_eventos_segmento = max_eventos_segmento
+        self.metadatos = dict(metadatos or {})
+
+        inicio = time.time()
+        self._reloj = reloj or (lambda: time.time() - inicio)
+
+        self._archivo = open(ruta, 'wb')
+        self._estado = estado_vacio()
+        self._indice: List[List[float]] = []
+        self._num_eventos = 0
+        self._eventos_segmento = 0
+        self._t_ultimo_keyframe: Optional[float] = None
+        self._t_ultimo = 0.0
+        self.lock = Lock()
+
+    # --- API DE EVENTOS ---
+
+    def registrar_celda(self, estado_celda, t: Optional[float] = None):
+        """Registra el estado actual de una celda (EstadoCelda o dict)"""
+        valor = _serializar(estado_celda)
+        self._registrar(EVENTO_CELDA, clave_celda(valor['x'], valor['y']), valor, t)
+
+    def registrar_agente(self, agente_id: int, datos, t: Optional[float] = None):
+        """Registra posicion/bateria/orden de un agente"""
+        self._registrar(EVENTO_AGENTE, str(agente_id), _serializar(datos), t)
+
+    def registrar_metricas(self, metricas, t: Optional[float] = None):
+        """Registra las metricas globales del sistema"""
+        self._registrar(EVENTO_METRICAS, None, _serializar(metricas), t)
+
+    def callback_ui(self, siguiente: Optional[Callable] = None, manager=None) -> Callable:
+        """
+        Adaptador con la firma del callback de UI (celdas, agentes, metricas)
+
+        Solo graba lo que cambio respecto al ultimo estado conocido y despues
+        reenvia la llamada a `siguiente` (normalmente AgenteUI.actualizar).
+        Con `manager` solo se serializan las celdas que el Manager marco en
+        `celdas_sucias_bitacora` desde el evento anterior, no el huerto entero.
+        """
+        if manager is not None:
+            # Lo que ya esta en el huerto entra en el primer evento
+            manager.celdas_sucias_bitacora = set(manager.mapa_estados)
+
+        def callback(celdas, agentes, metricas):
+            t = self._reloj()
+            cambiadas = celdas
+            if manager is not None:
+                sucias, manager.celdas_sucias_bitacora = manager.celdas_sucias_bitacora, set()
+                cambiadas = [manager.mapa_estados[p] for p in sucias if p in manager.mapa_estados]
+            for celda in cambiadas:
+                valor = _serializar(celda)
+                clave = clave_celda(valor['x'], valor['y'])
+                if self._estado['celdas'].get(clave) != valor:
+                    self._registrar(EVENTO_CELDA, clave, valor, t)
+            for agente in agentes:
+                valor = _serializar(agente)
+                clave = str(valor.get('id'))
+                if self._estado['agentes'].get(clave) != valor:
+                    self._registrar(EVENTO_AGENTE, clave, valor, t)
+            if metricas is not None:
+                self._registrar(EVENTO_METRICAS, None, _serializar(metricas), t)
+            if siguiente:
+                siguiente(celdas, agentes, metricas)
+        return callback
+
+    # --- ESCRITURA ---
+
+    def _registrar(self, tipo: str, ident: Optional[str], valor: Dict, t: Optional[float]):
+        with self.lock:
+            if self._archivo is None:
+                return
+            # El tiempo nunca retrocede: la busqueda binaria depende de ello
+            t = max(self._t_ultimo, self._reloj() if t is None else t)
+            self._t_ultimo = t
+
+            if (self._t_ultimo_keyframe is None
+                    or t - self._t_ultimo_keyframe >= self.intervalo_keyframe
+                    or self._eventos_segmento >= self.max_eventos_segmento):
+                self._escribir_keyframe(t)
+
+            evento = {'t': t, 'k': tipo, 'v': valor}
+            if ident is not None:
+                evento['id'] = ident
+            aplicar_evento(self._estado, evento)
+            self._escribir_linea(evento)
+            self._num_eventos += 1
+            self._eventos_segmento += 1
+
+    def _escribir_keyframe(self, t: float):
+        offset = self._archivo.tell()
+        self._indice.append([t, offset, self._num_eventos])
+        self._escribir_linea({'t': t, 'k': KEYFRAME, 'estado': self._estado})
+        self._t_ultimo_keyframe = t
+        self._eventos_segmento = 0
+
+    def _escribir_linea(self, registro: Dict):
+        self._archivo.write(json.dumps(registro, separators=(',', ':')).encode('utf-8'))
+        self._archivo.write(b"\n")
+
+    def guardar_indice(self):
+        """Vuelca el indice de keyframes a disco"""
+        with self.lock:
+            if self._archivo is not None:
+                self._archivo.flush()
+            with open(self.ruta_indice, 'w', encoding='utf-8') as f:
+                json.dump({'keyframes': self._indice, 'eventos': self._num_eventos,
+                           'metadatos': _serializar(self.metadatos)}, f)
+
+    def cerrar(self):
+        """Cierra la bitacora y escribe el indice final"""
+        self.guardar_indice()
+        with self.lock:
+            if self._archivo is not None:
+                self._archivo.close()
+                self._archivo = None
+
+
+# ========================================================================
+# LECTURA Y BUSQUEDA
+# ========================================================================
+
+class LectorBitacora:
+    """
+    Reproduce una bitacora grabada por GrabadorBitacora
+
+    Mantiene un cursor (estado reconstruido + offset del siguiente evento)
+    que permite buscar un tiempo con `buscar(t)` o avanzar con `siguiente_evento()`.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._archivo = open(ruta, 'rb')
+        self.metadatos: Dict[str, Any] = {}
+        self._keyframes = self._cargar_indice()
+        self._tiempos = [k[0] for k in self._keyframes]
+        self.duracion = self._leer_duracion()
+
+        # Cursor
+        self.estado: Dict[str, Dict] = estado_vacio()
+        self.t_actual = 0.0
+        self._offset = 0
+        if self._keyframes:
+            self.buscar(self._tiempos[0])
+
+    def _cargar_indice(self) -> List[List[float]]:
+        """Lee el indice; si no existe (grabacion interrumpida) lo reconstruye"""
+        try:
+            with open(self.ruta + ".idx", 'r', encoding='utf-8') as f:
+                indice = json.load(f)
+            self.metadatos = indice.get('metadatos', {})
+            return indice['keyframes']
+        except (OSError, ValueError, KeyError):
+            return self._reconstruir_indice()
+
+    def _reconstruir_indice(self) -> List[List[float]]:
+        indice = []
+        num_evento = 0
+        self._archivo.seek(0)
+        while True:
+            offset = self._archivo.tell()
+            linea = self._archivo.readline()
+            if not linea:
+                break
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                break  # Linea truncada al final del archivo
+            if registro['k'] == KEYFRAME:
+                indice.append([registro['t'], offset, num_evento])
+            else:
+                num_evento += 1
+        return indice
+
+    def _leer_duracion(self) -> float:
+        """Tiempo del ultimo registro completo del archivo"""
+        if not self._keyframes:
+            return 0.0
+        self._archivo.seek(self._keyframes[-1][1])
+        t = self._keyframes[-1][0]
+        for linea in self._archivo:
+            try:
+                t = json.loads(linea)['t']
+            except ValueError:
+                break
+        return t
+
+    # --- NAVEGACION ---
+
+    def buscar(self, t: float):
+        """
+        Reconstruye el estado en el tiempo `t`
+
+        Busqueda binaria sobre el indice + reproduccion de un solo segmento.
+        """
+        if not self._keyframes:
+            return
+        i = max(0, bisect.bisect_right(self._tiempos, t) - 1)
+        self._archivo.seek(self._keyframes[i][1])
+        keyframe = json.loads(self._archivo.readline())
+        self.estado = keyframe['estado']
+        self.t_actual = keyframe['t']
+        self._offset = self._archivo.tell()
+        self.avanzar_hasta(t)
+
+    def avanzar_hasta(self, t: float) -> int:
+        """Aplica los eventos con tiempo <= t; retorna cuantos aplico"""
+        aplicados = 0
+        while True:
+            evento, offset = self._leer_siguiente()
+            if evento is None or evento['t'] > t:
+                break
+            self._aplicar(evento, offset)
+            aplicados += 1
+        self.t_actual = max(self.t_actual, t)
+        return aplicados
+
+    def siguiente_evento(self) -> Optional[Dict]:
+        """Avanza exactamente un evento (modo paso a paso)"""
+        evento, offset = self._leer_siguiente()
+        if evento is not None:
+            self._aplicar(evento, offset)
+        return evento
+
+    def _leer_siguiente(self) -> Tuple[Optional[Dict], int]:
+        """
+        Lee el siguiente evento sin consumirlo (los keyframes se saltan)
+
+        Returns:
+            (evento, offset de la linea siguiente) o (None, offset actual)
+        """
+        self._archivo.seek(self._offset)
+        while True:
+            linea = self._archivo.readline()
+            if not linea:
+                return None, self._offset
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                return None, self._offset
+            if registro['k'] != KEYFRAME:
+                return registro, self._archivo.tell()
+            # Un keyframe intermedio no cambia el estado: se consume y se sigue
+            self._offset = self._archivo.tell()
+
+    def _aplicar(self, evento: Dict, offset: int):
+        aplicar_evento(self.estado, evento)
+        self.t_actual = evento['t']
+        self._offset = offset
+
+    def cerrar(self):
+        self._archivo.close()
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+BROTES DE PLAGA (UNION-FIND INCREMENTAL)
+========================================
+
+Responsabilidades:
+1. Agrupar las celdas infestadas (nivel_plagas >= umbral) en BROTES: sus
+   componentes conexas en 8-vecindad, como las zonas COMPONENTE de
+   cuarentena.py
+2. Mantenerlos al dia lectura por lectura con union-find (union por tamano
+   y compresion de caminos): una celda que se infesta une su brote con los
+   de sus vecinas en tiempo casi constante amortizado
+3. Llevar por brote: tamano, caja (x0, y0, x1, y1), centroide, nivel maximo
+   y su celda
+4. Dividir el brote cuando una celda sana (tratamiento): se reetiqueta solo
+   ese brote, recorriendo sus celdas
+5. Identificador estable por brote para que el capataz de UNA respuesta por
+   brote y no una por celda
+
+Al unir, el brote mayor conserva su id (con empate, el mas antiguo); al
+dividir, lo conserva el pedazo mayor.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+
+Celda = Tuple[int, int]
+SANA = -1
+
+
+@dataclass
+class Brote:
+    """Componente conexa de celdas infestadas"""
+    id: int
+    celdas: int
+    caja: Tuple[int, int, int, int]     # x0, y0, x1, y1 (inclusive)
+    centroide: Tuple[float, float]
+    nivel_maximo: float
+    celda_maxima: Celda
+
+    def __str__(self):
+        x0, y0, x1, y1 = self.caja
+        return (f"Brote {self.id}: {self.celdas} celdas en ({x0}, {y0})-({x1}, {y1}), "
+                f"nivel max {self.nivel_maximo:.1f} en {self.celda_maxima}")
+
+
+class BrotesPlaga:
+    """
+    Componentes de celdas infestadas de un huerto de filas x columnas
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        umbral: nivel_plagas a partir del cual una celda esta infestada
+    """
+
+    def __init__(self, filas: int, columnas: int, umbral: float = 5.0):
+        self.filas = filas
+        self.columnas = columnas
+        self.umbral = umbral
+
+        n = filas * columnas
+        # Listas de Python: el union-find es acceso escalar, mas rapido que en NumPy
+        self._padre = [SANA] * n
+        self._nivel = [0.0] * n
+        # Indexados por la raiz de cada brote
+        self._tamano: Dict[int, int] = {}
+        self._caja: Dict[int, List[int]] = {}
+        self._suma: Dict[int, List[int]] = {}          # suma de x, suma de y
+        self._maxima: Dict[int, int] = {}              # celda (indice) de nivel maximo
+        self._miembros: Dict[int, List[int]] = {}
+        self._id: Dict[int, int] = {}
+        self._siguiente_id = 1
+        self._lock = Lock()
+
+        self.uniones = 0
+        self.divisiones = 0
+
+    # ========================================================================
+    # UNION-FIND
+    # ========================================================================
+
+    def _raiz(self, i: int) -> int:
+        padre = self._padre
+        while padre[i] != i:
+            padre[i] = padre[padre[i]]   # compresion por mitades
+            i = padre[i]
+        return i
+
+    def _vecinas(self, i: int):
+        x, y = divmod(i, self.columnas)
+        for vx in range(max(0, x - 1), min(self.filas, x + 2)):
+            for vy in range(max(0, y - 1), min(self.columnas, y + 2)):
+                j = vx * self.columnas + vy
+                if j != i:
+                    yield j
+
+    def _nuevo(self, i: int, id_brote: Optional[int] = None):
+        x, y = divmod(i, self.columnas)
+        self._padre[i] = i
+        self._tamano[i] = 1
+        self._caja[i] = [x, y, x, y]
+        self._suma[i] = [x, y]
+        self._maxima[i] = i
+        self._miembros[i] = [i]
+        if id_brote is None:
+            id_brote = self._siguiente_id
+            self._siguiente_id += 1
+        self._id[i] = id_brote
+
+    def _unir(self, a: int, b: int) -> int:
+        a, b = self._raiz(a), self._raiz(b)
+        if a == b:
+            return a
+        if (self._tamano[a], -self._id[a]) < (self._tamano[b], -self._id[b]):
+            a, b = b, a
+        # b cuelga de a; a conserva su id (con empate, el brote mas antiguo)
+        self._padre[b] = a
+        self._tamano[a] += self._tamano.pop(b)
+        caja, otra = self._caja[a], self._caja.pop(b)
+        caja[0], caja[1] = min(caja[0], otra[0]), min(caja[1], otra[1])
+        caja[2], caja[3] = max(caja[2], otra[2]), max(caja[3], otra[3])
+        suma, otra = self._suma[a], self._suma.pop(b)
+        suma[0] += otra[0]
+        suma[1] += otra[1]
+        maxima = self._maxima.pop(b)
+        if self._nivel[maxima] > self._nivel[self._maxima[a]]:
+            self._maxima[a] = maxima
+        self._miembros[a].extend(self._miembros.pop(b))
+        del self._id[b]
+        self.uniones += 1
+        return a
+
+    def _quitar(self, i: int):
+        """La celda sana: se reetiqueta su brote sin ella"""
+        raiz = self._raiz(i)
+        id_brote = self._id.pop(raiz)
+        miembros = self._miembros.pop(raiz)
+        for nombre in (self._tamano, self._caja, self._suma, self._maxima):
+            del nombre[raiz]
+        for j in miembros:
+            self._padre[j] = SANA
+
+        # Recorrido por anchura de las celdas restantes: un brote por componente
+        restantes = set(miembros)
+        restantes.discard(i)
+        piezas = []
+        while restantes:
+            inicio = restantes.pop()
+            pieza, cola = [inicio], deque([inicio])
+            while cola:
+                actual = cola.popleft()
+                for j in self._vecinas(actual):
+                    if j in restantes:
+                        restantes.discard(j)
+                        pieza.append(j)
+                        cola.append(j)
+            piezas.append(pieza)
+        piezas.sort(key=len, reverse=True)
+        if len(piezas) > 1:
+            self.divisiones += 1
+
+        for k, pieza in enumerate(piezas):
+            primera = pieza[0]
+            self._nuevo(primera, id_brote if k == 0 else None)
+            for j in pieza[1:]:
+                self._padre[j] = primera
+                self._agregar_a_raiz(primera, j)
+
+    def _agregar_a_raiz(self, raiz: int, i: int):
+        x, y = divmod(i, self.columnas)
+        self._tamano[raiz] += 1
+        caja = self._caja[raiz]
+        caja[0], caja[1] = min(caja[0], x), min(caja[1], y)
+        caja[2], caja[3] = max(caja[2], x), max(caja[3], y)
+        self._suma[raiz][0] += x
+        self._suma[raiz][1] += y
+        if self._nivel[i] > self._nivel[self._maxima[raiz]]:
+            self._maxima[raiz] = i
+        self._miembros[raiz].append(i)
+
+    # ========================================================================
+    # ACTUALIZACION
+    # ========================================================================
+
+    def actualizar(self, celda: Celda, nivel: float) -> Optional[int]:
+        """
+        Nuevo nivel de plagas de una celda
+
+        Returns:
+            id del brote de la celda, o None si la celda no esta infestada
+        """
+        x, y = celda
+        i = x * self.columnas + y
+        with self._lock:
+            infestada = self._padre[i] != SANA
+            if nivel < self.umbral:
+                if infestada:
+                    self._quitar(i)
+                self._nivel[i] = nivel
+                return None
+
+            anterior = self._nivel[i]
+            self._nivel[i] = nivel
+            if not infestada:
+                self._nuevo(i)
+                raiz = i
+                for j in self._vecinas(i):
+                    if self._padre[j] != SANA:
+                        raiz = self._unir(raiz, j)
+                return self._id[raiz]
+
+            raiz = self._raiz(i)
+            maxima = self._maxima[raiz]
+            if nivel > self._nivel[maxima]:
+                self._maxima[raiz] = i
+            elif maxima == i and nivel < anterior:
+                # Bajo el maximo del brote: buscarlo de nuevo entre sus celdas
+                self._maxima[raiz] = max(self._miembros[raiz], key=self._nivel.__getitem__)
+            return self._id[raiz]
+
+    def tratar(self, celda: Celda):
+        """Celda tratada: deja de estar infestada"""
+        self.actualizar(celda, 0.0)
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def _brote(self, raiz: int) -> Brote:
+        tamano = self._tamano[raiz]
+        suma = self._suma[raiz]
+        maxima = self._maxima[raiz]
+        return Brote(
+            id=self._id[raiz],
+            celdas=tamano,
+            caja=tuple(self._caja[raiz]),
+            centroide=(suma[0] / tamano, suma[1] / tamano),
+            nivel_maximo=self._nivel[maxima],
+            celda_maxima=divmod(maxima, self.columnas),
+        )
+
+    def brote_de(self, celda: Celda) -> Optional[Brote]:
+        """Brote de una celda (None si esta sana)"""
+        i = celda[0] * self.columnas + celda[1]
+        with self._lock:
+            if self._padre[i] == SANA:
+                return None
+            return self._brote(self._raiz(i))
+
+    def infestada(self, celda: Celda) -> bool:
+        return self._padre[celda[0] * self.columnas + celda[1]] != SANA
+
+    def brotes(self, minimo: int = 1) -> List[Brote]:
+        """Brotes de al menos `minimo` celdas, del mayor al menor"""
+        with self._lock:
+            lista = [self._brote(r) for r, t in self._tamano.items() if t >= minimo]
+        lista.sort(key=lambda b: (-b.celdas, -b.nivel_maximo, b.id))
+        return lista
+
+    def celdas_de(self, id_brote: int) -> List[Celda]:
+        with self._lock:
+            for raiz, id_actual in self._id.items():
+                if id_actual == id_brote:
+                    return [divmod(i, self.columnas) for i in self._miembros[raiz]]
+        return []
+
+    def __len__(self) -> int:
+        return len(self._tamano)
+
+    def reporte(self) -> str:
+        brotes = self.brotes()
+        texto = (f"  • Brotes activos: {len(brotes)} "
+                 f"({sum(b.celdas for b in brotes)} celdas con plagas >= {self.umbral})\n"
+                 f"  • Uniones: {self.uniones} | divisiones: {self.divisiones}")
+        for brote in brotes[:3]:
+            texto += f"\n  • {brote}"
+        return texto
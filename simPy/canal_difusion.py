@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+CANAL DE DIFUSION - ORDENES PARA TODA LA FLOTA
+==============================================
+
+Responsabilidades:
+1. Publicar una orden para todos los agentes con UNA sola escritura:
+   la orden queda en el canal y el contador de epoca sube en uno
+2. Permitir que cada agente revise el canal en O(1) en sus puntos de
+   control (compara su ultima epoca vista con la del canal, sin lock)
+3. Auditar cada difusion: orden, hora, confirmaciones de los agentes y
+   latencia de propagacion (publicacion -> confirmacion mas tardia)
+
+Una difusion reemplaza a la anterior: un agente que revisa tarde solo ve
+la orden vigente, nunca una cola de ordenes viejas.
+"""
+
+import time
+from dataclasses import dataclass
+from threading import Condition, Lock
+from typing import Any, List, Optional, Tuple
+
+
+TODOS_LOS_AGENTES = -1  # agente_destino de una orden difundida
+
+
+@dataclass
+class RegistroDifusion:
+    """Auditoria de una epoca del canal"""
+    epoca: int
+    orden: Any
+    publicada: float           # time.perf_counter() al publicar
+    confirmaciones: int = 0
+    latencia_maxima: float = 0.0  # segundos hasta la confirmacion mas tardia
+
+
+class CanalDifusion:
+    """
+    Canal de ordenes de flota con contador de epoca
+
+    La epoca se escribe al final de `publicar`, asi que un agente que ve
+    una epoca nueva siempre encuentra su orden ya guardada.
+    """
+
+    def __init__(self):
+        self.epoca = 0
+        self.orden = None
+        self.registros: List[RegistroDifusion] = []
+        self._lock = Lock()
+        self._cambio = Condition(self._lock)
+
+    # ========================================================================
+    # PUBLICACION (CAPATAZ)
+    # ========================================================================
+
+    def publicar(self, orden) -> int:
+        """Difunde `orden` a toda la flota y retorna su epoca"""
+        with self._lock:
+            epoca = self.epoca + 1
+            self.registros.append(RegistroDifusion(epoca, orden, time.perf_counter()))
+            self.orden = orden
+            self.epoca = epoca
+            self._cambio.notify_all()
+        return epoca
+
+    def restaurar(self, orden):
+        """Deja `orden` como vigente sin abrir una epoca (restauracion de checkpoint)"""
+        with self._lock:
+            self.orden = orden
+
+    # ========================================================================
+    # LECTURA (AGENTES)
+    # ========================================================================
+
+    def leer(self, epoca_vista: int) -> Optional[Tuple[int, Any]]:
+        """
+        (epoca, orden) si hubo una difusion despues de `epoca_vista`, si no None
+
+        El caso comun (nada nuevo) es una sola comparacion sin lock.
+        """
+        if self.epoca == epoca_vista:
+            return None
+        with self._lock:
+            return self.epoca, self.orden
+
+    def confirmar(self, epoca: int):
+        """El agente aplico la orden de `epoca`"""
+        ahora = time.perf_counter()
+        with self._lock:
+            registro = self.registros[epoca - 1]
+            registro.confirmaciones += 1
+            latencia = ahora - registro.publicada
+            if latencia > registro.latencia_maxima:
+                registro.latencia_maxima = latencia
+
+    def esperar_cambio(self, epoca_vista: int, espera: Optional[float] = None) -> bool:
+        """Bloquea hasta una epoca distinta de `epoca_vista`; False si vencio la espera"""
+        with self._lock:
+            return self._cambio.wait_for(lambda: self.epoca != epoca_vista, espera)
+
+    # ========================================================================
+    # REPORTE
+    # ========================================================================
+
+    def reporte(self) -> str:
+        with self._lock:
+            registros = list(self.registros)
+        if not registros:
+            return "  • Sin difusiones"
+        lineas = [f"  • Difusiones: {len(registros)}"]
+        for r in registros:
+            orden = getattr(r.orden, 'tipo_orden', r.orden)
+            orden = getattr(orden, 'value', orden)
+            lineas.append(f"    - Epoca {r.epoca}: {orden} | confirmaciones {r.confirmaciones} | "
+                          f"latencia max {r.latencia_maxima * 1000.0:.1f} ms")
+        return "\n".join(lineas)
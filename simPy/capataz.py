@@ -21,6 +21,13 @@ from datetime import datetime
 from enum import Enum
 from threading import Lock
 
+import numpy as np
+
+from canal_difusion import CanalDifusion, TODOS_LOS_AGENTES
+from enrutador_ordenes import EnrutadorOrdenes
+from motor_reglas import MotorReglas, Regla, Umbral
+from perfilador import medir_fase
+
 
 # TIPOS DE ORDENES DEL CAPATAZ
 
@@ -39,12 +46,15 @@ class OrdenCapataz:
     razon: str
     prioridad: int
     timestamp: datetime = None
+    secuencia: int = 0  # Asignada por el capataz al emitir (1, 2, ...)
     
     def __post_init__(self):
         if self.timestamp is None:
             self.timestamp = datetime.now()
     
     def __str__(self):
+        if self.agente_destino == TODOS_LOS_AGENTES:
+            return f"[Orden para toda la flota] {self.tipo_orden.value}: {self.razon}"
         return f"[Orden para Agente {self.agente_destino}] {self.tipo_orden.value}: {self.razon}"
 
 
@@ -88,6 +98,56 @@ class EstadoAgente:
             self.timestamp = datetime.now()
 
 
+# TABLA DE REGLAS DE DECISION
+# Se evaluan en orden; la primera regla con orden que se cumple gana.
+# Las reglas sin orden (None) solo emiten un aviso y la evaluacion continua.
+
+REGLAS_CAPATAZ = [
+    # REGLA 1: Bateria critica → ABANDONA
+    Regla("bateria_critica",
+          (('bateria', '<=', Umbral('bateria_critica')),),
+          TipoOrden.ABANDONA, 5,
+          RazonOrden.EMERGENCIA.value + " (Bateria: {bateria:.1f}%)"),
+    # REGLA 2: Bateria baja → PARATE
+    Regla("bateria_baja",
+          (('bateria', '<=', Umbral('bateria_baja')),
+           ('estado', '==', 'recolectando')),
+          TipoOrden.PARATE, 4,
+          RazonOrden.BATERIA_BAJA.value + " ({bateria:.1f}%)"),
+    # REGLA 3: Bateria recuperada tras un PARATE → CONTINUA
+    Regla("bateria_recuperada",
+          (('bateria', '>', Umbral('bateria_recuperada')),
+           ('estado', '==', 'parado'),
+           ('ultima_orden', '==', TipoOrden.PARATE)),
+          TipoOrden.CONTINUA, 3,
+          RazonOrden.BATERIA_RECUPERADA.value + " ({bateria:.1f}%)"),
+    # REGLA 4: Capacidad llena → PARATE
+    Regla("capacidad_llena",
+          (('carga', '>=', Umbral('capacidad_llena')),
+           ('estado', '==', 'recolectando')),
+          TipoOrden.PARATE, 3,
+          RazonOrden.SOBRECARGA.value + " ({frutos_cargados}/{capacidad_maxima})"),
+    # REGLA 5: Eficiencia baja → Advertencia
+    Regla("eficiencia_baja",
+          (('eficiencia', '<', Umbral('eficiencia_minima')),
+           ('celdas_exploradas', '>', 20)),
+          None, 0,
+          "Eficiencia baja ({eficiencia:.1f} frutos/min)"),
+    # REGLA 5b: Eficiencia MUY baja → ABANDONA
+    Regla("eficiencia_muy_baja",
+          (('eficiencia', '<', Umbral('eficiencia_minima')),
+           ('celdas_exploradas', '>', 20),
+           ('eficiencia', '<', Umbral('eficiencia_abandono'))),
+          TipoOrden.ABANDONA, 2,
+          RazonOrden.EFICIENCIA_BAJA.value + " ({eficiencia:.1f} frutos/min)"),
+]
+
+# Campos calculados (validos para un EstadoAgente y para columnas NumPy)
+CAMPOS_DERIVADOS_CAPATAZ = {
+    'carga': lambda e, u: e.frutos_cargados / u['capacidad_maxima'],
+}
+
+
 # AGENTE CAPATAZ
 
 class AgenteCapataz:
@@ -105,7 +165,13 @@ class AgenteCapataz:
     def __init__(
         self, 
         posicion_observacion: Tuple[int, int] = (0, 0),
-        num_agentes: int = 3
+        num_agentes: int = 3,
+        flota=None,
+        canal: Optional[CanalDifusion] = None,
+        cuarentena=None,
+        focos=None,
+        brotes=None,
+        indice=None
     ):
         """
         Inicializa el Agente Capataz
@@ -113,6 +179,12 @@ class AgenteCapataz:
         Args:
             posicion_observacion: Posicion fija desde donde observa
             num_agentes: Número de recolectores a supervisar
+            flota: Tabla de flota del Manager (tabla_flota.py), o None
+            canal: Canal de difusion que leen los agentes (uno nuevo si es None)
+            cuarentena: Gestor de cuarentenas del Manager (cuarentena.py), o None
+            focos: Focos de plagas del Manager (focos_espaciales.py), o None
+            brotes: Brotes de plaga del Manager (brotes.py), o None
+            indice: Indice de rectangulos del Manager (indice_huerto.py), o None
         """
         self.posicion = posicion_observacion
         self.num_agentes = num_agentes
@@ -122,12 +194,40 @@ class AgenteCapataz:
         
         # Historial de ordenes emitidas
         self.ordenes_emitidas: List[OrdenCapataz] = []
+        self.ultima_orden: Dict[int, OrdenCapataz] = {}  # agente_id -> ultima orden
+        
+        # Entrega de ordenes a los recolectores (cada agente registra su buzon)
+        self.enrutador = EnrutadorOrdenes()
+        
+        # Ordenes para toda la flota (emergencia, fin de turno): una escritura por orden
+        self.canal = canal if canal is not None else CanalDifusion()
+        
+        # Tabla de flota del Manager (posiciones al dia); None = usar estados_agentes
+        self.flota = flota
+        
+        # Zonas de cuarentena del Manager; None = abandono general ante contaminacion critica
+        self.cuarentena = cuarentena
+        
+        # Focos de plagas del Manager (Gi*, focos_espaciales.py); None = cada celda por separado
+        self.focos = focos
+        
+        # Brotes de plaga del Manager (brotes.py); None = una respuesta por celda
+        self.brotes = brotes
+        self._cajas_atendidas: Dict[int, Tuple[int, int, int, int]] = {}  # brote -> caja ya despejada
+        
+        # Indice de rectangulos del Manager (indice_huerto.py): frutos en juego de un brote
+        self.indice = indice
         
         # Estadisticas del capataz
         self.ordenes_parate = 0
         self.ordenes_continua = 0
         self.ordenes_abandona = 0
         self.decisiones_totales = 0
+        self.anomalias_reportadas = 0
+        self.anomalias_atendidas = 0
+        self.contaminaciones_en_foco = 0
+        self.respuestas_brote = 0
+        self.contaminaciones_agrupadas = 0  # celdas de un brote ya atendido
         
         # Control
         self.activo = True
@@ -139,10 +239,21 @@ class AgenteCapataz:
             'bateria_critica': 5.0,
             'contaminacion_alta': 7.0,
             'contaminacion_critica': 9.0,
+            'anomalia_plagas': 4.0,  # |z| de plagas contra la historia de la celda
             'capacidad_llena': 0.9,  # 90% de capacidad
+            'capacidad_maxima': 50,  # frutos (ConfiguracionAgente.capacidad_carga)
+            'bateria_recuperada': 50.0,
             'eficiencia_minima': 5.0,  # frutos por minuto
+            'eficiencia_abandono': 2.0,
         }
         
+        # Reglas de decision compiladas una sola vez
+        self.motor_reglas = MotorReglas(
+            REGLAS_CAPATAZ,
+            derivados=CAMPOS_DERIVADOS_CAPATAZ,
+            extras=('ultima_orden',)
+        )
+        
         # Tiempo de inicio
         self.tiempo_inicio = time.time()
         
@@ -212,104 +323,167 @@ class AgenteCapataz:
         """
         if nivel >= self.umbrales['contaminacion_critica']:
             print(f"[Capataz] [ADVERTENCIA] ALERTA: Contaminacion critica en {celda} (Nivel: {nivel:.1f})")
-            self._emitir_ordenes_emergencia_contaminacion(celda)
+            if self.cuarentena is not None:
+                # Solo se cierra la region infestada; el resto de la flota sigue trabajando
+                zona = self.cuarentena.reportar_gusano(celda)
+                print(f"[Capataz] [CUARENTENA] Zona {zona.id}: {len(zona.celdas)} celdas prohibidas hasta tratar {celda}")
+            else:
+                self._emitir_ordenes_emergencia_contaminacion(celda)
         
         elif nivel >= self.umbrales['contaminacion_alta']:
-            print(f"[Capataz] [ADVERTENCIA] Contaminacion alta en {celda} (Nivel: {nivel:.1f})")
+            brote = self.brotes.brote_de(celda) if self.brotes is not None else None
+            if brote is not None and brote.celdas > 1:
+                self._atender_brote(brote)
+            elif self.focos is not None and self.focos.en_foco(celda):
+                # Parte de un foco: la contaminacion se extiende a las vecinas, se aparta a mas agentes
+                self.contaminaciones_en_foco += 1
+                print(f"[Capataz] [FOCO] Contaminacion alta en {celda} dentro de un foco de plagas "
+                      f"(Nivel: {nivel:.1f}, Gi* {self.focos.gi_celda(celda):.1f})")
+                self._evaluar_agentes_cercanos(celda, radio=2 + self.focos.radio)
+            else:
+                print(f"[Capataz] [ADVERTENCIA] Contaminacion alta en {celda} (Nivel: {nivel:.1f})")
+                self._evaluar_agentes_cercanos(celda)
+    
+    def _atender_brote(self, brote):
+        """
+        Una respuesta por brote: se apartan los agentes cercanos a su caja
+        
+        Las celdas nuevas del brote que caen dentro de la caja ya despejada
+        no generan otra respuesta; si el brote crece fuera de ella, se
+        responde de nuevo con la caja ampliada.
+        """
+        atendida = self._cajas_atendidas.get(brote.id)
+        x0, y0, x1, y1 = brote.caja
+        if atendida is not None and atendida[0] <= x0 and atendida[1] <= y0 and x1 <= atendida[2] and y1 <= atendida[3]:
+            self.contaminaciones_agrupadas += 1
+            return
+        self._cajas_atendidas[brote.id] = brote.caja
+        self.respuestas_brote += 1
+        en_juego = ""
+        if self.indice is not None:
+            en_juego = f" | {self.indice.suma_caja('maduros', brote.caja)} frutos maduros en su caja"
+        print(f"[Capataz] [BROTE] {brote}{en_juego}")
+        self._evaluar_agentes_cercanos(brote.celda_maxima, caja=brote.caja)
+    
+    def reportar_anomalia(self, celda: Tuple[int, int], canales: Tuple[str, ...], puntaje: float):
+        """
+        Recibe una lectura que se aleja de la historia de su celda
+        (detector_anomalias.py) o de la distribucion conjunta de su zona
+        (detector_multivariado.py), aunque no cruce los umbrales fijos
+        
+        Args:
+            celda: Coordenadas de la celda
+            canales: Canales de sensor anomalos
+            puntaje: Mayor |z| de la lectura o su distancia de Mahalanobis
+        """
+        self.anomalias_reportadas += 1
+        print(f"[Capataz] [ANOMALIA] {celda}: {', '.join(canales)} (|z| {puntaje:.1f})")
+        
+        # Un salto brusco de plagas se trata como contaminacion alta
+        if 'nivel_plagas' in canales and puntaje >= self.umbrales['anomalia_plagas']:
+            self.anomalias_atendidas += 1
             self._evaluar_agentes_cercanos(celda)
     
     # ========================================================================
     # LOGICA DE DECISION
     # ========================================================================
     
+    @medir_fase("capataz.reglas")
     def _evaluar_y_emitir_orden(self, agente_id: int):
         """
         Evalúa el estado de un agente y decide si emitir una orden
         
-        Proceso de decision:
-        1. Verificar bateria
-        2. Verificar capacidad de carga
-        3. Verificar eficiencia
-        4. Verificar estado actual
-        5. Emitir orden si es necesario
+        Las reglas estan en REGLAS_CAPATAZ (bateria, capacidad de carga,
+        eficiencia y estado actual); aqui solo se ejecuta la tabla compilada
+        y se emite la orden de la regla ganadora.
         """
         estado = self.estados_agentes.get(agente_id)
         if not estado:
             return
         
-        # REGLA 1: Bateria critica → ABANDONA
-        if estado.bateria <= self.umbrales['bateria_critica']:
-            self._emitir_orden(
-                agente_id,
-                TipoOrden.ABANDONA,
-                RazonOrden.EMERGENCIA.value + f" (Bateria: {estado.bateria:.1f}%)",
-                prioridad=5
-            )
+        ultima = self._obtener_ultima_orden(agente_id)
+        regla, avisos = self.motor_reglas.evaluar(
+            estado, self.umbrales,
+            {'ultima_orden': ultima.tipo_orden if ultima else None}
+        )
+        if regla is None and not avisos:
             return
         
-        # REGLA 2: Bateria baja → PARATE
-        if estado.bateria <= self.umbrales['bateria_baja'] and estado.estado == 'recolectando':
-            self._emitir_orden(
-                agente_id,
-                TipoOrden.PARATE,
-                RazonOrden.BATERIA_BAJA.value + f" ({estado.bateria:.1f}%)",
-                prioridad=4
-            )
-            return
+        valores = dict(self.umbrales, **vars(estado))
+        for aviso in avisos:
+            print(f"[Capataz] [DATOS] Agente {agente_id}: {aviso.formatear_razon(valores)}")
         
-        # REGLA 3: Bateria recuperada → CONTINUA
-        if estado.bateria > 50.0 and estado.estado == 'parado':
-            # Verificar que se detuvo por bateria baja
-            ultima_orden = self._obtener_ultima_orden(agente_id)
-            if ultima_orden and ultima_orden.tipo_orden == TipoOrden.PARATE:
-                self._emitir_orden(
-                    agente_id,
-                    TipoOrden.CONTINUA,
-                    RazonOrden.BATERIA_RECUPERADA.value + f" ({estado.bateria:.1f}%)",
-                    prioridad=3
-                )
-                return
+        if regla is not None:
+            self._emitir_orden(agente_id, regla.orden, regla.formatear_razon(valores), prioridad=regla.prioridad)
+    
+    @medir_fase("capataz.reglas")
+    def evaluar_flota(self) -> int:
+        """
+        Evalua las reglas para todos los agentes a la vez (vectorizado)
         
-        # REGLA 4: Capacidad llena → PARATE
-        capacidad_maxima = 50  # Ajustar según configuracion real
-        porcentaje_carga = estado.frutos_cargados / capacidad_maxima
+        Produce las mismas ordenes que llamar a _evaluar_y_emitir_orden
+        con cada agente.
         
-        if porcentaje_carga >= self.umbrales['capacidad_llena'] and estado.estado == 'recolectando':
-            self._emitir_orden(
-                agente_id,
-                TipoOrden.PARATE,
-                RazonOrden.SOBRECARGA.value + f" ({estado.frutos_cargados}/{capacidad_maxima})",
-                prioridad=3
-            )
-            return
+        Returns:
+            Numero de ordenes emitidas
+        """
+        estados = list(self.estados_agentes.values())
+        if not estados:
+            return 0
         
-        # REGLA 5: Eficiencia baja → Advertencia (y eventualmente ABANDONA)
-        if estado.eficiencia < self.umbrales['eficiencia_minima'] and estado.celdas_exploradas > 20:
-            print(f"[Capataz] [DATOS] Agente {agente_id}: Eficiencia baja ({estado.eficiencia:.1f} frutos/min)")
-            
-            # Si la eficiencia es MUY baja, abandonar
-            if estado.eficiencia < 2.0:
-                self._emitir_orden(
-                    agente_id,
-                    TipoOrden.ABANDONA,
-                    RazonOrden.EFICIENCIA_BAJA.value + f" ({estado.eficiencia:.1f} frutos/min)",
-                    prioridad=2
-                )
-    
-    def _evaluar_agentes_cercanos(self, celda_contaminada: Tuple[int, int]):
+        columnas = {
+            campo: np.array([getattr(e, campo) for e in estados])
+            for campo in ('bateria', 'frutos_cargados', 'estado', 'celdas_exploradas', 'eficiencia')
+        }
+        ultimas = np.empty(len(estados), dtype=object)
+        for i, e in enumerate(estados):
+            ultima = self._obtener_ultima_orden(e.agente_id)
+            ultimas[i] = ultima.tipo_orden if ultima else None
+        columnas['ultima_orden'] = ultimas
+        
+        resultado = self.motor_reglas.evaluar_lote(columnas, self.umbrales)
+        
+        emitidas = 0
+        for i, estado in enumerate(estados):
+            indice = resultado.ganadora[i]
+            avisos = [j for j, mascara in resultado.avisos.items() if mascara[i]]
+            if indice < 0 and not avisos:
+                continue
+            valores = dict(self.umbrales, **vars(estado))
+            for j in avisos:
+                print(f"[Capataz] [DATOS] Agente {estado.agente_id}: "
+                      f"{self.motor_reglas.reglas[j].formatear_razon(valores)}")
+            if indice >= 0:
+                regla = self.motor_reglas.reglas[indice]
+                self._emitir_orden(estado.agente_id, regla.orden,
+                                   regla.formatear_razon(valores), prioridad=regla.prioridad)
+                emitidas += 1
+        return emitidas
+    
+    def _evaluar_agentes_cercanos(self, celda_contaminada: Tuple[int, int], radio: int = 2,
+                                  caja: Optional[Tuple[int, int, int, int]] = None):
         """
         Evalúa agentes cercanos a una zona contaminada
         
         Args:
             celda_contaminada: Coordenadas de la celda con alta contaminacion
+            radio: Distancia Manhattan hasta la que se detiene a los agentes
+            caja: (x0, y0, x1, y1) de un brote; la distancia se mide a la caja
         """
+        if caja is None:
+            caja = celda_contaminada + celda_contaminada
+        if self.flota is not None:
+            self._evaluar_agentes_cercanos_flota(caja, radio)
+            return
+        
+        x0, y0, x1, y1 = caja
         for agente_id, estado in self.estados_agentes.items():
-            # Calcular distancia Manhattan
-            distancia = abs(estado.posicion[0] - celda_contaminada[0]) + \
-                       abs(estado.posicion[1] - celda_contaminada[1])
+            # Calcular distancia Manhattan (0 dentro de la caja)
+            px, py = estado.posicion
+            distancia = max(x0 - px, 0, px - x1) + max(y0 - py, 0, py - y1)
             
             # Si esta muy cerca y recolectando, detenerlo
-            if distancia <= 2 and estado.estado == 'recolectando':
+            if distancia <= radio and estado.estado == 'recolectando':
                 self._emitir_orden(
                     agente_id,
                     TipoOrden.PARATE,
@@ -317,6 +491,31 @@ class AgenteCapataz:
                     prioridad=4
                 )
     
+    def _evaluar_agentes_cercanos_flota(self, caja: Tuple[int, int, int, int], radio: int = 2):
+        """Misma regla sobre una instantanea de la tabla de flota (vectorizada)"""
+        x0, y0, x1, y1 = caja
+        flota = self.flota.instantanea()
+        distancias = (np.maximum(np.maximum(x0 - flota.x, flota.x - x1), 0)
+                      + np.maximum(np.maximum(y0 - flota.y, flota.y - y1), 0))
+        # Recolectando = activo y con CONTINUA como ultima orden
+        cercanos = ((distancias <= radio) & flota.activo
+                    & (flota.orden == self._codigo_flota(TipoOrden.CONTINUA)))
+        
+        for i in np.flatnonzero(cercanos):
+            self._emitir_orden(
+                int(flota.ids[i]),
+                TipoOrden.PARATE,
+                RazonOrden.ZONA_CONTAMINADA.value + f" (Distancia: {int(distancias[i])} celdas)",
+                prioridad=4
+            )
+    
+    def _codigo_flota(self, tipo_orden: TipoOrden) -> int:
+        """Codigo de `tipo_orden` en la tabla de flota (sus estados comparten el valor de TipoOrden)"""
+        for estado in self.flota.estados_orden:
+            if getattr(estado, 'value', estado) == tipo_orden.value:
+                return self.flota.codigo_orden(estado)
+        raise KeyError(tipo_orden)
+    
     def _emitir_ordenes_emergencia_contaminacion(self, celda: Tuple[int, int]):
         """
         Emite ordenes de emergencia por contaminacion critica
@@ -326,13 +525,11 @@ class AgenteCapataz:
         """
         print(f"\n[Capataz] [EMERGENCIA] EMERGENCIA: Emitiendo ordenes de abandono por contaminacion critica")
         
-        for agente_id in self.estados_agentes.keys():
-            self._emitir_orden(
-                agente_id,
-                TipoOrden.ABANDONA,
-                RazonOrden.CONTAMINACION_CRITICA.value + f" en {celda}",
-                prioridad=5
-            )
+        self._difundir_orden(
+            TipoOrden.ABANDONA,
+            RazonOrden.CONTAMINACION_CRITICA.value + f" en {celda}",
+            prioridad=5
+        )
     
     # ========================================================================
     # EMISION Y GESTION DE ORDENES
@@ -363,7 +560,9 @@ class AgenteCapataz:
         
         with self.lock:
             self.ordenes_emitidas.append(orden)
+            self.ultima_orden[agente_id] = orden
             self.decisiones_totales += 1
+            orden.secuencia = self.decisiones_totales
             
             if tipo_orden == TipoOrden.PARATE:
                 self.ordenes_parate += 1
@@ -371,19 +570,56 @@ class AgenteCapataz:
                 self.ordenes_continua += 1
             elif tipo_orden == TipoOrden.ABANDONA:
                 self.ordenes_abandona += 1
+
+            # Su lugar en la cola del agente se reserva con la secuencia
+            encolada = self.enrutador.encolar(orden)
         
         # Mostrar la orden
         print(f"\n[Capataz] [ANUNCIO] {orden}")
         print(f"[Capataz] Prioridad: {'[PRIORIDAD]' * prioridad}")
         
-        # Aqui se enviaria la orden al agente
-        # En la implementacion real, llamaria a un callback o metodo del agente
+        # Entregar al agente destino (fuera del lock, en orden de secuencia)
+        if encolada:
+            self.enrutador.entregar(agente_id)
+        return orden
+    
+    def _difundir_orden(self, tipo_orden: TipoOrden, razon: str, prioridad: int = 5):
+        """
+        Emite una orden para TODOS los agentes como una sola orden auditada
+        
+        La orden no se reparte agente por agente: queda en el canal de
+        difusion y cada agente la aplica en su siguiente punto de control.
+        """
+        orden = OrdenCapataz(
+            agente_destino=TODOS_LOS_AGENTES,
+            tipo_orden=tipo_orden,
+            razon=razon,
+            prioridad=prioridad
+        )
+        
+        with self.lock:
+            self.ordenes_emitidas.append(orden)
+            self.decisiones_totales += 1
+            orden.secuencia = self.decisiones_totales
+            
+            if tipo_orden == TipoOrden.PARATE:
+                self.ordenes_parate += 1
+            elif tipo_orden == TipoOrden.CONTINUA:
+                self.ordenes_continua += 1
+            elif tipo_orden == TipoOrden.ABANDONA:
+                self.ordenes_abandona += 1
+        
+        epoca = self.canal.publicar(orden)
+        print(f"\n[Capataz] [ANUNCIO] {orden} (epoca {epoca})")
         return orden
     
     def _obtener_ultima_orden(self, agente_id: int) -> Optional[OrdenCapataz]:
-        """Obtiene la última orden emitida a un agente"""
-        ordenes_agente = [o for o in self.ordenes_emitidas if o.agente_destino == agente_id]
-        return ordenes_agente[-1] if ordenes_agente else None
+        """Obtiene la última orden que aplica a un agente (propia o difundida)"""
+        propia = self.ultima_orden.get(agente_id)
+        difundida = self.canal.orden
+        if difundida is None or (propia is not None and propia.secuencia > difundida.secuencia):
+            return propia
+        return difundida
     
     # ========================================================================
     # ORDENES MANUALES (CONTROL DIRECTO)
@@ -401,17 +637,15 @@ class AgenteCapataz:
         """Orden manual: ABANDONA"""
         self._emitir_orden(agente_id, TipoOrden.ABANDONA, razon, prioridad=5)
     
+    def ordenar_flota(self, tipo_orden: TipoOrden, razon: str = "Orden manual del capataz") -> OrdenCapataz:
+        """Orden manual para toda la flota (una sola difusion)"""
+        return self._difundir_orden(tipo_orden, razon, prioridad=5)
+    
     def ordenar_fin_turno(self):
         """Ordena a todos los agentes abandonar (fin de turno)"""
         print(f"\n[Capataz] [CAMPANA] FIN DE TURNO - Ordenando abandono general")
         
-        for agente_id in self.estados_agentes.keys():
-            self._emitir_orden(
-                agente_id,
-                TipoOrden.ABANDONA,
-                RazonOrden.FIN_TURNO.value,
-                prioridad=5
-            )
+        self._difundir_orden(TipoOrden.ABANDONA, RazonOrden.FIN_TURNO.value, prioridad=5)
     
     # ========================================================================
     # MONITOREO Y REPORTES
@@ -481,6 +715,14 @@ class AgenteCapataz:
   • Cosechas totales: {cosechas_totales}
 """
         
+        reporte += f"\n[ANUNCIO] ENTREGA DE ORDENES:\n{self.enrutador.reporte()}\n"
+        reporte += f"\n[EMERGENCIA] ORDENES A TODA LA FLOTA:\n{self.canal.reporte()}\n"
+        reporte += f"\n[REGLAS] DISPAROS POR REGLA:\n{self.motor_reglas.reporte()}\n"
+        reporte += (f"\n[ANOMALIA] LECTURAS FUERA DE LA HISTORIA DE SU CELDA: {self.anomalias_reportadas}"
+                    f" ({self.anomalias_atendidas} con agentes cercanos evaluados)\n")
+        reporte += f"[FOCO] CONTAMINACIONES ALTAS DENTRO DE UN FOCO DE PLAGAS: {self.contaminaciones_en_foco}\n"
+        reporte += (f"[BROTE] RESPUESTAS POR BROTE: {self.respuestas_brote}"
+                    f" ({self.contaminaciones_agrupadas} celdas cubiertas por una respuesta anterior)\n")
         reporte += f"\n{'='*70}\n"
         
         return reporte
@@ -0,0 +1,610 @@
+# -*- coding: utf-8 -*-
+"""
+CHECKPOINTS DE LA SIMULACION
+============================
+
+Responsabilidades:
+1. Capturar el estado en curso del Manager, Agentes Fisicos y Capataz
+   (en el hilo de ingesta, el unico que escribe el huerto: captura consistente)
+2. Escribirlo comprimido en segundo plano (sin frenar a los agentes)
+3. Guardar solo los cambios desde el checkpoint anterior (incremental): las
+   celdas que el Manager marco en `celdas_sucias`, sin recorrer el huerto
+4. Compactar periodicamente en un checkpoint completo
+5. Restaurar el estado para continuar la jornada donde se quedo
+
+Que se guarda:
+- Campo: mapa_estados, celdas_exploradas, datos crudos, colas de instrucciones
+  (el indice de rectangulos se reconstruye desde mapa_estados)
+- Analitica: series, detectores, focos y brotes completos en la base; cada
+  delta trae las lecturas y tratamientos recibidos desde el anterior
+  (`eventos_sucios` del Manager) y se reaplican al restaurar
+- Agentes: posicion, bateria, carga, celdas asignadas (la ruta restante es lo
+  no explorado de ellas), instrucciones pendientes
+- Capataz: estados de agentes, ordenes emitidas, contadores, controles
+- Zonas de cuarentena: celdas con gusano sin tratar
+- Modelo de plagas: nivel real de cada celda y su generador
+- Microclima: hora simulada y campos de temperatura y humedad
+  (de ambos modelos un delta guarda solo las celdas que cambiaron)
+- Estado del generador aleatorio global, semilla raiz y generador de cada agente
+
+Formato en disco: secuencia de registros [4 bytes longitud][zlib(pickle)].
+El primer registro es siempre completo ('base'); los siguientes son 'delta'.
+"""
+
+import copy
+import os
+import pickle
+import queue
+import random
+import struct
+import time
+import zlib
+from threading import Thread, Event, Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from canal_difusion import TODOS_LOS_AGENTES
+from mapa_celdas import MapaCeldas
+
+
+BASE = "base"
+DELTA = "delta"
+
+# Contadores del Manager que se guardan si existen (difieren entre versiones)
+CONTADORES_MANAGER = [
+    'frutos_cosechados_total',
+    'contador_gusanos',
+    'cosechas_ordenadas_total',
+    'tratamientos_ordenados_total',
+]
+
+# Atributos opcionales de AgenteFisico
+CAMPOS_AGENTE = [
+    'cosechas_completadas',
+    'tratamientos_completados',
+    'celdas_exploradas',
+    'estado_capataz',
+    'exploracion_completa',
+]
+
+CONTADORES_CAPATAZ = [
+    'ordenes_parate',
+    'ordenes_continua',
+    'ordenes_abandona',
+    'decisiones_totales',
+    'anomalias_reportadas',
+    'anomalias_atendidas',
+    'contaminaciones_en_foco',
+    'respuestas_brote',
+    'contaminaciones_agrupadas',
+]
+
+# Estructuras derivadas de las lecturas (completas solo en la base)
+ANALITICA = [
+    'series',
+    'detector',
+    'multivariado',
+    'focos_plagas',
+    'focos_anomalia',
+    'brotes',
+]
+
+
+# ========================================================================
+# CAPTURA
+# ========================================================================
+
+def _capturar_agente(agente, asignadas_guardadas: Dict[int, Any]) -> Dict[str, Any]:
+    """Estado de un agente fisico (sus celdas asignadas solo si cambiaron)"""
+    estado = {
+        'agente_id': agente.agente_id,
+        'posicion_actual': agente.posicion_actual,
+        'bateria': agente.bateria,
+        'frutos_cargados': agente.frutos_cargados,
+        'activo': agente.activo,
+    }
+    # La lista se reemplaza al reasignar: basta comparar identidad
+    if asignadas_guardadas.get(agente.agente_id) is not agente.celdas_asignadas:
+        estado['celdas_asignadas'] = list(agente.celdas_asignadas)
+        asignadas_guardadas[agente.agente_id] = agente.celdas_asignadas
+    for campo in CAMPOS_AGENTE:
+        if hasattr(agente, campo):
+            estado[campo] = getattr(agente, campo)
+
+    cola = getattr(agente, 'cola_instrucciones', None)
+    if cola is not None:
+        with cola.mutex:
+            estado['instrucciones_pendientes'] = list(cola.queue)
+    return estado
+
+
+def _capturar_capataz(capataz, desde_orden: int) -> Dict[str, Any]:
+    """Estado del Capataz supervisor (capataz.py)"""
+    with capataz.lock:
+        estado = {
+            'estados_agentes': dict(capataz.estados_agentes),
+            'ordenes_nuevas': capataz.ordenes_emitidas[desde_orden:],
+            'total_ordenes': len(capataz.ordenes_emitidas),
+            'tiempo_transcurrido': time.time() - capataz.tiempo_inicio,
+            'umbrales': dict(capataz.umbrales),
+            'cajas_atendidas': dict(capataz._cajas_atendidas),
+        }
+        for campo in CONTADORES_CAPATAZ:
+            estado[campo] = getattr(capataz, campo)
+    return estado
+
+
+def _capturar_analitica(objeto) -> Dict[str, Any]:
+    """Copia de los atributos de una estructura de analitica (sin su lock)"""
+    with objeto._lock:
+        return copy.deepcopy({k: v for k, v in vars(objeto).items() if k != '_lock'})
+
+
+def _delta_modelo(estado: Dict[str, Any], anterior: Dict[str, Any]) -> Dict[str, Any]:
+    """Estado de un modelo con solo las celdas de cada grilla que cambiaron desde `anterior`"""
+    delta: Dict[str, Any] = {'cambios': {}}
+    for campo, valor in estado.items():
+        previo = anterior.get(campo)
+        if isinstance(valor, np.ndarray) and isinstance(previo, np.ndarray) and previo.shape == valor.shape:
+            indices = np.flatnonzero(valor != previo)
+            delta['cambios'][campo] = (indices, valor.ravel()[indices])
+        else:
+            delta[campo] = valor
+    return delta
+
+
+def _capturar_controles(controles: Dict[int, Dict]) -> Dict[int, Dict]:
+    """Controles de ordenes (rama Simulation: Event + bandera de aborto)"""
+    return {
+        agente_id: {
+            'pausado': not ctrl['evento'].is_set(),
+            'abortar': ctrl['abortar'],
+            'orden_texto': ctrl['orden_texto'],
+        }
+        for agente_id, ctrl in controles.items()
+    }
+
+
+# ========================================================================
+# GESTOR DE CHECKPOINTS
+# ========================================================================
+
+class GestorCheckpoints:
+    """
+    Toma checkpoints incrementales de un Manager en curso
+
+    La captura corre en el hilo de ingesta del Manager (si lo hay) y cuesta
+    O(celdas cambiadas); la serializacion, compresion y escritura las hace
+    un hilo de fondo. Sin hilo de ingesta, quien llama a `guardar()` debe ser
+    el unico que escribe el huerto en ese momento.
+    """
+
+    def __init__(self, manager, ruta: str, compactar_cada: int = 20, nivel_compresion: int = 6):
+        """
+        Args:
+            manager: AgenteCapataz de manager.py
+            ruta: Archivo de checkpoints
+            compactar_cada: Numero de deltas antes de escribir una base nueva
+            nivel_compresion: Nivel de zlib (1 = rapido, 9 = compacto)
+        """
+        self.manager = manager
+        self.ruta = ruta
+        self.compactar_cada = compactar_cada
+        self.nivel_compresion = nivel_compresion
+
+        # Lo ya escrito (para calcular deltas)
+        self._crudos_guardados: Dict = {}
+        self._asignadas_guardadas: Dict[int, Any] = {}
+        self._len_colas: Dict[str, int] = {}
+        self._ordenes_guardadas = 0
+        self._modelos_guardados: Dict[str, Dict] = {}
+        self._deltas_desde_base = 0
+        self._secuencia = 0
+
+        # Escritura en segundo plano
+        self._cola_escritura: queue.Queue = queue.Queue()
+        self._escritor = Thread(target=self._bucle_escritura, daemon=True)
+        self._escritor.start()
+        self._automatico: Optional[Thread] = None
+        self._detener = Event()
+        self._lock_captura = Lock()  # guardar() automatico y manual no se cruzan
+
+        # Estadisticas
+        self.checkpoints_escritos = 0
+        self.bytes_escritos = 0
+        self.ultimo_tiempo_captura = 0.0
+
+    # --- CAPTURA ---
+
+    def capturar(self, completo: bool = False) -> Dict[str, Any]:
+        """
+        Construye el registro del checkpoint (base o delta)
+
+        Corre en el hilo de ingesta del Manager si esta activo, asi ninguna
+        lectura se aplica a medias durante la captura.
+
+        Args:
+            completo: Fuerza un checkpoint completo
+        """
+        with self._lock_captura:
+            ingesta = getattr(self.manager, 'ingesta', None)
+            if ingesta is not None:
+                return ingesta.ejecutar(self._capturar, completo)
+            return self._capturar(completo)
+
+    def _capturar(self, completo: bool) -> Dict[str, Any]:
+        inicio = time.perf_counter()
+        m = self.manager
+        completo = completo or self._secuencia == 0 or self._deltas_desde_base >= self.compactar_cada
+
+        if completo:
+            self._crudos_guardados = {}
+            self._asignadas_guardadas = {}
+            self._len_colas = {}
+            self._ordenes_guardadas = 0
+            self._modelos_guardados = {}
+
+        # Celdas cambiadas desde el checkpoint anterior (las marca el Manager)
+        sucias, m.celdas_sucias = m.celdas_sucias, set()
+        eventos, m.eventos_sucios = m.eventos_sucios or [], []
+        if completo:
+            celdas = dict(m.mapa_estados)
+            # Bits empaquetados (MapaCeldas se serializa asi)
+            exploradas = m.celdas_exploradas.copia()
+        else:
+            celdas = {p: m.mapa_estados[p] for p in sucias if p in m.mapa_estados}
+            exploradas = [p for p in sucias if p in m.celdas_exploradas]
+        registro: Dict[str, Any] = {
+            'tipo': BASE if completo else DELTA,
+            'secuencia': self._secuencia,
+            'timestamp': time.time(),
+            'grid': (m.grid_filas, m.grid_columnas),
+            'celdas': celdas,
+            'exploradas': exploradas,
+            'tiempo_transcurrido': time.time() - m.tiempo_inicio,
+            'contadores': {c: getattr(m, c) for c in CONTADORES_MANAGER if hasattr(m, c)},
+            'colas': {},
+            'agentes': [_capturar_agente(a, self._asignadas_guardadas) for a in m.agentes_fisicos],
+            'rng': random.getstate(),
+        }
+
+        # Semilla raiz y estado del generador de cada agente
+        aleatorio = getattr(m, 'aleatorio', None)
+        if aleatorio is not None:
+            registro['rng_flujos'] = aleatorio.estado()
+
+        # Analitica: completa en la base; un delta trae lo que hay que reaplicarle
+        if completo:
+            registro['analitica'] = {n: _capturar_analitica(getattr(m, n)) for n in ANALITICA}
+        else:
+            registro['eventos'] = eventos
+
+        crudos = getattr(m, 'datos_crudos', None)
+        if crudos is not None:
+            crudos = dict(crudos)
+            registro['datos_crudos'] = {p: d for p, d in crudos.items() if self._crudos_guardados.get(p) is not d}
+            self._crudos_guardados = crudos
+
+        # Las colas del Manager solo crecen: se guarda lo agregado
+        for nombre in ('cola_cosechas', 'cola_tratamientos'):
+            cola = getattr(m, nombre, None)
+            if cola is not None:
+                desde = self._len_colas.get(nombre, 0)
+                registro['colas'][nombre] = cola[desde:]
+                self._len_colas[nombre] = len(cola)
+
+        capataz = getattr(m, 'capataz', None)
+        if capataz is not None:
+            registro['capataz'] = _capturar_capataz(capataz, self._ordenes_guardadas)
+            self._ordenes_guardadas = registro['capataz']['total_ordenes']
+
+        controles = getattr(m, 'controles_agentes', None)
+        if controles is not None:
+            registro['controles'] = _capturar_controles(controles)
+
+        cuarentena = getattr(m, 'cuarentena', None)
+        if cuarentena is not None:
+            registro['cuarentena'] = cuarentena.infestadas()
+
+        # Modelos: completos en la base, solo las celdas cambiadas en un delta
+        for clave, nombre in (('plagas', 'modelo_plagas'), ('clima', 'clima')):
+            modelo = getattr(m, nombre, None)
+            if modelo is None:
+                continue
+            estado = modelo.estado()
+            anterior = self._modelos_guardados.get(clave)
+            registro[clave] = estado if anterior is None else _delta_modelo(estado, anterior)
+            self._modelos_guardados[clave] = estado
+
+        self._deltas_desde_base = 0 if completo else self._deltas_desde_base + 1
+        self._secuencia += 1
+        self.ultimo_tiempo_captura = time.perf_counter() - inicio
+        return registro
+
+    def guardar(self, completo: bool = False, esperar: bool = False):
+        """
+        Toma un checkpoint y lo encola para escritura en segundo plano
+
+        Args:
+            completo: Fuerza un checkpoint completo
+            esperar: Bloquea hasta que el checkpoint este en disco
+        """
+        self._cola_escritura.put(self.capturar(completo))
+        if esperar:
+            self._cola_escritura.join()
+
+    def iniciar_automatico(self, intervalo: float):
+        """Toma un checkpoint cada `intervalo` segundos en un hilo propio"""
+        def bucle():
+            while not self._detener.wait(intervalo):
+                self.guardar()
+
+        self._automatico = Thread(target=bucle, daemon=True)
+        self._automatico.start()
+
+    def detener(self):
+        """Detiene el modo automatico, toma un checkpoint final y espera a que llegue a disco"""
+        self._detener.set()
+        if self._automatico is not None:
+            self._automatico.join()
+        self.guardar(esperar=True)
+
+    # --- ESCRITURA ---
+
+    def _bucle_escritura(self):
+        while True:
+            registro = self._cola_escritura.get()
+            try:
+                self._escribir(registro)
+            except Exception as e:
+                print(f"[Checkpoint] [ERROR] No se pudo escribir el checkpoint: {e}")
+            finally:
+                self._cola_escritura.task_done()
+
+    def _escribir(self, registro: Dict[str, Any]):
+        datos = zlib.compress(pickle.dumps(registro, protocol=pickle.HIGHEST_PROTOCOL), self.nivel_compresion)
+        bloque = struct.pack('<I', len(datos)) + datos
+
+        if registro['tipo'] == BASE:
+            # Una base nueva reemplaza el archivo de forma atomica
+            temporal = self.ruta + ".tmp"
+            with open(temporal, 'wb') as f:
+                f.write(bloque)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporal, self.ruta)
+        else:
+            with open(self.ruta, 'ab') as f:
+                f.write(bloque)
+                f.flush()
+
+        self.checkpoints_escritos += 1
+        self.bytes_escritos += len(bloque)
+
+
+# ========================================================================
+# CARGA Y RESTAURACION
+# ========================================================================
+
+def leer_registros(ruta: str) -> List[Dict[str, Any]]:
+    """Lee los registros de un archivo de checkpoints (ignora un final truncado)"""
+    registros = []
+    with open(ruta, 'rb') as f:
+        while True:
+            cabecera = f.read(4)
+            if len(cabecera) < 4:
+                break
+            (longitud,) = struct.unpack('<I', cabecera)
+            datos = f.read(longitud)
+            if len(datos) < longitud:
+                break
+            registros.append(pickle.loads(zlib.decompress(datos)))
+    return registros
+
+
+def _como_mapa(grid, exploradas) -> MapaCeldas:
+    """Celdas exploradas de un registro (los checkpoints viejos guardaban un set)"""
+    if isinstance(exploradas, MapaCeldas):
+        return exploradas
+    return MapaCeldas(grid[0], grid[1], exploradas)
+
+
+def _aplicar_delta_modelo(estado: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Estado de un modelo despues de un delta (los checkpoints viejos lo traian completo)"""
+    if 'cambios' not in delta:
+        return delta
+    nuevo = dict(estado, **{c: v for c, v in delta.items() if c != 'cambios'})
+    for campo, (indices, valores) in delta['cambios'].items():
+        nuevo[campo].flat[indices] = valores
+    return nuevo
+
+
+def _reconstruir_indice(manager, infestadas):
+    """Indice de rectangulos desde mapa_estados (las celdas tratadas ya no cuentan como gusano)"""
+    grillas = {capa: np.zeros((manager.grid_filas, manager.grid_columnas), dtype=np.int64)
+               for capa in ('frutos', 'maduros', 'exploradas', 'gusanos')}
+    for (x, y), celda in manager.mapa_estados.items():
+        grillas['frutos'][x, y] = celda.frutos_disponibles
+        grillas['maduros'][x, y] = celda.frutos_disponibles if celda.listo_para_cosechar else 0
+        grillas['exploradas'][x, y] = 1
+        grillas['gusanos'][x, y] = celda.tiene_gusano and (infestadas is None or (x, y) in infestadas)
+    manager.indice.construir(**grillas)
+
+
+def _restaurar_analitica(manager, analitica: Dict[str, Dict], eventos: List):
+    """Analitica de la base mas las lecturas y tratamientos de los deltas, en orden"""
+    for nombre, atributos in analitica.items():
+        objeto = getattr(manager, nombre)
+        with objeto._lock:
+            vars(objeto).update(atributos)
+    for t, evento in eventos:
+        if isinstance(evento, tuple):
+            manager.brotes.tratar(evento)
+        else:
+            manager._actualizar_analitica(evento, t)
+
+
+def cargar_checkpoint(ruta: str) -> Dict[str, Any]:
+    """
+    Reconstruye el ultimo estado aplicando base + deltas
+
+    Returns:
+        Estado completo con el mismo formato que un registro 'base'
+    """
+    registros = leer_registros(ruta)
+    if not registros or registros[0]['tipo'] != BASE:
+        raise ValueError(f"Checkpoint invalido o vacio: {ruta}")
+
+    estado = registros[0]
+    estado['celdas'] = dict(estado['celdas'])
+    estado['exploradas'] = _como_mapa(estado['grid'], estado['exploradas'])
+    if 'capataz' in estado:
+        estado['capataz']['ordenes'] = list(estado['capataz'].pop('ordenes_nuevas'))
+    agentes = {a['agente_id']: a for a in estado['agentes']}
+    estado['eventos'] = []
+
+    for delta in registros[1:]:
+        estado['celdas'].update(delta['celdas'])
+        estado['exploradas'] |= _como_mapa(estado['grid'], delta['exploradas'])
+        if 'datos_crudos' in delta:
+            estado.setdefault('datos_crudos', {}).update(delta['datos_crudos'])
+        estado['eventos'].extend(delta.get('eventos', []))
+        for clave in ('plagas', 'clima'):
+            if clave in delta:
+                estado[clave] = _aplicar_delta_modelo(estado.get(clave, {}), delta[clave])
+        for nombre, nuevos in delta['colas'].items():
+            estado['colas'].setdefault(nombre, []).extend(nuevos)
+        if 'capataz' in delta:
+            ordenes = estado['capataz']['ordenes']
+            ordenes.extend(delta['capataz'].pop('ordenes_nuevas'))
+            estado['capataz'] = dict(delta['capataz'], ordenes=ordenes)
+        # Un delta trae las celdas asignadas de un agente solo si cambiaron
+        for datos in delta['agentes']:
+            agentes[datos['agente_id']] = dict(agentes.get(datos['agente_id'], {}), **datos)
+        for clave in ('secuencia', 'timestamp', 'tiempo_transcurrido', 'contadores',
+                      'rng', 'rng_flujos', 'controles', 'cuarentena'):
+            if clave in delta:
+                estado[clave] = delta[clave]
+
+    estado['agentes'] = list(agentes.values())
+    return estado
+
+
+def restaurar_checkpoint(manager, ruta: str) -> Dict[str, Any]:
+    """
+    Restaura un checkpoint sobre un Manager con sus agentes ya creados
+
+    Debe llamarse despues de crear_agentes_fisicos() y en lugar de
+    distribuir_trabajo(): cada agente recibe solo su ruta restante.
+    """
+    estado = cargar_checkpoint(ruta)
+    ahora = time.time()
+
+    if (manager.grid_filas, manager.grid_columnas) != tuple(estado['grid']):
+        raise ValueError(f"El checkpoint es de un grid {estado['grid'][0]}x{estado['grid'][1]}")
+
+    # Campo
+    manager.mapa_estados.clear()
+    manager.mapa_estados.update(estado['celdas'])
+    manager.celdas_exploradas.clear()
+    manager.celdas_exploradas.update(estado['exploradas'])
+    if 'datos_crudos' in estado and hasattr(manager, 'datos_crudos'):
+        manager.datos_crudos.clear()
+        manager.datos_crudos.update(estado['datos_crudos'])
+    for nombre, cola in estado['colas'].items():
+        setattr(manager, nombre, list(cola))
+    for contador, valor in estado['contadores'].items():
+        setattr(manager, contador, valor)
+    manager.tiempo_inicio = ahora - estado['tiempo_transcurrido']
+    manager.celdas_sucias = set()
+    manager.eventos_sucios = None
+
+    # Estructuras derivadas del campo
+    if hasattr(manager, 'indice'):
+        infestadas = {tuple(c) for c in estado['cuarentena']} if 'cuarentena' in estado else None
+        _reconstruir_indice(manager, infestadas)
+    if 'analitica' in estado:
+        _restaurar_analitica(manager, estado['analitica'], estado['eventos'])
+
+    # Agentes
+    agentes = {a.agente_id: a for a in manager.agentes_fisicos}
+    for datos in estado['agentes']:
+        agente = agentes.get(datos['agente_id'])
+        if agente is None:
+            continue
+        agente.posicion_actual = tuple(datos['posicion_actual'])
+        agente.bateria = datos['bateria']
+        agente.frutos_cargados = datos['frutos_cargados']
+        # Las celdas se reparten sin solapamiento: lo no explorado es lo que falta
+        if 'celdas_asignadas' in datos:
+            agente.asignar_celdas(estado['exploradas'].filtrar_sin_marcar(datos['celdas_asignadas']))
+        else:
+            agente.asignar_celdas(datos['ruta_restante'])
+        for campo in CAMPOS_AGENTE:
+            if campo in datos:
+                setattr(agente, campo, datos[campo])
+        for instruccion in datos.get('instrucciones_pendientes', []):
+            agente.recibir_instruccion(instruccion)
+        agente._publicar_flota()
+
+    # Capataz supervisor
+    capataz = getattr(manager, 'capataz', None)
+    if capataz is not None and 'capataz' in estado:
+        datos = estado['capataz']
+        with capataz.lock:
+            capataz.estados_agentes = dict(datos['estados_agentes'])
+            capataz.ordenes_emitidas = list(datos['ordenes'])
+            capataz.ultima_orden = {o.agente_destino: o for o in capataz.ordenes_emitidas
+                                    if o.agente_destino != TODOS_LOS_AGENTES}
+            difundidas = [o for o in capataz.ordenes_emitidas if o.agente_destino == TODOS_LOS_AGENTES]
+            if difundidas:
+                capataz.canal.restaurar(difundidas[-1])
+            capataz.umbrales.update(datos['umbrales'])
+            capataz._cajas_atendidas = dict(datos.get('cajas_atendidas', {}))
+            for contador in CONTADORES_CAPATAZ:
+                if contador in datos:
+                    setattr(capataz, contador, datos[contador])
+            capataz.tiempo_inicio = ahora - datos['tiempo_transcurrido']
+
+    # Controles de ordenes (rama Simulation)
+    controles = getattr(manager, 'controles_agentes', None)
+    if controles is not None and 'controles' in estado:
+        for agente_id, datos in estado['controles'].items():
+            ctrl = controles.get(agente_id)
+            if ctrl is None:
+                continue
+            ctrl['abortar'] = datos['abortar']
+            ctrl['orden_texto'] = datos['orden_texto']
+            flota = getattr(manager, 'flota', None)
+            if flota is not None:
+                flota.escribir(flota.fila(agente_id), orden=datos['orden_texto'])
+            if datos['pausado']:
+                ctrl['evento'].clear()
+            else:
+                ctrl['evento'].set()
+
+    # Zonas de cuarentena (se reabren a partir de sus celdas con gusano)
+    cuarentena = getattr(manager, 'cuarentena', None)
+    if cuarentena is not None:
+        for celda in estado.get('cuarentena', []):
+            cuarentena.reportar_gusano(tuple(celda))
+
+    # Nivel real de plagas (el modelo sigue desde el paso guardado)
+    modelo = getattr(manager, 'modelo_plagas', None)
+    if modelo is not None and 'plagas' in estado:
+        modelo.restaurar(estado['plagas'])
+
+    # Microclima (sigue desde la hora guardada)
+    clima = getattr(manager, 'clima', None)
+    if clima is not None and 'clima' in estado:
+        clima.restaurar(estado['clima'])
+
+    random.setstate(estado['rng'])
+    aleatorio = getattr(manager, 'aleatorio', None)
+    if aleatorio is not None and 'rng_flujos' in estado:
+        aleatorio.restaurar(estado['rng_flujos'])
+
+    print(f"[Checkpoint] [OK] Restaurado checkpoint #{estado['secuencia']} "
+          f"({len(estado['exploradas'])} celdas exploradas)")
+    return estado
@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+"""
+COMPUERTA DE REGRESION DE RENDIMIENTO
+=====================================
+
+Ejecuta la suite de benchmark.py varias veces, compara contra una linea base
+JSON generada en la misma maquina y falla (codigo de salida 1) cuando un
+camino vigilado empeora mas alla de la tolerancia con significancia estadistica.
+
+Criterio de regresion para cada benchmark vigilado:
+    1. El cambio de ops/s (media actual vs media base) supera la tolerancia
+    2. La diferencia es significativa: el intervalo de confianza al 95%
+       de la diferencia de medias (Welch) no contiene el cero
+
+Un benchmark vigilado que falta en la corrida actual (omitido o con error)
+o en la linea base tambien hace fallar la compuerta: un camino que no se
+mide no puede aprobar.
+
+USO:
+    # Generar / actualizar la linea base
+    python comparar_benchmarks.py --actualizar-base
+
+    # Comparar (uso en CI)
+    python comparar_benchmarks.py --corridas 5 --tolerancia 10
+
+LINEA BASE EN CI:
+    ops/s solo es comparable en la misma maquina, asi que la linea base no
+    se versiona: CI la genera en el mismo runner a partir de la rama destino
+    y despues compara la rama del cambio contra ella.
+
+        git checkout <rama destino>
+        python comparar_benchmarks.py --actualizar-base --base /tmp/base.json
+        git checkout <rama del cambio>
+        python comparar_benchmarks.py --base /tmp/base.json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from benchmark import ejecutar_suite
+
+
+RUTA_BASE = "benchmarks_base.json"
+
+# Caminos que protegen el throughput del que depende la planificacion
+VIGILADOS = [
+    "manager.ingesta",                    # ingesta de sensores
+    "manager._evaluar_riesgo",
+    "capataz.actualizar_estado_agente",   # decision del capataz
+    "capataz._evaluar_agentes_cercanos",
+    "ui.frame",                           # render de un frame
+]
+
+# Valores criticos t de Student (dos colas, 95%) por grados de libertad
+_T_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086,
+    25: 2.060, 30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+def t_critico(grados: float) -> float:
+    """
+    Valor t al 95% para `grados` de libertad (fraccionarios con Welch)
+
+    Redondea hacia abajo a la fila de la tabla: menos grados dan un t mayor,
+    asi que el intervalo nunca queda mas angosto que el real.
+    """
+    filas = [g for g in _T_95 if g <= grados]
+    return _T_95[max(filas)] if filas else _T_95[1]
+
+
+def intervalo_confianza(muestras: List[float]) -> Tuple[float, float]:
+    """Media y semiancho del IC al 95%"""
+    media = statistics.fmean(muestras)
+    if len(muestras) < 2:
+        return media, 0.0
+    error = statistics.stdev(muestras) / math.sqrt(len(muestras))
+    return media, t_critico(len(muestras) - 1) * error
+
+
+def diferencia_welch(base: List[float], actual: List[float]) -> Tuple[float, float]:
+    """
+    Diferencia de medias (actual - base) y semiancho de su IC al 95% (Welch)
+    """
+    diferencia = statistics.fmean(actual) - statistics.fmean(base)
+    if len(base) < 2 or len(actual) < 2:
+        return diferencia, 0.0
+    vb = statistics.variance(base) / len(base)
+    va = statistics.variance(actual) / len(actual)
+    if vb + va == 0:
+        return diferencia, 0.0
+    grados = (vb + va) ** 2 / (vb ** 2 / (len(base) - 1) + va ** 2 / (len(actual) - 1))
+    return diferencia, t_critico(grados) * math.sqrt(vb + va)
+
+
+# ========================================================================
+# RECOLECCION DE MUESTRAS
+# ========================================================================
+
+def recolectar(corridas: int, grupos: Optional[List[str]], repeticiones: int,
+               semilla: int, rapido: bool) -> Dict:
+    """
+    Ejecuta la suite `corridas` veces y agrupa las muestras por benchmark
+
+    Returns:
+        {'metadatos': {...}, 'benchmarks': {nombre: {'ops_por_segundo': [...], 'p99_us': [...]}},
+         'omitidos': {nombre: motivo}}
+    """
+    benchmarks: Dict[str, Dict] = {}
+    omitidos: Dict[str, str] = {}
+    metadatos = {}
+    for i in range(corridas):
+        print(f"\n[COMPARAR] Corrida {i + 1}/{corridas}")
+        documento = ejecutar_suite(grupos, repeticiones, semilla, None, rapido)
+        metadatos = documento['metadatos']
+        for r in documento['resultados']:
+            if r['estado'] != 'ok':
+                omitidos[r['nombre']] = f"{r['estado']}: {r['motivo']}"
+                continue
+            entrada = benchmarks.setdefault(r['nombre'], {'grupo': r['grupo'], 'ops_por_segundo': [], 'p99_us': []})
+            entrada['ops_por_segundo'].append(r['ops_por_segundo'])
+            entrada['p99_us'].append(r['p99_us'])
+
+    metadatos = dict(metadatos, corridas=corridas, fecha=datetime.now().isoformat())
+    # Basta una corrida fallida para no tener todas las muestras
+    return {'metadatos': metadatos, 'benchmarks': benchmarks, 'omitidos': omitidos}
+
+
+# ========================================================================
+# COMPARACION
+# ========================================================================
+
+def comparar(base: Dict, actual: Dict, tolerancia_pct: float, vigilados: List[str]) -> List[Dict]:
+    """Compara dos documentos de muestras; retorna una fila por benchmark"""
+    filas = []
+    omitidos = actual.get('omitidos', {})
+    nombres = sorted(set(base['benchmarks']) | set(actual['benchmarks']) | set(vigilados))
+    for nombre in nombres:
+        b = base['benchmarks'].get(nombre)
+        a = actual['benchmarks'].get(nombre)
+        fila = {'nombre': nombre, 'vigilado': nombre in vigilados}
+
+        if a is None:
+            fila['estado'] = 'OMITIDO'
+            fila['motivo'] = omitidos.get(nombre, "no se ejecuto")
+        elif b is None:
+            fila['estado'] = 'NUEVO'
+            fila['motivo'] = "no esta en la linea base"
+        else:
+            media_b, ic_b = intervalo_confianza(b['ops_por_segundo'])
+            media_a, ic_a = intervalo_confianza(a['ops_por_segundo'])
+            diferencia, ic_dif = diferencia_welch(b['ops_por_segundo'], a['ops_por_segundo'])
+            cambio = 100.0 * diferencia / media_b if media_b else 0.0
+            significativo = abs(diferencia) > ic_dif
+
+            if not significativo:
+                estado = 'RUIDO'
+            elif cambio <= -tolerancia_pct:
+                estado = 'REGRESION'
+            elif cambio >= tolerancia_pct:
+                estado = 'MEJORA'
+            else:
+                estado = 'OK'
+
+            fila.update(
+                base=media_b, ic_base=ic_b, actual=media_a, ic_actual=ic_a,
+                cambio_pct=cambio, significativo=significativo, estado=estado,
+                p99_base=statistics.median(b['p99_us']), p99_actual=statistics.median(a['p99_us'])
+            )
+        filas.append(fila)
+    return filas
+
+
+def fallos_compuerta(filas: List[Dict]) -> List[Dict]:
+    """Filas vigiladas que hacen fallar la compuerta: regresiones y caminos sin medir"""
+    return [f for f in filas if f['vigilado'] and f['estado'] in ('REGRESION', 'OMITIDO', 'NUEVO')]
+
+
+def tabla(filas: List[Dict]) -> str:
+    """Tabla legible con la diferencia por benchmark"""
+    encabezado = (f"{'BENCHMARK':<34} {'BASE ops/s':>20} {'ACTUAL ops/s':>20} "
+                  f"{'CAMBIO':>8} {'p99 us':>17}  ESTADO")
+    lineas = [encabezado, "-" * len(encabezado)]
+    for f in filas:
+        marca = "*" if f['vigilado'] else " "
+        if 'base' not in f:
+            lineas.append(f"{marca}{f['nombre']:<33} {'-':>20} {'-':>20} {'-':>8} {'-':>17}  "
+                          f"{f['estado']} ({f['motivo']})")
+            continue
+        base = f"{f['base']:.0f} ±{f['ic_base']:.0f}"
+        actual = f"{f['actual']:.0f} ±{f['ic_actual']:.0f}"
+        p99 = f"{f['p99_base']:.1f}->{f['p99_actual']:.1f}"
+        lineas.append(f"{marca}{f['nombre']:<33} {base:>20} {actual:>20} "
+                      f"{f['cambio_pct']:>+7.1f}% {p99:>17}  {f['estado']}")
+    lineas.append("(* = camino vigilado; IC al 95%)")
+    return "\n".join(lineas)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compuerta de regresion de rendimiento")
+    parser.add_argument('--base', default=RUTA_BASE, help="Linea base JSON")
+    parser.add_argument('--actualizar-base', action='store_true', help="Reescribe la linea base con esta corrida")
+    parser.add_argument('--corridas', type=int, default=5, help="Repeticiones de la suite completa")
+    parser.add_argument('--tolerancia', type=float, default=10.0, help="Perdida de ops/s tolerada (%%)")
+    parser.add_argument('--grupo', action='append', choices=['micro', 'ui', 'macro'])
+    parser.add_argument('--repeticiones', type=int, default=2000)
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--rapido', action='store_true')
+    parser.add_argument('--vigilar', action='append', help="Benchmark vigilado adicional")
+    args = parser.parse_args(argv)
+
+    grupos = args.grupo or ['micro', 'ui']
+    actual = recolectar(args.corridas, grupos, args.repeticiones, args.semilla, args.rapido)
+
+    if args.actualizar_base:
+        with open(args.base, 'w', encoding='utf-8') as f:
+            json.dump(actual, f, indent=2)
+        print(f"\n[OK] Linea base actualizada: {args.base}")
+        return 0
+
+    try:
+        with open(args.base, 'r', encoding='utf-8') as f:
+            base = json.load(f)
+    except OSError:
+        print(f"\n[ERROR] No existe la linea base {args.base}. Generala con --actualizar-base")
+        return 2
+
+    vigilados = VIGILADOS + (args.vigilar or [])
+    filas = comparar(base, actual, args.tolerancia, vigilados)
+    print("\n" + tabla(filas))
+
+    fallos = fallos_compuerta(filas)
+    if fallos:
+        print(f"\n[ERROR] {len(fallos)} camino(s) vigilado(s) con regresion o sin medir "
+              f"(tolerancia {args.tolerancia:.1f}%):")
+        for f in fallos:
+            if f['estado'] == 'REGRESION':
+                print(f"   - {f['nombre']}: {f['cambio_pct']:+.1f}%")
+            else:
+                print(f"   - {f['nombre']}: {f['estado']} ({f['motivo']})")
+        return 1
+
+    print(f"\n[OK] Sin regresiones significativas (tolerancia {args.tolerancia:.1f}%)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
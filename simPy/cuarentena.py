@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+ZONAS DE CUARENTENA
+===================
+
+Responsabilidades:
+1. Mantener las regiones prohibidas del huerto alrededor de las celdas con
+   gusano, en lugar de sacar a toda la flota:
+   - RADIO: cada celda con gusano abre su propia zona (cuadrado de `radio`)
+   - COMPONENTE: las celdas con gusano vecinas forman UNA zona (su
+     componente conexa, ampliada en `radio`)
+2. Planificar el recorrido de los agentes alrededor de las zonas:
+   - Las celdas prohibidas de la ruta se difieren al final de la ruta
+   - Los traslados rodean las zonas (camino mas corto en la cuadricula,
+     buscado con A* solo en la caja de origen y destino mas las zonas que
+     la tocan)
+3. Readmitir las celdas cuando se tratan todas las celdas con gusano de su zona
+4. Reportar el rendimiento perdido: celdas diferidas y perdidas, pasos de
+   desvio y area x tiempo en cuarentena
+
+La consulta "esta celda esta prohibida" es O(1): un arreglo NumPy con cuantas
+zonas cubren cada celda.
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+Celda = Tuple[int, int]
+
+
+class ModoCuarentena(Enum):
+    """Forma de la region prohibida"""
+    RADIO = "radio"
+    COMPONENTE = "componente"
+
+
+@dataclass
+class ZonaCuarentena:
+    """Region prohibida abierta por una o mas celdas con gusano"""
+    id: int
+    infestadas: Set[Celda]
+    celdas: Set[Celda] = field(default_factory=set)
+    abierta: float = field(default_factory=time.time)
+    cerrada: Optional[float] = None
+
+    def celda_segundos(self, ahora: float = None) -> float:
+        """Area por tiempo que la zona estuvo (o esta) cerrada al trabajo"""
+        fin = self.cerrada if self.cerrada is not None else (ahora or time.time())
+        return len(self.celdas) * (fin - self.abierta)
+
+    def caja(self) -> Tuple[int, int, int, int]:
+        """(x0, y0, x1, y1) inclusive que contiene la zona"""
+        xs = [c[0] for c in self.celdas]
+        ys = [c[1] for c in self.celdas]
+        return min(xs), min(ys), max(xs), max(ys)
+
+
+class GestorCuarentena:
+    """
+    Zonas de cuarentena de un huerto de filas x columnas
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        modo: ModoCuarentena (o su valor en texto)
+        radio: Celdas alrededor de cada celda con gusano que tambien se prohiben
+    """
+
+    def __init__(self, filas: int, columnas: int, modo=ModoCuarentena.RADIO, radio: int = 1):
+        self.filas = filas
+        self.columnas = columnas
+        self.modo = ModoCuarentena(modo)
+        self.radio = radio
+
+        self._cobertura = np.zeros((filas, columnas), dtype=np.int32)  # zonas que cubren cada celda
+        self.zonas: Dict[int, ZonaCuarentena] = {}        # activas
+        self.cerradas: List[ZonaCuarentena] = []
+        self._zona_de: Dict[Celda, int] = {}               # celda con gusano -> zona
+        self._cajas: Dict[int, Tuple[int, int, int, int]] = {}  # zona activa -> su caja
+        self._siguiente_id = 1
+        self._lock = Lock()
+
+        # Rendimiento perdido
+        self.celdas_diferidas = 0   # saltadas en la primera pasada de una ruta
+        self.celdas_perdidas = 0    # seguian prohibidas al terminar la ruta
+        self.pasos_desvio = 0       # pasos extra por rodear zonas
+
+    # ========================================================================
+    # APERTURA Y CIERRE DE ZONAS
+    # ========================================================================
+
+    def reportar_gusano(self, celda: Celda) -> ZonaCuarentena:
+        """Pone en cuarentena la region de una celda con gusano y retorna su zona"""
+        with self._lock:
+            if celda in self._zona_de:
+                return self.zonas[self._zona_de[celda]]
+
+            infestadas = {celda}
+            if self.modo == ModoCuarentena.COMPONENTE:
+                # Fusionar las zonas con gusano vecino (8-vecindad)
+                vecinas = {
+                    self._zona_de[v] for v in self._vecinos(celda, 1) if v in self._zona_de
+                }
+                for zona_id in vecinas:
+                    zona = self.zonas.pop(zona_id)
+                    del self._cajas[zona_id]
+                    self._cubrir(zona.celdas, -1)
+                    infestadas |= zona.infestadas
+
+            zona = ZonaCuarentena(id=self._siguiente_id, infestadas=infestadas)
+            self._siguiente_id += 1
+            for c in infestadas:
+                zona.celdas.add(c)
+                zona.celdas.update(self._vecinos(c, self.radio))
+                self._zona_de[c] = zona.id
+            self._cubrir(zona.celdas, +1)
+            self.zonas[zona.id] = zona
+            self._cajas[zona.id] = zona.caja()
+            return zona
+
+    def reportar_tratada(self, celda: Celda) -> List[Celda]:
+        """
+        Marca una celda con gusano como tratada
+
+        Returns:
+            Celdas readmitidas (la zona se cierra cuando no le quedan celdas con gusano)
+        """
+        with self._lock:
+            zona_id = self._zona_de.pop(celda, None)
+            if zona_id is None:
+                return []
+            zona = self.zonas[zona_id]
+            zona.infestadas.discard(celda)
+            if zona.infestadas:
+                return []
+
+            del self.zonas[zona_id]
+            del self._cajas[zona_id]
+            zona.cerrada = time.time()
+            self.cerradas.append(zona)
+            self._cubrir(zona.celdas, -1)
+            return [c for c in zona.celdas if not self._cobertura[c]]
+
+    def _vecinos(self, celda: Celda, radio: int) -> Iterator[Celda]:
+        x, y = celda
+        for i in range(max(0, x - radio), min(self.filas, x + radio + 1)):
+            for j in range(max(0, y - radio), min(self.columnas, y + radio + 1)):
+                yield (i, j)
+
+    def _cubrir(self, celdas: Iterable[Celda], delta: int):
+        for c in celdas:
+            self._cobertura[c] += delta
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def prohibida(self, celda: Celda) -> bool:
+        return bool(self._cobertura[celda])
+
+    def mapa(self) -> np.ndarray:
+        """Mascara booleana (filas x columnas) de las celdas prohibidas"""
+        return self._cobertura > 0
+
+    @property
+    def activa(self) -> bool:
+        return bool(self.zonas)
+
+    def infestadas(self) -> List[Celda]:
+        """Celdas con gusano aun sin tratar (lo que hace falta para reabrir las zonas)"""
+        with self._lock:
+            return list(self._zona_de)
+
+    # ========================================================================
+    # PLANIFICACION ALREDEDOR DE LAS ZONAS
+    # ========================================================================
+
+    def recorrer(self, ruta: List[Celda]) -> Iterator[Celda]:
+        """
+        Recorre una ruta saltando las celdas en cuarentena
+
+        Las celdas saltadas se intentan otra vez al final de la ruta (si su
+        zona ya se cerro); las que siguen prohibidas se cuentan como perdidas.
+        """
+        diferidas = []
+        for celda in ruta:
+            if self.prohibida(celda):
+                diferidas.append(celda)
+                self.celdas_diferidas += 1
+                continue
+            yield celda
+
+        for celda in diferidas:
+            if self.prohibida(celda):
+                self.celdas_perdidas += 1
+                continue
+            yield celda
+
+    def distancia(self, origen: Celda, destino: Celda) -> int:
+        """
+        Pasos de origen a destino rodeando las zonas (Manhattan si no hay zonas)
+
+        El origen y el destino pueden estar dentro de una zona (un agente que
+        sale de ella o va a tratarla). Si las zonas cierran el paso se usa la
+        distancia Manhattan.
+
+        Si la caja de origen y destino no tiene celdas prohibidas el camino
+        directo existe y no se busca nada. Si no, A* busca en esa caja
+        ampliada con las zonas que la tocan (y una celda de margen para
+        rodearlas), y solo si ahi no hay camino, en todo el huerto.
+        """
+        manhattan = abs(destino[0] - origen[0]) + abs(destino[1] - origen[1])
+        if not self.zonas or manhattan <= 1:
+            return manhattan
+
+        with self._lock:
+            caja = self._caja_busqueda(origen, destino)
+            if caja is None:
+                return manhattan
+            x0, y0, x1, y1 = caja
+            prohibidas = self._cobertura[x0:x1 + 1, y0:y1 + 1] > 0
+        pasos = _a_estrella(prohibidas, (origen[0] - x0, origen[1] - y0), (destino[0] - x0, destino[1] - y0))
+        if pasos is None and caja != (0, 0, self.filas - 1, self.columnas - 1):
+            with self._lock:
+                prohibidas = self._cobertura > 0
+            pasos = _a_estrella(prohibidas, origen, destino)
+        if pasos is None:
+            return manhattan
+        with self._lock:
+            self.pasos_desvio += pasos - manhattan
+        return pasos
+
+    def _caja_busqueda(self, origen: Celda, destino: Celda) -> Optional[Tuple[int, int, int, int]]:
+        """Caja (x0, y0, x1, y1) donde buscar el rodeo; None si el camino directo esta libre (lock tomado)"""
+        x0, x1 = sorted((origen[0], destino[0]))
+        y0, y1 = sorted((origen[1], destino[1]))
+        # Origen y destino pueden estar prohibidos: no cierran el camino directo
+        bloqueadas = (np.count_nonzero(self._cobertura[x0:x1 + 1, y0:y1 + 1])
+                      - bool(self._cobertura[origen]) - bool(self._cobertura[destino]))
+        if not bloqueadas:
+            return None
+
+        cambio = True
+        while cambio:
+            cambio = False
+            for zx0, zy0, zx1, zy1 in self._cajas.values():
+                if zx0 > x1 + 1 or zx1 < x0 - 1 or zy0 > y1 + 1 or zy1 < y0 - 1:
+                    continue
+                caja = (max(0, min(x0, zx0 - 1)), max(0, min(y0, zy0 - 1)),
+                        min(self.filas - 1, max(x1, zx1 + 1)), min(self.columnas - 1, max(y1, zy1 + 1)))
+                if caja != (x0, y0, x1, y1):
+                    x0, y0, x1, y1 = caja
+                    cambio = True
+        return x0, y0, x1, y1
+
+    # ========================================================================
+    # REPORTE
+    # ========================================================================
+
+    def metricas(self) -> Dict[str, float]:
+        ahora = time.time()
+        with self._lock:
+            return {
+                'zonas_activas': len(self.zonas),
+                'zonas_cerradas': len(self.cerradas),
+                'celdas_prohibidas': int(np.count_nonzero(self._cobertura)),
+                'celdas_diferidas': self.celdas_diferidas,
+                'celdas_perdidas': self.celdas_perdidas,
+                'pasos_desvio': self.pasos_desvio,
+                'celda_segundos': sum(z.celda_segundos(ahora) for z in list(self.zonas.values()) + self.cerradas),
+            }
+
+    def reporte(self) -> str:
+        m = self.metricas()
+        return (f"  • Modo: {self.modo.value} (radio {self.radio})\n"
+                f"  • Zonas activas/cerradas: {m['zonas_activas']} / {m['zonas_cerradas']} "
+                f"({m['celdas_prohibidas']} celdas prohibidas ahora)\n"
+                f"  • Celdas diferidas: {m['celdas_diferidas']} | perdidas: {m['celdas_perdidas']}\n"
+                f"  • Pasos de desvio: {m['pasos_desvio']}\n"
+                f"  • Area x tiempo en cuarentena: {m['celda_segundos']:.1f} celda-s")
+
+
+def _a_estrella(prohibidas: np.ndarray, origen: Celda, destino: Celda) -> Optional[int]:
+    """
+    Pasos del camino mas corto en 4-vecindad sin pisar celdas prohibidas
+    (salvo el origen y el destino); None si no hay camino
+
+    La cota es la distancia Manhattan, asi que el primer camino que llega
+    al destino es el mas corto. Entre empates se expande primero el nodo
+    mas avanzado.
+    """
+    filas, columnas = prohibidas.shape
+    dx, dy = destino
+    mejor = {origen: 0}
+    abiertos = [(abs(dx - origen[0]) + abs(dy - origen[1]), 0, origen)]
+    while abiertos:
+        _, menos_pasos, (x, y) = heapq.heappop(abiertos)
+        pasos = -menos_pasos
+        if pasos > mejor[(x, y)]:
+            continue  # Entrada vieja: la celda ya se alcanzo por un camino mas corto
+        for vecino in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            vx, vy = vecino
+            if not (0 <= vx < filas and 0 <= vy < columnas):
+                continue
+            if vecino == destino:
+                return pasos + 1
+            if prohibidas[vx, vy] or mejor.get(vecino, pasos + 2) <= pasos + 1:
+                continue
+            mejor[vecino] = pasos + 1
+            heapq.heappush(abiertos, (pasos + 1 + abs(dx - vx) + abs(dy - vy), -(pasos + 1), vecino))
+    return None
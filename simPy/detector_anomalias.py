@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+DETECTOR DE ANOMALIAS POR CELDA (EWMA EN LINEA)
+===============================================
+
+Responsabilidades:
+1. Llevar por celda y por canal de sensor una media y una varianza con
+   decaimiento exponencial (EWMA), actualizadas en O(1) por lectura
+2. Marcar las lecturas que se alejan de la PROPIA historia de la celda
+   (puntaje z contra la media y desviacion anteriores a la lectura),
+   ademas de los umbrales fijos del Manager
+3. Actualizar todo el huerto en una pasada vectorizada cuando las lecturas
+   llegan en lote (el resultado es el mismo que leerlas una por una)
+4. Entregar el puntaje de cada celda para EstadoCelda, la UI y el capataz
+
+Actualizacion (por canal):
+    delta    = x - media
+    z        = delta / max(desviacion, desviacion_minima)
+    media   += alfa * delta
+    varianza = (1 - alfa) * (varianza + alfa * delta^2)
+
+Una celda no se juzga hasta tener `minimo_lecturas` lecturas previas.
+"""
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from series_celdas import CANALES
+
+
+SIN_EVALUAR = object()  # la lectura aun no paso por el detector
+
+# Desviacion minima por canal: variaciones menores no son anomalas aunque
+# la historia de la celda sea casi constante
+DESVIACION_MINIMA = {
+    'temperatura': 0.5,
+    'humedad': 1.0,
+    'nivel_plagas': 0.25,
+    'nivel_nutrientes': 0.25,
+    'nivel_maduracion': 0.25,
+}
+
+
+@dataclass
+class AnomaliaCelda:
+    """Lectura que se aleja de la historia de su celda"""
+    celda: Tuple[int, int]
+    canales: Tuple[str, ...]        # canales con |z| >= umbral_z
+    puntaje: float                  # max |z| de la lectura
+    z: Dict[str, float]
+
+    def __str__(self):
+        detalle = ", ".join(f"{c} z={self.z[c]:+.1f}" for c in self.canales)
+        return f"Anomalia en {self.celda}: {detalle}"
+
+
+class DetectorAnomalias:
+    """
+    Estadisticas EWMA por celda y canal
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        alfa: Peso de la lectura nueva (0.1 ~ memoria de las ultimas 10-20 lecturas)
+        umbral_z: |z| a partir del cual un canal es anomalo
+        minimo_lecturas: Lecturas previas antes de juzgar una celda
+    """
+
+    def __init__(self, filas: int, columnas: int, alfa: float = 0.1, umbral_z: float = 4.0,
+                 minimo_lecturas: int = 5, desviacion_minima: Optional[Dict[str, float]] = None):
+        self.filas = filas
+        self.columnas = columnas
+        self.alfa = alfa
+        self.umbral_z = umbral_z
+        self.minimo_lecturas = minimo_lecturas
+        minima = dict(DESVIACION_MINIMA, **(desviacion_minima or {}))
+        self._desviacion_minima = np.array([minima[c] for c in CANALES], dtype=np.float64)
+
+        n = filas * columnas
+        self._media = np.zeros((n, len(CANALES)), dtype=np.float64)
+        self._varianza = np.zeros((n, len(CANALES)), dtype=np.float64)
+        self._lecturas = np.zeros(n, dtype=np.int32)
+        self._puntaje = np.zeros(n, dtype=np.float32)     # max |z| de la ultima lectura
+        self._mascara = np.zeros(n, dtype=np.uint8)       # bit c = canal c anomalo en la ultima lectura
+        self._bits = 1 << np.arange(len(CANALES))
+        self._lock = Lock()
+
+        self.lecturas = 0
+        self.anomalias = 0
+
+    # ========================================================================
+    # ACTUALIZACION
+    # ========================================================================
+
+    def _paso(self, indices: np.ndarray, valores: np.ndarray) -> np.ndarray:
+        """Actualiza celdas distintas entre si; retorna z (lecturas x canales)"""
+        media = self._media[indices]
+        varianza = self._varianza[indices]
+        delta = valores - media
+        desviacion = np.maximum(np.sqrt(varianza), self._desviacion_minima)
+        juzgada = (self._lecturas[indices] >= self.minimo_lecturas)[:, None]
+        z = np.where(juzgada, delta / desviacion, 0.0)
+
+        primera = (self._lecturas[indices] == 0)[:, None]
+        self._media[indices] = np.where(primera, valores, media + self.alfa * delta)
+        self._varianza[indices] = np.where(primera, 0.0, (1.0 - self.alfa) * (varianza + self.alfa * delta * delta))
+        self._lecturas[indices] += 1
+
+        anomalos = np.abs(z) >= self.umbral_z
+        self._puntaje[indices] = np.abs(z).max(axis=1)
+        self._mascara[indices] = anomalos @ self._bits
+        self.anomalias += int(anomalos.any(axis=1).sum())
+        return z
+
+    def actualizar(self, datos) -> Optional[AnomaliaCelda]:
+        """Procesa una lectura (DatosExploracion); retorna la anomalia si la hay"""
+        i = datos.x * self.columnas + datos.y
+        valores = np.array([datos.temperatura, datos.humedad, datos.nivel_plagas,
+                            datos.nivel_nutrientes, datos.nivel_maduracion], dtype=np.float64)
+        with self._lock:
+            # Mismas operaciones que _paso sobre las filas de la celda (vistas, sin indexado)
+            media, varianza = self._media[i], self._varianza[i]
+            n = int(self._lecturas[i])
+            delta = valores - media
+            if n >= self.minimo_lecturas:
+                z = delta / np.maximum(np.sqrt(varianza), self._desviacion_minima)
+            else:
+                z = np.zeros(len(CANALES))
+            if n == 0:
+                media[:] = valores
+            else:
+                media += self.alfa * delta
+                varianza[:] = (1.0 - self.alfa) * (varianza + self.alfa * delta * delta)
+            self._lecturas[i] = n + 1
+            self.lecturas += 1
+
+            absoluto = np.abs(z)
+            anomalos = absoluto >= self.umbral_z
+            self._puntaje[i] = absoluto.max()
+            self._mascara[i] = int(anomalos @ self._bits)
+            if not anomalos.any():
+                return None
+            self.anomalias += 1
+        return AnomaliaCelda(
+            celda=(datos.x, datos.y),
+            canales=tuple(c for c, a in zip(CANALES, anomalos) if a),
+            puntaje=float(absoluto.max()),
+            z={c: float(v) for c, v in zip(CANALES, z)},
+        )
+
+    def actualizar_lote(self, indices: np.ndarray, valores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Procesa un lote de lecturas de todo el huerto
+
+        Las lecturas repetidas de una celda se aplican en orden (una ronda
+        vectorizada por repeticion), igual que llamar a actualizar() una a una.
+
+        Args:
+            indices: Indice lineal de la celda de cada lectura
+            valores: (lecturas x canales) en el orden de CANALES
+
+        Returns:
+            (z por lectura y canal, mascara de lecturas anomalas)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        valores = np.asarray(valores, dtype=np.float64)
+        z = np.zeros(valores.shape, dtype=np.float64)
+        if not len(indices):
+            return z, np.zeros(0, dtype=np.bool_)
+
+        # Ronda de cada lectura = cuantas lecturas previas de su celda hay en el lote
+        orden = np.argsort(indices, kind='stable')
+        ordenadas = indices[orden]
+        inicio = np.flatnonzero(np.r_[True, ordenadas[1:] != ordenadas[:-1]])
+        conteo = np.diff(np.append(inicio, len(ordenadas)))
+        ronda = np.empty(len(indices), dtype=np.int64)
+        ronda[orden] = np.arange(len(indices)) - np.repeat(inicio, conteo)
+
+        with self._lock:
+            for r in range(int(conteo.max())):
+                fila = np.flatnonzero(ronda == r)
+                z[fila] = self._paso(indices[fila], valores[fila])
+            self.lecturas += len(indices)
+        return z, (np.abs(z) >= self.umbral_z).any(axis=1)
+
+    def actualizar_lecturas(self, lecturas) -> list:
+        """actualizar_lote sobre una lista de DatosExploracion; una AnomaliaCelda (o None) por lectura"""
+        if not lecturas:
+            return []
+        indices = np.fromiter((d.x * self.columnas + d.y for d in lecturas), dtype=np.int64, count=len(lecturas))
+        valores = np.array([(d.temperatura, d.humedad, d.nivel_plagas, d.nivel_nutrientes, d.nivel_maduracion)
+                            for d in lecturas], dtype=np.float64)
+        z, anomalas = self.actualizar_lote(indices, valores)
+        resultado = [None] * len(lecturas)
+        for k in np.flatnonzero(anomalas):
+            fila = z[k]
+            resultado[k] = AnomaliaCelda(
+                celda=(lecturas[k].x, lecturas[k].y),
+                canales=tuple(c for c, v in zip(CANALES, fila) if abs(v) >= self.umbral_z),
+                puntaje=float(np.abs(fila).max()),
+                z={c: float(v) for c, v in zip(CANALES, fila)},
+            )
+        return resultado
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def puntaje(self, celda: Tuple[int, int]) -> float:
+        return float(self._puntaje[celda[0] * self.columnas + celda[1]])
+
+    def canales_anomalos(self, celda: Tuple[int, int]) -> Tuple[str, ...]:
+        mascara = int(self._mascara[celda[0] * self.columnas + celda[1]])
+        return tuple(c for k, c in enumerate(CANALES) if mascara >> k & 1)
+
+    def campos_celda(self, celda: Tuple[int, int]) -> Dict:
+        """Campos de EstadoCelda con la ultima evaluacion de la celda"""
+        return {'puntaje_anomalia': self.puntaje(celda), 'canales_anomalos': self.canales_anomalos(celda)}
+
+    def mapa_puntajes(self) -> np.ndarray:
+        """max |z| de la ultima lectura de cada celda (filas x columnas)"""
+        return self._puntaje.reshape(self.filas, self.columnas).copy()
+
+    def estadisticas(self, celda: Tuple[int, int]) -> Dict[str, Tuple[float, float]]:
+        """(media, desviacion) de cada canal de una celda"""
+        i = celda[0] * self.columnas + celda[1]
+        return {c: (float(self._media[i, k]), float(np.sqrt(self._varianza[i, k])))
+                for k, c in enumerate(CANALES)}
+
+    def reporte(self) -> str:
+        celdas = int(np.count_nonzero(self._puntaje >= self.umbral_z))
+        return (f"  • Lecturas evaluadas: {self.lecturas} (alfa {self.alfa}, umbral |z| {self.umbral_z})\n"
+                f"  • Lecturas anomalas: {self.anomalias} | celdas anomalas ahora: {celdas}")
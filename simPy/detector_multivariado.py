@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+DETECTOR MULTIVARIADO POR ZONA (WELFORD + MAHALANOBIS)
+======================================================
+
+Responsabilidades:
+1. Llevar por zona del huerto (bloques de lado_zona x lado_zona celdas) la
+   media y la covarianza de los cinco canales de sensor, actualizadas en
+   linea con el algoritmo de Welford (O(canales^2) por lectura)
+2. Puntuar cada DatosExploracion con su distancia de Mahalanobis a la zona:
+   senales debiles combinadas (calido + humedo + algo de plaga) que ningun
+   umbral por canal ve por separado
+3. Decir que canales empujan la distancia (contribucion de cada canal a d^2)
+4. Mantener el puntaje de la ultima lectura de cada celda y el ranking de
+   las celdas mas anomalas
+
+La covarianza se regulariza con la desviacion minima de cada canal y su
+inversa se recalcula cada `recalcular` lecturas de la zona, asi que
+puntuar una lectura es un producto 5x5. Con 5 canales, d^2 de una lectura
+normal sigue una chi^2 de 5 grados: d >= 4.5 ocurre ~1 vez en 1000.
+"""
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from series_celdas import CANALES
+from detector_anomalias import DESVIACION_MINIMA
+
+
+@dataclass
+class AnomaliaMultivariada:
+    """Lectura lejos de la distribucion conjunta de su zona"""
+    celda: Tuple[int, int]
+    zona: int
+    canales: Tuple[str, ...]        # canales que aportan la mayor parte de d^2
+    puntaje: float                  # distancia de Mahalanobis d
+    contribuciones: Dict[str, float]
+
+    def __str__(self):
+        detalle = ", ".join(f"{c} {self.contribuciones[c]:.0%}" for c in self.canales)
+        return f"Combinacion anomala en {self.celda} (zona {self.zona}): {detalle}"
+
+
+class DetectorMultivariado:
+    """
+    Media y covarianza de Welford por zona, puntaje de Mahalanobis por lectura
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        lado_zona: Lado de los bloques que comparten estadisticas
+        umbral: Distancia d a partir de la cual la lectura es anomala
+        minimo_lecturas: Lecturas de la zona antes de juzgarla
+        recalcular: Cada cuantas lecturas de la zona se invierte de nuevo la covarianza
+    """
+
+    def __init__(self, filas: int, columnas: int, lado_zona: int = 5, umbral: float = 4.5,
+                 minimo_lecturas: int = 10, recalcular: int = 8,
+                 desviacion_minima: Optional[Dict[str, float]] = None):
+        self.filas = filas
+        self.columnas = columnas
+        self.lado_zona = lado_zona
+        self.umbral = umbral
+        self.minimo_lecturas = max(2, minimo_lecturas)
+        self.recalcular = max(1, recalcular)
+        minima = dict(DESVIACION_MINIMA, **(desviacion_minima or {}))
+        self._piso = np.diag([minima[c] ** 2 for c in CANALES])
+
+        self.zonas_x = -(-filas // lado_zona)
+        self.zonas_y = -(-columnas // lado_zona)
+        z, c = self.zonas_x * self.zonas_y, len(CANALES)
+        self._n = np.zeros(z, dtype=np.int64)
+        self._media = np.zeros((z, c), dtype=np.float64)
+        self._m2 = np.zeros((z, c, c), dtype=np.float64)          # suma de productos de desviaciones
+        self._precision = np.zeros((z, c, c), dtype=np.float64)   # inversa de la covarianza regularizada
+        self._vigente = np.zeros(z, dtype=np.bool_)               # la precision corresponde a _n reciente
+
+        self._puntaje = np.zeros(filas * columnas, dtype=np.float32)  # d de la ultima lectura de cada celda
+        self._lock = Lock()
+        self.lecturas = 0
+        self.anomalias = 0
+
+    def zona(self, celda: Tuple[int, int]) -> int:
+        x, y = celda
+        return (x // self.lado_zona) * self.zonas_y + y // self.lado_zona
+
+    def _zonas(self, indices: np.ndarray) -> np.ndarray:
+        x, y = np.divmod(indices, self.columnas)
+        return (x // self.lado_zona) * self.zonas_y + y // self.lado_zona
+
+    # ========================================================================
+    # ACTUALIZACION
+    # ========================================================================
+
+    def _invertir(self, zonas: np.ndarray):
+        """Recalcula la precision de las zonas indicadas"""
+        covarianza = self._m2[zonas] / (self._n[zonas] - 1)[:, None, None] + self._piso
+        self._precision[zonas] = np.linalg.inv(covarianza)
+        self._vigente[zonas] = True
+
+    def _paso(self, zonas: np.ndarray, valores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Actualiza zonas distintas entre si; retorna (d, contribucion de cada canal a d^2)
+
+        La lectura se puntua contra las estadisticas anteriores a ella.
+        """
+        juzgada = self._n[zonas] >= self.minimo_lecturas
+        desactualizada = zonas[juzgada & ~self._vigente[zonas]]
+        if len(desactualizada):
+            self._invertir(desactualizada)
+
+        delta = valores - self._media[zonas]
+        contribucion = np.where(juzgada[:, None], delta * np.einsum('zij,zj->zi', self._precision[zonas], delta), 0.0)
+        d = np.sqrt(np.maximum(contribucion.sum(axis=1), 0.0))
+
+        # Welford: media += delta / n ; M2 += delta (x - media_nueva)^T
+        n = self._n[zonas] + 1
+        self._n[zonas] = n
+        media = self._media[zonas] + delta / n[:, None]
+        self._media[zonas] = media
+        self._m2[zonas] += delta[:, :, None] * (valores - media)[:, None, :]
+        self._vigente[zonas[n % self.recalcular == 0]] = False
+        return d, contribucion
+
+    def _anomalia(self, celda, zona, d, contribucion) -> AnomaliaMultivariada:
+        total = max(float(contribucion.sum()), 1e-12)
+        aportes = {c: max(0.0, float(v)) / total for c, v in zip(CANALES, contribucion)}
+        # Canales que explican la distancia: de mayor a menor aporte hasta cubrir el 80%
+        canales, cubierto = [], 0.0
+        for c in sorted(aportes, key=aportes.get, reverse=True):
+            canales.append(c)
+            cubierto += aportes[c]
+            if cubierto >= 0.8:
+                break
+        return AnomaliaMultivariada(celda=celda, zona=int(zona), canales=tuple(canales),
+                                    puntaje=float(d), contribuciones=aportes)
+
+    def actualizar(self, datos) -> Optional[AnomaliaMultivariada]:
+        """Procesa una lectura (DatosExploracion); retorna la anomalia si la hay"""
+        i = datos.x * self.columnas + datos.y
+        z = self.zona((datos.x, datos.y))
+        valores = np.array([datos.temperatura, datos.humedad, datos.nivel_plagas,
+                            datos.nivel_nutrientes, datos.nivel_maduracion], dtype=np.float64)
+        with self._lock:
+            # Mismas operaciones que _paso sobre las filas de la zona (vistas, sin indexado)
+            n = int(self._n[z])
+            media = self._media[z]
+            delta = valores - media
+            if n >= self.minimo_lecturas:
+                if not self._vigente[z]:
+                    self._invertir(np.array([z]))
+                contribucion = delta * (self._precision[z] @ delta)
+            else:
+                contribucion = np.zeros(len(CANALES))
+            d = float(np.sqrt(max(contribucion.sum(), 0.0)))
+
+            n += 1
+            self._n[z] = n
+            media += delta / n
+            self._m2[z] += delta[:, None] * (valores - media)[None, :]
+            if n % self.recalcular == 0:
+                self._vigente[z] = False
+
+            self._puntaje[i] = d
+            self.lecturas += 1
+            if d < self.umbral:
+                return None
+            self.anomalias += 1
+        return self._anomalia((datos.x, datos.y), z, d, contribucion)
+
+    def actualizar_lote(self, indices: np.ndarray, valores: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Procesa un lote de lecturas de todo el huerto
+
+        Las lecturas de una misma zona se aplican en orden (una ronda
+        vectorizada por repeticion), igual que llamar a actualizar() una a una.
+
+        Args:
+            indices: Indice lineal de la celda de cada lectura
+            valores: (lecturas x canales) en el orden de CANALES
+
+        Returns:
+            (d por lectura, contribucion por lectura y canal)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        valores = np.asarray(valores, dtype=np.float64)
+        d = np.zeros(len(indices), dtype=np.float64)
+        contribucion = np.zeros(valores.shape, dtype=np.float64)
+        if not len(indices):
+            return d, contribucion
+
+        zonas = self._zonas(indices)
+        orden = np.argsort(zonas, kind='stable')
+        ordenadas = zonas[orden]
+        inicio = np.flatnonzero(np.r_[True, ordenadas[1:] != ordenadas[:-1]])
+        conteo = np.diff(np.append(inicio, len(ordenadas)))
+        ronda = np.empty(len(indices), dtype=np.int64)
+        ronda[orden] = np.arange(len(indices)) - np.repeat(inicio, conteo)
+
+        with self._lock:
+            for r in range(int(conteo.max())):
+                fila = np.flatnonzero(ronda == r)
+                d[fila], contribucion[fila] = self._paso(zonas[fila], valores[fila])
+            # Con varias lecturas de una celda queda la ultima
+            self._puntaje[indices] = d
+            self.lecturas += len(indices)
+            self.anomalias += int(np.count_nonzero(d >= self.umbral))
+        return d, contribucion
+
+    def actualizar_lecturas(self, lecturas) -> list:
+        """actualizar_lote sobre una lista de DatosExploracion; una AnomaliaMultivariada (o None) por lectura"""
+        if not lecturas:
+            return []
+        indices = np.fromiter((d.x * self.columnas + d.y for d in lecturas), dtype=np.int64, count=len(lecturas))
+        valores = np.array([(d.temperatura, d.humedad, d.nivel_plagas, d.nivel_nutrientes, d.nivel_maduracion)
+                            for d in lecturas], dtype=np.float64)
+        d, contribucion = self.actualizar_lote(indices, valores)
+        resultado = [None] * len(lecturas)
+        for k in np.flatnonzero(d >= self.umbral):
+            celda = (lecturas[k].x, lecturas[k].y)
+            resultado[k] = self._anomalia(celda, self.zona(celda), d[k], contribucion[k])
+        return resultado
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def puntaje(self, celda: Tuple[int, int]) -> float:
+        return float(self._puntaje[celda[0] * self.columnas + celda[1]])
+
+    def campos_celda(self, celda: Tuple[int, int]) -> Dict:
+        """Campos de EstadoCelda con la ultima distancia de la celda"""
+        return {'distancia_multivariada': self.puntaje(celda)}
+
+    def mapa_puntajes(self) -> np.ndarray:
+        """d de la ultima lectura de cada celda (filas x columnas)"""
+        return self._puntaje.reshape(self.filas, self.columnas).copy()
+
+    def mas_anomalas(self, n: int = 10) -> List[Tuple[Tuple[int, int], float]]:
+        """Las n celdas con mayor d en su ultima lectura, de mayor a menor"""
+        n = min(n, len(self._puntaje))
+        if n <= 0:
+            return []
+        candidatas = np.argpartition(self._puntaje, -n)[-n:]
+        candidatas = candidatas[np.argsort(-self._puntaje[candidatas], kind='stable')]
+        return [(divmod(int(i), self.columnas), float(self._puntaje[i]))
+                for i in candidatas if self._puntaje[i] > 0]
+
+    def estadisticas(self, zona: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(media, covarianza) de una zona; covarianza NaN con menos de 2 lecturas"""
+        n = int(self._n[zona])
+        if n < 2:
+            return self._media[zona].copy(), np.full(self._m2[zona].shape, np.nan)
+        return self._media[zona].copy(), self._m2[zona] / (n - 1)
+
+    def reporte(self, n: int = 5) -> str:
+        texto = (f"  • Lecturas evaluadas: {self.lecturas} ({self.zonas_x * self.zonas_y} zonas de "
+                 f"{self.lado_zona}x{self.lado_zona}, umbral d {self.umbral})\n"
+                 f"  • Lecturas anomalas: {self.anomalias}")
+        ranking = [f"{celda} d={d:.1f}" for celda, d in self.mas_anomalas(n) if d >= self.umbral]
+        if ranking:
+            texto += "\n  • Celdas mas anomalas: " + ", ".join(ranking)
+        return texto
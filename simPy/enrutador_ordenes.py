@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+ENRUTADOR DE ORDENES DEL CAPATAZ
+================================
+
+Responsabilidades:
+1. Mantener la tabla agente_id -> buzon de cada recolector
+2. Entregar cada orden publicada por el capataz a su destinatario en O(1)
+3. Garantizar entrega exactamente una vez (descarta re-publicaciones de
+   un numero de secuencia ya entregado o pendiente) con memoria acotada:
+   por agente, la secuencia mas alta vista y las de una ventana debajo de
+   ella (las que llegan tarde pero dentro de la ventana se entregan)
+4. Entregar las ordenes de cada agente en el orden en que se encolaron
+   (cola FIFO por agente, vaciada por un solo hilo a la vez)
+5. Llevar contadores de publicacion, entrega, duplicados y ordenes sin destino
+
+El capataz encola cada orden en `_emitir_orden` bajo su lock, en el mismo
+paso que le asigna la secuencia, y la entrega despues de soltarlo. Asi dos
+hilos que emiten ordenes al mismo agente no pueden invertir su orden. Los
+agentes se registran al crearse. No se reemplazan metodos en tiempo de
+ejecucion.
+"""
+
+from collections import Counter, deque
+from threading import Lock
+from typing import Callable, Deque, Dict, Set
+
+
+VENTANA_SECUENCIAS = 64  # secuencias debajo de la mas alta que aun se aceptan tarde
+
+
+class EnrutadorOrdenes:
+    """
+    Tabla de buzones de los recolectores
+
+    Args:
+        ventana: Cuantas secuencias por debajo de la mas alta de un agente se
+            recuerdan; una secuencia mas vieja se descarta como re-publicacion
+    """
+
+    def __init__(self, ventana: int = VENTANA_SECUENCIAS):
+        self.buzones: Dict[int, Callable] = {}
+        self.ventana = max(1, ventana)
+        self.secuencia_maxima: Dict[int, int] = {}
+        self.secuencias_recientes: Dict[int, Set[int]] = {}
+        self.pendientes: Dict[int, Deque] = {}
+        self._entregando: Set[int] = set()
+        self.lock = Lock()
+
+        # Contadores
+        self.publicadas = 0
+        self.entregadas = 0
+        self.duplicadas = 0
+        self.sin_destino = 0
+        self.entregas_por_agente: Counter = Counter()
+
+    def registrar(self, agente_id: int, buzon: Callable):
+        """
+        Registra el buzon de un agente
+
+        Args:
+            agente_id: ID del recolector
+            buzon: Funcion que recibe la OrdenCapataz
+        """
+        with self.lock:
+            self.buzones[agente_id] = buzon
+
+    def desregistrar(self, agente_id: int):
+        with self.lock:
+            self.buzones.pop(agente_id, None)
+
+    def encolar(self, orden) -> bool:
+        """
+        Reserva el lugar de una orden en la cola de su agente (sin entregarla)
+
+        Returns:
+            True si la orden quedo pendiente; False si no hay buzon o su
+            secuencia ya se habia publicado
+        """
+        agente_id = orden.agente_destino
+        with self.lock:
+            self.publicadas += 1
+            if agente_id not in self.buzones:
+                self.sin_destino += 1
+                return False
+            secuencia = getattr(orden, 'secuencia', 0)
+            if secuencia and not self._secuencia_nueva(agente_id, secuencia):
+                self.duplicadas += 1
+                return False
+            self.pendientes.setdefault(agente_id, deque()).append(orden)
+            return True
+
+    def _secuencia_nueva(self, agente_id: int, secuencia: int) -> bool:
+        """Registra `secuencia` si no se habia visto (lock tomado); O(1) amortizado"""
+        maxima = self.secuencia_maxima.get(agente_id, 0)
+        piso = maxima - self.ventana
+        if secuencia <= piso:
+            return False  # Mas vieja que la ventana: se trata como re-publicacion
+        recientes = self.secuencias_recientes.setdefault(agente_id, set())
+        if secuencia in recientes:
+            return False
+        recientes.add(secuencia)
+        if secuencia > maxima:
+            self.secuencia_maxima[agente_id] = secuencia
+            if len(recientes) > 2 * self.ventana:
+                piso = secuencia - self.ventana
+                self.secuencias_recientes[agente_id] = {s for s in recientes if s > piso}
+        return True
+
+    def entregar(self, agente_id: int) -> int:
+        """
+        Entrega las ordenes pendientes de un agente, en orden de llegada
+
+        Si otro hilo ya esta entregando a ese agente, este retorna de
+        inmediato y aquel entrega tambien lo recien encolado.
+
+        Returns:
+            Cantidad de ordenes entregadas por este hilo
+        """
+        with self.lock:
+            if agente_id in self._entregando:
+                return 0
+            self._entregando.add(agente_id)
+        entregadas = 0
+        try:
+            while True:
+                with self.lock:
+                    cola = self.pendientes.get(agente_id)
+                    buzon = self.buzones.get(agente_id)
+                    if not cola:
+                        self._entregando.discard(agente_id)
+                        return entregadas
+                    orden = cola.popleft()
+                    if buzon is None:
+                        self.sin_destino += 1
+                        continue
+                    self.entregadas += 1
+                    self.entregas_por_agente[agente_id] += 1
+                # La entrega ocurre fuera del lock: el agente puede reportar su estado
+                # al capataz y provocar otra orden durante la entrega (queda en la cola)
+                buzon(orden)
+                entregadas += 1
+        except BaseException:
+            with self.lock:
+                self._entregando.discard(agente_id)
+            raise
+
+    def publicar(self, orden) -> bool:
+        """
+        Encola una orden y la entrega a su agente destino
+
+        Returns:
+            True si la orden se acepto; False si no hay buzon o ya se habia publicado
+        """
+        if not self.encolar(orden):
+            return False
+        self.entregar(orden.agente_destino)
+        return True
+
+    def reporte(self) -> str:
+        return (f"  • Publicadas: {self.publicadas}\n"
+                f"  • Entregadas: {self.entregadas}\n"
+                f"  • Duplicadas descartadas: {self.duplicadas}\n"
+                f"  • Sin destino: {self.sin_destino}")
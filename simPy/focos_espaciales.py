@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+FOCOS ESPACIALES (GETIS-ORD Gi* Y MORAN LOCAL)
+==============================================
+
+Responsabilidades:
+1. Distinguir un valor alto aislado de un FOCO: una region donde la celda y
+   sus vecinas estan altas a la vez (plagas, puntaje de anomalia, ...)
+2. Mantener por celda la suma y el numero de celdas con valor en su
+   ventana de (2 radio + 1)^2 celdas, mas la suma y suma de cuadrados
+   globales; de ahi salen Gi* y la I de Moran local de cualquier celda
+3. Actualizar en O((2 radio + 1)^2) cuando cambia una celda, sin recorrer
+   el huerto; el calculo completo (tabla de sumas acumuladas) solo al
+   cargar un lote grande o para corregir el redondeo acumulado
+4. Entregar el mapa de focos y el ranking de celdas calientes al capataz
+   y a la UI
+
+Solo cuentan las celdas con valor (exploradas). Con media m, desviacion s
+y n celdas con valor, para la celda i con suma S y W celdas en su ventana:
+
+    Gi*  = (S - m W) / (s sqrt((n W - W^2) / (n - 1)))
+    I    = (x - m) / s^2 * ((S - x) - (W - 1) m)
+
+Gi* >= 1.96 es un foco caliente (95%), <= -1.96 un foco frio.
+"""
+
+import math
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nucleos import contar_vecinos
+
+
+Z_FOCO = 1.96
+
+
+def _suma_ventana(arreglo: np.ndarray, radio: int) -> np.ndarray:
+    """Suma de cada ventana cuadrada recortada al huerto (tabla de sumas acumuladas)"""
+    filas, columnas = arreglo.shape
+    integral = np.zeros((filas + 1, columnas + 1), dtype=np.float64)
+    np.cumsum(np.cumsum(arreglo, axis=0, dtype=np.float64), axis=1, out=integral[1:, 1:])
+    integral = np.pad(integral, radio, mode='edge')
+    v = 2 * radio + 1
+    return (integral[v:v + filas, v:v + columnas] - integral[:filas, v:v + columnas]
+            - integral[v:v + filas, :columnas] + integral[:filas, :columnas])
+
+
+class FocosEspaciales:
+    """
+    Estadisticos locales de autocorrelacion sobre una variable del huerto
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        radio: Radio de la ventana de vecinos (1 = 3x3)
+        umbral_z: |Gi*| a partir del cual una celda es foco
+        campo: Nombre del campo de EstadoCelda que recibe el Gi* de la celda
+    """
+
+    def __init__(self, filas: int, columnas: int, radio: int = 1, umbral_z: float = Z_FOCO,
+                 campo: str = 'foco'):
+        self.filas = filas
+        self.columnas = columnas
+        self.radio = radio
+        self.umbral_z = umbral_z
+        self.campo = campo
+
+        self._valores = np.zeros((filas, columnas), dtype=np.float64)
+        self._presente = np.zeros((filas, columnas), dtype=np.bool_)
+        self._suma = np.zeros((filas, columnas), dtype=np.float64)     # suma de la ventana
+        self._cuenta = np.zeros((filas, columnas), dtype=np.int32)     # celdas con valor en la ventana
+        self._n = 0
+        self._s1 = 0.0
+        self._s2 = 0.0
+        self._cambios = 0   # actualizaciones incrementales desde el ultimo calculo completo
+        self._lock = Lock()
+
+    # ========================================================================
+    # ACTUALIZACION
+    # ========================================================================
+
+    def _ventana(self, x: int, y: int) -> Tuple[slice, slice]:
+        return (slice(max(0, x - self.radio), x + self.radio + 1),
+                slice(max(0, y - self.radio), y + self.radio + 1))
+
+    def _poner(self, x: int, y: int, valor: float):
+        ventana = self._ventana(x, y)
+        if self._presente[x, y]:
+            anterior = self._valores[x, y]
+            self._suma[ventana] += valor - anterior
+            self._s1 += valor - anterior
+            self._s2 += valor * valor - anterior * anterior
+        else:
+            self._presente[x, y] = True
+            self._suma[ventana] += valor
+            self._cuenta[ventana] += 1
+            self._n += 1
+            self._s1 += valor
+            self._s2 += valor * valor
+        self._valores[x, y] = valor
+
+    def actualizar(self, celda: Tuple[int, int], valor: float):
+        """Nuevo valor de una celda: actualiza solo su ventana"""
+        x, y = celda
+        with self._lock:
+            self._poner(x, y, float(valor))
+            self._cambios += 1
+            # El redondeo de las sumas incrementales se corrige cada tanto (costo amortizado O(1))
+            if self._cambios >= self._valores.size:
+                self._recalcular()
+
+    def actualizar_lote(self, indices: np.ndarray, valores: np.ndarray):
+        """
+        Nuevos valores de varias celdas (indices lineales); con indices
+        repetidos queda el ultimo. Un lote grande se recalcula completo.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        valores = np.asarray(valores, dtype=np.float64)
+        if not len(indices):
+            return
+        with self._lock:
+            if len(indices) * (2 * self.radio + 1) ** 2 >= self._valores.size:
+                self._valores.flat[indices] = valores
+                self._presente.flat[indices] = True
+                self._recalcular()
+                return
+            for i, valor in zip(indices.tolist(), valores.tolist()):
+                self._poner(*divmod(i, self.columnas), valor)
+            self._cambios += len(indices)
+
+    def _recalcular(self):
+        valores = np.where(self._presente, self._valores, 0.0)
+        self._suma = _suma_ventana(valores, self.radio)
+        self._cuenta = contar_vecinos(self._presente, self.radio)
+        self._n = int(np.count_nonzero(self._presente))
+        self._s1 = float(valores.sum())
+        self._s2 = float((valores * valores).sum())
+        self._cambios = 0
+
+    def recalcular(self):
+        """Calculo completo desde los valores (descarta el redondeo acumulado)"""
+        with self._lock:
+            self._recalcular()
+
+    # ========================================================================
+    # ESTADISTICOS
+    # ========================================================================
+
+    def _globales(self) -> Optional[Tuple[int, float, float]]:
+        """(n, media, varianza); None si aun no hay dispersion"""
+        n = self._n
+        if n < 3:
+            return None
+        media = self._s1 / n
+        varianza = self._s2 / n - media * media
+        if varianza <= 1e-12 * max(1.0, media * media):
+            return None
+        return n, media, varianza
+
+    def gi_estrella(self) -> np.ndarray:
+        """Gi* de todo el huerto (filas x columnas); NaN en celdas sin valor"""
+        with self._lock:
+            globales = self._globales()
+            if globales is None:
+                return np.full(self._valores.shape, np.nan)
+            n, media, varianza = globales
+            w = self._cuenta.astype(np.float64)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                z = (self._suma - media * w) / (np.sqrt(varianza) * np.sqrt((n * w - w * w) / (n - 1)))
+            return np.where(self._presente & (w < n), z, np.nan)
+
+    def gi_celda(self, celda: Tuple[int, int]) -> float:
+        """Gi* de una celda en O(1); NaN si no se puede calcular"""
+        x, y = celda
+        with self._lock:
+            globales = self._globales()
+            w = float(self._cuenta[x, y])
+            if globales is None or not self._presente[x, y] or w >= globales[0]:
+                return float('nan')
+            n, media, varianza = globales
+            return float((self._suma[x, y] - media * w) / math.sqrt(varianza * (n * w - w * w) / (n - 1)))
+
+    def moran_local(self) -> np.ndarray:
+        """I de Moran local (filas x columnas); positiva = la celda se parece a sus vecinas"""
+        with self._lock:
+            globales = self._globales()
+            if globales is None:
+                return np.full(self._valores.shape, np.nan)
+            _, media, varianza = globales
+            desvio = self._valores - media
+            vecinas = (self._suma - self._valores) - (self._cuenta - 1) * media
+            return np.where(self._presente, desvio / varianza * vecinas, np.nan)
+
+    # ========================================================================
+    # FOCOS
+    # ========================================================================
+
+    def mapa_focos(self) -> np.ndarray:
+        """+1 foco caliente, -1 foco frio, 0 sin foco o sin valor (int8, filas x columnas)"""
+        z = self.gi_estrella()
+        mapa = np.zeros(z.shape, dtype=np.int8)
+        mapa[z >= self.umbral_z] = 1
+        mapa[z <= -self.umbral_z] = -1
+        return mapa
+
+    def en_foco(self, celda: Tuple[int, int]) -> bool:
+        return self.gi_celda(celda) >= self.umbral_z
+
+    def focos(self, n: int = 10) -> List[Tuple[Tuple[int, int], float]]:
+        """Las n celdas mas calientes (Gi* >= umbral_z), de mayor a menor"""
+        z = np.nan_to_num(self.gi_estrella(), nan=-np.inf).ravel()
+        calientes = np.flatnonzero(z >= self.umbral_z)
+        if len(calientes) > n:
+            calientes = calientes[np.argpartition(z[calientes], -n)[-n:]]
+        calientes = calientes[np.argsort(-z[calientes], kind='stable')]
+        return [(divmod(int(i), self.columnas), float(z[i])) for i in calientes]
+
+    def campos_celda(self, celda: Tuple[int, int]) -> Dict:
+        """Campo de EstadoCelda con el Gi* actual de la celda (0 si no se puede calcular)"""
+        z = self.gi_celda(celda)
+        return {self.campo: 0.0 if np.isnan(z) else z}
+
+    def reporte(self) -> str:
+        mapa = self.mapa_focos()
+        texto = (f"  • Celdas con valor: {self._n} (ventana {2 * self.radio + 1}x{2 * self.radio + 1})\n"
+                 f"  • Celdas en foco caliente: {int(np.count_nonzero(mapa == 1))} | "
+                 f"frio: {int(np.count_nonzero(mapa == -1))}")
+        ranking = [f"{celda} Gi*={z:.1f}" for celda, z in self.focos(5)]
+        if ranking:
+            texto += "\n  • Mas calientes: " + ", ".join(ranking)
+        return texto
@@ -0,0 +1,168 @@
+# -*- coding: utf-8 -*-
+"""
+INDICE DE SUMAS POR RECTANGULO (FENWICK 2D)
+===========================================
+
+Responsabilidades:
+1. Responder "cuantos frutos / frutos maduros / celdas exploradas / celdas
+   con gusano hay en este rectangulo" en O(log filas * log columnas), sin
+   recorrer mapa_estados
+2. Actualizar una celda en O(log filas * log columnas) cuando llega su lectura,
+   se cosecha o se trata
+3. Construir todo el indice en O(celdas) a partir de grillas completas
+   (checkpoint, motor lockstep)
+
+Un arbol de Fenwick 2D por capa, todas en un solo arreglo NumPy
+(capas x (filas + 1) x (columnas + 1)). Los nodos que toca una operacion
+son el producto de los nodos de su fila y los de su columna, asi que se
+actualizan/suman para todas las capas con un solo indexado. Se guarda
+tambien el valor de cada celda para poder fijarlo (`fijar`) y el total de
+cada capa (O(1)).
+"""
+
+from threading import Lock
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+CAPAS = ('frutos', 'maduros', 'exploradas', 'gusanos')
+
+
+def _pasos_subida(i: int, limite: int) -> list:
+    """Nodos que cubren la posicion i (base 1) en una actualizacion"""
+    nodos = []
+    while i <= limite:
+        nodos.append(i)
+        i += i & -i
+    return nodos
+
+
+def _pasos_bajada(i: int) -> list:
+    """Nodos cuya suma es el prefijo [1, i]"""
+    nodos = []
+    while i > 0:
+        nodos.append(i)
+        i -= i & -i
+    return nodos
+
+
+class IndiceHuerto:
+    """
+    Sumas por rectangulo de las capas del huerto
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        capas: Nombres de las capas (por defecto CAPAS)
+    """
+
+    def __init__(self, filas: int, columnas: int, capas: Sequence[str] = CAPAS):
+        self.filas = filas
+        self.columnas = columnas
+        self.capas = tuple(capas)
+        self._capa = {nombre: k for k, nombre in enumerate(self.capas)}
+
+        self._arbol = np.zeros((len(self.capas), filas + 1, columnas + 1), dtype=np.int64)
+        self._valores = np.zeros((len(self.capas), filas, columnas), dtype=np.int64)
+        self._totales = np.zeros(len(self.capas), dtype=np.int64)
+        self._lock = Lock()
+
+    def capa(self, nombre: str) -> int:
+        return self._capa[nombre]
+
+    # ========================================================================
+    # ACTUALIZACION
+    # ========================================================================
+
+    def sumar(self, celda: Tuple[int, int], **deltas: int):
+        """Suma a las capas indicadas de una celda (p. ej. sumar((3, 4), frutos=-2))"""
+        x, y = celda
+        delta = np.zeros(len(self.capas), dtype=np.int64)
+        for nombre, valor in deltas.items():
+            delta[self._capa[nombre]] = valor
+        with self._lock:
+            self._sumar(x, y, delta)
+
+    def fijar(self, celda: Tuple[int, int], **valores: int):
+        """Fija el valor de las capas indicadas de una celda"""
+        x, y = celda
+        delta = np.zeros(len(self.capas), dtype=np.int64)
+        with self._lock:
+            for nombre, valor in valores.items():
+                k = self._capa[nombre]
+                delta[k] = int(valor) - self._valores[k, x, y]
+            if delta.any():
+                self._sumar(x, y, delta)
+
+    def _sumar(self, x: int, y: int, delta: np.ndarray):
+        self._valores[:, x, y] += delta
+        self._totales += delta
+        xs = np.array(_pasos_subida(x + 1, self.filas))
+        ys = np.array(_pasos_subida(y + 1, self.columnas))
+        self._arbol[:, xs[:, None], ys] += delta[:, None, None]
+
+    def construir(self, **grillas: np.ndarray):
+        """
+        Reconstruye el indice desde grillas completas (filas x columnas) en O(celdas)
+
+        Las capas que no se pasan quedan en cero.
+        """
+        with self._lock:
+            self._valores[:] = 0
+            for nombre, grilla in grillas.items():
+                self._valores[self._capa[nombre]] = np.asarray(grilla, dtype=np.int64)
+            # Nodo (i, j) = suma del bloque (i - bajo(i), i] x (j - bajo(j), j]
+            prefijo = np.zeros_like(self._arbol)
+            np.cumsum(np.cumsum(self._valores, axis=1), axis=2, out=prefijo[:, 1:, 1:])
+            i = np.arange(self.filas + 1)
+            j = np.arange(self.columnas + 1)
+            bi, bj = i - (i & -i), j - (j & -j)
+            self._arbol = (prefijo - prefijo[:, bi, :] - prefijo[:, :, bj] + prefijo[:, bi][:, :, bj])
+            self._arbol[:, 0, :] = 0
+            self._arbol[:, :, 0] = 0
+            self._totales = self._valores.sum(axis=(1, 2))
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    @staticmethod
+    def _lados(a: int, b: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Nodos y signos de prefijo(b) - prefijo(a) en un eje"""
+        mas, menos = _pasos_bajada(b), _pasos_bajada(a)
+        return (np.array(mas + menos, dtype=np.int64),
+                np.array([1] * len(mas) + [-1] * len(menos), dtype=np.int64))
+
+    def sumas(self, x0: int = 0, x1: Optional[int] = None, y0: int = 0, y1: Optional[int] = None) -> Dict[str, int]:
+        """Suma de cada capa en el rectangulo [x0, x1) x [y0, y1) (como MapaCeldas.contar)"""
+        x1 = self.filas if x1 is None else min(x1, self.filas)
+        y1 = self.columnas if y1 is None else min(y1, self.columnas)
+        x0, y0 = max(0, x0), max(0, y0)
+        if x1 <= x0 or y1 <= y0:
+            return dict.fromkeys(self.capas, 0)
+        # Inclusion-exclusion de las cuatro esquinas: (filas con signo) x (columnas con signo)
+        xs, sx = self._lados(x0, x1)
+        ys, sy = self._lados(y0, y1)
+        with self._lock:
+            total = (self._arbol[:, xs[:, None], ys] @ sy) @ sx
+        return {nombre: int(total[k]) for k, nombre in enumerate(self.capas)}
+
+    def suma(self, capa: str, x0: int = 0, x1: Optional[int] = None, y0: int = 0, y1: Optional[int] = None) -> int:
+        """Suma de una capa en el rectangulo [x0, x1) x [y0, y1)"""
+        return self.sumas(x0, x1, y0, y1)[capa]
+
+    def suma_caja(self, capa: str, caja: Tuple[int, int, int, int]) -> int:
+        """Suma de una capa en la caja (x0, y0, x1, y1) inclusive (brotes.Brote.caja)"""
+        x0, y0, x1, y1 = caja
+        return self.suma(capa, x0, x1 + 1, y0, y1 + 1)
+
+    def total(self, capa: str) -> int:
+        """Suma de una capa en todo el huerto (O(1))"""
+        return int(self._totales[self._capa[capa]])
+
+    def valor(self, celda: Tuple[int, int], capa: str) -> int:
+        return int(self._valores[self._capa[capa], celda[0], celda[1]])
+
+    def grilla(self, capa: str) -> np.ndarray:
+        """Copia de los valores de una capa (filas x columnas)"""
+        return self._valores[self._capa[capa]].copy()
@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""
+INGESTA DEL MANAGER - HILO UNICO ESCRITOR
+=========================================
+
+Responsabilidades:
+1. Recibir las lecturas de todos los agentes en una cola acotada
+   (muchos productores, un consumidor)
+2. Procesarlas en UN solo hilo del Manager, dueño del estado del huerto
+   (mapa_estados, celdas_exploradas, contadores y colas de instrucciones)
+3. Aplicar contrapresion cuando la cola se llena:
+   - BLOQUEAR: el agente espera a que haya lugar
+   - DESCARTAR_ANTIGUO: se descarta la telemetria mas vieja; los trabajos
+     de control (tratamientos, cosechas, capturas) nunca se descartan y, si
+     no queda telemetria que descartar, el agente espera
+   - COALESCER: una lectura nueva de una celda ya pendiente reemplaza a la
+     anterior en su mismo lugar de la cola, sea un trabajo suelto o una
+     lectura dentro de un lote (si la celda no estaba pendiente y la cola
+     esta llena, el agente espera)
+4. Adelantar los trabajos urgentes (lecturas con gusano) en una cola propia
+   que se vacia primero, junto con lo que su mismo productor ya tenia
+   pendiente, asi cada agente conserva su orden y un lote viejo nunca se
+   aplica despues de uno nuevo
+5. Medir profundidad de la cola y retraso de ingesta (encolado -> proceso)
+
+El productor de cada trabajo es el hilo que lo encola (un hilo por agente).
+"""
+
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Sequence
+
+
+class PoliticaContrapresion(Enum):
+    """Que hacer cuando la cola de ingesta esta llena"""
+    BLOQUEAR = "bloquear"
+    DESCARTAR_ANTIGUO = "descartar_antiguo"
+    COALESCER = "coalescer"
+
+
+class ColaIngesta:
+    """
+    Cola acotada de trabajos (funcion, argumentos) con clave opcional
+
+    Los urgentes van en su propia cola, que se vacia antes que la normal.
+    Al llegar un urgente, lo pendiente de su productor pasa a la cola
+    urgente (sus entradas en la normal quedan marcadas y se saltan al
+    sacarlas), asi que adelantarlo cuesta O(pendientes del productor) y no
+    O(cola).
+
+    Args:
+        capacidad: Maximo de entradas pendientes
+        politica: PoliticaContrapresion
+    """
+
+    # Campos de una entrada
+    CLAVE, FUNCION, ARGS, T_ENCOLADO, PRODUCTOR, DESCARTABLE, MOVIDA, CLAVES = range(8)
+
+    def __init__(self, capacidad: int = 1024, politica: PoliticaContrapresion = PoliticaContrapresion.BLOQUEAR):
+        if capacidad < 1:
+            raise ValueError("La capacidad de la cola debe ser al menos 1")
+        self.capacidad = capacidad
+        self.politica = PoliticaContrapresion(politica)
+
+        # Entradas: [clave, funcion, args, t_encolado, productor, descartable, movida, claves]
+        self._entradas: Deque[list] = deque()
+        self._urgentes: Deque[list] = deque()
+        self._por_productor: Dict[int, Deque[list]] = {}  # pendientes en la cola normal, en orden
+        self._pendientes: Dict[Hashable, tuple] = {}      # clave -> (entrada, indice en su lote o None)
+        self._n = 0                                        # entradas vivas en ambas colas
+        self._lock = threading.Lock()
+        self._no_vacia = threading.Condition(self._lock)
+        self._no_llena = threading.Condition(self._lock)
+        self._cerrada = False
+
+        # Metricas
+        self.encoladas = 0
+        self.descartadas = 0
+        self.coalescidas = 0
+        self.esperas = 0          # Veces que un productor tuvo que esperar
+        self.urgentes = 0
+        self.profundidad_maxima = 0
+
+    def __len__(self):
+        return self._n
+
+    def encolar(self, funcion: Callable, *args, clave: Optional[Hashable] = None, urgente: bool = False,
+                descartable: bool = False, claves: Optional[Sequence[Hashable]] = None) -> bool:
+        """
+        Agrega un trabajo; retorna False si la cola esta cerrada
+
+        `clave` identifica la celda para la politica COALESCER. Un lote
+        (args[0] es la lista de lecturas) da en `claves` la celda de cada
+        lectura: con COALESCER, la lectura de una celda que ya esta pendiente
+        en otro lote reemplaza a aquella en su lugar y sale del lote nuevo, y
+        dentro de un mismo lote queda la ultima de cada celda. Solo los
+        trabajos `descartable` (telemetria) se pueden perder con
+        DESCARTAR_ANTIGUO. Un trabajo `urgente` va al frente de la cola,
+        detras de lo pendiente de su mismo productor, y nunca espera, se
+        descarta ni se coalesce.
+        """
+        productor = threading.get_ident()
+        with self._lock:
+            if self._cerrada:
+                return False
+            ahora = time.perf_counter()
+
+            if urgente:
+                self._adelantar(productor, [clave, funcion, args, ahora, productor, False, False, None])
+                self._n += 1
+                self.encoladas += 1
+                self.urgentes += 1
+                self._no_vacia.notify()
+                return True
+
+            coalescer = self.politica == PoliticaContrapresion.COALESCER
+            if coalescer and claves is not None:
+                args, claves = self._coalescer_lote(args, claves)
+                if not claves and not any(args[1:]):
+                    return True  # Todo el lote quedo en lotes ya pendientes
+            elif coalescer and clave is not None:
+                pendiente = self._pendientes.get(clave)
+                if pendiente is not None and pendiente[1] is None:
+                    # Conserva su lugar y su tiempo de encolado (el retraso real)
+                    entrada = pendiente[0]
+                    entrada[self.FUNCION], entrada[self.ARGS] = funcion, args
+                    self.coalescidas += 1
+                    return True
+
+            if self._n >= self.capacidad:
+                if not (self.politica == PoliticaContrapresion.DESCARTAR_ANTIGUO and self._descartar_antiguo()):
+                    self.esperas += 1
+                    while self._n >= self.capacidad and not self._cerrada:
+                        self._no_llena.wait()
+                    if self._cerrada:
+                        return False
+
+            entrada = [clave, funcion, args, ahora, productor, descartable, False, claves]
+            self._entradas.append(entrada)
+            self._por_productor.setdefault(productor, deque()).append(entrada)
+            if coalescer:
+                if claves is not None:
+                    for i, c in enumerate(claves):
+                        self._pendientes[c] = (entrada, i)
+                elif clave is not None:
+                    self._pendientes[clave] = (entrada, None)
+            self._n += 1
+            self.encoladas += 1
+            if self._n > self.profundidad_maxima:
+                self.profundidad_maxima = self._n
+            self._no_vacia.notify()
+            return True
+
+    def _coalescer_lote(self, args: tuple, claves: Sequence[Hashable]):
+        """Deja en lotes pendientes las lecturas de sus celdas; retorna (args, claves) de lo que queda"""
+        ultima: Dict[Hashable, int] = {}
+        for i, c in enumerate(claves):
+            if c in ultima:
+                self.coalescidas += 1  # Dentro del lote queda la mas nueva
+            ultima[c] = i
+        lecturas = args[0]
+        nuevas, nuevas_claves = [], []
+        for c, i in ultima.items():
+            pendiente = self._pendientes.get(c)
+            if pendiente is not None and pendiente[1] is not None:
+                entrada, j = pendiente
+                entrada[self.ARGS][0][j] = lecturas[i]
+                self.coalescidas += 1
+            else:
+                nuevas.append(lecturas[i])
+                nuevas_claves.append(c)
+        return (nuevas,) + tuple(args[1:]), nuevas_claves
+
+    def _adelantar(self, productor: int, entrada: list):
+        """Pasa a la cola urgente lo pendiente de `productor` (en su orden) seguido de `entrada`"""
+        propias = self._por_productor.pop(productor, None)
+        if propias:
+            for e in propias:
+                e[self.MOVIDA] = True  # Su copia en la cola normal se salta
+            self._urgentes.extend(propias)
+        self._urgentes.append(entrada)
+
+    def _olvidar(self, entrada: list):
+        """Quita las claves de una entrada que sale de la cola"""
+        claves = entrada[self.CLAVES]
+        if claves is None:
+            claves = () if entrada[self.CLAVE] is None else (entrada[self.CLAVE],)
+        for c in claves:
+            pendiente = self._pendientes.get(c)
+            if pendiente is not None and pendiente[0] is entrada:
+                del self._pendientes[c]
+
+    def _descartar_antiguo(self) -> bool:
+        """Saca la telemetria mas vieja; False si todo lo pendiente es de control"""
+        # La telemetria adelantada junto a un urgente es la mas vieja de la cola
+        for i, entrada in enumerate(self._urgentes):
+            if entrada[self.DESCARTABLE]:
+                del self._urgentes[i]
+                break
+        else:
+            for i, entrada in enumerate(self._entradas):
+                if entrada[self.DESCARTABLE] and not entrada[self.MOVIDA]:
+                    del self._entradas[i]
+                    propias = self._por_productor[entrada[self.PRODUCTOR]]
+                    propias.remove(entrada)
+                    if not propias:
+                        del self._por_productor[entrada[self.PRODUCTOR]]
+                    break
+            else:
+                return False
+        self._olvidar(entrada)
+        self._n -= 1
+        self.descartadas += 1
+        return True
+
+    def _sacar(self) -> Optional[list]:
+        """Siguiente entrada viva: primero las urgentes (lock tomado)"""
+        if self._urgentes:
+            return self._urgentes.popleft()
+        while self._entradas:
+            entrada = self._entradas.popleft()
+            if entrada[self.MOVIDA]:
+                continue
+            propias = self._por_productor[entrada[self.PRODUCTOR]]
+            propias.popleft()
+            if not propias:
+                del self._por_productor[entrada[self.PRODUCTOR]]
+            return entrada
+        return None
+
+    def tomar(self, maximo: int = 256, espera: Optional[float] = None) -> List[list]:
+        """
+        Saca hasta `maximo` entradas (espera si la cola esta vacia)
+
+        Returns:
+            Lista de entradas; vacia si vencio la espera o la cola se cerro
+        """
+        with self._lock:
+            if not self._n and not self._cerrada:
+                self._no_vacia.wait(espera)
+            lote = []
+            while self._n and len(lote) < maximo:
+                entrada = self._sacar()
+                self._olvidar(entrada)
+                self._n -= 1
+                lote.append(entrada)
+            if lote:
+                self._no_llena.notify_all()
+            return lote
+
+    def cerrar(self):
+        """Rechaza nuevas entradas y despierta a todos los hilos en espera"""
+        with self._lock:
+            self._cerrada = True
+            self._no_vacia.notify_all()
+            self._no_llena.notify_all()
+
+    @property
+    def cerrada(self) -> bool:
+        return self._cerrada
+
+
+class HiloIngesta:
+    """
+    Hilo consumidor unico: ejecuta cada trabajo de la cola en orden
+
+    Args:
+        capacidad: Tamaño de la cola
+        politica: PoliticaContrapresion (o su valor en texto)
+        lote_maximo: Trabajos que se sacan de la cola por vuelta
+    """
+
+    def __init__(self, capacidad: int = 1024, politica=PoliticaContrapresion.BLOQUEAR, lote_maximo: int = 256):
+        self.cola = ColaIngesta(capacidad, PoliticaContrapresion(politica))
+        self.lote_maximo = lote_maximo
+        self._hilo = threading.Thread(target=self._bucle, name="manager-ingesta", daemon=True)
+
+        # Metricas de retraso (segundos)
+        self.procesadas = 0
+        self.errores = 0
+        self.retraso_ultimo = 0.0
+        self.retraso_maximo = 0.0
+        self._retraso_total = 0.0
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def encolar(self, funcion: Callable, *args, clave: Optional[Hashable] = None, urgente: bool = False,
+                descartable: bool = False, claves: Optional[Sequence[Hashable]] = None) -> bool:
+        """Llamado desde los hilos de los agentes"""
+        return self.cola.encolar(funcion, *args, clave=clave, urgente=urgente, descartable=descartable,
+                                 claves=claves)
+
+    def en_hilo_ingesta(self) -> bool:
+        return threading.current_thread() is self._hilo
+
+    def ejecutar(self, funcion: Callable, *args) -> Any:
+        """
+        Ejecuta `funcion` en el hilo de ingesta y espera su resultado
+
+        Sirve para leer el estado del huerto de forma consistente desde otro
+        hilo (checkpoints). Si el hilo no corre o la cola ya esta cerrada,
+        se ejecuta en el hilo que llama.
+        """
+        if self.en_hilo_ingesta() or not self._hilo.is_alive():
+            return funcion(*args)
+        listo = threading.Event()
+        resultado: Dict[str, Any] = {}
+
+        def trabajo():
+            try:
+                resultado['valor'] = funcion(*args)
+            except BaseException as e:
+                resultado['error'] = e
+            finally:
+                listo.set()
+
+        # Detras de lo ya encolado: la captura ve aplicado todo lo anterior
+        if not self.cola.encolar(trabajo):
+            return funcion(*args)
+        listo.wait()
+        if 'error' in resultado:
+            raise resultado['error']
+        return resultado['valor']
+
+    def _bucle(self):
+        while True:
+            lote = self.cola.tomar(self.lote_maximo, espera=0.5)
+            if not lote:
+                if self.cola.cerrada and not len(self.cola):
+                    return
+                continue
+            for _, funcion, args, t_encolado, *_ in lote:
+                retraso = time.perf_counter() - t_encolado
+                self.retraso_ultimo = retraso
+                self._retraso_total += retraso
+                if retraso > self.retraso_maximo:
+                    self.retraso_maximo = retraso
+                try:
+                    funcion(*args)
+                except Exception as e:
+                    self.errores += 1
+                    print(f"[Ingesta] [ERROR] {e!r}")
+                self.procesadas += 1
+
+    def detener(self, espera: float = 5.0):
+        """Cierra la cola, procesa lo pendiente y espera al hilo"""
+        self.cola.cerrar()
+        if self._hilo.is_alive() and not self.en_hilo_ingesta():
+            self._hilo.join(espera)
+
+    def metricas(self) -> Dict[str, Any]:
+        """Profundidad de cola, contadores de contrapresion y retraso de ingesta"""
+        c = self.cola
+        return {
+            'politica': c.politica.value,
+            'capacidad': c.capacidad,
+            'profundidad': len(c),
+            'profundidad_maxima': c.profundidad_maxima,
+            'encoladas': c.encoladas,
+            'procesadas': self.procesadas,
+            'descartadas': c.descartadas,
+            'coalescidas': c.coalescidas,
+            'esperas_productor': c.esperas,
+            'urgentes': c.urgentes,
+            'errores': self.errores,
+            'retraso_ultimo_ms': self.retraso_ultimo * 1000.0,
+            'retraso_medio_ms': (self._retraso_total / self.procesadas * 1000.0) if self.procesadas else 0.0,
+            'retraso_maximo_ms': self.retraso_maximo * 1000.0,
+        }
+
+    def reporte(self) -> str:
+        m = self.metricas()
+        return (f"  • Politica: {m['politica']} (capacidad {m['capacidad']})\n"
+                f"  • Procesadas: {m['procesadas']} / encoladas {m['encoladas']}\n"
+                f"  • Descartadas: {m['descartadas']} | Coalescidas: {m['coalescidas']} | "
+                f"Esperas: {m['esperas_productor']} | Urgentes: {m['urgentes']}\n"
+                f"  • Profundidad maxima: {m['profundidad_maxima']}\n"
+                f"  • Retraso medio/max: {m['retraso_medio_ms']:.2f} / {m['retraso_maximo_ms']:.2f} ms")
@@ -1,23 +1,8 @@
 # -*- coding: utf-8 -*-
 """
-<<<<<<< HEAD
-AGENTE MANAGER CON COORDINACION MULTI-AGENTE Y CAPATAZ
-=======================================================
-
-Responsabilidades:
-1. Recibir datos de riesgo de los agentes exploradores
-2. Evaluar riesgos con umbrales y reglas
-3. Detectar jitomates listos para cosechar
-4. Establecer prioridades y protocolo de accion
-5. Enviar instrucciones de COSECHA y TRATAMIENTO al Agente Fisico
-6. Enviar informacion de estado al Agente UI
-7. COORDINAR 5 AGENTES FISICOS trabajando en paralelo
-8. INTEGRAR AL CAPATAZ como supervisor
-=======
 AGENTE CAPATAZ (MANAGER)
 ========================
 El "Ojo" que todo lo ve. Coordina recolectores y detecta amenazas críticas (Gusano).
->>>>>>> Simulation
 """
 
 from typing import List, Dict, Tuple, Optional, Callable
@@ -26,15 +11,24 @@ from datetime import datetime
 from enum import Enum
 import time
 from threading import Thread, Lock, Event
+from perfilador import medir_fase
+from tabla_flota import TablaFlota
+from canal_difusion import CanalDifusion
+from cuarentena import GestorCuarentena
+from aleatorio import FlujosAleatorios, MODELO_PLAGAS
+from mapa_celdas import MapaCeldas
+from series_celdas import SeriesCeldas
+from detector_anomalias import DetectorAnomalias, SIN_EVALUAR
+from detector_multivariado import DetectorMultivariado
+from focos_espaciales import FocosEspaciales
+from brotes import BrotesPlaga
+from indice_huerto import IndiceHuerto
+from modelo_plagas import ModeloPlagas
+from modelo_clima import ModeloClima
+import riesgo_lote
+import capataz
+from capataz import TipoOrden
 
-<<<<<<< HEAD
-# Importar Capataz
-from capataz import AgenteCapataz, TipoOrden
-
-
-class NivelRiesgo(Enum):
-    """Niveles de riesgo para el analisis"""
-=======
 # --- ENUMS Y ESTRUCTURAS DE DATOS ---
 
 class OrdenCapataz(Enum):
@@ -44,33 +38,13 @@ class OrdenCapataz(Enum):
     ABANDONAR = "ABANDONA"    # Cancelación de emergencia
 
 class NivelRiesgo(Enum):
->>>>>>> Simulation
     SIN_DATOS = 0
     BAJO = 1
     MEDIO = 2
     ALTO = 3
-<<<<<<< HEAD
-    CRITICO = 4
-
-
-class TipoAmenaza(Enum):
-    """Tipos de amenazas detectables"""
-    PLAGA = "Plaga"
-    HONGO = "Hongo"
-    SEQUIA = "Sequia"
-    EXCESO_AGUA = "Exceso de agua"
-    NUTRIENTES_BAJOS = "Nutrientes bajos"
-    TEMPERATURA_ALTA = "Temperatura alta"
-    TEMPERATURA_BAJA = "Temperatura baja"
-
-
-class EstadoMaduracion(Enum):
-    """Estados de maduracion de los jitomates"""
-=======
     CRITICO = 4 # Aquí vive el Gusano
 
 class EstadoMaduracion(Enum):
->>>>>>> Simulation
     VERDE = "Verde"
     EN_MADURACION = "En maduracion"
     MADURO = "Maduro"
@@ -78,10 +52,6 @@ class EstadoMaduracion(Enum):
 
 @dataclass
 class DatosExploracion:
-<<<<<<< HEAD
-    """Datos que envia el Agente Fisico al Manager"""
-=======
->>>>>>> Simulation
     x: int
     y: int
     temperatura: float
@@ -95,36 +65,10 @@ class DatosExploracion:
 
 @dataclass
 class InstruccionCosecha:
-<<<<<<< HEAD
-    """Instruccion de COSECHA para el Agente Fisico"""
-=======
->>>>>>> Simulation
     celda_objetivo: Tuple[int, int]
     frutos_a_cosechar: int
     prioridad: int
     descripcion: str
-<<<<<<< HEAD
-    timestamp: datetime = field(default_factory=datetime.now)
-    
-    def __str__(self):
-        return f"Cosecha en {self.celda_objetivo}: {self.frutos_a_cosechar} frutos (Prioridad: {self.prioridad})"
-
-
-@dataclass
-class InstruccionTratamiento:
-    """Instruccion de TRATAMIENTO para el Agente Fisico"""
-    celda_objetivo: Tuple[int, int]
-    tipo_tratamiento: str
-    nivel_urgencia: int
-    tipo_amenaza: str
-    descripcion: str
-    timestamp: datetime = field(default_factory=datetime.now)
-    
-    def __str__(self):
-        return f"Tratamiento en {self.celda_objetivo}: {self.tipo_tratamiento} (Urgencia: {self.nivel_urgencia})"
-
-=======
->>>>>>> Simulation
 
 @dataclass
 class EstadoCelda:
@@ -135,6 +79,10 @@ class EstadoCelda:
     frutos_disponibles: int
     listo_para_cosechar: bool
     tiene_gusano: bool = False # Flag específico para el gusano
+    puntaje_anomalia: float = 0.0 # max |z| contra la historia de la celda
+    canales_anomalos: Tuple[str, ...] = ()
+    distancia_multivariada: float = 0.0 # Mahalanobis contra la zona
+    foco_plagas: float = 0.0 # Gi* de plagas: >= 1.96 la celda es parte de un foco
 
 @dataclass
 class EstadoAgenteVisibilidad:
@@ -148,52 +96,23 @@ class EstadoAgenteVisibilidad:
 
 @dataclass
 class MetricasSistema:
-<<<<<<< HEAD
-    """Metricas del sistema para la UI"""
-=======
->>>>>>> Simulation
     tiempo_transcurrido: float = 0.0
     celdas_exploradas: int = 0
     celdas_totales: int = 0
     frutos_cosechados: int = 0
     agentes_activos: int = 0
     amenazas_gusano: int = 0 # Contador de gusanos
+    frutos_totales_detectados: int = 0
+    frutos_listos_cosecha: int = 0
 
 # --- CLASE PRINCIPAL ---
 
-<<<<<<< HEAD
-# AGENTE MANAGER CON COORDINACION Y CAPATAZ
-
-class AgenteManager:
-    """
-    Agente Manager: Núcleo de decision y coordinacion del sistema
-    
-    RESPONSABILIDADES:
-    - Crear y coordinar múltiples agentes fisicos
-    - Distribuir trabajo entre agentes
-    - Asignar instrucciones al agente mas apropiado
-    - Monitorear estado de todos los agentes
-    - INTEGRAR AL CAPATAZ como supervisor
-    """
-    
-    def __init__(self, grid_filas: int = 10, grid_columnas: int = 10, num_agentes: int = 5):
-        """
-        Inicializa el Agente Manager con coordinacion multi-agente y capataz
-        
-        Args:
-            grid_filas: Número de filas del cultivo
-            grid_columnas: Número de columnas del cultivo
-            num_agentes: Número de agentes fisicos a coordinar
-        """
-        # Configuracion del grid
-=======
 class AgenteCapataz:
     """
     El Capataz: Observa, evalúa riesgos críticos y da órdenes imperativas.
     """
     
     def __init__(self, grid_filas: int = 10, grid_columnas: int = 10, num_agentes: int = 3):
->>>>>>> Simulation
         self.grid_filas = grid_filas
         self.grid_columnas = grid_columnas
         self.num_agentes = num_agentes
@@ -201,77 +120,82 @@ class AgenteCapataz:
         # Datos del huerto
         self.mapa_estados: Dict[Tuple[int, int], EstadoCelda] = {}
         self.cola_cosechas: List[InstruccionCosecha] = []
-<<<<<<< HEAD
-        self.cola_tratamientos: List[InstruccionTratamiento] = []
-        
-        # Control de exploracion
-        self.celdas_exploradas: set = set()
-        
-        # Control de agentes fisicos
-        self.agentes_fisicos: List = []
-        self.agentes_threads: List[Thread] = []
-        self.lock_agentes = Lock()
-=======
-        self.celdas_exploradas: set = set()
+        self.celdas_exploradas = MapaCeldas(grid_filas, grid_columnas)
+        self.celdas_sucias = set()  # Cambiadas desde el ultimo checkpoint (las consume checkpoint.py)
+        self.eventos_sucios: Optional[List] = None  # Lecturas y tratamientos desde el ultimo checkpoint (idem)
+        self.celdas_sucias_bitacora: Optional[set] = None  # Cambiadas desde el ultimo evento grabado (bitacora.py)
         
         # Gestión de Agentes Físicos
         self.agentes_fisicos = []
         # Diccionario para controlar los hilos de los agentes
         # Key: agente_id, Value: {'evento_pausa': Event, 'flag_abortar': bool, 'orden_actual': OrdenCapataz}
         self.controles_agentes = {}
->>>>>>> Simulation
+        
+        # Estado visible de la flota (cada agente escribe su fila)
+        self.flota = TablaFlota(tuple(OrdenCapataz), capacidad=num_agentes)
+        
+        # Ordenes para toda la flota: una escritura en el canal, no una por agente
+        self.canal = CanalDifusion()
+        
+        # Hilo unico de ingesta; iniciar_jornada lo activa si no se activo antes
+        # (None = las llamadas se procesan en el hilo que las hace)
+        self.ingesta = None
+        self._lote_abierto = False  # Durante un lote se notifica a la UI una sola vez
         
         # Metricas
         self.tiempo_inicio = time.time()
         self.frutos_cosechados_total = 0
         self.contador_gusanos = 0
         
-        # Callback UI
-        self._callback_ui: Optional[Callable] = None
+        # Zonas de cuarentena alrededor de las celdas con gusano
+        self.cuarentena = GestorCuarentena(grid_filas, grid_columnas)
+        
+        # Historial acotado de lecturas por celda (no solo la ultima)
+        self.series = SeriesCeldas(grid_filas, grid_columnas)
         
-<<<<<<< HEAD
-        # Umbrales
-        self.umbrales = {
-            'temperatura_min': 15.0,
-            'temperatura_max': 30.0,
-            'humedad_min': 40.0,
-            'humedad_max': 80.0,
-            'nivel_plagas_critico': 7.0,
-            'nivel_plagas_alto': 5.0,
-            'nivel_nutrientes_bajo': 4.0,
-        }
+        # Lecturas que se alejan de la historia de su celda (EWMA por canal)
+        self.detector = DetectorAnomalias(grid_filas, grid_columnas)
         
-        self.umbrales_cosecha = {
-            'maduracion_minima': 7.0,
-            'maduracion_optima': 8.5,
-            'maduracion_sobre': 9.5,
-            'tamano_minimo': 5.0,
-        }
+        # Combinaciones de canales raras para la zona (covarianza de Welford)
+        self.multivariado = DetectorMultivariado(grid_filas, grid_columnas)
         
-        # NUEVO: Crear Agente Capataz
-        self.capataz = AgenteCapataz(
+        # Focos espaciales (Gi*) de plagas y de puntaje de anomalia
+        self.focos_plagas = FocosEspaciales(grid_filas, grid_columnas, campo='foco_plagas')
+        self.focos_anomalia = FocosEspaciales(grid_filas, grid_columnas, campo='foco_anomalia')
+        
+        # Brotes: componentes conexas de celdas con plagas (union-find incremental)
+        self.brotes = BrotesPlaga(grid_filas, grid_columnas, umbral=5.0)
+        
+        # Sumas por rectangulo de frutos, maduros, exploradas y gusanos (Fenwick 2D)
+        self.indice = IndiceHuerto(grid_filas, grid_columnas)
+        
+        # Un generador por agente derivado de la semilla raiz (ver sembrar())
+        self.aleatorio = FlujosAleatorios()
+        
+        # Nivel real de plagas (automata celular que se propaga); los sensores lo muestrean
+        self.modelo_plagas = ModeloPlagas(grid_filas, grid_columnas,
+                                          rng=self.aleatorio.campo(MODELO_PLAGAS))
+        
+        # Microclima del invernadero (temperatura y humedad por celda y hora)
+        self.clima = ModeloClima(grid_filas, grid_columnas)
+        
+        # Supervisor (capataz.py): reglas por agente, respuesta a contaminacion,
+        # anomalias y brotes, y entrega de ordenes. Comparte el canal y las
+        # estructuras del huerto en lugar de llevar copias propias
+        self.capataz = capataz.AgenteCapataz(
             posicion_observacion=(0, 0),
-            num_agentes=num_agentes
+            num_agentes=num_agentes,
+            flota=self.flota,
+            canal=self.canal,
+            cuarentena=self.cuarentena,
+            focos=self.focos_plagas,
+            brotes=self.brotes,
+            indice=self.indice
         )
         
-        print(f"[Manager] Inicializado - Grid: {grid_filas}x{grid_columnas}")
-        print(f"[Manager] Coordinando {num_agentes} agentes fisicos")
-        print(f"[Manager] [CAPATAZ] Capataz asignado en posicion {self.capataz.posicion}")
-    
-    # ========================================================================
-    # COORDINACION MULTI-AGENTE
-    # ========================================================================
-    
-    def crear_agentes_fisicos(self):
-        """
-        Crea los agentes fisicos y los configura con el capataz
-        
-        IMPORTANTE: Debe llamarse ANTES de iniciar_exploracion_multi_agente()
-        """
-        from fisico import AgenteFisico, ConfiguracionAgente
+        # Callback UI
+        self._callback_ui: Optional[Callable] = None
         
-        print(f"\n[Manager] [AGENTES] Creando {self.num_agentes} agentes fisicos...")
-=======
         print(f"[Capataz] 👁️ Observando huerto {grid_filas}x{grid_columnas}")
 
     def registrar_agente_ui(self, callback):
@@ -279,7 +203,6 @@ class AgenteCapataz:
 
     def crear_agentes_fisicos(self):
         from fisico import AgenteFisico # Import local para evitar ciclo
->>>>>>> Simulation
         
         print(f"[Capataz] 📢 Contratando {self.num_agentes} recolectores...")
         for i in range(1, self.num_agentes + 1):
@@ -296,73 +219,26 @@ class AgenteCapataz:
             # Instanciar agente inyectándole sus controles
             agente = AgenteFisico(
                 agente_id=i,
-<<<<<<< HEAD
-                callback_enviar_datos=self.recibir_datos_exploracion,
-                callback_reportar_cosecha=self.reportar_cosecha_completada,
-                callback_actualizar_capataz=self._actualizar_capataz,
-                config=ConfiguracionAgente(agente_id=i)
-            )
-            self.agentes_fisicos.append(agente)
-        
-        print(f"[Manager] [OK] {self.num_agentes} agentes creados")
-        print(f"[Manager] [CONEXION] Agentes conectados con el Capataz")
-    
-    def distribuir_trabajo(self):
-        """
-        Distribuye las celdas del grid entre los agentes
-        
-        Estrategia: Division por filas para minimizar desplazamientos
-        """
-        if not self.agentes_fisicos:
-            print("[Manager] [ADVERTENCIA] Error: No hay agentes creados. Llama crear_agentes_fisicos() primero")
-            return
-        
-        print(f"\n[Manager] [INFO] Distribuyendo trabajo entre {self.num_agentes} agentes...")
-        
-        # Generar todas las celdas
-        todas_celdas = [
-            (x, y) 
-            for x in range(self.grid_filas) 
-            for y in range(self.grid_columnas)
-        ]
-        
-        # Dividir equitativamente
-        celdas_por_agente = len(todas_celdas) // self.num_agentes
-        
-        for i, agente in enumerate(self.agentes_fisicos):
-            inicio = i * celdas_por_agente
-            fin = inicio + celdas_por_agente if i < self.num_agentes - 1 else len(todas_celdas)
-            celdas_asignadas = todas_celdas[inicio:fin]
-            agente.asignar_celdas(celdas_asignadas)
-        
-        print(f"[Manager] [OK] Trabajo distribuido")
-    
-    def iniciar_exploracion_multi_agente(self):
-        """
-        Inicia la exploracion con todos los agentes en paralelo
-        El capataz supervisara automaticamente
-        """
-        if not self.agentes_fisicos:
-            print("[Manager] [ADVERTENCIA] Error: Primero llama crear_agentes_fisicos() y distribuir_trabajo()")
-            return
-        
-        print(f"\n[Manager] [INIT] Iniciando exploracion multi-agente")
-        print(f"[Manager] {self.num_agentes} agentes trabajando en paralelo")
-        print(f"[Manager] [CAPATAZ] Capataz supervisando desde {self.capataz.posicion}\n")
-        
-        # Crear threads para cada agente
-        self.agentes_threads = []
-=======
-                callback_datos=self.recibir_datos,
-                callback_cosecha=self.reportar_cosecha,
+                callback_datos=self.entrada_datos,
+                callback_cosecha=self.entrada_cosecha,
                 control_evento=evento_pausa,
-                control_abortar=lambda id=i: self.controles_agentes[id]['abortar']
+                control_abortar=lambda id=i: self.controles_agentes[id]['abortar'],
+                callback_lote=self.entrada_lote,
+                canal=self.canal,
+                callback_tratamiento=self.entrada_tratamiento,
+                cuarentena=self.cuarentena,
+                rng=self.aleatorio.agente(i),
+                plagas=self.modelo_plagas,
+                clima=self.clima
             )
             self.agentes_fisicos.append(agente)
+            agente.conectar_flota(self.flota)
+            # Buzon del agente en el enrutador del supervisor: sus ordenes llegan por ahi
+            self.capataz.enrutador.registrar(i, lambda orden, id=i: self._aplicar_orden(id, orden))
 
     def distribuir_trabajo(self):
         # Distribución simple por franjas
-        celdas = [(r, c) for r in range(self.grid_filas) for c in range(self.grid_columnas)]
+        celdas = self.celdas_exploradas.sin_marcar()
         chunk = len(celdas) // self.num_agentes
         for i, agente in enumerate(self.agentes_fisicos):
             start = i * chunk
@@ -370,8 +246,11 @@ class AgenteCapataz:
             agente.asignar_celdas(celdas[start:end])
 
     def iniciar_jornada(self):
+        # Series, detectores, focos, brotes, indice y cuarentena no son seguros
+        # entre hilos: con agentes en paralelo solo los escribe el hilo de ingesta
+        if self.ingesta is None:
+            self.activar_ingesta()
         threads = []
->>>>>>> Simulation
         for agente in self.agentes_fisicos:
             t = Thread(target=agente.iniciar_trabajo)
             t.start()
@@ -383,215 +262,22 @@ class AgenteCapataz:
 
     # --- LÓGICA DE ÓRDENES DEL CAPATAZ ---
 
-    def emitir_orden(self, agente_id: int, orden: OrdenCapataz):
-        """Emite una de las 3 órdenes sagradas"""
+    def emitir_orden(self, agente_id: int, orden: OrdenCapataz, razon: str = "Orden manual del capataz"):
+        """Emite una de las 3 órdenes sagradas (pasa por el supervisor, que la audita y la entrega)"""
+        ordenar = {
+            OrdenCapataz.PARAR: self.capataz.ordenar_parate,
+            OrdenCapataz.CONTINUAR: self.capataz.ordenar_continua,
+            OrdenCapataz.ABANDONAR: self.capataz.ordenar_abandona,
+        }[orden]
+        ordenar(agente_id, razon)
+
+    def _aplicar_orden(self, agente_id: int, orden):
+        """Buzon de un agente: aplica en sus controles la orden que entrega el enrutador"""
+        orden = OrdenCapataz(orden.tipo_orden.value)
         ctrl = self.controles_agentes[agente_id]
         ctrl['orden_texto'] = orden
+        self.flota.escribir(self.flota.fila(agente_id), orden=orden)
         
-<<<<<<< HEAD
-        print(f"\n[Manager] [OK] Exploracion multi-agente completada")
-        self._mostrar_resumen_agentes()
-    
-    def _asignar_instruccion_a_agente(self, instruccion):
-        """
-        Asigna una instruccion al agente mas apropiado
-        """
-        if not self.agentes_fisicos:
-            return
-        
-        # Asignar al primer agente disponible
-        for agente in self.agentes_fisicos:
-            if not agente.procesando_instruccion and agente.activo:
-                agente.recibir_instruccion(instruccion)
-                break
-    
-    def _mostrar_resumen_agentes(self):
-        """Muestra resumen del trabajo de todos los agentes"""
-        print(f"\n{'='*70}")
-        print("RESUMEN DE AGENTES FISICOS")
-        print(f"{'='*70}")
-        
-        total_celdas = 0
-        total_cosechas = 0
-        total_tratamientos = 0
-        
-        for agente in self.agentes_fisicos:
-            stats = agente.obtener_estadisticas()
-            total_celdas += stats['celdas_exploradas']
-            total_cosechas += stats['cosechas_completadas']
-            total_tratamientos += stats['tratamientos_completados']
-            
-            print(f"\n[AGENTES] Agente {stats['agente_id']}:")
-            print(f"   [BUSQUEDA] Celdas exploradas: {stats['celdas_exploradas']}")
-            print(f"   [FRUTOS] Cosechas: {stats['cosechas_completadas']}")
-            print(f"   [ADVERTENCIA] Tratamientos: {stats['tratamientos_completados']}")
-            print(f"   🔋 Bateria: {stats['bateria']:.1f}%")
-            print(f"   [TRABAJO] Frutos cargados: {stats['frutos_cargados']}")
-            print(f"   [DATOS] Estado: {stats['estado_capataz']}")
-        
-        print(f"\n{'='*70}")
-        print(f"TOTALES:")
-        print(f"   [BUSQUEDA] Celdas exploradas: {total_celdas}/{self.celdas_totales}")
-        print(f"   [FRUTOS] Total cosechas: {total_cosechas}")
-        print(f"   [ADVERTENCIA] Total tratamientos: {total_tratamientos}")
-        print(f"{'='*70}\n")
-    
-    # ========================================================================
-    # INTEGRACION CON EL CAPATAZ
-    # ========================================================================
-    
-    def _actualizar_capataz(
-        self,
-        agente_id: int,
-        posicion: Tuple[int, int],
-        bateria: float,
-        frutos_cargados: int,
-        estado: str,
-        celdas_exploradas: int,
-        cosechas_completadas: int
-    ):
-        """
-        Callback para que agentes notifiquen al capataz
-        """
-        self.capataz.actualizar_estado_agente(
-            agente_id=agente_id,
-            posicion=posicion,
-            bateria=bateria,
-            frutos_cargados=frutos_cargados,
-            estado=estado,
-            celdas_exploradas=celdas_exploradas,
-            cosechas_completadas=cosechas_completadas
-        )
-    
-    def _enviar_orden_capataz_a_agente(self, orden):
-        """
-        Envia una orden del capataz a un agente especifico
-        """
-        agente = next((a for a in self.agentes_fisicos if a.agente_id == orden.agente_destino), None)
-        if agente:
-            agente.recibir_orden_capataz(orden.tipo_orden, orden.razon)
-    
-    # ========================================================================
-    # RECEPCION Y PROCESAMIENTO DE DATOS
-    # ========================================================================
-    
-    def registrar_agente_ui(self, callback: Callable[[List[EstadoCelda], MetricasSistema], None]):
-        """Registra el callback para comunicarse con el Agente UI"""
-        self._callback_agente_ui = callback
-        print("[Manager] Agente UI registrado")
-    
-    def recibir_datos_exploracion(self, datos: DatosExploracion):
-        """
-        Recibe datos del Agente Fisico (llamado por callback)
-        """
-        pos = (datos.x, datos.y)
-        
-        # Almacenar datos
-        self.datos_crudos[pos] = datos
-        self.celdas_exploradas.add(pos)
-        
-        # REPORTAR CONTAMINACION AL CAPATAZ
-        if datos.nivel_plagas > 5.0:
-            self.capataz.reportar_contaminacion(
-                celda=(datos.x, datos.y),
-                nivel=datos.nivel_plagas
-            )
-        
-        # Evaluar COSECHA
-        if self._requiere_cosecha(datos):
-            instruccion_cosecha = self._generar_instruccion_cosecha(datos)
-            self.cola_cosechas.append(instruccion_cosecha)
-            self.cosechas_ordenadas_total += 1
-            self._asignar_instruccion_a_agente(instruccion_cosecha)
-            print(f"[Manager] [FRUTOS] COSECHA ordenada: {instruccion_cosecha}")
-        
-        # Evaluar RIESGOS
-        estado_celda = self._evaluar_riesgo(datos)
-        self.mapa_estados[pos] = estado_celda
-        
-        print(f"[Manager] Celda ({datos.x}, {datos.y}) - Riesgo: {estado_celda.nivel_riesgo.name} | Maduracion: {estado_celda.estado_maduracion.name}")
-        
-        # Generar tratamiento si necesario
-        if estado_celda.requiere_tratamiento:
-            instruccion_tratamiento = self._generar_instruccion_tratamiento(estado_celda)
-            self.cola_tratamientos.append(instruccion_tratamiento)
-            self.tratamientos_ordenados_total += 1
-            self._asignar_instruccion_a_agente(instruccion_tratamiento)
-            print(f"[Manager] [ADVERTENCIA] TRATAMIENTO ordenado: {instruccion_tratamiento}")
-        
-        # Actualizar UI
-        self._notificar_ui()
-    
-    def reportar_cosecha_completada(self, celda: Tuple[int, int], frutos_cosechados: int):
-        """El Agente Fisico llama esto despues de cosechar"""
-        self.frutos_cosechados_total += frutos_cosechados
-        print(f"[Manager] [OK] Cosecha completada en {celda}: {frutos_cosechados} frutos")
-        print(f"[Manager] Total cosechado: {self.frutos_cosechados_total} frutos")
-        self._notificar_ui()
-    
-    # ========================================================================
-    # EVALUACION Y DECISION
-    # ========================================================================
-    
-    def _requiere_cosecha(self, datos: DatosExploracion) -> bool:
-        return (
-            datos.frutos_disponibles > 0 and
-            datos.nivel_maduracion >= self.umbrales_cosecha['maduracion_minima'] and
-            datos.tamano_fruto >= self.umbrales_cosecha['tamano_minimo']
-        )
-    
-    def _generar_instruccion_cosecha(self, datos: DatosExploracion) -> InstruccionCosecha:
-        maduracion = datos.nivel_maduracion
-        
-        if maduracion >= self.umbrales_cosecha['maduracion_sobre']:
-            prioridad = 5
-            descripcion = "URGENTE: Frutos sobre maduros"
-        elif maduracion >= self.umbrales_cosecha['maduracion_optima']:
-            prioridad = 4
-            descripcion = "Frutos en punto optimo"
-        else:
-            prioridad = 3
-            descripcion = "Frutos maduros listos"
-        
-        return InstruccionCosecha(
-            celda_objetivo=(datos.x, datos.y),
-            frutos_a_cosechar=datos.frutos_disponibles,
-            nivel_maduracion=maduracion,
-            prioridad=prioridad,
-            descripcion=descripcion
-        )
-    
-    def _evaluar_riesgo(self, datos: DatosExploracion) -> EstadoCelda:
-        """Evalúa riesgo"""
-        riesgos = []
-        
-        if datos.temperatura < self.umbrales['temperatura_min']:
-            riesgos.append({'tipo': TipoAmenaza.TEMPERATURA_BAJA, 'valor': 5.0})
-        elif datos.temperatura > self.umbrales['temperatura_max']:
-            riesgos.append({'tipo': TipoAmenaza.TEMPERATURA_ALTA, 'valor': 5.0})
-        
-        if datos.nivel_plagas >= self.umbrales['nivel_plagas_critico']:
-            riesgos.append({'tipo': TipoAmenaza.PLAGA, 'valor': datos.nivel_plagas})
-        
-        estado_maduracion = self._determinar_estado_maduracion(datos.nivel_maduracion)
-        listo_cosechar = self._requiere_cosecha(datos)
-        
-        if not riesgos:
-            return EstadoCelda(
-                x=datos.x, y=datos.y,
-                nivel_riesgo=NivelRiesgo.BAJO,
-                tipo_amenaza="Normal",
-                valor_riesgo=0.0,
-                requiere_tratamiento=False,
-                prioridad=1,
-                estado_maduracion=estado_maduracion,
-                frutos_disponibles=datos.frutos_disponibles,
-                listo_para_cosechar=listo_cosechar
-            )
-        
-        riesgo_principal = max(riesgos, key=lambda r: r['valor'])
-        return EstadoCelda(
-=======
         if orden == OrdenCapataz.PARAR:
             ctrl['evento'].clear() # Bloquea el thread del agente
             print(f"[Capataz] ✋ ORDEN: ¡Agente {agente_id}, PARATE!")
@@ -606,33 +292,114 @@ class AgenteCapataz:
             ctrl['evento'].set()   # Asegura que corra para leer la bandera
             print(f"[Capataz] ⚠️ ORDEN: ¡Agente {agente_id}, ABANDONA LA RECOLECCIÓN!")
 
+    def difundir_orden(self, orden: OrdenCapataz, razon: str = "Orden manual del capataz"):
+        """
+        Emite una orden a TODOS los agentes con una sola escritura (la leen en su punto de control)
+
+        Pasa por el supervisor, que la audita y la cuenta; retorna la orden publicada.
+        """
+        return self.capataz.ordenar_flota(TipoOrden(orden.value), razon)
+
     # --- RECEPCIÓN DE DATOS ---
 
-    def recibir_datos(self, datos: DatosExploracion):
-        """El agente envía datos. El Capataz busca al GUSANO."""
+    def entrada_datos(self, datos: DatosExploracion):
+        """Callback de los agentes: la lectura pasa por la ingesta del Capataz"""
+        self._encolar(self.recibir_datos, datos, clave=(datos.x, datos.y), descartable=True)
+
+    def entrada_cosecha(self, cantidad: int):
+        """Callback de los agentes para cosechas"""
+        self._encolar(self.reportar_cosecha, cantidad)
+
+    def entrada_lote(self, lecturas: List[DatosExploracion], estado: Optional[Dict] = None, urgente: bool = False):
+        """Callback de telemetria por lotes (ver telemetria.py)"""
+        # Una clave por lectura: con 'coalescer' la celda ya pendiente en otro lote se reemplaza alli
+        self._encolar(self.recibir_lote, lecturas, estado, urgente=urgente, descartable=True,
+                      claves=[(d.x, d.y) for d in lecturas])
+
+    @medir_fase("manager.recibir_lote")
+    def recibir_lote(self, lecturas: List[DatosExploracion], estado: Optional[Dict] = None):
+        """
+        Procesa un lote de lecturas notificando a la UI una sola vez
+
+        El ultimo estado del agente (si viene) pasa al supervisor despues de
+        las lecturas, que ya reflejan su posicion; su fila de la tabla de flota
+        la escribe el propio agente.
+        """
+        self._lote_abierto = True
+        try:
+            # Todo el lote pasa por el detector en una sola actualizacion
+            anomalias = self.detector.actualizar_lecturas(lecturas)
+            multivariadas = self.multivariado.actualizar_lecturas(lecturas)
+            # Y por las reglas de riesgo en una sola pasada (mismas que _evaluar_riesgo)
+            riesgo = riesgo_lote.evaluar_lecturas(lecturas)
+            niveles = [NivelRiesgo(n) for n in riesgo.nivel_riesgo.tolist()]
+            filas = zip(lecturas, anomalias, multivariadas, niveles,
+                        riesgo.tiene_gusano.tolist(), riesgo.listo_para_cosechar.tolist())
+            for datos, anomalia, multivariada, nivel, gusano, listo in filas:
+                self.recibir_datos(datos, anomalia, multivariada, riesgo=(nivel, gusano, listo))
+        finally:
+            self._lote_abierto = False
+        if estado:
+            self.capataz.actualizar_estado_agente(**estado)
+        if lecturas:
+            self._notificar_ui()
+
+    def entrada_tratamiento(self, celda: Tuple[int, int]):
+        """Callback de los agentes: celda con gusano tratada"""
+        self._encolar(self.reportar_tratamiento, celda)
+
+    def reportar_tratamiento(self, celda: Tuple[int, int]):
+        if self.eventos_sucios is not None:
+            self.eventos_sucios.append((time.time(), celda))
+        self.brotes.tratar(celda)
+        self.indice.fijar(celda, gusanos=0)
+        readmitidas = self.cuarentena.reportar_tratada(celda)
+        if readmitidas:
+            print(f"[Capataz] ✅ Cuarentena levantada en {celda}: {len(readmitidas)} celdas readmitidas")
+            self._notificar_ui()
+
+    @medir_fase("manager.recibir_datos")
+    def recibir_datos(self, datos: DatosExploracion, anomalia=SIN_EVALUAR, multivariada=SIN_EVALUAR,
+                      riesgo: Optional[Tuple[NivelRiesgo, bool, bool]] = None):
+        """
+        El agente envía datos. El Capataz busca al GUSANO.
+
+        Un lote trae ya evaluados la anomalia, la distancia multivariada y el
+        riesgo (nivel, gusano, lista para cosechar) de cada lectura.
+        """
+        t = time.time()
+        if self.eventos_sucios is not None:
+            self.eventos_sucios.append((t, datos))
+        
+        # 0. Lecturas fuera de la historia de la celda o de la zona (ademas del umbral fijo)
+        anomalia, multivariada, id_brote = self._actualizar_analitica(datos, t, anomalia, multivariada)
+        if anomalia is not None:
+            self._reportar_anomalia(anomalia)
+        if multivariada is not None:
+            self._reportar_anomalia(multivariada)
         
-        # 1. Análisis de Riesgo (Buscando al Gusano)
-        tiene_gusano = False
-        nivel_riesgo = NivelRiesgo.BAJO
+        # 1. Análisis de Riesgo (Buscando al Gusano) y de Cosecha
+        nivel_riesgo, tiene_gusano, listo_cosecha = riesgo or self._evaluar_riesgo(datos)
         
-        if datos.nivel_plagas > 8.0:
-            tiene_gusano = True
-            nivel_riesgo = NivelRiesgo.CRITICO
+        if tiene_gusano:
             self.contador_gusanos += 1
             print(f"[Capataz] 🐛 ¡GUSANO DETECTADO EN ({datos.x}, {datos.y})! Nivel: {datos.nivel_plagas:.1f}")
             
             # --- ACCIÓN DEL CAPATAZ ---
-            # Si hay gusano, ordena ABANDONAR al agente que lo vio
-            self.emitir_orden(datos.agente_id, OrdenCapataz.ABANDONAR)
-            
-            # Opcional: Parar a los vecinos por seguridad (ejemplo de lógica compleja)
-            # self.emitir_orden(otro_agente_id, OrdenCapataz.PARAR)
-
-        # 2. Análisis de Cosecha
-        listo_cosecha = (datos.frutos_disponibles > 0 and 
-                         datos.nivel_maduracion > 7.0 and 
-                         not tiene_gusano) # No cosechar si hay gusano
-
+            # Cuarentena alrededor del gusano: los agentes la rodean hasta que se trate
+            zona = self.cuarentena.reportar_gusano((datos.x, datos.y))
+            maduros = self.indice.suma_caja('maduros', zona.caja())
+            print(f"[Capataz] 🚧 Zona {zona.id} en cuarentena ({len(zona.celdas)} celdas, "
+                  f"{maduros} frutos maduros retenidos)")
+            brote = self.brotes.brote_de((datos.x, datos.y)) if id_brote is not None else None
+            if brote is not None and brote.celdas > 1:
+                print(f"[Capataz] 🐛 {brote}")
+
+        # El supervisor aparta a los agentes cercanos (por foco o por brote si los hay)
+        if datos.nivel_plagas >= self.capataz.umbrales['contaminacion_alta']:
+            self.capataz.reportar_contaminacion((datos.x, datos.y), datos.nivel_plagas)
+
+        # 2. Registro de Cosecha
         if listo_cosecha:
             # Crear instrucción (aunque el agente autónomo ya lo sabe, el manager lo registra)
             instr = InstruccionCosecha((datos.x, datos.y), datos.frutos_disponibles, 1, "Cosecha standard")
@@ -642,114 +409,169 @@ class AgenteCapataz:
 
         # 3. Guardar Estado
         estado = EstadoCelda(
->>>>>>> Simulation
             x=datos.x, y=datos.y,
             nivel_riesgo=nivel_riesgo,
             tipo_amenaza="GUSANO" if tiene_gusano else "Ninguna",
             frutos_disponibles=datos.frutos_disponibles,
             listo_para_cosechar=listo_cosecha,
-            tiene_gusano=tiene_gusano
+            tiene_gusano=tiene_gusano,
+            **self.detector.campos_celda((datos.x, datos.y)),
+            **self.multivariado.campos_celda((datos.x, datos.y)),
+            **self.focos_plagas.campos_celda((datos.x, datos.y))
         )
         self.mapa_estados[(datos.x, datos.y)] = estado
+        self.celdas_sucias.add((datos.x, datos.y))
+        if self.celdas_sucias_bitacora is not None:
+            self.celdas_sucias_bitacora.add((datos.x, datos.y))
+        self._indexar(estado)
         self.celdas_exploradas.add((datos.x, datos.y))
         
         # 4. Actualizar UI
         self._notificar_ui()
 
+    def _actualizar_analitica(self, datos: DatosExploracion, t: Optional[float] = None,
+                              anomalia=SIN_EVALUAR, multivariada=SIN_EVALUAR):
+        """
+        Lleva la lectura a la serie, los detectores, los focos y los brotes
+
+        checkpoint.py la usa tambien para reaplicar las lecturas de un delta.
+        Retorna (anomalia, anomalia multivariada, id del brote de la celda).
+        """
+        celda = (datos.x, datos.y)
+        self.series.registrar(datos, t)
+        if anomalia is SIN_EVALUAR:
+            anomalia = self.detector.actualizar(datos)
+        if multivariada is SIN_EVALUAR:
+            multivariada = self.multivariado.actualizar(datos)
+        self.focos_plagas.actualizar(celda, datos.nivel_plagas)
+        self.focos_anomalia.actualizar(celda, self.detector.puntaje(celda))
+        id_brote = self.brotes.actualizar(celda, datos.nivel_plagas)
+        return anomalia, multivariada, id_brote
+
+    @medir_fase("manager.evaluar_riesgo")
+    def _evaluar_riesgo(self, datos: DatosExploracion) -> Tuple[NivelRiesgo, bool, bool]:
+        """Reglas de la lectura: (nivel de riesgo, tiene gusano, lista para cosechar)"""
+        tiene_gusano = datos.nivel_plagas > 8.0
+        nivel_riesgo = NivelRiesgo.CRITICO if tiene_gusano else NivelRiesgo.BAJO
+        listo_cosecha = (datos.frutos_disponibles > 0 and 
+                         datos.nivel_maduracion > 7.0 and 
+                         not tiene_gusano) # No cosechar si hay gusano
+        return nivel_riesgo, tiene_gusano, listo_cosecha
+
     def reportar_cosecha(self, cantidad: int):
         self.frutos_cosechados_total += cantidad
         self._notificar_ui()
 
-    def _notificar_ui(self):
-<<<<<<< HEAD
-        """Envia actualizacion al Agente UI"""
-        if not self._callback_agente_ui:
+    def sembrar(self, semilla: Optional[int] = None) -> int:
+        """
+        Fija la semilla raiz de la jornada (antes de crear los agentes)
+
+        Cada agente recibe su propio generador derivado de esta semilla, asi
+        que la misma semilla repite las mismas lecturas. Retorna la semilla
+        (la generada, si se paso None) para guardarla con la corrida.
+        """
+        self.aleatorio = FlujosAleatorios(semilla)
+        self.modelo_plagas.reiniciar(self.aleatorio.campo(MODELO_PLAGAS))
+        print(f"[Capataz] 📋 Semilla raiz: {self.aleatorio.semilla}")
+        return self.aleatorio.semilla
+
+    def configurar_cuarentena(self, modo: str = 'radio', radio: int = 1):
+        """Cambia la forma de las zonas de cuarentena (antes de crear los agentes)"""
+        self.cuarentena = GestorCuarentena(self.grid_filas, self.grid_columnas, modo, radio)
+        self.capataz.cuarentena = self.cuarentena
+
+    def configurar_clima(self, precalcular: bool = True, **parametros):
+        """
+        Cambia el microclima (antes de crear los agentes)
+
+        Con precalcular=True se simula un dia completo una sola vez y las
+        lecturas interpolan sobre el (conviene en huertos grandes).
+        """
+        self.clima = ModeloClima(self.grid_filas, self.grid_columnas, **parametros)
+        if precalcular:
+            self.clima.precalcular_dia()
+
+    def _indexar(self, estado: EstadoCelda):
+        """Refleja el estado de una celda en el indice de rectangulos"""
+        self.indice.fijar(
+            (estado.x, estado.y),
+            frutos=estado.frutos_disponibles,
+            maduros=estado.frutos_disponibles if estado.listo_para_cosechar else 0,
+            exploradas=1,
+            gusanos=int(estado.tiene_gusano)
+        )
+
+    def _reportar_anomalia(self, anomalia):
+        """Lectura fuera de la historia de su celda o de su zona: la decide el supervisor"""
+        self.capataz.reportar_anomalia(anomalia.celda, anomalia.canales, anomalia.puntaje)
+
+    # --- INGESTA (UN SOLO HILO ESCRITOR) ---
+
+    def activar_ingesta(self, capacidad: int = 1024, politica: str = 'bloquear'):
+        """
+        Procesa las lecturas de todos los agentes en un solo hilo dueño del
+        estado del huerto, alimentado por una cola acotada
+
+        Args:
+            capacidad: Entradas pendientes maximas
+            politica: 'bloquear', 'descartar_antiguo' o 'coalescer'
+        """
+        from ingesta import HiloIngesta  # Import local: solo si se activa
+        self.ingesta = HiloIngesta(capacidad, politica)
+        self.ingesta.iniciar()
+        print(f"[Capataz] 🔗 Ingesta en hilo unico (cola {capacidad}, politica {politica})")
+
+    def detener_ingesta(self):
+        """Procesa lo pendiente, detiene el hilo de ingesta y muestra sus metricas"""
+        if self.ingesta is None:
             return
+        self.ingesta.detener()
+        print(f"[Capataz] 📊 Ingesta:\n{self.ingesta.reporte()}")
+
+    def _encolar(self, funcion: Callable, *args, clave=None, urgente: bool = False, descartable: bool = False,
+                 claves=None):
+        """
+        Entrada comun de los callbacks: encola si hay hilo de ingesta, si no ejecuta en linea
+
+        Solo la telemetria es `descartable`; tratamientos y cosechas nunca se pierden.
+        """
+        if self.ingesta is None or self.ingesta.en_hilo_ingesta():
+            funcion(*args)
+        else:
+            self.ingesta.encolar(funcion, *args, clave=clave, urgente=urgente, descartable=descartable,
+                                 claves=claves)
+
+    @medir_fase("manager.notificar_ui")
+    def _notificar_ui(self):
+        if not self._callback_ui or self._lote_abierto: return
         
-        estados = list(self.mapa_estados.values())
-        metricas = self._calcular_metricas()
-        self._callback_agente_ui(estados, metricas)
-    
+        # Los agentes se leen de la tabla de flota (la UI toma una
+        # instantanea al dibujar), no se reconstruye una lista por evento
+        self._callback_ui(list(self.mapa_estados.values()), self.flota, self._calcular_metricas())
+
+    @medir_fase("manager.calcular_metricas")
     def _calcular_metricas(self) -> MetricasSistema:
-        """Calcula metricas con info multi-agente"""
-        frutos_totales = sum(e.frutos_disponibles for e in self.mapa_estados.values())
-        frutos_listos = sum(
-            e.frutos_disponibles 
-            for e in self.mapa_estados.values() 
-            if e.listo_para_cosechar
-        )
-        
-        agentes_explorando = sum(1 for a in self.agentes_fisicos if a.activo and not a.exploracion_completa)
-        
         return MetricasSistema(
-=======
-        if not self._callback_ui: return
-        
-        # Preparar datos visuales de los agentes
-        estados_agentes = []
-        for agente in self.agentes_fisicos:
-            # Obtener posición actual del objeto agente
-            pos = agente.posicion_actual
-            orden = self.controles_agentes[agente.agente_id]['orden_texto']
-            
-            vis = EstadoAgenteVisibilidad(
-                id=agente.agente_id,
-                x=pos[0], y=pos[1],
-                orden_actual=orden,
-                bateria=agente.bateria,
-                cargando_frutos=agente.frutos_cargados
-            )
-            estados_agentes.append(vis)
-
-        metricas = MetricasSistema(
->>>>>>> Simulation
             tiempo_transcurrido=time.time() - self.tiempo_inicio,
             celdas_exploradas=len(self.celdas_exploradas),
             celdas_totales=self.grid_filas * self.grid_columnas,
             frutos_cosechados=self.frutos_cosechados_total,
             agentes_activos=len(self.agentes_fisicos),
-            amenazas_gusano=self.contador_gusanos
+            amenazas_gusano=self.contador_gusanos,
+            # Totales del indice: O(1) en lugar de recorrer mapa_estados
+            frutos_totales_detectados=self.indice.total('frutos'),
+            frutos_listos_cosecha=self.indice.total('maduros')
         )
-<<<<<<< HEAD
-    
-    def generar_reporte(self) -> str:
-        """Genera reporte con metricas multi-agente y capataz"""
-        metricas = self._calcular_metricas()
-=======
->>>>>>> Simulation
-        
-        self._callback_ui(list(self.mapa_estados.values()), estados_agentes, metricas)
-
-<<<<<<< HEAD
-AGENTES FISICOS:
-  • Total agentes: {metricas.agentes_activos}
-  • Agentes explorando: {metricas.agentes_explorando}
-
-EXPLORACION:
-  • Celdas exploradas: {metricas.celdas_exploradas}/{metricas.celdas_totales}
-  • Progreso: {metricas.porcentaje_analizado:.1f}%
-  • Tiempo: {metricas.tiempo_transcurrido:.1f}s
-
-COSECHA:
-  • Frutos detectados: {metricas.frutos_totales_detectados}
-  • Listos para cosechar: {metricas.frutos_listos_cosecha}
-  • Cosechas ordenadas: {metricas.cosechas_ordenadas}
-  • Frutos cosechados: {metricas.frutos_cosechados} [FRUTOS]
-
-RIESGOS:
-  • Celdas criticas: {metricas.celdas_criticas}
-  • Alto riesgo: {metricas.celdas_alto_riesgo}
-  • Tratamientos ordenados: {metricas.tratamientos_ordenados}
-
-{'='*70}
-"""
-        
-        # Agregar reporte del capataz
-        reporte += f"\n{self.capataz.generar_reporte_final()}"
-        
-        return reporte
-=======
+
     def detener_todo(self):
-        for id_a in self.controles_agentes:
-            self.emitir_orden(id_a, OrdenCapataz.ABANDONAR)
->>>>>>> Simulation
+        self.capataz.ordenar_fin_turno()
+        print(f"[Capataz] 🚧 Cuarentenas:\n{self.cuarentena.reporte()}")
+        print(f"[Capataz] 📈 Anomalias por celda:\n{self.detector.reporte()}")
+        print(f"[Capataz] 📈 Anomalias multivariadas por zona:\n{self.multivariado.reporte()}")
+        print(f"[Capataz] 🔥 Focos de plagas:\n{self.focos_plagas.reporte()}")
+        print(f"[Capataz] 🔥 Focos de anomalias:\n{self.focos_anomalia.reporte()}")
+        print(f"[Capataz] 🐛 Brotes de plaga:\n{self.brotes.reporte()}")
+        print(f"[Capataz] 🐛 Modelo de plagas (nivel real):\n{self.modelo_plagas.reporte()}")
+        print(f"[Capataz] 🌡 Microclima:\n{self.clima.reporte()}")
+        print(self.capataz.generar_reporte_final())
+        self.capataz.detener()
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+"""
+MICROCLIMA DEL INVERNADERO (DIFUSION DE TEMPERATURA Y HUMEDAD)
+==============================================================
+
+Responsabilidades:
+1. Guardar la temperatura y la humedad reales de cada celda, con
+   continuidad espacial y ciclo dia/noche, para que las amenazas
+   TEMPERATURA_ALTA/BAJA y de humedad dependan del lugar y de la hora
+2. Avanzar el huerto un paso (dt horas) con operaciones vectorizadas:
+   - difusion entre celdas vecinas (laplaciano de 5 puntos, bordes aislados)
+   - intercambio con el exterior por la cubierta (todas las celdas), las
+     PAREDES (borde del huerto) y las VENTILAS (abiertas en su horario)
+   - ganancia solar de dia; riego: las LINEAS DE RIEGO humedecen y
+     enfrian su fila mientras riegan
+3. Entregar lecturas de sensor (valor + ruido) a los agentes con hilos,
+   avanzando la hora con la cuenta de lecturas (el tick de la simulacion,
+   no el tiempo real), y columnas al motor lockstep. Un paso reescribe los
+   campos en el lugar, asi que toda lectura toma el lock
+4. Precalcular y guardar un dia completo (`precalcular_dia`): despues de
+   eso una lectura es una interpolacion entre dos muestras, sin avanzar nada
+
+Exterior: temperatura t_media +- t_amplitud y humedad h_media -+ h_amplitud,
+con el maximo de temperatura a las 15 h. Cada celda avanza como
+
+    T' = (1 - 4 D - a) T + D * suma(vecinas) + a * T_ext + fuentes
+
+con `a` el acople al exterior de la celda; el paso es estable mientras
+4 D + a <= 1. 1000x1000 avanza en ~28-30 ms por paso en un nucleo Xeon de
+servidor (benchmark.py, modelo_clima.1000x1000.paso); con el dia
+precalculado una lectura no avanza nada.
+"""
+
+import math
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+HORAS_DIA = 24.0
+HUMEDAD_RIEGO = 95.0            # humedad a la que lleva el riego en su linea
+MAX_PASOS_LECTURA = 20          # pasos que puede avanzar una sola lectura
+
+
+def _sumar_vecinas(campo: np.ndarray, marco: np.ndarray, suma: np.ndarray):
+    """Suma de las 4 vecinas; el borde repite la celda (sin flujo hacia afuera)"""
+    marco[1:-1, 1:-1] = campo
+    marco[0, 1:-1] = campo[0]
+    marco[-1, 1:-1] = campo[-1]
+    marco[1:-1, 0] = campo[:, 0]
+    marco[1:-1, -1] = campo[:, -1]
+    np.add(marco[:-2, 1:-1], marco[2:, 1:-1], out=suma)
+    np.add(suma, marco[1:-1, :-2], out=suma)
+    np.add(suma, marco[1:-1, 2:], out=suma)
+
+
+class ModeloClima:
+    """
+    Temperatura y humedad del invernadero en una grilla filas x columnas
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        dt: Horas simuladas por paso
+        difusion: Fraccion que intercambia cada celda con cada vecina por paso
+        cubierta, pared, ventila: Acople al exterior por paso (todas las
+            celdas / borde / ventilas abiertas)
+        separacion_ventilas: Una ventila cada N columnas en las paredes norte
+            y sur (0 = sin ventilas; se agregan con agregar_ventila)
+        separacion_riego: Una linea de riego cada N filas (0 = sin riego)
+        hora_inicio: Hora del dia al empezar
+        lecturas_por_hora: Lecturas de sensor por hora simulada en medir() (None = no avanza)
+        ruido_temperatura, ruido_humedad: Desviacion del ruido de medir()
+    """
+
+    def __init__(self, filas: int, columnas: int, dt: float = 0.25, difusion: float = 0.12,
+                 cubierta: float = 0.06, pared: float = 0.1, ventila: float = 0.2,
+                 separacion_ventilas: int = 10, separacion_riego: int = 5,
+                 t_media: float = 18.0, t_amplitud: float = 8.0,
+                 h_media: float = 65.0, h_amplitud: float = 15.0,
+                 ganancia_solar: float = 0.7, riego: float = 0.25, enfriamiento_riego: float = 0.2,
+                 horario_ventilas: Tuple[float, float] = (10.0, 17.0),
+                 horarios_riego: Tuple[Tuple[float, float], ...] = ((6.0, 8.0), (18.0, 19.0)),
+                 hora_inicio: float = 6.0, lecturas_por_hora: Optional[float] = 20.0,
+                 ruido_temperatura: float = 0.3, ruido_humedad: float = 1.0):
+        self.filas = filas
+        self.columnas = columnas
+        self.dt = dt
+        self.difusion = difusion
+        self.cubierta = cubierta
+        self.pared = pared
+        self.ventila = ventila
+        self.t_media, self.t_amplitud = t_media, t_amplitud
+        self.h_media, self.h_amplitud = h_media, h_amplitud
+        self.ganancia_solar = ganancia_solar
+        self.riego = riego
+        self.enfriamiento_riego = enfriamiento_riego
+        self.horario_ventilas = horario_ventilas
+        self.horarios_riego = horarios_riego
+        self.hora_inicio = hora_inicio
+        self.lecturas_por_hora = lecturas_por_hora
+        self.ruido_temperatura = ruido_temperatura
+        self.ruido_humedad = ruido_humedad
+
+        forma = (filas, columnas)
+        # Fuentes (mascaras 0/1)
+        self.paredes = np.zeros(forma, dtype=np.float32)
+        self.paredes[[0, -1], :] = 1.0
+        self.paredes[:, [0, -1]] = 1.0
+        self.ventilas = np.zeros(forma, dtype=np.float32)
+        self.lineas_riego = np.zeros(forma, dtype=np.float32)
+        if separacion_ventilas:
+            for y in range(separacion_ventilas // 2, columnas, separacion_ventilas):
+                self.agregar_ventila((0, y))
+                self.agregar_ventila((filas - 1, y))
+        if separacion_riego:
+            for x in range(separacion_riego // 2, filas, separacion_riego):
+                self.agregar_linea_riego(x)
+
+        self.temperatura = np.empty(forma, dtype=np.float32)
+        self.humedad = np.empty(forma, dtype=np.float32)
+        self._marco = np.empty((filas + 2, columnas + 2), dtype=np.float32)
+        self._suma = np.empty(forma, dtype=np.float32)
+        self._fuente = np.empty(forma, dtype=np.float32)
+        self._coeficientes: Dict[Tuple[bool, bool], Tuple[np.ndarray, ...]] = {}
+        self._ciclo: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._lock = Lock()
+
+        self.pasos = 0
+        self.tiempo_pasos = 0.0
+        self.lecturas = 0           # Ticks del reloj de medir()
+        self.reiniciar()
+
+    # ========================================================================
+    # FUENTES
+    # ========================================================================
+
+    def agregar_ventila(self, celda: Tuple[int, int], radio: int = 1):
+        """Ventila centrada en la celda (cuadrado de `radio`)"""
+        x, y = celda
+        self.ventilas[max(0, x - radio):x + radio + 1, max(0, y - radio):y + radio + 1] = 1.0
+        self._cambiar_fuentes()
+
+    def agregar_linea_riego(self, fila: int):
+        self.lineas_riego[fila, :] = 1.0
+        self._cambiar_fuentes()
+
+    def _cambiar_fuentes(self):
+        # Los coeficientes y el dia precalculado dependen de las fuentes
+        self._coeficientes = {}
+        self._ciclo = None
+
+    def _coeficientes_estado(self, abiertas: bool, regando: bool) -> Tuple[np.ndarray, ...]:
+        """(coef temperatura, coef humedad, acople al exterior) de un estado de ventilas/riego"""
+        clave = (abiertas, regando)
+        if clave not in self._coeficientes:
+            acople = self.cubierta + self.pared * self.paredes
+            if abiertas:
+                acople = acople + self.ventila * self.ventilas
+            propio = 1.0 - 4.0 * self.difusion
+            acople_riego = self.riego * self.lineas_riego if regando else 0.0
+            coef_h = propio - acople - acople_riego
+            if coef_h.min() < 0:
+                raise ValueError(f"Paso inestable: 4 * difusion + acople maximo = {1.0 - coef_h.min():.2f} > 1")
+            self._coeficientes[clave] = (
+                (propio - acople).astype(np.float32),
+                coef_h.astype(np.float32),
+                acople.astype(np.float32),
+            )
+        return self._coeficientes[clave]
+
+    # ========================================================================
+    # CICLO DIA/NOCHE
+    # ========================================================================
+
+    @staticmethod
+    def _en_horario(hora: float, horario: Tuple[float, float]) -> bool:
+        return horario[0] <= hora % HORAS_DIA < horario[1]
+
+    def exterior(self, hora: float) -> Tuple[float, float]:
+        """(temperatura, humedad) exterior; maxima temperatura a las 15 h"""
+        onda = math.cos(2.0 * math.pi * (hora - 15.0) / HORAS_DIA)
+        return self.t_media + self.t_amplitud * onda, self.h_media - self.h_amplitud * onda
+
+    def sol(self, hora: float) -> float:
+        """Ganancia solar por paso: media onda entre las 6 y las 18 h"""
+        return self.ganancia_solar * max(0.0, math.sin(math.pi * ((hora % HORAS_DIA) - 6.0) / 12.0))
+
+    # ========================================================================
+    # AVANCE
+    # ========================================================================
+
+    def reiniciar(self):
+        """Todo el invernadero al promedio exterior, en hora_inicio"""
+        with self._lock:
+            self.temperatura[:] = self.t_media
+            self.humedad[:] = self.h_media
+            self.hora = self.hora_inicio
+            self.lecturas = 0
+
+    def _paso(self):
+        hora = self.hora
+        abiertas = self._en_horario(hora, self.horario_ventilas)
+        regando = any(self._en_horario(hora, h) for h in self.horarios_riego)
+        coef_t, coef_h, acople = self._coeficientes_estado(abiertas, regando)
+        t_ext, h_ext = self.exterior(hora)
+
+        # Temperatura: difusion + exterior + sol (- evaporacion en las lineas que riegan)
+        t = self.temperatura
+        _sumar_vecinas(t, self._marco, self._suma)
+        np.multiply(t, coef_t, out=t)
+        np.multiply(self._suma, self.difusion, out=self._suma)
+        np.add(t, self._suma, out=t)
+        np.multiply(acople, t_ext, out=self._fuente)
+        np.add(t, self._fuente, out=t)
+        t += self.sol(hora)
+        if regando:
+            t -= self.enfriamiento_riego * self.lineas_riego
+
+        # Humedad: difusion + exterior (+ riego hacia HUMEDAD_RIEGO)
+        h = self.humedad
+        _sumar_vecinas(h, self._marco, self._suma)
+        np.multiply(h, coef_h, out=h)
+        np.multiply(self._suma, self.difusion, out=self._suma)
+        np.add(h, self._suma, out=h)
+        np.multiply(acople, h_ext, out=self._fuente)
+        np.add(h, self._fuente, out=h)
+        if regando:
+            h += (self.riego * HUMEDAD_RIEGO) * self.lineas_riego
+
+        self.hora = hora + self.dt
+        self.pasos += 1
+
+    def avanzar_a(self, hora: float, max_pasos: Optional[int] = None):
+        """
+        Avanza hasta `hora` (horas desde la medianoche del primer dia)
+
+        Con el dia precalculado solo se mueve la hora. Si se llega a
+        max_pasos, la hora salta al objetivo (el resto de la evolucion se pierde).
+        """
+        with self._lock:
+            self._avanzar_a(hora, max_pasos)
+
+    def _avanzar_a(self, hora: float, max_pasos: Optional[int] = None):
+        # Con el lock tomado
+        if self._ciclo is not None:
+            # Nunca hacia atras: otro hilo pudo avanzar mas mientras este esperaba
+            self.hora = max(self.hora, hora)
+            return
+        inicio = time.perf_counter()
+        pasos = 0
+        while self.hora + self.dt <= hora:
+            if max_pasos is not None and pasos >= max_pasos:
+                self.hora = hora
+                break
+            self._paso()
+            pasos += 1
+        self.tiempo_pasos += time.perf_counter() - inicio
+
+    def avanzar_lectura(self, max_pasos: int = MAX_PASOS_LECTURA):
+        """Cuenta una lectura de sensor (un tick) y avanza a la hora que le corresponde"""
+        if self.lecturas_por_hora is None:
+            return
+        with self._lock:
+            self._contar_lectura(max_pasos)
+
+    def _contar_lectura(self, max_pasos: int):
+        # Con el lock tomado
+        self.lecturas += 1
+        self._avanzar_a(self.hora_inicio + self.lecturas / self.lecturas_por_hora, max_pasos)
+
+    # ========================================================================
+    # DIA PRECALCULADO
+    # ========================================================================
+
+    def precalcular_dia(self, muestras: int = 24, dias_calentamiento: int = 2):
+        """
+        Simula `dias_calentamiento` dias (regimen periodico) y guarda el
+        siguiente dia en `muestras` instantes (float16, 4 bytes por celda y
+        muestra). Las lecturas posteriores interpolan entre muestras.
+        """
+        self._ciclo = None
+        self.reiniciar()
+        hora_inicial = self.hora
+        self.avanzar_a(math.ceil(hora_inicial / HORAS_DIA + dias_calentamiento) * HORAS_DIA)
+        base = self.hora
+        temperatura = np.empty((muestras,) + self.temperatura.shape, dtype=np.float16)
+        humedad = np.empty_like(temperatura)
+        for k in range(muestras):
+            self.avanzar_a(base + k * HORAS_DIA / muestras)
+            temperatura[k] = self.temperatura
+            humedad[k] = self.humedad
+        with self._lock:
+            self._ciclo = (temperatura, humedad)
+            self.hora = hora_inicial
+            self.lecturas = 0
+
+    @property
+    def precalculado(self) -> bool:
+        return self._ciclo is not None
+
+    def _del_ciclo(self, celdas) -> Tuple[np.ndarray, np.ndarray]:
+        temperatura, humedad = self._ciclo
+        muestras = len(temperatura)
+        posicion = (self.hora % HORAS_DIA) / HORAS_DIA * muestras
+        k0 = int(posicion) % muestras
+        k1 = (k0 + 1) % muestras
+        w = np.float32(posicion - int(posicion))
+        t = (1 - w) * temperatura[k0].ravel()[celdas] + w * temperatura[k1].ravel()[celdas]
+        h = (1 - w) * humedad[k0].ravel()[celdas] + w * humedad[k1].ravel()[celdas]
+        return t.astype(np.float32), h.astype(np.float32)
+
+    # ========================================================================
+    # SENSORES
+    # ========================================================================
+
+    def _valores(self, celdas) -> Tuple[np.ndarray, np.ndarray]:
+        # Con el lock tomado; copias, no vistas de los campos que _paso reescribe
+        if self._ciclo is not None:
+            return self._del_ciclo(celdas)
+        return self.temperatura.ravel()[celdas].copy(), self.humedad.ravel()[celdas].copy()
+
+    def valores(self, celdas) -> Tuple[np.ndarray, np.ndarray]:
+        """(temperatura, humedad) reales de las celdas (indices lineales) a la hora actual"""
+        with self._lock:
+            return self._valores(celdas)
+
+    def mapas(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(temperatura, humedad) de todo el huerto a la hora actual"""
+        return tuple(v.reshape(self.filas, self.columnas) for v in self.valores(slice(None)))
+
+    def medir(self, celda: Tuple[int, int], rng=None) -> Tuple[float, float]:
+        """
+        Lectura de los sensores de temperatura y humedad: cuenta la lectura en
+        el reloj del modelo y suma ruido gaussiano (rng: el random.Random del agente)
+        """
+        with self._lock:
+            if self.lecturas_por_hora is not None:
+                self._contar_lectura(MAX_PASOS_LECTURA)
+            t, h = self._valores(celda[0] * self.columnas + celda[1])
+        t, h = float(t), float(h)
+        if rng is not None:
+            t += rng.gauss(0.0, self.ruido_temperatura)
+            h += rng.gauss(0.0, self.ruido_humedad)
+        return t, min(100.0, max(0.0, h))
+
+    # ========================================================================
+    # ESTADO (CHECKPOINTS)
+    # ========================================================================
+
+    def estado(self) -> Dict:
+        """Hora y campos (con el dia precalculado basta la hora)"""
+        with self._lock:
+            if self._ciclo is not None:
+                return {'hora': self.hora}
+            return {'hora': self.hora, 'temperatura': self.temperatura.copy(), 'humedad': self.humedad.copy()}
+
+    def restaurar(self, estado: Dict):
+        """Vuelve al estado guardado; el reloj de medir() sigue desde esa hora"""
+        with self._lock:
+            self.hora = estado['hora']
+            self.hora_inicio = estado['hora']
+            if 'temperatura' in estado:
+                self.temperatura[:] = estado['temperatura']
+                self.humedad[:] = estado['humedad']
+            self.lecturas = 0
+
+    def reporte(self) -> str:
+        t, h = self.mapas()
+        dia = f"{self.hora % HORAS_DIA:04.1f} h"
+        modo = (f"dia precalculado ({len(self._ciclo[0])} muestras)" if self._ciclo is not None
+                else f"{self.pasos} pasos, {1000 * self.tiempo_pasos / max(1, self.pasos):.2f} ms/paso")
+        return (f"  • Hora: {dia} | {modo}\n"
+                f"  • Temperatura: {float(t.min()):.1f} - {float(t.max()):.1f} C (media {float(t.mean()):.1f})\n"
+                f"  • Humedad: {float(h.min()):.0f} - {float(h.max()):.0f}% (media {float(h.mean()):.0f})")
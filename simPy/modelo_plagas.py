@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+"""
+MODELO DE PROPAGACION DE PLAGAS (AUTOMATA CELULAR ESTOCASTICO)
+==============================================================
+
+Responsabilidades:
+1. Guardar el nivel REAL de plagas de cada celda (lo que miden los
+   sensores), con continuidad en el espacio y en el tiempo: volver a
+   explorar una celda o detectar temprano ahora importa
+2. Avanzar todo el huerto un paso con operaciones vectorizadas:
+   - crecimiento logistico con efecto Allee: bajo `umbral_allee` la plaga
+     se extingue sola, encima crece hasta el maximo
+   - contagio: una celda sana se infesta con probabilidad
+     1 - (1 - contagio)^k, con k = vecinas infestadas (8-vecindad)
+   - aparicion espontanea de focos nuevos
+3. Bajar la carga local al tratar una celda (y su vecindario)
+4. Entregar lecturas de sensor (nivel + ruido) a los agentes con hilos,
+   avanzando un paso cada `lecturas_por_paso` lecturas (el tick de la
+   simulacion), y columnas al motor lockstep. Un paso reescribe la grilla
+   en el lugar en varias operaciones, asi que toda lectura toma el lock
+
+El reloj es la cuenta de lecturas, no el tiempo real: con la misma semilla
+el modelo da los mismos pasos con los mismos sorteos en cada corrida. Que
+agente ve cada paso depende todavia del intercalado de los hilos; con un
+solo agente o con el motor lockstep la jornada se repite completa.
+
+El nivel se guarda en uint8 (ESCALA pasos por unidad, 0-10 -> 0-250), asi
+que la transicion de cada celda depende solo de (nivel, k): se precalcula
+una TABLA de 256 x 9 entradas con (nivel base, salto, probabilidad del
+salto) y un paso es: contar vecinas (rebanadas desplazadas), un indexado
+en la tabla y una comparacion contra bytes aleatorios. El redondeo
+estocastico del crecimiento mantiene el valor esperado aun cuando crece
+menos de un escalon por paso. 1000x1000 avanza en ~15-17 ms por paso en un
+nucleo Xeon de servidor (benchmark.py, modelo_plagas.1000x1000.paso).
+"""
+
+import time
+from threading import Lock
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+ESCALA = 25                     # escalones por unidad de nivel_plagas
+NIVEL_MAXIMO = 10.0
+_TOPE = int(NIVEL_MAXIMO * ESCALA)
+_VECINAS = 9                    # k = 0..8
+
+
+def _contar_vecinas(marco: np.ndarray, fila: np.ndarray, conteo: np.ndarray):
+    """
+    Vecinas marcadas en 8-vecindad, sin contar la celda
+
+    marco: (filas + 2) x (columnas + 2) uint8 con la mascara en el centro
+    y borde en cero; fila y conteo son buffers reutilizados.
+    """
+    np.add(marco[:-2], marco[1:-1], out=fila)
+    np.add(fila, marco[2:], out=fila)
+    np.add(fila[:, :-2], fila[:, 1:-1], out=conteo)
+    np.add(conteo, fila[:, 2:], out=conteo)
+    np.subtract(conteo, marco[1:-1, 1:-1], out=conteo)
+
+
+class ModeloPlagas:
+    """
+    Nivel de plagas real del huerto como automata celular estocastico
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        rng: np.random.Generator (p. ej. FlujosAleatorios.campo(MODELO_PLAGAS))
+        crecimiento: Tasa logistica por paso
+        umbral_allee: Nivel bajo el cual la plaga se extingue sola
+        contagio: Probabilidad por paso de que UNA vecina infestada contagie
+        umbral_contagio: Nivel a partir del cual una celda contagia
+        siembra: Nivel con el que arranca una celda recien contagiada
+        aparicion: Probabilidad por celda y paso de un foco espontaneo
+        focos_iniciales: Fraccion de celdas infestadas al inicio
+        lecturas_por_paso: Lecturas de sensor por paso en medir() (None = solo paso())
+        ruido_sensor: Desviacion del ruido de medir()
+    """
+
+    def __init__(self, filas: int, columnas: int, rng: Optional[np.random.Generator] = None,
+                 crecimiento: float = 0.08, umbral_allee: float = 1.2, contagio: float = 0.02,
+                 umbral_contagio: float = 5.0, siembra: float = 1.6, aparicion: float = 1e-5,
+                 focos_iniciales: float = 0.02, lecturas_por_paso: Optional[int] = 8,
+                 ruido_sensor: float = 0.2):
+        self.filas = filas
+        self.columnas = columnas
+        self.crecimiento = crecimiento
+        self.umbral_allee = umbral_allee
+        self.contagio = contagio
+        self.umbral_contagio = umbral_contagio
+        self.siembra = siembra
+        self.aparicion = aparicion
+        self.focos_iniciales = focos_iniciales
+        self.lecturas_por_paso = lecturas_por_paso
+        self.ruido_sensor = ruido_sensor
+
+        self._nivel_contagio = int(round(umbral_contagio * ESCALA))
+        self._nivel_siembra = int(round(siembra * ESCALA))
+        self._tabla = self._construir_tabla()
+
+        # Estado y buffers de un paso (sin reservar memoria por paso)
+        self._niveles = np.zeros((filas, columnas), dtype=np.uint8)
+        self._marco = np.zeros((filas + 2, columnas + 2), dtype=np.uint8)
+        self._fila = np.empty((filas, columnas + 2), dtype=np.uint8)
+        self._vecinas = np.empty((filas, columnas), dtype=np.uint8)
+        self._indice = np.empty((filas, columnas), dtype=np.uint16)
+        self._transicion = np.empty((filas, columnas), dtype='<u4')
+        self._salta = np.empty((filas, columnas), dtype=np.bool_)
+        self._lock = Lock()
+
+        self.pasos = 0
+        self.tratamientos = 0
+        self.tiempo_pasos = 0.0
+        self.lecturas = 0           # Ticks del reloj de medir()
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.reiniciar()
+
+    # ========================================================================
+    # TABLA DE TRANSICION
+    # ========================================================================
+
+    def _construir_tabla(self) -> np.ndarray:
+        """
+        Transicion de cada (nivel, vecinas infestadas) empaquetada en uint32
+
+        byte 0: nivel base | byte 1: salto | byte 2: probabilidad del salto (/256)
+        El nivel siguiente es base + salto si un byte aleatorio < probabilidad.
+        """
+        nivel = np.minimum(np.arange(256), _TOPE) / ESCALA
+        # Crecimiento logistico con efecto Allee, redondeado al azar entre dos escalones
+        siguiente = nivel + self.crecimiento * nivel * (nivel / self.umbral_allee - 1.0) * (1.0 - nivel / NIVEL_MAXIMO)
+        escalones = np.clip(siguiente, 0.0, NIVEL_MAXIMO) * ESCALA
+        base = np.floor(escalones)
+        prob = np.rint((escalones - base) * 256)
+        base += prob == 256
+        prob[prob == 256] = 0
+
+        base = np.repeat(base[:, None], _VECINAS, axis=1)
+        salto = np.where(base < _TOPE, 1.0, 0.0)
+        prob = np.repeat(prob[:, None], _VECINAS, axis=1)
+
+        # Contagio de las celdas bajo el nivel de siembra: salto hasta la siembra
+        k = np.arange(_VECINAS)
+        contagio = np.minimum(np.rint((1.0 - (1.0 - self.contagio) ** k) * 256), 255)
+        susceptible = (np.arange(256) < self._nivel_siembra)[:, None] & (k > 0)[None, :]
+        salto = np.where(susceptible, self._nivel_siembra - base, salto)
+        prob = np.where(susceptible, contagio[None, :], prob)
+
+        tabla = base.astype(np.uint32) | (salto.astype(np.uint32) << 8) | (prob.astype(np.uint32) << 16)
+        return tabla.astype('<u4').ravel()
+
+    # ========================================================================
+    # ESTADO INICIAL
+    # ========================================================================
+
+    def reiniciar(self, rng: Optional[np.random.Generator] = None):
+        """Huerto inicial: fondo bajo el umbral de Allee y focos_iniciales infestados"""
+        if rng is not None:
+            self.rng = rng
+        forma = (self.filas, self.columnas)
+        allee = int(self.umbral_allee * ESCALA)
+        with self._lock:
+            self._niveles[:] = self.rng.integers(0, allee, forma, dtype=np.uint8)
+            focos = self.rng.random(forma) < self.focos_iniciales
+            self._niveles[focos] = self.rng.integers(self._nivel_siembra, _TOPE + 1, int(focos.sum()), dtype=np.uint8)
+            self.pasos = 0
+            self.tratamientos = 0
+            self.tiempo_pasos = 0.0
+            self.lecturas = 0
+
+    # ========================================================================
+    # AVANCE
+    # ========================================================================
+
+    def _paso(self):
+        niveles = self._niveles
+        # 1. Vecinas infestadas de cada celda
+        np.greater_equal(niveles, self._nivel_contagio, out=self._marco[1:-1, 1:-1])
+        _contar_vecinas(self._marco, self._fila, self._vecinas)
+
+        # 2. Transicion de (nivel, k): un indexado en la tabla
+        np.multiply(niveles, _VECINAS, out=self._indice, dtype=np.uint16)
+        np.add(self._indice, self._vecinas, out=self._indice)
+        self._tabla.take(self._indice, out=self._transicion, mode='clip')
+        campos = self._transicion.view(np.uint8).reshape(self.filas, self.columnas, 4)
+
+        # 3. Sorteo: nivel = base + salto si el byte aleatorio cae bajo la probabilidad
+        ruido = self.rng.integers(0, 256, niveles.shape, dtype=np.uint8)
+        np.less(ruido, campos[..., 2], out=self._salta)
+        np.multiply(self._salta, campos[..., 1], out=niveles)
+        np.add(niveles, campos[..., 0], out=niveles)
+
+        # 4. Focos espontaneos (pocos: se sortea cuantos y donde)
+        nuevos = self.rng.binomial(niveles.size, self.aparicion)
+        if nuevos:
+            celdas = self.rng.integers(0, niveles.size, nuevos)
+            niveles.flat[celdas] = np.maximum(niveles.flat[celdas], self._nivel_siembra)
+        self.pasos += 1
+
+    def paso(self, pasos: int = 1):
+        """Avanza todo el huerto `pasos` pasos"""
+        with self._lock:
+            inicio = time.perf_counter()
+            for _ in range(pasos):
+                self._paso()
+            self.tiempo_pasos += time.perf_counter() - inicio
+
+    def avanzar_lectura(self):
+        """
+        Cuenta una lectura de sensor (un tick) y da un paso cada `lecturas_por_paso`
+
+        La cuenta y el paso ocurren bajo el mismo lock, asi que dos hilos
+        que leen a la vez nunca dan el mismo paso dos veces.
+        """
+        if self.lecturas_por_paso is None:
+            return
+        with self._lock:
+            self._contar_lectura()
+
+    def _contar_lectura(self):
+        # Con el lock tomado
+        self.lecturas += 1
+        if self.lecturas % self.lecturas_por_paso:
+            return
+        inicio = time.perf_counter()
+        self._paso()
+        self.tiempo_pasos += time.perf_counter() - inicio
+
+    # ========================================================================
+    # TRATAMIENTO
+    # ========================================================================
+
+    def tratar(self, celda: Tuple[int, int], radio: int = 1, eficacia: float = 0.9):
+        """Fumiga la celda y su vecindario: la carga baja a (1 - eficacia)"""
+        x, y = celda
+        ventana = (slice(max(0, x - radio), x + radio + 1), slice(max(0, y - radio), y + radio + 1))
+        queda = int(round((1.0 - eficacia) * 256))
+        with self._lock:
+            local = self._niveles[ventana].astype(np.uint16) * queda
+            self._niveles[ventana] = local >> 8
+            self.tratamientos += 1
+
+    # ========================================================================
+    # SENSORES
+    # ========================================================================
+
+    def nivel(self, celda: Tuple[int, int]) -> float:
+        """Nivel real de plagas de una celda"""
+        with self._lock:
+            return int(self._niveles[celda[0], celda[1]]) / ESCALA
+
+    def medir(self, celda: Tuple[int, int], rng=None) -> float:
+        """
+        Lectura del sensor de plagas: cuenta la lectura en el reloj del
+        modelo y suma ruido gaussiano (rng: el random.Random del agente)
+        """
+        with self._lock:
+            if self.lecturas_por_paso is not None:
+                self._contar_lectura()
+            nivel = int(self._niveles[celda[0], celda[1]]) / ESCALA
+        if rng is not None and self.ruido_sensor > 0:
+            nivel += rng.gauss(0.0, self.ruido_sensor)
+        return min(NIVEL_MAXIMO, max(0.0, nivel))
+
+    def niveles(self, celdas: np.ndarray) -> np.ndarray:
+        """Nivel real de varias celdas (indices lineales), float32"""
+        with self._lock:
+            return self._niveles.ravel()[celdas] * np.float32(1.0 / ESCALA)
+
+    def mapa(self) -> np.ndarray:
+        """Nivel real de todo el huerto (filas x columnas, float32)"""
+        with self._lock:
+            return self._niveles * np.float32(1.0 / ESCALA)
+
+    def infestadas(self, umbral: Optional[float] = None) -> int:
+        """Celdas con nivel >= umbral (por defecto umbral_contagio)"""
+        umbral = self.umbral_contagio if umbral is None else umbral
+        with self._lock:
+            return int(np.count_nonzero(self._niveles >= int(round(umbral * ESCALA))))
+
+    # ========================================================================
+    # ESTADO (CHECKPOINTS)
+    # ========================================================================
+
+    def estado(self) -> Dict:
+        with self._lock:
+            return {
+                'niveles': self._niveles.copy(),
+                'pasos': self.pasos,
+                'tratamientos': self.tratamientos,
+                'lecturas': self.lecturas,
+                'rng': self.rng.bit_generator.state,
+            }
+
+    def restaurar(self, estado: Dict):
+        """Vuelve al estado guardado; el reloj de medir() sigue desde la lectura guardada"""
+        with self._lock:
+            self._niveles[:] = estado['niveles']
+            self.pasos = estado['pasos']
+            self.tratamientos = estado['tratamientos']
+            self.lecturas = estado.get('lecturas', 0)
+            self.rng.bit_generator.state = estado['rng']
+
+    def reporte(self) -> str:
+        medio = 1000 * self.tiempo_pasos / self.pasos if self.pasos else 0.0
+        return (f"  • Pasos del modelo: {self.pasos} ({medio:.2f} ms/paso) | tratamientos: {self.tratamientos}\n"
+                f"  • Celdas infestadas reales (>= {self.umbral_contagio}): {self.infestadas()} | "
+                f"con gusano (> 8.0): {self.infestadas(8.0 + 1.0 / ESCALA)}")
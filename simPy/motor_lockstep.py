@@ -0,0 +1,562 @@
+# -*- coding: utf-8 -*-
+"""
+MOTOR LOCKSTEP - TODA LA FLOTA AVANZA UN TICK POR PASO
+======================================================
+
+Alternativa al modelo de un hilo por agente con pausas time.sleep():
+
+Responsabilidades:
+1. Guardar el estado de TODOS los agentes en arreglos NumPy (una posicion
+   por agente): posicion, destino, bateria, carga, orden y estado de trabajo
+2. Avanzar a toda la flota un tick por `paso()`:
+   - Movimiento (un paso Manhattan hacia el destino, nucleos.paso_manhattan),
+     consumo de bateria y deteccion de llegada son operaciones vectorizadas
+     sobre toda la flota
+   - Las llegadas a celda se evaluan juntas con riesgo_lote.evaluar_lote
+     (exploracion, cosecha y deteccion del gusano en una sola pasada)
+3. Despachar en Python solo la logica por evento (llegada, cosecha, gusano,
+   orden) y solo si hay manejadores suscritos
+4. Entregar una InstantaneaFlota (tabla_flota.py) para la UI y el capataz
+
+Cada agente recorre un tramo contiguo de un barrido en serpentina del huerto
+y vuelve a su estacion de carga (la esquina de su bloque de `separacion_bases`
+celdas) para descargar y recargar.
+
+USO:
+    python motor_lockstep.py --filas 1000 --columnas 1000 --agentes 10000
+"""
+
+import argparse
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import nucleos
+import riesgo_lote
+from mapa_celdas import MapaCeldas
+from tabla_flota import InstantaneaFlota
+
+
+# Ordenes (mismos valores que OrdenCapataz de manager.py)
+ORDEN_CONTINUAR = 0
+ORDEN_PARAR = 1
+ORDEN_ABANDONAR = 2
+ESTADOS_ORDEN = ("CONTINUA", "PARATE", "ABANDONA")
+
+# Estado de trabajo de cada agente
+EXPLORANDO = 0    # yendo a (o llegando a) su siguiente celda
+VOLVIENDO = 1     # yendo a su estacion de carga
+EN_SERVICIO = 2   # descargando y recargando en la estacion
+TERMINADO = 3
+
+SIN_CELDA = -1
+EVENTOS = ('llegada', 'cosecha', 'gusano', 'orden')
+
+
+@dataclass
+class ConfiguracionLockstep:
+    """Parametros de la flota (los mismos valores que usan los agentes con hilos)"""
+    capacidad_carga: int = 50
+    bateria_inicial: float = 100.0
+    bateria_minima: float = 10.0       # reserva al llegar a la estacion
+    consumo_paso: float = 0.1          # por celda recorrida
+    consumo_exploracion: float = 1.0   # por celda explorada
+    consumo_fruto: float = 0.3         # por fruto cosechado
+    ticks_servicio: int = 5            # descarga + recarga en la estacion
+    separacion_bases: int = 50         # una estacion de carga cada N celdas
+
+
+# ========================================================================
+# CAMPO SINTETICO (LO QUE MIDEN LOS SENSORES)
+# ========================================================================
+
+class CampoSintetico:
+    """
+    Valores reales de cada celda en arreglos planos (indice lineal x * columnas + y)
+
+    Las distribuciones son las de _capturar_datos_sensores; el gusano aparece
+    en ~5% de las celdas, como en la rama Simulation. Con `plagas`
+    (modelo_plagas.ModeloPlagas) el nivel de plagas sale del modelo y con
+    `clima` (modelo_clima.ModeloClima) la temperatura y la humedad.
+    """
+
+    def __init__(self, filas: int, columnas: int, rng: np.random.Generator, prob_gusano: float = 0.05,
+                 plagas=None, clima=None):
+        n = filas * columnas
+        self.filas = filas
+        self.columnas = columnas
+        self.temperatura = rng.uniform(10.0, 35.0, n).astype(np.float32)
+        self.humedad = rng.uniform(30.0, 90.0, n).astype(np.float32)
+        self.nivel_plagas = rng.uniform(0.0, 7.0, n).astype(np.float32)
+        gusano = rng.random(n) < prob_gusano
+        self.nivel_plagas[gusano] = rng.uniform(8.5, 10.0, int(gusano.sum()))
+        self.nivel_nutrientes = rng.uniform(2.0, 9.0, n).astype(np.float32)
+        self.nivel_maduracion = rng.uniform(0.0, 10.0, n).astype(np.float32)
+        self.frutos = np.where(self.nivel_maduracion > 4.0, rng.integers(0, 6, n), 0).astype(np.int16)
+        self.plagas = plagas
+        self.clima = clima
+
+    def muestrear(self, celdas: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Columnas de sensores de las celdas dadas (orden de riesgo_lote.evaluar_lote)"""
+        plagas = self.nivel_plagas[celdas] if self.plagas is None else self.plagas.niveles(celdas)
+        if self.clima is None:
+            temperatura, humedad = self.temperatura[celdas], self.humedad[celdas]
+        else:
+            temperatura, humedad = self.clima.valores(celdas)
+        return (temperatura, humedad, plagas,
+                self.nivel_nutrientes[celdas], self.nivel_maduracion[celdas], self.frutos[celdas])
+
+    def cosechar(self, celdas: np.ndarray, cantidad: np.ndarray):
+        self.frutos[celdas] -= cantidad.astype(self.frutos.dtype)
+
+
+# ========================================================================
+# MOTOR
+# ========================================================================
+
+class MotorLockstep:
+    """
+    Flota completa en arreglos NumPy que avanza de forma sincrona
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        num_agentes: Agentes de la flota
+        config: ConfiguracionLockstep
+        campo: Objeto con muestrear(celdas) y cosechar(celdas, cantidad);
+               None = CampoSintetico generado con `rng`
+        rng: np.random.Generator (p. ej. FlujosAleatorios.campo(CAMPO_SINTETICO))
+        cuarentena: GestorCuarentena opcional; las celdas prohibidas se
+                    difieren al final de la ruta de cada agente
+        umbrales: Umbrales de riesgo (por defecto riesgo_lote.UMBRALES_RIESGO)
+        series: SeriesCeldas opcional; cada llegada agrega su lectura (tiempo = tick)
+        plagas: ModeloPlagas opcional; da el nivel de plagas del campo y
+                avanza un paso cada `ticks_plagas` ticks
+        clima: ModeloClima opcional; da temperatura y humedad y avanza
+               a la hora del tick (ticks_por_hora ticks por hora simulada)
+    """
+
+    def __init__(
+        self,
+        filas: int,
+        columnas: int,
+        num_agentes: int,
+        config: Optional[ConfiguracionLockstep] = None,
+        campo=None,
+        rng: Optional[np.random.Generator] = None,
+        cuarentena=None,
+        umbrales: Optional[Dict] = None,
+        series=None,
+        plagas=None,
+        ticks_plagas: int = 10,
+        clima=None,
+        ticks_por_hora: int = 60
+    ):
+        self.filas = filas
+        self.columnas = columnas
+        self.num_agentes = num_agentes
+        self.config = config or ConfiguracionLockstep()
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.plagas = plagas
+        self.ticks_plagas = max(1, ticks_plagas)
+        self.clima = clima
+        self.ticks_por_hora = ticks_por_hora
+        self.campo = (campo if campo is not None
+                      else CampoSintetico(filas, columnas, self.rng, plagas=plagas, clima=clima))
+        self.cuarentena = cuarentena
+        self.umbrales = umbrales
+        self.series = series
+
+        n = num_agentes
+        self.x = np.zeros(n, dtype=np.int32)
+        self.y = np.zeros(n, dtype=np.int32)
+        self.destino_x = np.zeros(n, dtype=np.int32)
+        self.destino_y = np.zeros(n, dtype=np.int32)
+        self.base_x = np.zeros(n, dtype=np.int32)
+        self.base_y = np.zeros(n, dtype=np.int32)
+        self.objetivo = np.full(n, SIN_CELDA, dtype=np.int64)   # celda (indice lineal) que va a explorar
+        self.bateria = np.full(n, self.config.bateria_inicial, dtype=np.float64)
+        self.carga = np.zeros(n, dtype=np.int32)
+        self.orden = np.full(n, ORDEN_CONTINUAR, dtype=np.int8)
+        self.estado = np.full(n, VOLVIENDO, dtype=np.int8)
+        self.servicio = np.zeros(n, dtype=np.int32)             # ticks de servicio restantes
+
+        # Rutas: un tramo [ruta_inicio, ruta_fin) de `ruta` por agente
+        self.ruta = np.zeros(0, dtype=np.int64)
+        self.ruta_inicio = np.zeros(n, dtype=np.int64)
+        self.ruta_fin = np.zeros(n, dtype=np.int64)
+        self.puntero = np.zeros(n, dtype=np.int64)
+        self._diferidas: Dict[int, List[int]] = {}
+
+        self.celdas_exploradas = MapaCeldas(filas, columnas)
+        self._manejadores: Dict[str, List[Callable]] = {evento: [] for evento in EVENTOS}
+
+        # Contadores
+        self.tick = 0
+        self.pasos = 0
+        self.frutos_cosechados = 0
+        self.frutos_descargados = 0
+        self.celdas_gusano = 0
+        self.visitas_base = 0
+        self.tiempo_pasos = 0.0
+
+        self.asignar_rutas(self._rutas_serpentina())
+
+    # ========================================================================
+    # RUTAS
+    # ========================================================================
+
+    def _rutas_serpentina(self) -> List[np.ndarray]:
+        """Barrido en serpentina del huerto partido en tramos contiguos casi iguales"""
+        barrido = np.arange(self.filas * self.columnas, dtype=np.int64).reshape(self.filas, self.columnas)
+        barrido[1::2] = barrido[1::2, ::-1]
+        return np.array_split(barrido.ravel(), self.num_agentes)
+
+    def asignar_rutas(self, rutas: Sequence[Sequence]):
+        """
+        Asigna la ruta de cada agente
+
+        Args:
+            rutas: Por agente, indices lineales o celdas (x, y) en orden de visita
+                   (p. ej. las celdas_asignadas del reparto del Manager)
+        """
+        planas = []
+        for ruta in rutas:
+            ruta = np.asarray(ruta, dtype=np.int64)
+            if ruta.ndim == 2:
+                ruta = ruta[:, 0] * self.columnas + ruta[:, 1]
+            planas.append(ruta.reshape(-1))
+        largos = np.array([len(r) for r in planas], dtype=np.int64)
+        self.ruta = np.concatenate(planas) if planas else np.zeros(0, dtype=np.int64)
+        self.ruta_fin = np.cumsum(largos)
+        self.ruta_inicio = self.ruta_fin - largos
+        self.puntero = self.ruta_inicio.copy()
+        self._diferidas.clear()
+
+        # Estacion de carga: esquina del bloque donde empieza la ruta
+        sep = max(1, self.config.separacion_bases)
+        primera = np.where(largos > 0, self.ruta[np.minimum(self.ruta_inicio, max(0, len(self.ruta) - 1))], 0)
+        self.base_x[:] = (primera // self.columnas) // sep * sep
+        self.base_y[:] = (primera % self.columnas) // sep * sep
+
+        # Todos arrancan en su estacion, listos para salir
+        self.x[:], self.y[:] = self.base_x, self.base_y
+        self.estado[:] = EN_SERVICIO
+        self.servicio[:] = 0
+        self.objetivo[:] = SIN_CELDA
+
+    def _quedan_celdas(self, ids: np.ndarray) -> np.ndarray:
+        quedan = self.puntero[ids] < self.ruta_fin[ids]
+        if self._diferidas:
+            quedan |= np.array([bool(self._diferidas.get(int(i))) for i in ids], dtype=np.bool_)
+        return quedan
+
+    # ========================================================================
+    # EVENTOS
+    # ========================================================================
+
+    def suscribir(self, evento: str, manejador: Callable):
+        """
+        Registra un manejador de eventos
+
+        - 'llegada': manejador(agentes, celdas, resultado) una vez por tick con
+                     todas las llegadas (arreglos y riesgo_lote.ResultadoLote)
+        - 'cosecha': manejador(agente_id, (x, y), frutos) por cosecha
+        - 'gusano':  manejador(agente_id, (x, y)) por celda con gusano
+        - 'orden':   manejador(orden, agentes) por cada ordenar()
+        """
+        if evento not in self._manejadores:
+            raise ValueError(f"Evento desconocido: {evento} (validos: {', '.join(EVENTOS)})")
+        self._manejadores[evento].append(manejador)
+
+    def _celda(self, indice: int) -> Tuple[int, int]:
+        return divmod(int(indice), self.columnas)
+
+    # ========================================================================
+    # ORDENES
+    # ========================================================================
+
+    def ordenar(self, orden, agentes: Optional[Sequence[int]] = None):
+        """
+        Aplica una orden a toda la flota (o a los agentes dados)
+
+        `orden` puede ser el codigo, su texto ('PARATE') o un OrdenCapataz.
+        ABANDONAR manda a los agentes a su estacion y ahi terminan.
+        """
+        orden = getattr(orden, 'value', orden)
+        codigo = ESTADOS_ORDEN.index(orden) if isinstance(orden, str) else int(orden)
+        ids = np.arange(self.num_agentes) if agentes is None else np.asarray(agentes, dtype=np.int64)
+        ids = ids[self.estado[ids] != TERMINADO]
+        self.orden[ids] = codigo
+        if codigo == ORDEN_ABANDONAR:
+            self._volver_a_base(ids)
+        for manejador in self._manejadores['orden']:
+            manejador(ESTADOS_ORDEN[codigo], ids)
+
+    # ========================================================================
+    # TICK
+    # ========================================================================
+
+    def paso(self) -> int:
+        """
+        Avanza un tick a toda la flota
+
+        Returns:
+            Agentes que siguen trabajando
+        """
+        inicio = time.perf_counter()
+        cfg = self.config
+
+        # 0. Microclima a la hora del tick
+        if self.clima is not None:
+            self.clima.avanzar_a(self.clima.hora_inicio + self.tick / self.ticks_por_hora)
+
+        # 1. Movimiento: un paso Manhattan (primero en x, luego en y)
+        moviendo = (self.orden != ORDEN_PARAR) & (self.estado <= VOLVIENDO)
+        movidos = nucleos.paso_manhattan(self.x, self.y, self.destino_x, self.destino_y, moviendo)
+        self.bateria[movidos] -= cfg.consumo_paso
+        self.pasos += int(np.count_nonzero(movidos))
+
+        # 2. Llegadas
+        llegaron = moviendo & (self.x == self.destino_x) & (self.y == self.destino_y)
+        a_celda = np.flatnonzero(llegaron & (self.estado == EXPLORANDO))
+        a_base = np.flatnonzero(llegaron & (self.estado == VOLVIENDO))
+        if len(a_celda):
+            self._explorar(a_celda)
+        if len(a_base):
+            self._llegar_a_base(a_base)
+
+        # 3. Servicio en la estacion
+        en_servicio = (self.estado == EN_SERVICIO) & (self.orden == ORDEN_CONTINUAR)
+        self.servicio[en_servicio] -= 1
+        listos = np.flatnonzero(en_servicio & (self.servicio <= 0))
+        if len(listos):
+            self._siguiente_destino(listos)
+
+        # 4. Propagacion de plagas en todo el huerto
+        if self.plagas is not None and self.tick % self.ticks_plagas == 0:
+            self.plagas.paso()
+
+        self.tick += 1
+        self.tiempo_pasos += time.perf_counter() - inicio
+        return int(np.count_nonzero(self.estado != TERMINADO))
+
+    def ejecutar(self, max_ticks: Optional[int] = None) -> int:
+        """Avanza hasta que toda la flota termine (o max_ticks); retorna los ticks dados"""
+        inicial = self.tick
+        while self.paso():
+            if max_ticks is not None and self.tick - inicial >= max_ticks:
+                break
+        return self.tick - inicial
+
+    # ========================================================================
+    # LOGICA POR LLEGADA
+    # ========================================================================
+
+    def _explorar(self, ids: np.ndarray):
+        """Exploracion y cosecha de todas las llegadas del tick en una pasada"""
+        cfg = self.config
+        celdas = self.objetivo[ids]
+        self.celdas_exploradas.agregar_indices(celdas)
+        self.bateria[ids] -= cfg.consumo_exploracion
+
+        columnas = self.campo.muestrear(celdas)
+        if self.series is not None:
+            self.series.registrar_lote(celdas, np.column_stack(columnas[:5]), self.series.origen + self.tick)
+        resultado = riesgo_lote.evaluar_lote(*columnas, umbrales=self.umbrales)
+
+        # Cosecha: lo que cabe en la carga
+        espacio = cfg.capacidad_carga - self.carga[ids]
+        cosecha = np.where(resultado.listo_para_cosechar,
+                           np.minimum(columnas[5].astype(np.int32), espacio), 0)
+        if cosecha.any():
+            self.carga[ids] += cosecha
+            self.bateria[ids] -= cfg.consumo_fruto * cosecha
+            self.campo.cosechar(celdas, cosecha)
+            self.frutos_cosechados += int(cosecha.sum())
+
+        # Eventos en Python
+        for manejador in self._manejadores['llegada']:
+            manejador(ids, celdas, resultado)
+        if self._manejadores['cosecha']:
+            for k in np.flatnonzero(cosecha):
+                for manejador in self._manejadores['cosecha']:
+                    manejador(int(ids[k]), self._celda(celdas[k]), int(cosecha[k]))
+        gusanos = np.flatnonzero(resultado.tiene_gusano)
+        self.celdas_gusano += len(gusanos)
+        if len(gusanos) and (self.cuarentena is not None or self._manejadores['gusano']):
+            for k in gusanos:
+                celda = self._celda(celdas[k])
+                if self.cuarentena is not None:
+                    self.cuarentena.reportar_gusano(celda)
+                for manejador in self._manejadores['gusano']:
+                    manejador(int(ids[k]), celda)
+
+        self.objetivo[ids] = SIN_CELDA
+        self._siguiente_destino(ids)
+
+    def _llegar_a_base(self, ids: np.ndarray):
+        """Descarga y recarga; los que abandonaron o ya no tienen celdas terminan"""
+        self.frutos_descargados += int(self.carga[ids].sum())
+        self.carga[ids] = 0
+        self.bateria[ids] = self.config.bateria_inicial
+        self.visitas_base += len(ids)
+
+        fin = (self.orden[ids] == ORDEN_ABANDONAR) | ~self._quedan_celdas(ids)
+        self.estado[ids] = np.where(fin, TERMINADO, EN_SERVICIO).astype(np.int8)
+        self.servicio[ids] = self.config.ticks_servicio
+
+    def _volver_a_base(self, ids: np.ndarray):
+        # La celda a medio camino vuelve al frente de la ruta
+        pendiente = ids[(self.estado[ids] == EXPLORANDO) & (self.objetivo[ids] != SIN_CELDA)]
+        for i in pendiente:
+            self._diferidas.setdefault(int(i), []).insert(0, int(self.objetivo[i]))
+        self.objetivo[ids] = SIN_CELDA
+        self.destino_x[ids] = self.base_x[ids]
+        self.destino_y[ids] = self.base_y[ids]
+        self.estado[ids] = VOLVIENDO
+
+    def _siguiente_destino(self, ids: np.ndarray):
+        """Siguiente celda de la ruta, o la estacion si hace falta descargar o recargar"""
+        cfg = self.config
+        ids = ids[self.orden[ids] != ORDEN_ABANDONAR]
+
+        # Reserva para ir a una celda mas y volver a la estacion
+        distancia_base = np.abs(self.x[ids] - self.base_x[ids]) + np.abs(self.y[ids] - self.base_y[ids])
+        reserva = cfg.bateria_minima + cfg.consumo_paso * (distancia_base + 2) + cfg.consumo_exploracion
+        a_base = (self.carga[ids] >= cfg.capacidad_carga) | (self.bateria[ids] < reserva)
+        a_base |= ~self._quedan_celdas(ids)
+        self._volver_a_base(ids[a_base])
+
+        ids = ids[~a_base]
+        if not len(ids):
+            return
+        en_ruta = self.puntero[ids] < self.ruta_fin[ids]
+        con_ruta = ids[en_ruta]
+        celdas = self.ruta[self.puntero[con_ruta]]
+        self.puntero[con_ruta] += 1
+
+        if self.cuarentena is not None and self.cuarentena.activa:
+            prohibidas = self.cuarentena.mapa().ravel()[celdas]
+            for k in np.flatnonzero(prohibidas):
+                celdas[k] = self._saltar_prohibidas(int(con_ruta[k]), int(celdas[k]))
+
+        self.objetivo[con_ruta] = celdas
+        for i in ids[~en_ruta]:
+            self.objetivo[i] = self._tomar_diferida(int(i))
+
+        sin_celda = ids[self.objetivo[ids] == SIN_CELDA]
+        self._volver_a_base(sin_celda)
+        ids = ids[self.objetivo[ids] != SIN_CELDA]
+        self.destino_x[ids] = self.objetivo[ids] // self.columnas
+        self.destino_y[ids] = self.objetivo[ids] % self.columnas
+        self.estado[ids] = EXPLORANDO
+
+    def _saltar_prohibidas(self, agente: int, celda: int) -> int:
+        """Difiere las celdas en cuarentena y retorna la primera permitida de la ruta"""
+        prohibidas = self.cuarentena.mapa().ravel()
+        diferidas = self._diferidas.setdefault(agente, [])
+        while celda != SIN_CELDA and prohibidas[celda]:
+            diferidas.append(celda)
+            self.cuarentena.celdas_diferidas += 1
+            if self.puntero[agente] < self.ruta_fin[agente]:
+                celda = int(self.ruta[self.puntero[agente]])
+                self.puntero[agente] += 1
+            else:
+                celda = self._tomar_diferida(agente)
+        return celda
+
+    def _tomar_diferida(self, agente: int) -> int:
+        """Primera celda diferida ya permitida; las que siguen prohibidas se pierden"""
+        diferidas = self._diferidas.get(agente)
+        prohibidas = self.cuarentena.mapa().ravel() if self.cuarentena is not None else None
+        while diferidas:
+            celda = diferidas.pop(0)
+            if prohibidas is None or not prohibidas[celda]:
+                return celda
+            self.cuarentena.celdas_perdidas += 1
+        self._diferidas.pop(agente, None)
+        return SIN_CELDA
+
+    # ========================================================================
+    # LECTURA DEL ESTADO
+    # ========================================================================
+
+    def instantanea(self) -> InstantaneaFlota:
+        """Copia del estado de la flota con el formato de TablaFlota (para la UI y el capataz)"""
+        return InstantaneaFlota(
+            ids=np.arange(self.num_agentes, dtype=np.int32),
+            x=self.x.copy(), y=self.y.copy(),
+            bateria=self.bateria.copy(),
+            carga=self.carga.copy(),
+            orden=self.orden.copy(),
+            activo=self.estado != TERMINADO,
+            estados_orden=ESTADOS_ORDEN,
+            version=self.tick,
+        )
+
+    def metricas(self) -> Dict[str, float]:
+        return {
+            'ticks': self.tick,
+            'agentes_activos': int(np.count_nonzero(self.estado != TERMINADO)),
+            'celdas_exploradas': len(self.celdas_exploradas),
+            'cobertura': self.celdas_exploradas.cobertura(),
+            'pasos': self.pasos,
+            'frutos_cosechados': self.frutos_cosechados,
+            'frutos_descargados': self.frutos_descargados,
+            'celdas_gusano': self.celdas_gusano,
+            'visitas_base': self.visitas_base,
+            'ms_por_tick': self.tiempo_pasos / max(1, self.tick) * 1000.0,
+        }
+
+    def reporte(self) -> str:
+        m = self.metricas()
+        return (f"  • Ticks: {m['ticks']} ({m['ms_por_tick']:.2f} ms/tick, "
+                f"{m['agentes_activos']} agentes activos)\n"
+                f"  • Celdas exploradas: {m['celdas_exploradas']} ({m['cobertura'] * 100:.1f}%)\n"
+                f"  • Pasos recorridos: {m['pasos']} | visitas a estacion: {m['visitas_base']}\n"
+                f"  • Frutos cosechados/descargados: {m['frutos_cosechados']} / {m['frutos_descargados']}\n"
+                f"  • Celdas con gusano: {m['celdas_gusano']}")
+
+
+# ========================================================================
+# EJECUCION DIRECTA
+# ========================================================================
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Jornada completa con el motor lockstep")
+    parser.add_argument('--filas', type=int, default=1000)
+    parser.add_argument('--columnas', type=int, default=1000)
+    parser.add_argument('--agentes', type=int, default=10000)
+    parser.add_argument('--ticks', type=int, default=None, help="Maximo de ticks (por defecto hasta terminar)")
+    parser.add_argument('--semilla', type=int, default=None)
+    parser.add_argument('--plagas', action='store_true', help="Nivel de plagas del modelo de propagacion")
+    parser.add_argument('--clima', action='store_true', help="Temperatura y humedad del microclima (dia precalculado)")
+    args = parser.parse_args(argv)
+
+    from aleatorio import FlujosAleatorios, CAMPO_SINTETICO, MODELO_PLAGAS
+    flujos = FlujosAleatorios(args.semilla)
+    print(f"[Lockstep] {args.agentes} agentes en {args.filas}x{args.columnas} (semilla {flujos.semilla})")
+    plagas = None
+    if args.plagas:
+        from modelo_plagas import ModeloPlagas
+        plagas = ModeloPlagas(args.filas, args.columnas, rng=flujos.campo(MODELO_PLAGAS), lecturas_por_paso=None)
+    clima = None
+    if args.clima:
+        from modelo_clima import ModeloClima
+        clima = ModeloClima(args.filas, args.columnas)
+        clima.precalcular_dia()
+    motor = MotorLockstep(args.filas, args.columnas, args.agentes, rng=flujos.campo(CAMPO_SINTETICO),
+                          plagas=plagas, clima=clima)
+    motor.ejecutar(args.ticks)
+    print(motor.reporte())
+    if plagas is not None:
+        print(plagas.reporte())
+    if clima is not None:
+        print(clima.reporte())
+    return motor
+
+
+if __name__ == "__main__":
+    main()
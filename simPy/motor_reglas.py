@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+MOTOR DE REGLAS DECLARATIVAS
+============================
+
+Responsabilidades:
+1. Definir reglas como datos: condiciones, orden, prioridad y razon
+2. Compilar la tabla UNA vez en una funcion Python con la cadena if/elif
+   equivalente (sin recorrer la tabla en cada evaluacion)
+3. Evaluar la misma tabla vectorizada sobre el estado de toda la flota
+4. Contar disparos por regla y tiempo de evaluacion
+
+Semantica (igual a una cadena if/return escrita a mano):
+- Las reglas se evaluan en orden; la primera regla con orden que se cumple
+  gana y detiene la evaluacion.
+- Una regla sin orden (orden=None) es un aviso: se registra y la evaluacion
+  continua con la siguiente regla.
+
+Cada condicion es una tupla (campo, operador, valor). El valor puede ser una
+constante o Umbral('nombre'), que se lee del diccionario de umbrales en el
+momento de evaluar (cambiar un umbral no requiere recompilar).
+"""
+
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+OPERADORES = ('<', '<=', '>', '>=', '==', '!=')
+
+
+@dataclass(frozen=True)
+class Umbral:
+    """Referencia a un umbral por nombre"""
+    nombre: str
+
+
+@dataclass(frozen=True)
+class Regla:
+    """Una fila de la tabla de reglas"""
+    nombre: str
+    condiciones: Tuple[Tuple[str, str, Any], ...]
+    orden: Any                 # Valor a emitir; None = solo aviso
+    prioridad: int
+    razon: str                 # Plantilla str.format con los campos del estado y los umbrales
+
+    def formatear_razon(self, valores: Dict[str, Any]) -> str:
+        return self.razon.format(**valores)
+
+
+@dataclass
+class EstadisticaRegla:
+    nombre: str
+    disparos: int = 0
+
+
+@dataclass
+class ResultadoFlota:
+    """Resultado vectorizado: indice de regla ganadora por agente (-1 = ninguna)"""
+    ganadora: np.ndarray
+    avisos: Dict[int, np.ndarray] = field(default_factory=dict)  # indice regla -> mascara
+
+
+class MotorReglas:
+    """
+    Tabla de reglas compilada
+
+    Args:
+        reglas: Tabla de reglas en orden de evaluacion
+        derivados: Campos calculados {nombre: f(estado, umbrales)}; deben
+                   funcionar tanto con escalares como con arreglos NumPy
+        extras: Campos que no estan en el estado y se pasan aparte (contexto)
+    """
+
+    def __init__(
+        self,
+        reglas: Sequence[Regla],
+        derivados: Optional[Dict[str, Callable]] = None,
+        extras: Sequence[str] = ()
+    ):
+        self.reglas = list(reglas)
+        self.derivados = dict(derivados or {})
+        self.extras = tuple(extras)
+
+        for regla in self.reglas:
+            for campo, operador, _ in regla.condiciones:
+                if operador not in OPERADORES:
+                    raise ValueError(f"Regla '{regla.nombre}': operador invalido {operador!r}")
+
+        # Estadisticas
+        self.estadisticas = [EstadisticaRegla(r.nombre) for r in self.reglas]
+        self.evaluaciones = 0
+        self.tiempo_total_ns = 0
+
+        self._evaluar = self._compilar()
+
+    # ========================================================================
+    # COMPILACION
+    # ========================================================================
+
+    def _expresion(self, campo: str) -> str:
+        if campo in self.derivados:
+            return f"d_{campo}"
+        if campo in self.extras:
+            return f"x[{campo!r}]"
+        return f"e.{campo}"
+
+    def _compilar(self) -> Callable:
+        """Genera y compila la cadena if/elif equivalente a la tabla"""
+        constantes: List[Any] = []
+
+        def valor(v) -> str:
+            if isinstance(v, Umbral):
+                return f"u[{v.nombre!r}]"
+            constantes.append(v)
+            return f"k[{len(constantes) - 1}]"
+
+        usados = {c for r in self.reglas for c, _, _ in r.condiciones}
+        lineas = ["def _evaluar(e, u, x, avisos):"]
+        for campo in self.derivados:
+            if campo in usados:
+                lineas.append(f"    d_{campo} = D[{campo!r}](e, u)")
+
+        for i, regla in enumerate(self.reglas):
+            condicion = " and ".join(
+                f"({self._expresion(c)} {op} {valor(v)})" for c, op, v in regla.condiciones
+            ) or "True"
+            lineas.append(f"    if {condicion}:")
+            if regla.orden is None:
+                lineas.append(f"        avisos.append({i})")
+            else:
+                lineas.append(f"        return {i}")
+        lineas.append("    return -1")
+
+        codigo = "\n".join(lineas)
+        espacio = {'k': constantes, 'D': self.derivados}
+        exec(compile(codigo, "<reglas>", "exec"), espacio)
+        self.codigo_fuente = codigo
+        return espacio['_evaluar']
+
+    # ========================================================================
+    # EVALUACION
+    # ========================================================================
+
+    def evaluar(self, estado, umbrales: Dict[str, Any],
+                contexto: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Regla], List[Regla]]:
+        """
+        Evalua un estado
+
+        Returns:
+            (regla ganadora o None, lista de reglas de aviso que se cumplieron)
+        """
+        avisos: List[int] = []
+        inicio = time.perf_counter_ns()
+        indice = self._evaluar(estado, umbrales, contexto or {}, avisos)
+        self.tiempo_total_ns += time.perf_counter_ns() - inicio
+        self.evaluaciones += 1
+
+        for i in avisos:
+            self.estadisticas[i].disparos += 1
+        if indice < 0:
+            return None, [self.reglas[i] for i in avisos]
+        self.estadisticas[indice].disparos += 1
+        return self.reglas[indice], [self.reglas[i] for i in avisos]
+
+    def evaluar_lote(self, columnas: Dict[str, np.ndarray], umbrales: Dict[str, Any]) -> ResultadoFlota:
+        """
+        Evalua la tabla sobre toda la flota a la vez
+
+        Args:
+            columnas: Un arreglo por campo (incluidos los extras), todos de igual largo
+            umbrales: Diccionario de umbrales
+        """
+        inicio = time.perf_counter_ns()
+        n = len(next(iter(columnas.values()))) if columnas else 0
+        e = SimpleNamespace(**columnas)
+        derivados = {nombre: f(e, umbrales) for nombre, f in self.derivados.items()}
+
+        def columna(campo):
+            if campo in derivados:
+                return derivados[campo]
+            return columnas[campo]
+
+        ganadora = np.full(n, -1, dtype=np.int16)
+        pendiente = np.ones(n, dtype=bool)
+        avisos: Dict[int, np.ndarray] = {}
+
+        for i, regla in enumerate(self.reglas):
+            cumple = pendiente.copy()
+            for campo, operador, v in regla.condiciones:
+                referencia = umbrales[v.nombre] if isinstance(v, Umbral) else v
+                cumple &= _comparar(columna(campo), operador, referencia)
+            if regla.orden is None:
+                avisos[i] = cumple
+            else:
+                ganadora[cumple] = i
+                pendiente &= ~cumple
+            self.estadisticas[i].disparos += int(cumple.sum())
+
+        self.evaluaciones += n
+        self.tiempo_total_ns += time.perf_counter_ns() - inicio
+        return ResultadoFlota(ganadora=ganadora, avisos=avisos)
+
+    # ========================================================================
+    # REPORTES
+    # ========================================================================
+
+    def reporte(self) -> str:
+        """Disparos por regla y costo medio de evaluacion"""
+        media_us = (self.tiempo_total_ns / self.evaluaciones / 1000.0) if self.evaluaciones else 0.0
+        lineas = [f"  • Evaluaciones: {self.evaluaciones} ({media_us:.2f} us/evaluacion)"]
+        for regla, est in zip(self.reglas, self.estadisticas):
+            lineas.append(f"  • {regla.nombre}: {est.disparos} disparos")
+        return "\n".join(lineas)
+
+
+def _comparar(columna, operador: str, referencia):
+    """Comparacion elemento a elemento (np.asarray para columnas de objetos)"""
+    a = np.asarray(columna)
+    if operador == '<':
+        r = a < referencia
+    elif operador == '<=':
+        r = a <= referencia
+    elif operador == '>':
+        r = a > referencia
+    elif operador == '>=':
+        r = a >= referencia
+    elif operador == '==':
+        r = a == referencia
+    else:
+        r = a != referencia
+    return np.asarray(r, dtype=bool)
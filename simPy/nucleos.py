@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+NUCLEOS ACELERADOS (NUMBA OPCIONAL)
+===================================
+
+Responsabilidades:
+1. Reunir los nucleos de calculo que siguen siendo bucles aun vectorizados:
+   - paso_manhattan:      un paso de cada agente hacia su destino (motor lockstep)
+   - contar_vecinos:      celdas marcadas en el vecindario de cada celda
+                          (celdas con valor en la ventana de focos_espaciales)
+2. Compilarlos con Numba (njit) si esta instalado y usar la version NumPy
+   si no lo esta; ambas versiones devuelven exactamente lo mismo
+3. Medir la aceleracion de cada nucleo (`medir_aceleracion`)
+
+La evaluacion de riesgo ya es una sola pasada sin ramas en riesgo_lote.py,
+asi que no tiene nucleo aparte.
+
+USO:
+    python nucleos.py                 # aceleracion por nucleo
+    SIM_NUMBA=0 python motor_lockstep.py   # forzar la version NumPy
+"""
+
+import os
+import time
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+try:
+    import numba
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    numba = None
+    NUMBA_DISPONIBLE = False
+
+# Se puede desactivar para comparar o depurar (SIM_NUMBA=0)
+USAR_NUMBA = NUMBA_DISPONIBLE and os.environ.get('SIM_NUMBA', '1') != '0'
+
+
+def _compilar(funcion: Callable) -> Callable:
+    if not NUMBA_DISPONIBLE:
+        return funcion
+    return numba.njit(cache=True, nogil=True)(funcion)
+
+
+# ========================================================================
+# PASO MANHATTAN
+# ========================================================================
+
+def _paso_manhattan_bucle(x, y, destino_x, destino_y, moviendo, movidos):
+    for i in range(x.shape[0]):
+        movidos[i] = False
+        if not moviendo[i]:
+            continue
+        if x[i] < destino_x[i]:
+            x[i] += 1
+            movidos[i] = True
+        elif x[i] > destino_x[i]:
+            x[i] -= 1
+            movidos[i] = True
+        elif y[i] < destino_y[i]:
+            y[i] += 1
+            movidos[i] = True
+        elif y[i] > destino_y[i]:
+            y[i] -= 1
+            movidos[i] = True
+
+
+def _paso_manhattan_numpy(x, y, destino_x, destino_y, moviendo, movidos):
+    dx = np.sign(destino_x - x)
+    dy = np.sign(destino_y - y)
+    mueve_x = moviendo & (dx != 0)
+    mueve_y = moviendo & (dx == 0) & (dy != 0)
+    x += np.where(mueve_x, dx, 0).astype(x.dtype)
+    y += np.where(mueve_y, dy, 0).astype(y.dtype)
+    np.logical_or(mueve_x, mueve_y, out=movidos)
+
+
+_paso_manhattan_jit = _compilar(_paso_manhattan_bucle)
+
+
+def paso_manhattan(x: np.ndarray, y: np.ndarray, destino_x: np.ndarray, destino_y: np.ndarray,
+                   moviendo: np.ndarray) -> np.ndarray:
+    """
+    Avanza una celda (primero en x, luego en y) a los agentes en `moviendo`
+
+    Modifica x, y en su lugar y retorna la mascara de los que se movieron.
+    """
+    movidos = np.empty(len(x), dtype=np.bool_)
+    if USAR_NUMBA:
+        _paso_manhattan_jit(x, y, destino_x, destino_y, moviendo, movidos)
+    else:
+        _paso_manhattan_numpy(x, y, destino_x, destino_y, moviendo, movidos)
+    return movidos
+
+
+# ========================================================================
+# CONTEO DE VECINOS
+# ========================================================================
+
+def _vecinos_bucle(mascara, radio, conteo):
+    filas, columnas = mascara.shape
+    for x in range(filas):
+        for y in range(columnas):
+            total = 0
+            for i in range(max(0, x - radio), min(filas, x + radio + 1)):
+                for j in range(max(0, y - radio), min(columnas, y + radio + 1)):
+                    if mascara[i, j]:
+                        total += 1
+            conteo[x, y] = total
+
+
+def _vecinos_numpy(mascara, radio, conteo):
+    # Tabla de sumas acumuladas: cada ventana es una resta de cuatro esquinas.
+    # Repetir los bordes de la tabla equivale a recortar la ventana al huerto.
+    filas, columnas = mascara.shape
+    integral = np.zeros((filas + 1, columnas + 1), dtype=np.int32)
+    np.cumsum(np.cumsum(mascara, axis=0, dtype=np.int32), axis=1, out=integral[1:, 1:])
+    integral = np.pad(integral, radio, mode='edge')
+    v = 2 * radio + 1
+    np.subtract(integral[v:v + filas, v:v + columnas], integral[:filas, v:v + columnas], out=conteo)
+    conteo -= integral[v:v + filas, :columnas]
+    conteo += integral[:filas, :columnas]
+
+
+_vecinos_jit = _compilar(_vecinos_bucle)
+
+
+def contar_vecinos(mascara: np.ndarray, radio: int = 1) -> np.ndarray:
+    """
+    Celdas marcadas en el cuadrado de `radio` alrededor de cada celda (incluida ella)
+
+    Args:
+        mascara: Arreglo booleano filas x columnas (p. ej. nivel_plagas > umbral)
+    """
+    mascara = np.ascontiguousarray(mascara, dtype=np.bool_)
+    conteo = np.empty(mascara.shape, dtype=np.int32)
+    if USAR_NUMBA:
+        _vecinos_jit(mascara, int(radio), conteo)
+    else:
+        _vecinos_numpy(mascara, int(radio), conteo)
+    return conteo
+
+
+# ========================================================================
+# ACELERACION POR NUCLEO
+# ========================================================================
+
+def _casos(rng: np.random.Generator) -> Dict[str, Tuple[Callable, Callable, Callable]]:
+    """nombre -> (preparar, version numpy, version numba)"""
+    n, lado = 10000, 1000
+
+    def preparar_paso():
+        x = rng.integers(0, lado, n).astype(np.int32)
+        y = rng.integers(0, lado, n).astype(np.int32)
+        return (x, y, rng.integers(0, lado, n).astype(np.int32), rng.integers(0, lado, n).astype(np.int32),
+                rng.random(n) < 0.9, np.empty(n, dtype=np.bool_))
+
+    def preparar_vecinos():
+        return rng.random((lado, lado)) < 0.05, 2, np.empty((lado, lado), dtype=np.int32)
+
+    return {
+        'paso_manhattan': (preparar_paso, _paso_manhattan_numpy, _paso_manhattan_jit),
+        'contar_vecinos': (preparar_vecinos, _vecinos_numpy, _vecinos_jit),
+    }
+
+
+def _tiempo(funcion: Callable, args: tuple, repeticiones: int) -> float:
+    funcion(*args)  # calentamiento (y compilacion en Numba)
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion(*args)
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def medir_aceleracion(repeticiones: int = 20, semilla: int = 42) -> Dict[str, Dict[str, float]]:
+    """
+    Tiempo por llamada (us) de cada nucleo en NumPy y en Numba, y la aceleracion
+
+    Sin Numba solo se reporta la version NumPy (aceleracion = None).
+    """
+    resultados = {}
+    for nombre, (preparar, con_numpy, con_numba) in _casos(np.random.default_rng(semilla)).items():
+        fila = {'numpy_us': _tiempo(con_numpy, preparar(), repeticiones) * 1e6,
+                'numba_us': None, 'aceleracion': None}
+        if NUMBA_DISPONIBLE:
+            fila['numba_us'] = _tiempo(con_numba, preparar(), repeticiones) * 1e6
+            fila['aceleracion'] = fila['numpy_us'] / fila['numba_us']
+        resultados[nombre] = fila
+    return resultados
+
+
+if __name__ == "__main__":
+    print(f"[Nucleos] Numba {'disponible' if NUMBA_DISPONIBLE else 'NO instalado (solo NumPy)'}")
+    for nombre, fila in medir_aceleracion().items():
+        linea = f"[Nucleos] {nombre:<20} numpy {fila['numpy_us']:>10.1f}us"
+        if fila['aceleracion'] is not None:
+            linea += f"  numba {fila['numba_us']:>10.1f}us  x{fila['aceleracion']:.1f}"
+        print(linea)
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+PERFILADOR - TEMPORIZADORES POR FASE Y PERFILES DE EJECUCION
+============================================================
+
+Responsabilidades:
+1. Medir fases con nombre (movimiento, cosecha, evaluacion del manager,
+   reglas del capataz, callbacks de UI, render, print) con bajo overhead
+2. Activar cProfile o un perfilador por muestreo para toda una corrida
+3. Exportar una tabla resumen por fase
+4. Exportar un trace compatible con Chrome (chrome://tracing, Perfetto)
+   y pilas plegadas para flamegraph.pl / speedscope
+
+Desactivado (por defecto), cada fase cuesta una comprobacion de bandera.
+
+USO:
+    import perfilador
+    perfilador.activar(trace=True, medir_print=True)
+    perfilador.iniciar_perfil('muestreo')      # o 'cprofile'
+    ... simulacion ...
+    perfilador.detener_perfil('perfil.folded')
+    print(perfilador.tabla_resumen())
+    perfilador.exportar_chrome_trace('trace.json')
+
+    # Tambien se activa con la variable de entorno SIM_PERFIL=1
+"""
+
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+_activo = os.environ.get('SIM_PERFIL') == '1'
+_trace_activo = False
+_lock = threading.Lock()
+_reloj = time.perf_counter_ns
+_t0 = _reloj()
+
+
+@dataclass
+class EstadisticaFase:
+    """Acumulado de una fase"""
+    nombre: str
+    llamadas: int = 0
+    total_ns: int = 0
+    propio_ns: int = 0  # Tiempo total menos fases anidadas
+    minimo_ns: int = 0
+    maximo_ns: int = 0
+
+    def registrar(self, duracion: int, propio: int):
+        if self.llamadas == 0 or duracion < self.minimo_ns:
+            self.minimo_ns = duracion
+        if duracion > self.maximo_ns:
+            self.maximo_ns = duracion
+        self.llamadas += 1
+        self.total_ns += duracion
+        self.propio_ns += propio
+
+
+_fases: Dict[str, EstadisticaFase] = {}
+_eventos_trace: deque = deque(maxlen=500_000)
+_local = threading.local()
+
+
+# ========================================================================
+# ACTIVACION
+# ========================================================================
+
+def activar(trace: bool = False, medir_print: bool = False):
+    """
+    Activa los temporizadores de fase
+
+    Args:
+        trace: Guarda cada ocurrencia para exportar un Chrome trace
+        medir_print: Mide el tiempo gastado en sys.stdout (fase 'salida.print')
+    """
+    global _activo, _trace_activo
+    _activo = True
+    _trace_activo = trace
+    if medir_print and not isinstance(sys.stdout, _SalidaMedida):
+        sys.stdout = _SalidaMedida(sys.stdout)
+
+
+def desactivar():
+    """Desactiva los temporizadores (los datos acumulados se conservan)"""
+    global _activo, _trace_activo
+    _activo = False
+    _trace_activo = False
+    if isinstance(sys.stdout, _SalidaMedida):
+        sys.stdout = sys.stdout.original
+
+
+def activo() -> bool:
+    return _activo
+
+
+def reiniciar():
+    """Borra las estadisticas y el trace acumulados"""
+    global _t0
+    with _lock:
+        _fases.clear()
+        _eventos_trace.clear()
+    _t0 = _reloj()
+
+
+# ========================================================================
+# TEMPORIZADORES DE FASE
+# ========================================================================
+
+def _pila() -> List[int]:
+    """Pila por hilo con el tiempo de fases hijas de cada nivel abierto"""
+    pila = getattr(_local, 'pila', None)
+    if pila is None:
+        pila = _local.pila = []
+    return pila
+
+
+def _cerrar(nombre: str, inicio: int, pila: List[int]):
+    fin = _reloj()
+    duracion = fin - inicio
+    hijos = pila.pop()
+    if pila:
+        pila[-1] += duracion
+
+    with _lock:
+        estadistica = _fases.get(nombre)
+        if estadistica is None:
+            estadistica = _fases[nombre] = EstadisticaFase(nombre)
+        estadistica.registrar(duracion, duracion - hijos)
+        if _trace_activo:
+            _eventos_trace.append((nombre, inicio, duracion, threading.get_ident()))
+
+
+@contextmanager
+def fase(nombre: str):
+    """Mide un bloque: `with fase('manager.evaluar'): ...`"""
+    if not _activo:
+        yield
+        return
+    pila = _pila()
+    pila.append(0)
+    inicio = _reloj()
+    try:
+        yield
+    finally:
+        _cerrar(nombre, inicio, pila)
+
+
+def medir_fase(nombre: str) -> Callable:
+    """Decorador para medir cada llamada a una funcion o metodo"""
+    def decorador(func):
+        @functools.wraps(func)
+        def envoltura(*args, **kwargs):
+            if not _activo:
+                return func(*args, **kwargs)
+            pila = _pila()
+            pila.append(0)
+            inicio = _reloj()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _cerrar(nombre, inicio, pila)
+        return envoltura
+    return decorador
+
+
+class _SalidaMedida:
+    """Proxy de sys.stdout que atribuye el tiempo de escritura a 'salida.print'"""
+
+    def __init__(self, original):
+        self.original = original
+
+    @medir_fase("salida.print")
+    def write(self, texto):
+        return self.original.write(texto)
+
+    def flush(self):
+        return self.original.flush()
+
+    def __getattr__(self, nombre):
+        return getattr(self.original, nombre)
+
+
+# ========================================================================
+# EXPORTACION
+# ========================================================================
+
+def resumen() -> List[EstadisticaFase]:
+    """Estadisticas por fase ordenadas por tiempo total"""
+    with _lock:
+        return sorted((EstadisticaFase(**vars(e)) for e in _fases.values()),
+                      key=lambda e: e.total_ns, reverse=True)
+
+
+def tabla_resumen() -> str:
+    """Tabla legible por fase (tiempos en milisegundos)"""
+    filas = resumen()
+    total = sum(e.propio_ns for e in filas) or 1
+    encabezado = (f"{'FASE':<28} {'LLAMADAS':>9} {'TOTAL ms':>11} {'PROPIO ms':>11} "
+                  f"{'MEDIA ms':>9} {'MAX ms':>9} {'% PROPIO':>9}")
+    lineas = [encabezado, "-" * len(encabezado)]
+    for e in filas:
+        media = e.total_ns / e.llamadas if e.llamadas else 0
+        lineas.append(
+            f"{e.nombre:<28} {e.llamadas:>9} {e.total_ns / 1e6:>11.2f} {e.propio_ns / 1e6:>11.2f} "
+            f"{media / 1e6:>9.3f} {e.maximo_ns / 1e6:>9.3f} {100.0 * e.propio_ns / total:>8.1f}%"
+        )
+    return "\n".join(lineas)
+
+
+def exportar_chrome_trace(ruta: str):
+    """
+    Escribe el trace en formato Trace Event (chrome://tracing, Perfetto)
+
+    Requiere haber activado con trace=True.
+    """
+    with _lock:
+        eventos = list(_eventos_trace)
+    nombres_hilos = {h.ident: h.name for h in threading.enumerate()}
+    trace = [
+        {'name': nombre, 'cat': nombre.split('.')[0], 'ph': 'X',
+         'ts': (inicio - _t0) / 1000.0, 'dur': duracion / 1000.0,
+         'pid': os.getpid(), 'tid': tid}
+        for nombre, inicio, duracion, tid in eventos
+    ]
+    for tid in {e[3] for e in eventos}:
+        trace.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                      'args': {'name': nombres_hilos.get(tid, str(tid))}})
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace, 'displayTimeUnit': 'ms'}, f)
+    print(f"[PERFIL] Chrome trace: {ruta} ({len(eventos)} eventos)")
+
+
+# ========================================================================
+# PERFILES DE TODA LA CORRIDA
+# ========================================================================
+
+class PerfiladorMuestreo:
+    """
+    Perfilador por muestreo de todos los hilos (sys._current_frames)
+
+    Acumula pilas plegadas "hilo;modulo:funcion;..." con su numero de
+    muestras, el formato que consumen flamegraph.pl y speedscope.
+    """
+
+    def __init__(self, intervalo: float = 0.005):
+        self.intervalo = intervalo
+        self.pilas: Counter = Counter()
+        self.muestras = 0
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._bucle, name="perfilador-muestreo", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        self._hilo.join()
+
+    def _bucle(self):
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo):
+            nombres = {h.ident: h.name for h in threading.enumerate()}
+            for tid, frame in sys._current_frames().items():
+                if tid == propio:
+                    continue
+                pila = []
+                while frame is not None:
+                    codigo = frame.f_code
+                    pila.append(f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}")
+                    frame = frame.f_back
+                pila.append(nombres.get(tid, str(tid)))
+                self.pilas[";".join(reversed(pila))] += 1
+            self.muestras += 1
+
+    def exportar(self, ruta: str):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            for pila, cuenta in self.pilas.most_common():
+                f.write(f"{pila} {cuenta}\n")
+        print(f"[PERFIL] Pilas plegadas: {ruta} ({self.muestras} muestras)")
+
+
+class PerfiladorCProfile:
+    """cProfile en el hilo actual y en cada hilo creado mientras esta activo"""
+
+    def __init__(self):
+        self.perfiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def _arrancar_en_hilo(self, *_):
+        # Llamado una vez al inicio de cada hilo nuevo (threading.setprofile)
+        perfil = cProfile.Profile()
+        with self._lock:
+            self.perfiles.append(perfil)
+        perfil.enable()
+
+    def iniciar(self):
+        threading.setprofile(self._arrancar_en_hilo)
+        self._arrancar_en_hilo()
+
+    def detener(self):
+        threading.setprofile(None)
+        for perfil in self.perfiles:
+            perfil.disable()
+
+    def exportar(self, ruta: str):
+        estadisticas = None
+        for perfil in self.perfiles:
+            perfil.create_stats()
+            if estadisticas is None:
+                estadisticas = pstats.Stats(perfil)
+            else:
+                estadisticas.add(perfil)
+        if estadisticas is not None:
+            estadisticas.dump_stats(ruta)
+            print(f"[PERFIL] cProfile: {ruta} ({len(self.perfiles)} hilos) - ver con snakeviz o pstats")
+
+
+_perfil_corrida = None
+
+
+def iniciar_perfil(modo: str = 'muestreo', intervalo: float = 0.005):
+    """
+    Activa un perfilador para toda la corrida
+
+    Args:
+        modo: 'muestreo' (bajo overhead, todos los hilos) o 'cprofile' (exacto)
+        intervalo: Segundos entre muestras (solo modo 'muestreo')
+    """
+    global _perfil_corrida
+    if modo == 'cprofile':
+        _perfil_corrida = PerfiladorCProfile()
+    elif modo == 'muestreo':
+        _perfil_corrida = PerfiladorMuestreo(intervalo)
+    else:
+        raise ValueError(f"Modo de perfil desconocido: {modo}")
+    _perfil_corrida.iniciar()
+
+
+def detener_perfil(ruta: Optional[str] = None):
+    """Detiene el perfilador de la corrida y exporta su resultado si se da `ruta`"""
+    global _perfil_corrida
+    if _perfil_corrida is None:
+        return
+    _perfil_corrida.detener()
+    if ruta:
+        _perfil_corrida.exportar(ruta)
+    _perfil_corrida = None
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+EVALUACION DE RIESGO POR LOTES (VECTORIZADA)
+============================================
+
+Evalua miles de lecturas de sensores de una sola vez con NumPy en lugar de
+recorrer reglas y crear diccionarios por lectura.
+
+Las salidas que tambien calcula el Manager son identicas a
+AgenteCapataz._evaluar_riesgo (manager.py), con los umbrales por defecto:
+
+    tiene_gusano         = nivel_plagas > umbral_gusano (8.0)
+    nivel_riesgo         = CRITICO si tiene gusano, si no BAJO
+    listo_para_cosechar  = frutos > 0  y  maduracion > maduracion_cosecha (7.0)  y  sin gusano
+
+Ademas se clasifica la amenaza principal de cada lectura. El Manager no
+hace esta clasificacion (solo guarda "GUSANO" o "Ninguna") y no cambia el
+nivel de riesgo; sirve para decidir tratamientos en la flota:
+
+    1. GUSANO            nivel_plagas >  umbral_gusano
+    2. PLAGA             nivel_plagas >= nivel_plagas_critico
+    3. TEMPERATURA       temperatura < min  |  temperatura > max
+    4. HUMEDAD           humedad < min (sequia) | > max (exceso)
+    5. NUTRIENTES        nivel_nutrientes < nivel_nutrientes_bajo
+    Sin amenazas         SIN_AMENAZA
+
+    requiere_tratamiento = hay alguna amenaza
+    prioridad_cosecha    = 5 (sobre madura) / 4 (optima) / 3 (madura) / 0
+
+`evaluar_lectura` es la version escalar de referencia; `evaluar_lote`
+devuelve exactamente lo mismo para cada posicion de los arreglos.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Umbrales por defecto. El Manager solo usa umbral_gusano y maduracion_cosecha
+# (AgenteCapataz._evaluar_riesgo y recibir_lote); los demas clasifican la amenaza
+UMBRALES_RIESGO = {
+    'temperatura_min': 15.0,
+    'temperatura_max': 30.0,
+    'humedad_min': 40.0,
+    'humedad_max': 80.0,
+    'nivel_plagas_critico': 7.0,
+    'nivel_plagas_alto': 5.0,
+    'nivel_nutrientes_bajo': 4.0,
+    'umbral_gusano': 8.0,
+}
+
+UMBRALES_COSECHA = {
+    'maduracion_cosecha': 7.0,
+    'maduracion_optima': 8.5,
+    'maduracion_sobre': 9.5,
+}
+
+# Codigos de amenaza (indice en TIPOS_AMENAZA)
+SIN_AMENAZA = 0
+GUSANO = 1
+PLAGA = 2
+TEMPERATURA_BAJA = 3
+TEMPERATURA_ALTA = 4
+SEQUIA = 5
+EXCESO_AGUA = 6
+NUTRIENTES_BAJOS = 7
+
+TIPOS_AMENAZA = [
+    "Normal",
+    "GUSANO",
+    "Plaga",
+    "Temperatura baja",
+    "Temperatura alta",
+    "Sequia",
+    "Exceso de agua",
+    "Nutrientes bajos",
+]
+
+# Valores de NivelRiesgo (manager.py); MEDIO y ALTO no los asigna el Manager
+NIVEL_BAJO = 1
+NIVEL_MEDIO = 2
+NIVEL_ALTO = 3
+NIVEL_CRITICO = 4
+
+
+@dataclass
+class ResultadoRiesgo:
+    """Resultado de una lectura (version escalar)"""
+    nivel_riesgo: int
+    tipo_amenaza: int
+    tiene_gusano: bool
+    requiere_tratamiento: bool
+    listo_para_cosechar: bool
+    prioridad_cosecha: int
+
+
+@dataclass
+class ResultadoLote:
+    """Resultado de un lote: un arreglo por campo, alineados con la entrada"""
+    nivel_riesgo: np.ndarray          # int8, valores de NivelRiesgo
+    tipo_amenaza: np.ndarray          # int8, indice en TIPOS_AMENAZA
+    tiene_gusano: np.ndarray          # bool
+    requiere_tratamiento: np.ndarray  # bool
+    listo_para_cosechar: np.ndarray   # bool
+    prioridad_cosecha: np.ndarray     # int8
+
+    def __len__(self):
+        return len(self.nivel_riesgo)
+
+    def fila(self, i: int) -> ResultadoRiesgo:
+        """Resultado de la lectura i como ResultadoRiesgo"""
+        return ResultadoRiesgo(
+            nivel_riesgo=int(self.nivel_riesgo[i]),
+            tipo_amenaza=int(self.tipo_amenaza[i]),
+            tiene_gusano=bool(self.tiene_gusano[i]),
+            requiere_tratamiento=bool(self.requiere_tratamiento[i]),
+            listo_para_cosechar=bool(self.listo_para_cosechar[i]),
+            prioridad_cosecha=int(self.prioridad_cosecha[i]),
+        )
+
+    def nombres_amenaza(self) -> List[str]:
+        return [TIPOS_AMENAZA[t] for t in self.tipo_amenaza]
+
+
+def _umbrales(umbrales: Optional[Dict], umbrales_cosecha: Optional[Dict]) -> Tuple[Dict, Dict]:
+    u = dict(UMBRALES_RIESGO, **(umbrales or {}))
+    c = dict(UMBRALES_COSECHA, **(umbrales_cosecha or {}))
+    return u, c
+
+
+# ========================================================================
+# REFERENCIA ESCALAR
+# ========================================================================
+
+def evaluar_lectura(
+    temperatura: float,
+    humedad: float,
+    nivel_plagas: float,
+    nivel_nutrientes: float,
+    nivel_maduracion: float,
+    frutos_disponibles: int,
+    umbrales: Optional[Dict] = None,
+    umbrales_cosecha: Optional[Dict] = None
+) -> ResultadoRiesgo:
+    """Evalua una lectura con las reglas escalares"""
+    u, c = _umbrales(umbrales, umbrales_cosecha)
+
+    tiene_gusano = nivel_plagas > u['umbral_gusano']
+    nivel = NIVEL_CRITICO if tiene_gusano else NIVEL_BAJO
+    if tiene_gusano:
+        tipo = GUSANO
+    elif nivel_plagas >= u['nivel_plagas_critico']:
+        tipo = PLAGA
+    elif temperatura < u['temperatura_min']:
+        tipo = TEMPERATURA_BAJA
+    elif temperatura > u['temperatura_max']:
+        tipo = TEMPERATURA_ALTA
+    elif humedad < u['humedad_min']:
+        tipo = SEQUIA
+    elif humedad > u['humedad_max']:
+        tipo = EXCESO_AGUA
+    elif nivel_nutrientes < u['nivel_nutrientes_bajo']:
+        tipo = NUTRIENTES_BAJOS
+    else:
+        tipo = SIN_AMENAZA
+
+    listo = frutos_disponibles > 0 and nivel_maduracion > c['maduracion_cosecha'] and not tiene_gusano
+    if not listo:
+        prioridad = 0
+    elif nivel_maduracion >= c['maduracion_sobre']:
+        prioridad = 5
+    elif nivel_maduracion >= c['maduracion_optima']:
+        prioridad = 4
+    else:
+        prioridad = 3
+
+    return ResultadoRiesgo(
+        nivel_riesgo=nivel,
+        tipo_amenaza=tipo,
+        tiene_gusano=tiene_gusano,
+        requiere_tratamiento=tipo != SIN_AMENAZA,
+        listo_para_cosechar=listo,
+        prioridad_cosecha=prioridad,
+    )
+
+
+# ========================================================================
+# VERSION VECTORIZADA
+# ========================================================================
+
+def evaluar_lote(
+    temperatura: Sequence[float],
+    humedad: Sequence[float],
+    nivel_plagas: Sequence[float],
+    nivel_nutrientes: Sequence[float],
+    nivel_maduracion: Sequence[float],
+    frutos_disponibles: Sequence[int],
+    umbrales: Optional[Dict] = None,
+    umbrales_cosecha: Optional[Dict] = None
+) -> ResultadoLote:
+    """
+    Evalua un lote de lecturas en unas pocas pasadas vectorizadas
+
+    Todos los arreglos deben tener la misma forma (1D o la forma del grid).
+    """
+    u, c = _umbrales(umbrales, umbrales_cosecha)
+    t = np.asarray(temperatura, dtype=np.float64)
+    h = np.asarray(humedad, dtype=np.float64)
+    p = np.asarray(nivel_plagas, dtype=np.float64)
+    n = np.asarray(nivel_nutrientes, dtype=np.float64)
+    m = np.asarray(nivel_maduracion, dtype=np.float64)
+    f = np.asarray(frutos_disponibles)
+
+    gusano = p > u['umbral_gusano']
+
+    # np.select elige la primera condicion verdadera: mismo orden que la cadena if/elif
+    tipo = np.select(
+        [gusano,
+         p >= u['nivel_plagas_critico'],
+         t < u['temperatura_min'],
+         t > u['temperatura_max'],
+         h < u['humedad_min'],
+         h > u['humedad_max'],
+         n < u['nivel_nutrientes_bajo']],
+        [GUSANO, PLAGA, TEMPERATURA_BAJA, TEMPERATURA_ALTA, SEQUIA, EXCESO_AGUA, NUTRIENTES_BAJOS],
+        default=SIN_AMENAZA
+    ).astype(np.int8)
+
+    # Mismo nivel que el Manager: solo el gusano eleva el riesgo
+    nivel = np.where(gusano, NIVEL_CRITICO, NIVEL_BAJO).astype(np.int8)
+
+    listo = (f > 0) & (m > c['maduracion_cosecha']) & ~gusano
+    prioridad = np.where(
+        m >= c['maduracion_sobre'], 5,
+        np.where(m >= c['maduracion_optima'], 4, 3)
+    ).astype(np.int8)
+    prioridad[~listo] = 0
+
+    return ResultadoLote(
+        nivel_riesgo=nivel,
+        tipo_amenaza=tipo,
+        tiene_gusano=gusano,
+        requiere_tratamiento=tipo != SIN_AMENAZA,
+        listo_para_cosechar=listo,
+        prioridad_cosecha=prioridad,
+    )
+
+
+def arreglos_desde_lecturas(lecturas: Sequence) -> Dict[str, np.ndarray]:
+    """
+    Convierte una lista de DatosExploracion (o registros de una bitacora)
+    en los arreglos columna que espera evaluar_lote
+    """
+    n = len(lecturas)
+
+    def columna(campo, dtype):
+        return np.fromiter((getattr(d, campo) for d in lecturas), dtype=dtype, count=n)
+
+    return {
+        'x': columna('x', np.int32),
+        'y': columna('y', np.int32),
+        'temperatura': columna('temperatura', np.float64),
+        'humedad': columna('humedad', np.float64),
+        'nivel_plagas': columna('nivel_plagas', np.float64),
+        'nivel_nutrientes': columna('nivel_nutrientes', np.float64),
+        'nivel_maduracion': columna('nivel_maduracion', np.float64),
+        'frutos_disponibles': columna('frutos_disponibles', np.int32),
+    }
+
+
+def evaluar_lecturas(lecturas: Sequence, umbrales: Optional[Dict] = None,
+                     umbrales_cosecha: Optional[Dict] = None) -> ResultadoLote:
+    """Atajo: evalua una lista de DatosExploracion (p. ej. toda una ruta)"""
+    a = arreglos_desde_lecturas(lecturas)
+    return evaluar_lote(
+        a['temperatura'], a['humedad'], a['nivel_plagas'], a['nivel_nutrientes'],
+        a['nivel_maduracion'], a['frutos_disponibles'], umbrales, umbrales_cosecha
+    )
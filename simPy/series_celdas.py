@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+SERIES DE TIEMPO POR CELDA (BUFFERS CIRCULARES)
+===============================================
+
+Responsabilidades:
+1. Guardar las ultimas `capacidad` lecturas de cada celda y canal de sensor
+   (temperatura, humedad, plagas, nutrientes, maduracion), no solo la ultima
+   como mapa_estados / datos_crudos
+2. Memoria fija desde el inicio: arreglos NumPy preasignados
+   (canales x capacidad x celdas); una lectura nueva pisa la mas vieja
+3. Alta O(1) por lectura y alta vectorizada de lotes (motor lockstep)
+4. Consultas de ventana sobre TODO el huerto de una vez: ultimas k lecturas,
+   media y pendiente (tendencia por segundo) de las ultimas k
+
+Cada posicion del buffer es un vector contiguo de todo el huerto, asi que
+una consulta de ventana son `capacidad` operaciones sobre vectores completos.
+Los tiempos se guardan en segundos desde `origen` (float32). Memoria:
+celdas * capacidad * (canales + 1) * 4 bytes (10x10 con capacidad 8 = 19 KB;
+1000x1000 = 192 MB, conviene bajar la capacidad).
+"""
+
+import time
+from threading import Lock
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+CANALES = ('temperatura', 'humedad', 'nivel_plagas', 'nivel_nutrientes', 'nivel_maduracion')
+
+
+class SeriesCeldas:
+    """
+    Buffers circulares por celda y canal
+
+    Args:
+        filas, columnas: Dimensiones del huerto
+        capacidad: Lecturas que se conservan por celda
+        origen: Tiempo cero de las series (por defecto, ahora)
+    """
+
+    def __init__(self, filas: int, columnas: int, capacidad: int = 8, origen: Optional[float] = None):
+        self.filas = filas
+        self.columnas = columnas
+        self.capacidad = capacidad
+        self.origen = time.time() if origen is None else origen
+
+        n = filas * columnas
+        self._valores = np.full((len(CANALES), capacidad, n), np.nan, dtype=np.float32)
+        self._tiempos = np.zeros((capacidad, n), dtype=np.float32)
+        self._cabeza = np.zeros(n, dtype=np.int32)   # posicion de la proxima escritura
+        self._cuenta = np.zeros(n, dtype=np.int32)   # lecturas guardadas (<= capacidad)
+        self._lock = Lock()
+        self.lecturas = 0
+
+    @staticmethod
+    def canal(canal: Union[int, str]) -> int:
+        return CANALES.index(canal) if isinstance(canal, str) else int(canal)
+
+    def memoria_bytes(self) -> int:
+        return self._valores.nbytes + self._tiempos.nbytes + self._cabeza.nbytes + self._cuenta.nbytes
+
+    # ========================================================================
+    # ALTA DE LECTURAS
+    # ========================================================================
+
+    def registrar(self, datos, t: Optional[float] = None):
+        """Agrega una lectura (DatosExploracion) a la serie de su celda"""
+        i = datos.x * self.columnas + datos.y
+        t = (time.time() if t is None else t) - self.origen
+        with self._lock:
+            p = self._cabeza[i]
+            self._valores[:, p, i] = (datos.temperatura, datos.humedad, datos.nivel_plagas,
+                                   datos.nivel_nutrientes, datos.nivel_maduracion)
+            self._tiempos[p, i] = t
+            self._cabeza[i] = (p + 1) % self.capacidad
+            if self._cuenta[i] < self.capacidad:
+                self._cuenta[i] += 1
+            self.lecturas += 1
+
+    def registrar_lote(self, indices: np.ndarray, valores: np.ndarray, t=None):
+        """
+        Agrega un lote de lecturas en una pasada
+
+        Args:
+            indices: Indice lineal de la celda de cada lectura (x * columnas + y)
+            valores: Arreglo (lecturas x canales) en el orden de CANALES
+            t: Tiempo absoluto de todas las lecturas o uno por lectura
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        valores = np.asarray(valores, dtype=np.float32)
+        if not len(indices):
+            return
+        t = np.broadcast_to(np.asarray(time.time() if t is None else t, dtype=np.float64) - self.origen,
+                            indices.shape)
+
+        # Varias lecturas de una celda en el lote ocupan posiciones consecutivas
+        orden = np.argsort(indices, kind='stable')
+        celdas = indices[orden]
+        nueva = np.empty(len(celdas), dtype=np.bool_)
+        nueva[0] = True
+        np.not_equal(celdas[1:], celdas[:-1], out=nueva[1:])
+        inicio = np.flatnonzero(nueva)
+        conteo = np.diff(np.append(inicio, len(celdas)))
+        rango = np.arange(len(celdas)) - np.repeat(inicio, conteo)
+        # Si una celda trae mas lecturas que la capacidad, solo caben las ultimas
+        quedan = rango >= np.repeat(conteo, conteo) - self.capacidad
+        unicas = celdas[inicio]
+
+        with self._lock:
+            posiciones = (self._cabeza[celdas] + rango) % self.capacidad
+            self._valores[:, posiciones[quedan], celdas[quedan]] = valores[orden][quedan].T
+            self._tiempos[posiciones[quedan], celdas[quedan]] = t[orden][quedan]
+            self._cabeza[unicas] = (self._cabeza[unicas] + conteo) % self.capacidad
+            self._cuenta[unicas] = np.minimum(self._cuenta[unicas] + conteo, self.capacidad)
+            self.lecturas += len(indices)
+
+    # ========================================================================
+    # CONSULTAS
+    # ========================================================================
+
+    def _filas(self, celdas: Optional[Sequence[int]]):
+        return slice(None) if celdas is None else np.asarray(celdas, dtype=np.int64)
+
+    def _ventana(self, k: int, filas):
+        """
+        Por cada posicion del buffer: (posicion, mascara de las celdas en las
+        que esa posicion guarda una de sus ultimas k lecturas)
+        """
+        k = max(1, min(k, self.capacidad))
+        cabeza = self._cabeza[filas]
+        limite = np.minimum(self._cuenta[filas], k)
+        for p in range(self.capacidad):
+            # Antiguedad de la posicion p en cada celda: 0 = la ultima escrita
+            yield p, (cabeza - 1 - p) % self.capacidad < limite
+
+    def _forma(self, arreglo: np.ndarray, celdas: Optional[Sequence[int]]) -> np.ndarray:
+        if celdas is None:
+            return arreglo.reshape((self.filas, self.columnas) + arreglo.shape[1:])
+        return arreglo
+
+    def ultimas(self, canal, k: int, celdas: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Ultimas k lecturas de un canal, de la mas vieja a la mas nueva
+
+        Returns:
+            (filas, columnas, k) para todo el huerto o (len(celdas), k);
+            NaN donde la celda aun no tiene k lecturas
+        """
+        filas = self._filas(celdas)
+        k = max(1, min(k, self.capacidad))
+        cabeza = self._cabeza[filas]
+        cuenta = self._cuenta[filas]
+        valores = self._valores[self.canal(canal)][:, filas]
+        resultado = np.full((len(cabeza), k), np.nan, dtype=np.float32)
+        for d in range(k):
+            posicion = (cabeza - k + d) % self.capacidad
+            tomada = np.take_along_axis(valores, posicion[None, :], axis=0)[0]
+            resultado[:, d] = np.where(d >= k - np.minimum(cuenta, k), tomada, np.nan)
+        return self._forma(resultado, celdas)
+
+    def media(self, canal, k: int, celdas: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Media de las ultimas k lecturas (NaN sin lecturas)"""
+        filas = self._filas(celdas)
+        valores = self._valores[self.canal(canal)]
+        suma = np.zeros(len(self._cabeza[filas]), dtype=np.float64)
+        n = np.zeros(len(suma), dtype=np.int32)
+        for p, validas in self._ventana(k, filas):
+            suma += np.where(validas, valores[p, filas], 0.0)
+            n += validas
+        with np.errstate(invalid='ignore', divide='ignore'):
+            media = np.where(n > 0, suma / n, np.nan)
+        return self._forma(media, celdas)
+
+    def pendiente(self, canal, k: int, celdas: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Tendencia de las ultimas k lecturas: pendiente de minimos cuadrados
+        contra el tiempo (unidades por segundo); NaN con menos de 2 lecturas
+        """
+        filas = self._filas(celdas)
+        valores = self._valores[self.canal(canal)]
+        ventana = [(p, validas, valores[p, filas].astype(np.float64), self._tiempos[p, filas].astype(np.float64))
+                   for p, validas in self._ventana(k, filas)]
+        ceros = np.zeros(len(self._cabeza[filas]), dtype=np.float64)
+        n, suma_t, suma_v = ceros.copy(), ceros.copy(), ceros.copy()
+        for _, validas, v, t in ventana:
+            n += validas
+            suma_t += np.where(validas, t, 0.0)
+            suma_v += np.where(validas, v, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            # Centrar tiempo y valor en cada celda evita perder precision
+            t_medio, v_medio = suma_t / n, suma_v / n
+            varianza, covarianza = ceros.copy(), ceros.copy()
+            for _, validas, v, t in ventana:
+                tc = np.where(validas, t - t_medio, 0.0)
+                varianza += tc * tc
+                covarianza += np.where(validas, tc * (v - v_medio), 0.0)
+            pendiente = np.where((n >= 2) & (varianza > 0), covarianza / varianza, np.nan)
+        return self._forma(pendiente, celdas)
+
+    def serie(self, celda: Tuple[int, int], canal) -> Tuple[np.ndarray, np.ndarray]:
+        """(tiempos absolutos, valores) de una celda, de la lectura mas vieja a la mas nueva"""
+        i = celda[0] * self.columnas + celda[1]
+        n = int(self._cuenta[i])
+        posiciones = (self._cabeza[i] - n + np.arange(n)) % self.capacidad
+        return (self._tiempos[posiciones, i].astype(np.float64) + self.origen,
+                self._valores[self.canal(canal), posiciones, i].copy())
+
+    def lecturas_por_celda(self) -> np.ndarray:
+        """Lecturas guardadas de cada celda (filas x columnas)"""
+        return self._cuenta.reshape(self.filas, self.columnas).copy()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+TABLA DE ESTADO DE LA FLOTA
+===========================
+
+Responsabilidades:
+1. Guardar el estado visible de todos los agentes en arreglos NumPy
+   (una fila por agente): posicion, bateria, carga, estado de orden y actividad
+2. Permitir que cada agente escriba SOLO su propia fila
+3. Entregar instantaneas consistentes (copias tomadas bajo el lock) a la UI
+   y al capataz, sin reconstruir listas de objetos en cada evento
+
+La tabla crece por duplicacion, asi que registrar miles de agentes cuesta
+O(1) amortizado y una instantanea es una copia contigua por columna.
+"""
+
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Sequence
+
+import numpy as np
+
+
+@dataclass
+class FilaFlota:
+    """Vista de una fila (mismos campos que EstadoAgenteVisibilidad)"""
+    id: int
+    x: int
+    y: int
+    orden_actual: Any
+    bateria: float
+    cargando_frutos: int
+    activo: bool
+
+
+@dataclass
+class InstantaneaFlota:
+    """Copia consistente de la tabla en un instante"""
+    ids: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    bateria: np.ndarray
+    carga: np.ndarray
+    orden: np.ndarray          # Codigo en `estados_orden`
+    activo: np.ndarray
+    estados_orden: tuple
+    version: int
+
+    def __len__(self):
+        return len(self.ids)
+
+    def orden_de(self, i: int):
+        return self.estados_orden[self.orden[i]]
+
+    def __iter__(self) -> Iterator[FilaFlota]:
+        for i in range(len(self.ids)):
+            yield FilaFlota(
+                id=int(self.ids[i]),
+                x=int(self.x[i]), y=int(self.y[i]),
+                orden_actual=self.estados_orden[self.orden[i]],
+                bateria=float(self.bateria[i]),
+                cargando_frutos=int(self.carga[i]),
+                activo=bool(self.activo[i])
+            )
+
+
+class TablaFlota:
+    """
+    Estado de la flota en arreglos columna
+
+    Args:
+        estados_orden: Valores posibles del estado de orden (el primero es el inicial)
+        capacidad: Filas reservadas al inicio
+    """
+
+    COLUMNAS = {
+        'ids': np.int32,
+        'x': np.int32,
+        'y': np.int32,
+        'bateria': np.float64,
+        'carga': np.int32,
+        'orden': np.int8,
+        'activo': np.bool_,
+    }
+
+    def __init__(self, estados_orden: Sequence, capacidad: int = 16):
+        self.estados_orden = tuple(estados_orden)
+        self._codigos: Dict[Any, int] = {v: i for i, v in enumerate(self.estados_orden)}
+        self._columnas = {nombre: np.zeros(capacidad, dtype=t) for nombre, t in self.COLUMNAS.items()}
+        self._filas: Dict[int, int] = {}  # agente_id -> fila
+        self.n = 0
+        self.version = 0
+        self.lock = Lock()
+
+    # ========================================================================
+    # REGISTRO Y ESCRITURA
+    # ========================================================================
+
+    def registrar(self, agente_id: int, x: int = 0, y: int = 0, bateria: float = 100.0) -> int:
+        """Reserva la fila de un agente y la retorna"""
+        with self.lock:
+            if agente_id in self._filas:
+                return self._filas[agente_id]
+            if self.n == len(self._columnas['ids']):
+                for nombre, arreglo in self._columnas.items():
+                    nuevo = np.zeros(2 * len(arreglo), dtype=arreglo.dtype)
+                    nuevo[:self.n] = arreglo[:self.n]
+                    self._columnas[nombre] = nuevo
+            fila = self.n
+            c = self._columnas
+            c['ids'][fila] = agente_id
+            c['x'][fila], c['y'][fila] = x, y
+            c['bateria'][fila] = bateria
+            c['carga'][fila] = 0
+            c['orden'][fila] = 0
+            c['activo'][fila] = False
+            self._filas[agente_id] = fila
+            self.n += 1
+            self.version += 1
+            return fila
+
+    def fila(self, agente_id: int) -> int:
+        return self._filas[agente_id]
+
+    def codigo_orden(self, estado) -> int:
+        return self._codigos[estado]
+
+    def escribir(self, fila: int, posicion=None, bateria: float = None, carga: int = None,
+                 orden=None, activo: bool = None):
+        """Actualiza la fila de un agente (solo los campos dados)"""
+        with self.lock:
+            c = self._columnas
+            if posicion is not None:
+                c['x'][fila], c['y'][fila] = posicion
+            if bateria is not None:
+                c['bateria'][fila] = bateria
+            if carga is not None:
+                c['carga'][fila] = carga
+            if orden is not None:
+                c['orden'][fila] = self._codigos[orden]
+            if activo is not None:
+                c['activo'][fila] = activo
+            self.version += 1
+
+    # ========================================================================
+    # LECTURA
+    # ========================================================================
+
+    def instantanea(self) -> InstantaneaFlota:
+        """Copia consistente de todas las filas"""
+        with self.lock:
+            n = self.n
+            copia = {nombre: arreglo[:n].copy() for nombre, arreglo in self._columnas.items()}
+            version = self.version
+        return InstantaneaFlota(estados_orden=self.estados_orden, version=version, **copia)
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self) -> Iterator[FilaFlota]:
+        """Itera una instantanea (compatible con listas de EstadoAgenteVisibilidad)"""
+        return iter(self.instantanea())
+
+    def posiciones(self) -> List[tuple]:
+        """(agente_id, x, y) de cada agente"""
+        s = self.instantanea()
+        return list(zip(s.ids.tolist(), s.x.tolist(), s.y.tolist()))
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+TELEMETRIA POR LOTES DEL AGENTE FISICO
+======================================
+
+Responsabilidades:
+1. Acumular las lecturas (DatosExploracion) y el ultimo estado del agente
+2. Enviarlos juntos al Manager cuando se junta `tamano_maximo` lecturas o
+   la mas vieja supera `latencia_maxima` segundos
+3. Enviar de inmediato, sin esperar al lote, las lecturas con gusano y los
+   cambios de estado del agente (parado / abandonado)
+
+El envio es un solo callback por lote: enviar(lecturas, estado, urgente).
+"""
+
+import time
+from threading import Lock
+from typing import Callable, Dict, List, Optional
+
+
+UMBRAL_GUSANO = 8.0  # nivel_plagas por encima del cual la lectura no espera
+
+
+def es_lectura_gusano(datos) -> bool:
+    return datos.nivel_plagas > UMBRAL_GUSANO
+
+
+class LoteTelemetria:
+    """
+    Buffer de telemetria de un agente
+
+    Args:
+        enviar: Callback del Manager enviar(lecturas, estado, urgente)
+        tamano_maximo: Lecturas por lote
+        latencia_maxima: Segundos que puede esperar la lectura mas vieja
+        urgente: Predicado de lecturas que no esperan (por defecto, gusano)
+    """
+
+    def __init__(
+        self,
+        enviar: Callable,
+        tamano_maximo: int = 16,
+        latencia_maxima: float = 0.25,
+        urgente: Callable = es_lectura_gusano,
+        reloj: Callable[[], float] = time.monotonic
+    ):
+        self.enviar = enviar
+        self.tamano_maximo = max(1, tamano_maximo)
+        self.latencia_maxima = latencia_maxima
+        self.urgente = urgente
+        self.reloj = reloj
+
+        self._lecturas: List = []
+        self._estado: Optional[Dict] = None
+        self._ultimo_estado_enviado: Optional[str] = None
+        self._desde: Optional[float] = None
+        self._lock = Lock()
+
+        # Estadisticas
+        self.lotes_enviados = 0
+        self.lecturas_enviadas = 0
+        self.envios_urgentes = 0
+
+    def agregar_lectura(self, datos):
+        """Agrega una lectura; la envia de inmediato si es urgente"""
+        if self.urgente is not None and self.urgente(datos):
+            with self._lock:
+                lecturas, estado = self._sacar()
+                lecturas.append(datos)
+            self._enviar(lecturas, estado, urgente=True)
+            return
+
+        with self._lock:
+            if self._desde is None:
+                self._desde = self.reloj()
+            self._lecturas.append(datos)
+            lleno = len(self._lecturas) >= self.tamano_maximo
+        if lleno:
+            self.vaciar()
+        else:
+            self.revisar()
+
+    def actualizar_estado(self, **estado):
+        """
+        Guarda el ultimo estado del agente (los anteriores se reemplazan)
+
+        Un cambio de estado ('recolectando' -> 'parado', etc.) se envia en el acto.
+        """
+        with self._lock:
+            self._estado = estado
+            if self._desde is None:
+                self._desde = self.reloj()
+            cambio = estado.get('estado') != self._ultimo_estado_enviado
+        if cambio:
+            self.vaciar(urgente=True)
+        else:
+            self.revisar()
+
+    def revisar(self):
+        """Envia el lote si la lectura mas vieja ya agoto la latencia permitida"""
+        desde = self._desde
+        if desde is not None and self.reloj() - desde >= self.latencia_maxima:
+            self.vaciar()
+
+    def vaciar(self, urgente: bool = False):
+        """Envia lo pendiente (si hay algo)"""
+        with self._lock:
+            lecturas, estado = self._sacar()
+        if lecturas or estado:
+            self._enviar(lecturas, estado, urgente)
+
+    def _sacar(self):
+        lecturas, estado = self._lecturas, self._estado
+        self._lecturas, self._estado, self._desde = [], None, None
+        if estado is not None:
+            self._ultimo_estado_enviado = estado.get('estado')
+        return lecturas, estado
+
+    def _enviar(self, lecturas: List, estado: Optional[Dict], urgente: bool):
+        self.lotes_enviados += 1
+        self.lecturas_enviadas += len(lecturas)
+        if urgente:
+            self.envios_urgentes += 1
+        self.enviar(lecturas, estado, urgente)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de los flujos aleatorios por agente (aleatorio.py)"""
+
+import numpy as np
+
+from aleatorio import CAMPO_SINTETICO, MODELO_PLAGAS, FlujosAleatorios
+
+
+def test_cada_agente_depende_solo_de_la_semilla_y_su_id():
+    a = FlujosAleatorios(7)
+    b = FlujosAleatorios(7)
+    # Orden de creacion y de consumo distinto, mismos numeros por agente
+    serie_a = [a.agente(1).random() for _ in range(5)]
+    a.agente(2).random()
+    b.agente(3).random()
+    b.agente(2).random()
+    serie_b = [b.agente(1).random() for _ in range(5)]
+    assert serie_a == serie_b
+    assert a.agente(1) is a.agente(1)
+    assert FlujosAleatorios(8).agente(1).random() != FlujosAleatorios(7).agente(1).random()
+
+
+def test_flujos_de_campo_son_reproducibles_e_independientes():
+    flujos = FlujosAleatorios(3)
+    campo = flujos.campo(CAMPO_SINTETICO).random(4)
+    assert np.array_equal(campo, FlujosAleatorios(3).campo(CAMPO_SINTETICO).random(4))
+    assert not np.array_equal(campo, flujos.campo(MODELO_PLAGAS).random(4))
+
+
+def test_restaurar_vuelve_los_generadores_entregados():
+    flujos = FlujosAleatorios(11)
+    rng = flujos.agente(4)
+    rng.random()
+    guardado = flujos.estado()
+    esperado = [rng.random() for _ in range(3)]
+    flujos.restaurar(guardado)
+    assert [rng.random() for _ in range(3)] == esperado
+    assert isinstance(FlujosAleatorios(None).semilla, int)
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la suite de benchmarks (benchmark.py)"""
+
+import benchmark
+from benchmark import Benchmark, Omitido, ejecutar_benchmark, ejecutar_suite, medir
+
+
+def test_medir_cuenta_las_operaciones_que_retorna_op():
+    resultado = medir(lambda: 4, repeticiones=10, calentamiento=0)
+    assert resultado['operaciones'] == 40
+    assert resultado['p50_us'] <= resultado['p99_us']
+
+
+def test_omitido_y_error_no_abortan_la_suite():
+    def omitir(rng, p):
+        raise Omitido("falta algo")
+
+    def fallar(rng, p):
+        return lambda: 1 / 0
+
+    omitido = ejecutar_benchmark(Benchmark("x.omitido", "micro", omitir), 5, 1)
+    error = ejecutar_benchmark(Benchmark("x.error", "micro", fallar), 5, 1)
+    assert (omitido.estado, omitido.motivo) == ("omitido", "falta algo")
+    assert error.estado == "error" and "ZeroDivisionError" in error.motivo
+
+
+def test_micro_benchmarks_del_manager_corren_sobre_el_manager_real():
+    documento = ejecutar_suite(['micro'], repeticiones=20, filtro='manager.', rapido=True)
+    nombres = {r['nombre']: r for r in documento['resultados']}
+    assert {'manager.ingesta', 'manager._evaluar_riesgo', 'manager._calcular_metricas'} <= set(nombres)
+    assert all(r['estado'] == 'ok' and r['operaciones'] > 0 for r in nombres.values())
+    assert documento['metadatos']['semilla'] == 42
+
+
+def test_jornada_pequena_procesa_todas_las_celdas():
+    b = next(b for b in benchmark.BENCHMARKS if b.nombre == "jornada.10x10.3ag")
+    r = ejecutar_benchmark(b, 1, 7, rapido=True)
+    assert r.estado == "ok"
+    assert r.operaciones == 100 * max(1, (b.repeticiones or 1) // 10)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la bitacora de repeticion (bitacora.py) y su conexion con el Capataz"""
+
+import os
+
+from bitacora import GrabadorBitacora, LectorBitacora, estado_vacio, aplicar_evento
+from manager import AgenteCapataz, DatosExploracion
+
+
+class Reloj:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _lectura(x, y, plagas=1.0, agente_id=1):
+    return DatosExploracion(x=x, y=y, temperatura=22.0, humedad=60.0, nivel_plagas=plagas,
+                            nivel_nutrientes=5.0, nivel_maduracion=8.0, frutos_disponibles=2,
+                            agente_id=agente_id)
+
+
+def test_callback_ui_del_capataz_graba_celdas_agentes_y_metricas(tmp_path):
+    ruta = str(tmp_path / "jornada.bitacora")
+    recibido = []
+    capataz = AgenteCapataz(grid_filas=4, grid_columnas=4, num_agentes=2)
+    semilla = capataz.sembrar(7)
+    grabador = GrabadorBitacora(ruta, metadatos={'semilla': semilla, 'grid': [4, 4]})
+    capataz.registrar_agente_ui(grabador.callback_ui(lambda *args: recibido.append(args)))
+    capataz.crear_agentes_fisicos()
+
+    capataz.recibir_datos(_lectura(0, 0))
+    capataz.recibir_datos(_lectura(1, 2, plagas=9.5))
+    grabador.cerrar()
+
+    # La UI recibe la llamada original despues de grabarla
+    assert len(recibido) == 2
+    lector = LectorBitacora(ruta)
+    lector.buscar(lector.duracion)
+    assert set(lector.estado['celdas']) == {"0,0", "1,2"}
+    assert lector.estado['celdas']["1,2"]['tiene_gusano'] is True
+    assert set(lector.estado['agentes']) == {"1", "2"}
+    assert lector.estado['metricas']['celdas_exploradas'] == 2
+    assert lector.metadatos == {'semilla': 7, 'grid': [4, 4]}
+    lector.cerrar()
+
+
+def test_buscar_equivale_a_reproducir_desde_el_inicio(tmp_path):
+    ruta = str(tmp_path / "b.bitacora")
+    reloj = Reloj()
+    grabador = GrabadorBitacora(ruta, intervalo_keyframe=5.0, max_eventos_segmento=7, reloj=reloj)
+    eventos = []
+    for i in range(60):
+        reloj.t = i * 0.5
+        celda = {'x': i % 3, 'y': i % 4, 'valor': i}
+        grabador.registrar_celda(celda)
+        eventos.append({'t': reloj.t, 'k': 'celda', 'id': f"{i % 3},{i % 4}", 'v': celda})
+    grabador.cerrar()
+
+    lector = LectorBitacora(ruta)
+    for t in (0.0, 3.2, 10.0, 17.75, 29.5):
+        esperado = estado_vacio()
+        for evento in eventos:
+            if evento['t'] <= t:
+                aplicar_evento(esperado, evento)
+        lector.buscar(t)
+        assert lector.estado == esperado
+    lector.cerrar()
+
+
+def test_indice_se_reconstruye_si_falta(tmp_path):
+    ruta = str(tmp_path / "c.bitacora")
+    reloj = Reloj()
+    grabador = GrabadorBitacora(ruta, intervalo_keyframe=1.0, reloj=reloj)
+    for i in range(10):
+        reloj.t = float(i)
+        grabador.registrar_celda({'x': i, 'y': 0})
+    grabador.cerrar()
+    completo = LectorBitacora(ruta)
+    os.remove(ruta + ".idx")
+    reconstruido = LectorBitacora(ruta)
+    assert reconstruido._keyframes == completo._keyframes
+    assert reconstruido.duracion == completo.duracion == 9.0
+    completo.cerrar()
+    reconstruido.cerrar()
+
+
+def test_visor_toma_el_grid_de_los_metadatos(tmp_path):
+    from visor_repeticion import VisorRepeticion
+
+    ruta = str(tmp_path / "d.bitacora")
+    grabador = GrabadorBitacora(ruta, metadatos={'grid': [6, 8]})
+    grabador.registrar_celda({'x': 0, 'y': 0})
+    grabador.cerrar()
+    visor = VisorRepeticion(ruta)
+    assert (visor.ui.rows, visor.ui.cols) == (6, 8)
+    visor.lector.cerrar()
+
+
+def test_con_el_manager_solo_serializa_las_celdas_sucias(tmp_path, monkeypatch):
+    import bitacora
+    ruta = str(tmp_path / "jornada.bitacora")
+    capataz = AgenteCapataz(grid_filas=6, grid_columnas=6, num_agentes=1)
+    capataz.recibir_datos(_lectura(5, 5))
+    grabador = GrabadorBitacora(ruta)
+    capataz.registrar_agente_ui(grabador.callback_ui(manager=capataz))
+    capataz.crear_agentes_fisicos()
+    for i in range(20):
+        capataz.recibir_datos(_lectura(i // 6, i % 6))
+
+    serializadas = []
+    original = bitacora._serializar
+    monkeypatch.setattr(bitacora, '_serializar', lambda v: serializadas.append(v) or original(v))
+    capataz.recibir_datos(_lectura(0, 0, plagas=9.5))
+    grabador.cerrar()
+
+    celdas = [v for v in serializadas if hasattr(v, 'tiene_gusano')]
+    assert [(c.x, c.y) for c in celdas] == [(0, 0)]
+    lector = LectorBitacora(ruta)
+    lector.buscar(lector.duracion)
+    assert len(lector.estado['celdas']) == 21 and lector.estado['celdas']["0,0"]['tiene_gusano'] is True
+    lector.cerrar()
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de los brotes de plaga (brotes.py) contra un relleno por inundacion"""
+
+import random
+
+from brotes import BrotesPlaga
+
+
+FILAS, COLUMNAS, UMBRAL = 9, 8, 5.0
+
+
+def _componentes(niveles):
+    """Componentes en 8-vecindad de las celdas con nivel >= UMBRAL (fuerza bruta)"""
+    pendientes = {c for c, nivel in niveles.items() if nivel >= UMBRAL}
+    componentes = []
+    while pendientes:
+        pila = [pendientes.pop()]
+        componente = set(pila)
+        while pila:
+            x, y = pila.pop()
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    vecina = (x + dx, y + dy)
+                    if vecina in pendientes:
+                        pendientes.discard(vecina)
+                        componente.add(vecina)
+                        pila.append(vecina)
+        componentes.append(frozenset(componente))
+    return componentes
+
+
+def test_brotes_coinciden_con_las_componentes_tras_cada_lectura():
+    rng = random.Random(5)
+    brotes = BrotesPlaga(FILAS, COLUMNAS, umbral=UMBRAL)
+    niveles = {(x, y): 0.0 for x in range(FILAS) for y in range(COLUMNAS)}
+    for paso in range(1500):
+        celda = (rng.randrange(FILAS), rng.randrange(COLUMNAS))
+        # Mas altas que bajas al principio, luego tratamientos
+        nivel = rng.uniform(0.0, 10.0) if paso < 700 else rng.uniform(0.0, 6.5)
+        esperado_id = brotes.actualizar(celda, nivel)
+        niveles[celda] = nivel
+        assert (esperado_id is None) == (nivel < UMBRAL)
+
+        componentes = _componentes(niveles)
+        assert len(brotes) == len(componentes)
+        obtenidas = {frozenset(brotes.celdas_de(b.id)) for b in brotes.brotes()}
+        assert obtenidas == set(componentes)
+        if paso % 50:
+            continue
+        for componente in componentes:
+            brote = brotes.brote_de(next(iter(componente)))
+            xs = [c[0] for c in componente]
+            ys = [c[1] for c in componente]
+            assert brote.celdas == len(componente)
+            assert brote.caja == (min(xs), min(ys), max(xs), max(ys))
+            assert brote.centroide == (sum(xs) / len(xs), sum(ys) / len(ys))
+            assert brote.nivel_maximo == max(niveles[c] for c in componente)
+            assert niveles[brote.celda_maxima] == brote.nivel_maximo
+        for celda, nivel in niveles.items():
+            assert brotes.infestada(celda) == (nivel >= UMBRAL)
+
+
+def test_ids_estables_al_unir_y_dividir():
+    brotes = BrotesPlaga(5, 7, umbral=UMBRAL)
+    grande = brotes.actualizar((2, 0), 6.0)
+    brotes.actualizar((2, 1), 6.0)
+    brotes.actualizar((2, 2), 6.0)
+    chico = brotes.actualizar((2, 4), 7.0)
+    assert chico != grande
+    # El puente une los dos brotes; el mayor conserva su id
+    assert brotes.actualizar((2, 3), 6.0) == grande
+    assert len(brotes) == 1 and brotes.uniones == 4
+    # Tratar el puente divide: el pedazo mayor se queda con el id
+    brotes.tratar((2, 2))
+    assert brotes.brote_de((2, 0)).id == grande
+    assert brotes.brote_de((2, 4)).id not in (grande, chico)
+    assert brotes.divisiones == 1
+    assert [b.celdas for b in brotes.brotes()] == [2, 2]
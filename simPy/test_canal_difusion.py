@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del canal de ordenes de flota (canal_difusion.py)"""
+
+import threading
+
+from canal_difusion import CanalDifusion
+
+
+def test_agente_al_dia_no_ve_nada_y_el_tardio_solo_la_vigente():
+    canal = CanalDifusion()
+    assert canal.leer(0) is None
+    canal.publicar("PARATE")
+    canal.publicar("CONTINUA")
+    assert canal.leer(2) is None
+    assert canal.leer(0) == (2, "CONTINUA")
+
+
+def test_confirmaciones_se_auditan_por_epoca():
+    canal = CanalDifusion()
+    canal.publicar("PARATE")
+    canal.publicar("CONTINUA")
+    for _ in range(3):
+        canal.confirmar(1)
+    canal.confirmar(2)
+    assert [r.confirmaciones for r in canal.registros] == [3, 1]
+    assert all(r.latencia_maxima >= 0.0 for r in canal.registros)
+    assert "Epoca 1: PARATE | confirmaciones 3" in canal.reporte()
+
+
+def test_restaurar_no_abre_epoca():
+    canal = CanalDifusion()
+    canal.restaurar("PARATE")
+    assert canal.epoca == 0 and canal.registros == []
+    assert canal.leer(0) is None and canal.orden == "PARATE"
+
+
+def test_esperar_cambio_despierta_con_la_publicacion():
+    canal = CanalDifusion()
+    assert not canal.esperar_cambio(0, espera=0.01)
+    vistos = []
+    hilo = threading.Thread(target=lambda: vistos.append(canal.esperar_cambio(0, espera=5.0)))
+    hilo.start()
+    canal.publicar("PARATE")
+    hilo.join()
+    assert vistos == [True]
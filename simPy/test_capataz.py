@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del capataz supervisor (capataz.py)"""
+
+from capataz import AgenteCapataz, TipoOrden
+from manager import AgenteCapataz as Manager, DatosExploracion, OrdenCapataz
+from tabla_flota import TablaFlota
+
+
+def _flota(filas):
+    """Tabla con los estados del Manager: (id, posicion, orden, activo) por agente"""
+    flota = TablaFlota(tuple(OrdenCapataz))
+    for agente_id, posicion, orden, activo in filas:
+        fila = flota.registrar(agente_id)
+        flota.escribir(fila, posicion=posicion, orden=orden, activo=activo)
+    return flota
+
+
+def test_agentes_cercanos_sobre_la_tabla_de_flota_del_manager():
+    flota = _flota([
+        (1, (3, 3), OrdenCapataz.CONTINUAR, True),   # cerca y recolectando
+        (2, (3, 4), OrdenCapataz.PARAR, True),       # cerca pero ya parado
+        (3, (4, 3), OrdenCapataz.CONTINUAR, False),  # cerca pero fuera de turno
+        (4, (9, 9), OrdenCapataz.CONTINUAR, True),   # lejos
+    ])
+    capataz = AgenteCapataz(num_agentes=4, flota=flota)
+    assert capataz.flota is flota
+
+    capataz._evaluar_agentes_cercanos((3, 3))
+
+    assert [(o.agente_destino, o.tipo_orden) for o in capataz.ordenes_emitidas] == [(1, TipoOrden.PARATE)]
+
+
+def test_caja_de_brote_mide_la_distancia_al_borde():
+    flota = _flota([
+        (1, (0, 0), OrdenCapataz.CONTINUAR, True),
+        (2, (7, 5), OrdenCapataz.CONTINUAR, True),
+    ])
+    capataz = AgenteCapataz(num_agentes=2, flota=flota)
+
+    capataz._evaluar_agentes_cercanos((4, 4), radio=1, caja=(3, 3, 6, 5))
+
+    assert [o.agente_destino for o in capataz.ordenes_emitidas] == [2]
+
+
+def test_el_manager_difunde_por_el_supervisor():
+    manager = Manager(grid_filas=4, grid_columnas=4, num_agentes=2)
+    manager.crear_agentes_fisicos()
+    assert manager.capataz.flota is manager.flota and manager.capataz.canal is manager.canal
+
+    orden = manager.difundir_orden(OrdenCapataz.ABANDONAR)
+
+    assert orden.tipo_orden == TipoOrden.ABANDONA and manager.capataz.ordenes_abandona == 1
+    agente = manager.agentes_fisicos[0]
+    assert agente._aplicar_difusion() is False
+    assert manager.flota.instantanea().orden_de(0) == OrdenCapataz.ABANDONAR
+
+
+def test_orden_manual_del_manager_llega_por_el_enrutador():
+    manager = Manager(grid_filas=4, grid_columnas=4, num_agentes=2)
+    manager.crear_agentes_fisicos()
+
+    manager.emitir_orden(2, OrdenCapataz.PARAR)
+
+    assert manager.capataz.enrutador.entregadas == 1 and manager.capataz.ordenes_parate == 1
+    assert not manager.controles_agentes[2]['evento'].is_set()
+    assert manager.controles_agentes[1]['evento'].is_set()
+    assert manager.flota.instantanea().orden_de(manager.flota.fila(2)) == OrdenCapataz.PARAR
+
+    manager.emitir_orden(2, OrdenCapataz.CONTINUAR)
+    assert manager.controles_agentes[2]['evento'].is_set()
+    assert manager.capataz.ultima_orden[2].tipo_orden == TipoOrden.CONTINUA
+
+
+def _lectura(x, y, plagas):
+    return DatosExploracion(x=x, y=y, temperatura=25.0, humedad=60.0, nivel_plagas=plagas,
+                            nivel_nutrientes=5.0, nivel_maduracion=5.0, frutos_disponibles=0, agente_id=1)
+
+
+def test_contaminacion_alta_del_manager_aparta_a_los_agentes_cercanos():
+    manager = Manager(grid_filas=6, grid_columnas=6, num_agentes=2)
+    manager.configurar_cuarentena('componente', 0)
+    manager.crear_agentes_fisicos()
+    assert manager.capataz.cuarentena is manager.cuarentena
+    manager.flota.escribir(manager.flota.fila(2), posicion=(5, 5))
+
+    manager.recibir_datos(_lectura(1, 1, 7.5))
+
+    assert [(o.agente_destino, o.tipo_orden) for o in manager.capataz.ordenes_emitidas] == [(1, TipoOrden.PARATE)]
+    assert not manager.controles_agentes[1]['evento'].is_set()
+    assert manager.controles_agentes[2]['evento'].is_set()
+
+
+def test_anomalia_de_plagas_del_detector_llega_al_supervisor():
+    manager = Manager(grid_filas=6, grid_columnas=6, num_agentes=1)
+    manager.crear_agentes_fisicos()
+    for _ in range(8):
+        manager.recibir_datos(_lectura(1, 1, 1.0))
+    manager.recibir_datos(_lectura(1, 1, 6.5))
+
+    assert manager.capataz.anomalias_reportadas >= 1 and manager.capataz.anomalias_atendidas >= 1
+    assert manager.capataz.ultima_orden[1].tipo_orden == TipoOrden.PARATE
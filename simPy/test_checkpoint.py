@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de los checkpoints incrementales (checkpoint.py)"""
+
+import threading
+
+from checkpoint import GestorCheckpoints, cargar_checkpoint, restaurar_checkpoint
+from capataz import TipoOrden
+from manager import AgenteCapataz, DatosExploracion, OrdenCapataz
+
+
+def _lectura(x, y, plagas=1.0):
+    return DatosExploracion(x=x, y=y, temperatura=22.0, humedad=60.0, nivel_plagas=plagas,
+                            nivel_nutrientes=5.0, nivel_maduracion=8.0, frutos_disponibles=2,
+                            agente_id=1)
+
+
+def _capataz(filas=6, columnas=6, agentes=2):
+    capataz = AgenteCapataz(grid_filas=filas, grid_columnas=columnas, num_agentes=agentes)
+    capataz.sembrar(3)
+    capataz.crear_agentes_fisicos()
+    capataz.distribuir_trabajo()
+    return capataz
+
+
+def test_delta_solo_lleva_las_celdas_cambiadas(tmp_path):
+    capataz = _capataz()
+    for x in range(6):
+        capataz.recibir_datos(_lectura(x, 0))
+    gestor = GestorCheckpoints(capataz, str(tmp_path / "c.ckpt"))
+    base = gestor.capturar()
+    assert base['tipo'] == 'base' and len(base['celdas']) == 6
+
+    capataz.recibir_datos(_lectura(0, 1))
+    capataz.recibir_datos(_lectura(0, 0))
+    delta = gestor.capturar()
+    assert delta['tipo'] == 'delta'
+    assert set(delta['celdas']) == {(0, 1), (0, 0)}
+    assert sorted(delta['exploradas']) == [(0, 0), (0, 1)]
+    # Las celdas asignadas no cambiaron: no se repiten en el delta
+    assert all('celdas_asignadas' not in a for a in delta['agentes'])
+
+    assert gestor.capturar()['celdas'] == {}
+
+
+def test_base_mas_deltas_reconstruye_el_estado(tmp_path):
+    ruta = str(tmp_path / "c.ckpt")
+    capataz = _capataz()
+    gestor = GestorCheckpoints(capataz, ruta, compactar_cada=3)
+    for i in range(36):
+        capataz.recibir_datos(_lectura(i // 6, i % 6, plagas=9.5 if i == 7 else 1.0))
+        if i % 5 == 4:
+            gestor.guardar()
+    gestor.detener()
+
+    estado = cargar_checkpoint(ruta)
+    assert estado['celdas'] == capataz.mapa_estados
+    assert set(estado['exploradas']) == set(capataz.celdas_exploradas)
+    assert estado['contadores']['contador_gusanos'] == 1
+
+
+def test_detener_toma_un_checkpoint_final(tmp_path):
+    ruta = str(tmp_path / "c.ckpt")
+    capataz = _capataz()
+    gestor = GestorCheckpoints(capataz, ruta)
+    gestor.guardar(esperar=True)
+    capataz.recibir_datos(_lectura(2, 3))
+    gestor.detener()
+    assert (2, 3) in cargar_checkpoint(ruta)['celdas']
+
+
+def test_la_captura_corre_en_el_hilo_de_ingesta(tmp_path):
+    capataz = _capataz()
+    capataz.activar_ingesta(64, 'bloquear')
+    gestor = GestorCheckpoints(capataz, str(tmp_path / "c.ckpt"))
+    hilos = []
+    capturar = gestor._capturar
+    gestor._capturar = lambda completo: hilos.append(threading.current_thread().name) or capturar(completo)
+    try:
+        capataz.entrada_datos(_lectura(1, 1))
+        registro = gestor.capturar()
+    finally:
+        capataz.detener_ingesta()
+    assert hilos == ["manager-ingesta"]
+    # Lo encolado antes de la captura ya esta aplicado
+    assert (1, 1) in registro['celdas']
+
+
+def test_restaurar_asigna_solo_lo_no_explorado(tmp_path):
+    ruta = str(tmp_path / "c.ckpt")
+    original = _capataz()
+    asignadas = {a.agente_id: list(a.celdas_asignadas) for a in original.agentes_fisicos}
+    for celda in asignadas[1][:5] + asignadas[2][:2]:
+        original.recibir_datos(_lectura(*celda))
+    gestor = GestorCheckpoints(original, ruta)
+    gestor.guardar()
+    original.recibir_datos(_lectura(*asignadas[2][2]))
+    gestor.detener()
+
+    nuevo = AgenteCapataz(grid_filas=6, grid_columnas=6, num_agentes=2)
+    nuevo.crear_agentes_fisicos()
+    restaurar_checkpoint(nuevo, ruta)
+    restantes = {a.agente_id: a.celdas_asignadas for a in nuevo.agentes_fisicos}
+    assert restantes[1] == asignadas[1][5:]
+    assert restantes[2] == asignadas[2][3:]
+    assert nuevo.mapa_estados == original.mapa_estados
+
+
+def test_restaurar_reconstruye_indice_analitica_y_flota(tmp_path):
+    ruta = str(tmp_path / "c.ckpt")
+    original = _capataz()
+    gestor = GestorCheckpoints(original, ruta, compactar_cada=50)
+    for i in range(12):
+        original.recibir_datos(_lectura(i // 6, i % 6, plagas=9.5 if i == 3 else 1.0))
+    gestor.guardar()
+    # Lo que sigue solo llega en deltas: lecturas repetidas y un tratamiento
+    for i in range(6, 24):
+        original.recibir_datos(_lectura(i // 6, i % 6, plagas=6.0 if i == 9 else 2.0))
+    original.reportar_tratamiento((0, 3))
+    original.agentes_fisicos[0].posicion_actual = (4, 4)
+    original.agentes_fisicos[0].bateria = 40.0
+    gestor.detener()
+
+    nuevo = AgenteCapataz(grid_filas=6, grid_columnas=6, num_agentes=2)
+    nuevo.crear_agentes_fisicos()
+    restaurar_checkpoint(nuevo, ruta)
+
+    antes, despues = original._calcular_metricas(), nuevo._calcular_metricas()
+    assert despues.frutos_totales_detectados == antes.frutos_totales_detectados == 2 * 24
+    assert despues.frutos_listos_cosecha == antes.frutos_listos_cosecha
+    for capa in ('frutos', 'maduros', 'exploradas', 'gusanos'):
+        assert (nuevo.indice.grilla(capa) == original.indice.grilla(capa)).all()
+    assert (nuevo.series.lecturas_por_celda() == original.series.lecturas_por_celda()).all()
+    assert (nuevo.detector.mapa_puntajes() == original.detector.mapa_puntajes()).all()
+    assert nuevo.multivariado.reporte() == original.multivariado.reporte()
+    assert nuevo.focos_plagas.campos_celda((1, 3)) == original.focos_plagas.campos_celda((1, 3))
+    assert nuevo.brotes.reporte() == original.brotes.reporte()
+    flota, fila = nuevo.flota.instantanea(), nuevo.flota.fila(1)
+    assert (flota.x[fila], flota.y[fila], flota.bateria[fila]) == (4, 4, 40.0)
+
+
+def test_delta_guarda_solo_las_celdas_cambiadas_del_modelo(tmp_path):
+    ruta = str(tmp_path / "c.ckpt")
+    capataz = _capataz()
+    gestor = GestorCheckpoints(capataz, ruta)
+    gestor.guardar()
+    capataz.modelo_plagas.tratar((2, 2), radio=0, eficacia=1.0)
+    capataz.modelo_plagas._niveles[1, 1] += 1
+    delta = gestor.capturar()
+    gestor._cola_escritura.put(delta)
+    gestor._cola_escritura.join()
+
+    indices, _ = delta['plagas']['cambios']['niveles']
+    assert 1 <= len(indices) <= 2 and 'niveles' not in delta['plagas']
+    assert (cargar_checkpoint(ruta)['plagas']['niveles'] == capataz.modelo_plagas.estado()['niveles']).all()
+
+
+def test_restaurar_devuelve_el_supervisor_y_sus_ordenes(tmp_path):
+    ruta = str(tmp_path / "c.ckpt")
+    original = _capataz()
+    gestor = GestorCheckpoints(original, ruta)
+    original.emitir_orden(2, OrdenCapataz.PARAR)
+    original.capataz.reportar_anomalia((1, 1), ('plagas',), 5.0)
+    gestor.detener()
+    capataz = original.capataz
+
+    nuevo = AgenteCapataz(grid_filas=6, grid_columnas=6, num_agentes=2)
+    nuevo.crear_agentes_fisicos()
+    restaurar_checkpoint(nuevo, ruta)
+
+    supervisor = nuevo.capataz
+    assert [(o.agente_destino, o.tipo_orden, o.secuencia) for o in supervisor.ordenes_emitidas] == \
+        [(o.agente_destino, o.tipo_orden, o.secuencia) for o in capataz.ordenes_emitidas]
+    assert supervisor.ultima_orden[2].tipo_orden == TipoOrden.PARATE
+    assert (supervisor.decisiones_totales, supervisor.anomalias_reportadas) == \
+        (capataz.decisiones_totales, capataz.anomalias_reportadas)
+    assert not nuevo.controles_agentes[2]['evento'].is_set()
+    assert nuevo.flota.instantanea().orden_de(nuevo.flota.fila(2)) == OrdenCapataz.PARAR
+
+    # Las ordenes nuevas siguen la numeracion y llegan por el enrutador
+    nuevo.emitir_orden(2, OrdenCapataz.CONTINUAR)
+    assert supervisor.ultima_orden[2].secuencia == capataz.decisiones_totales + 1
+    assert nuevo.controles_agentes[2]['evento'].is_set()
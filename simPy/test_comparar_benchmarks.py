@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la compuerta de regresion (comparar_benchmarks.py)"""
+
+import pytest
+
+from comparar_benchmarks import t_critico, comparar, fallos_compuerta, _T_95
+
+
+def _documento(muestras, omitidos=None):
+    return {
+        'benchmarks': {n: {'ops_por_segundo': list(v), 'p99_us': [1.0] * len(v)} for n, v in muestras.items()},
+        'omitidos': omitidos or {},
+    }
+
+
+@pytest.mark.parametrize("grados, esperado", [
+    (0.5, 12.706), (1.0, 12.706), (4.0, 2.776), (10.9, 2.228), (11.0, 2.228),
+    (14.99, 2.179), (29.0, 2.060), (500.0, 1.980),
+])
+def test_t_critico_redondea_los_grados_hacia_abajo(grados, esperado):
+    assert t_critico(grados) == esperado
+
+
+def test_t_critico_nunca_es_menor_que_el_de_la_fila_siguiente():
+    # Conservador: entre dos filas de la tabla se usa el t mayor (la de menos grados)
+    filas = sorted(_T_95)
+    for menor, mayor in zip(filas, filas[1:]):
+        medio = (menor + mayor) / 2
+        assert t_critico(medio) >= _T_95[mayor]
+
+
+def test_regresion_significativa_falla_y_el_ruido_no():
+    base = _documento({'a': [100, 101, 99, 100, 100], 'b': [100, 101, 99, 100, 100]})
+    actual = _documento({'a': [80, 81, 79, 80, 80], 'b': [99, 102, 98, 101, 100]})
+    filas = {f['nombre']: f for f in comparar(base, actual, 10.0, ['a', 'b'])}
+    assert filas['a']['estado'] == 'REGRESION'
+    assert filas['b']['estado'] == 'RUIDO'
+    assert [f['nombre'] for f in fallos_compuerta(filas.values())] == ['a']
+
+
+def test_vigilado_que_falta_en_la_corrida_actual_falla_la_compuerta():
+    base = _documento({'a': [100, 100, 100], 'b': [50, 50, 50]})
+    actual = _documento({'b': [50, 50, 50]}, omitidos={'a': "omitido: no se pudo importar manager"})
+    filas = comparar(base, actual, 10.0, ['a', 'b'])
+    fallos = fallos_compuerta(filas)
+    assert [(f['nombre'], f['estado']) for f in fallos] == [('a', 'OMITIDO')]
+    assert 'manager' in fallos[0]['motivo']
+
+
+def test_vigilado_ausente_de_ambas_corridas_o_de_la_base_falla():
+    base = _documento({})
+    actual = _documento({'nuevo': [10, 10, 10]})
+    fallos = {f['nombre']: f['estado'] for f in fallos_compuerta(comparar(base, actual, 10.0, ['nuevo', 'nunca']))}
+    assert fallos == {'nuevo': 'NUEVO', 'nunca': 'OMITIDO'}
+
+
+def test_no_vigilados_no_afectan_la_compuerta():
+    base = _documento({'x': [100, 100, 100]})
+    actual = _documento({})
+    assert fallos_compuerta(comparar(base, actual, 10.0, [])) == []
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de las zonas de cuarentena (cuarentena.py)"""
+
+import random
+from collections import deque
+
+import numpy as np
+
+from cuarentena import GestorCuarentena, ModoCuarentena
+
+
+def test_radio_abre_una_zona_por_celda_y_reabre_al_tratar():
+    gestor = GestorCuarentena(6, 6, ModoCuarentena.RADIO, radio=1)
+    gestor.reportar_gusano((0, 0))
+    gestor.reportar_gusano((1, 1))
+    assert len(gestor.zonas) == 2
+    assert gestor.mapa().sum() == 9
+    # (0, 0) y vecinas quedan cubiertas por la zona de (1, 1)
+    assert gestor.reportar_tratada((0, 0)) == []
+    assert gestor.prohibida((0, 0))
+    readmitidas = gestor.reportar_tratada((1, 1))
+    assert len(readmitidas) == 9 and not gestor.activa
+    assert gestor.mapa().sum() == 0
+
+
+def test_componente_fusiona_vecinas_y_cierra_con_la_ultima():
+    gestor = GestorCuarentena(6, 6, ModoCuarentena.COMPONENTE, radio=0)
+    gestor.reportar_gusano((2, 2))
+    gestor.reportar_gusano((4, 4))
+    zona = gestor.reportar_gusano((3, 3))
+    assert len(gestor.zonas) == 1
+    assert zona.infestadas == {(2, 2), (3, 3), (4, 4)}
+    assert gestor.reportar_tratada((2, 2)) == []
+    assert gestor.reportar_tratada((3, 3)) == []
+    assert sorted(gestor.reportar_tratada((4, 4))) == [(2, 2), (3, 3), (4, 4)]
+    assert len(gestor.cerradas) == 1
+
+
+def test_recorrer_difiere_y_cuenta_perdidas():
+    gestor = GestorCuarentena(3, 3, radio=0)
+    gestor.reportar_gusano((0, 1))
+    gestor.reportar_gusano((0, 2))
+    ruta = [(0, 0), (0, 1), (0, 2), (1, 0)]
+    recorrido = []
+    for celda in gestor.recorrer(ruta):
+        recorrido.append(celda)
+        if celda == (1, 0):
+            gestor.reportar_tratada((0, 1))
+    assert recorrido == [(0, 0), (1, 0), (0, 1)]
+    assert gestor.celdas_diferidas == 2 and gestor.celdas_perdidas == 1
+
+
+def test_distancia_rodea_la_zona():
+    gestor = GestorCuarentena(5, 5, radio=0)
+    assert gestor.distancia((0, 2), (4, 2)) == 4
+    for x in (1, 2, 3):
+        gestor.reportar_gusano((x, 2))
+    # Muro vertical en la columna 2: rodeo por la fila 0 o la 4
+    assert gestor.distancia((2, 1), (2, 3)) == 6
+    assert gestor.pasos_desvio == 4
+    # Sin paso posible se usa Manhattan
+    cerrado = GestorCuarentena(3, 3, radio=0)
+    for x in range(3):
+        cerrado.reportar_gusano((x, 1))
+    assert cerrado.distancia((0, 0), (0, 2)) == 2
+
+
+def _distancia_bfs(prohibidas, origen, destino):
+    """BFS sobre todo el huerto (referencia)"""
+    filas, columnas = prohibidas.shape
+    vistos = {origen}
+    frontera = deque([(origen, 0)])
+    while frontera:
+        (x, y), pasos = frontera.popleft()
+        for vecino in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if not (0 <= vecino[0] < filas and 0 <= vecino[1] < columnas):
+                continue
+            if vecino == destino:
+                return pasos + 1
+            if vecino in vistos or prohibidas[vecino]:
+                continue
+            vistos.add(vecino)
+            frontera.append((vecino, pasos + 1))
+    return abs(destino[0] - origen[0]) + abs(destino[1] - origen[1])
+
+
+def test_distancia_acotada_coincide_con_bfs_en_todo_el_huerto():
+    rng = random.Random(5)
+    for modo in ModoCuarentena:
+        gestor = GestorCuarentena(24, 24, modo, radio=1)
+        for _ in range(25):
+            gestor.reportar_gusano((rng.randrange(24), rng.randrange(24)))
+        prohibidas = np.array(gestor.mapa())
+        desvio = 0
+        for _ in range(300):
+            origen = (rng.randrange(24), rng.randrange(24))
+            destino = (rng.randrange(24), rng.randrange(24))
+            esperada = _distancia_bfs(prohibidas, origen, destino) if origen != destino else 0
+            assert gestor.distancia(origen, destino) == esperada, (modo, origen, destino)
+            desvio += esperada - (abs(destino[0] - origen[0]) + abs(destino[1] - origen[1]))
+        assert gestor.pasos_desvio == desvio
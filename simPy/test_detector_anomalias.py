@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del detector EWMA por celda (detector_anomalias.py)"""
+
+import math
+import random
+
+import numpy as np
+
+from detector_anomalias import DESVIACION_MINIMA, DetectorAnomalias
+from manager import DatosExploracion
+from series_celdas import CANALES
+
+
+def _datos(celda, valores):
+    return DatosExploracion(celda[0], celda[1], *valores, frutos_disponibles=0, agente_id=1)
+
+
+def _referencia(historia, valores, alfa=0.1, minimo=5):
+    """EWMA escalar de la formula del modulo; retorna z de la lectura y actualiza la historia"""
+    z = []
+    for c, x in enumerate(valores):
+        media, varianza = historia.get(c, (None, 0.0))
+        if media is None:
+            historia[c] = (x, 0.0)
+            z.append(0.0)
+            continue
+        delta = x - media
+        desviacion = max(math.sqrt(varianza), DESVIACION_MINIMA[CANALES[c]])
+        z.append(delta / desviacion if historia['n'] >= minimo else 0.0)
+        historia[c] = (media + alfa * delta, (1 - alfa) * (varianza + alfa * delta * delta))
+    historia['n'] += 1
+    return z
+
+
+def _lecturas(n, semilla):
+    rng = random.Random(semilla)
+    return [((rng.randrange(3), rng.randrange(3)),
+             [rng.gauss(20, 2), rng.gauss(60, 5), rng.gauss(3, 0.5), rng.gauss(5, 0.5), rng.gauss(6, 1)])
+            for _ in range(n)]
+
+
+def test_escalar_coincide_con_la_formula():
+    detector = DetectorAnomalias(3, 3, umbral_z=2.0)
+    historias = {}
+    for celda, valores in _lecturas(300, 1):
+        z = _referencia(historias.setdefault(celda, {'n': 0}), valores)
+        anomalia = detector.actualizar(_datos(celda, valores))
+        assert np.isclose(detector.puntaje(celda), max(abs(v) for v in z), rtol=1e-5)
+        esperados = tuple(c for c, v in zip(CANALES, z) if abs(v) >= 2.0)
+        assert detector.canales_anomalos(celda) == esperados
+        assert (anomalia is None) == (not esperados)
+
+
+def test_lote_con_celdas_repetidas_igual_que_una_por_una():
+    lecturas = _lecturas(400, 2)
+    escalar = DetectorAnomalias(3, 3, umbral_z=2.0)
+    esperado = [escalar.actualizar(_datos(celda, valores)) for celda, valores in lecturas]
+    lote = DetectorAnomalias(3, 3, umbral_z=2.0)
+    for inicio in range(0, 400, 37):
+        tramo = lecturas[inicio:inicio + 37]
+        obtenido = lote.actualizar_lecturas([_datos(c, v) for c, v in tramo])
+        for a, b in zip(obtenido, esperado[inicio:inicio + 37]):
+            assert (a is None) == (b is None)
+            if a is not None:
+                assert a.canales == b.canales and np.isclose(a.puntaje, b.puntaje)
+    assert lote.anomalias == escalar.anomalias and lote.lecturas == escalar.lecturas
+    assert np.allclose(lote.mapa_puntajes(), escalar.mapa_puntajes())
+
+
+def test_salto_de_plagas_se_marca_solo_con_historia():
+    detector = DetectorAnomalias(2, 2)
+    base = [22.0, 60.0, 2.0, 5.0, 6.0]
+    salto = [22.0, 60.0, 9.0, 5.0, 6.0]
+    assert detector.actualizar(_datos((0, 0), salto)) is None
+    for _ in range(5):
+        assert detector.actualizar(_datos((1, 1), base)) is None
+    anomalia = detector.actualizar(_datos((1, 1), salto))
+    assert anomalia is not None and anomalia.canales == ('nivel_plagas',)
+    assert anomalia.z['nivel_plagas'] == (9.0 - 2.0) / DESVIACION_MINIMA['nivel_plagas']
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del detector de Mahalanobis por zona (detector_multivariado.py)"""
+
+import numpy as np
+
+from detector_multivariado import DetectorMultivariado
+from manager import DatosExploracion
+
+
+def _datos(celda, valores):
+    return DatosExploracion(celda[0], celda[1], *map(float, valores), frutos_disponibles=0, agente_id=1)
+
+
+def _lecturas(n, semilla, filas=6, columnas=6):
+    """Temperatura y humedad correladas, como en un invernadero"""
+    rng = np.random.default_rng(semilla)
+    temperatura = rng.normal(22.0, 3.0, n)
+    valores = np.column_stack([
+        temperatura,
+        40.0 + 1.5 * temperatura + rng.normal(0.0, 1.0, n),
+        rng.normal(3.0, 1.0, n),
+        rng.normal(5.0, 1.0, n),
+        rng.normal(6.0, 1.5, n),
+    ])
+    celdas = list(zip(rng.integers(0, filas, n).tolist(), rng.integers(0, columnas, n).tolist()))
+    return celdas, valores
+
+
+def test_welford_y_distancia_coinciden_con_el_calculo_directo():
+    detector = DetectorMultivariado(6, 6, lado_zona=3, minimo_lecturas=10, recalcular=1, umbral=1e9)
+    celdas, valores = _lecturas(300, 1)
+    vistas = {}
+    for celda, fila in zip(celdas, valores):
+        zona = detector.zona(celda)
+        previas = np.array(vistas.get(zona, []))
+        detector.actualizar(_datos(celda, fila))
+        if len(previas) >= 10:
+            covarianza = np.cov(previas, rowvar=False) + detector._piso
+            delta = fila - previas.mean(axis=0)
+            esperado = np.sqrt(delta @ np.linalg.solve(covarianza, delta))
+            assert np.isclose(detector.puntaje(celda), esperado, rtol=1e-4)
+        else:
+            assert detector.puntaje(celda) == 0.0
+        vistas.setdefault(zona, []).append(fila)
+    for zona, filas in vistas.items():
+        media, covarianza = detector.estadisticas(zona)
+        assert np.allclose(media, np.mean(filas, axis=0))
+        if len(filas) >= 2:
+            assert np.allclose(covarianza, np.cov(np.array(filas), rowvar=False))
+
+
+def test_lote_igual_que_una_por_una():
+    celdas, valores = _lecturas(500, 2)
+    escalar = DetectorMultivariado(6, 6, lado_zona=3, umbral=3.0)
+    esperado = [escalar.actualizar(_datos(c, v)) for c, v in zip(celdas, valores)]
+    lote = DetectorMultivariado(6, 6, lado_zona=3, umbral=3.0)
+    obtenido = []
+    for inicio in range(0, 500, 45):
+        obtenido += lote.actualizar_lecturas([_datos(c, v) for c, v in
+                                              zip(celdas[inicio:inicio + 45], valores[inicio:inicio + 45])])
+    assert [a is None for a in obtenido] == [b is None for b in esperado]
+    for a, b in zip(obtenido, esperado):
+        if a is not None:
+            assert a.canales == b.canales and np.isclose(a.puntaje, b.puntaje)
+    assert np.allclose(lote.mapa_puntajes(), escalar.mapa_puntajes())
+    assert lote.anomalias == escalar.anomalias
+
+
+def test_combinacion_rara_se_marca_aunque_cada_canal_sea_normal():
+    detector = DetectorMultivariado(4, 4, lado_zona=4)
+    celdas, valores = _lecturas(200, 3, 4, 4)
+    for celda, fila in zip(celdas, valores):
+        detector.actualizar(_datos(celda, fila))
+    # Calido pero seco: cada valor por separado esta dentro de su rango habitual
+    anomalia = detector.actualizar(_datos((2, 2), [26.0, 67.0, 3.0, 5.0, 6.0]))
+    assert 26.0 < valores[:, 0].max() and valores[:, 1].min() < 67.0
+    assert anomalia is not None
+    assert set(anomalia.canales) <= {'temperatura', 'humedad'}
+    assert detector.mas_anomalas(1)[0][0] == (2, 2)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la entrega de ordenes (enrutador_ordenes.py y capataz._emitir_orden)"""
+
+import threading
+
+from capataz import AgenteCapataz, OrdenCapataz, TipoOrden
+from enrutador_ordenes import EnrutadorOrdenes
+
+
+def _orden(agente_id, secuencia, tipo=TipoOrden.PARATE):
+    return OrdenCapataz(agente_destino=agente_id, tipo_orden=tipo, razon="prueba",
+                        prioridad=3, secuencia=secuencia)
+
+
+def test_secuencias_fuera_de_orden_se_entregan_ambas():
+    enrutador = EnrutadorOrdenes()
+    recibidas = []
+    enrutador.registrar(1, recibidas.append)
+    assert enrutador.publicar(_orden(1, 12))
+    assert enrutador.publicar(_orden(1, 11))
+    assert [o.secuencia for o in recibidas] == [12, 11]
+    assert enrutador.duplicadas == 0
+
+
+def test_republicar_una_secuencia_no_la_entrega_dos_veces():
+    enrutador = EnrutadorOrdenes()
+    recibidas = []
+    enrutador.registrar(1, recibidas.append)
+    orden = _orden(1, 5)
+    assert enrutador.publicar(orden)
+    assert not enrutador.publicar(orden)
+    assert len(recibidas) == 1 and enrutador.duplicadas == 1
+    assert not enrutador.publicar(_orden(2, 6))
+    assert enrutador.sin_destino == 1
+
+
+def test_orden_emitida_durante_la_entrega_queda_detras():
+    enrutador = EnrutadorOrdenes()
+    recibidas = []
+
+    def buzon(orden):
+        recibidas.append(orden.secuencia)
+        if orden.secuencia == 1:
+            # Reentrada desde el buzon: no se entrega antes de terminar la actual
+            assert enrutador.publicar(_orden(1, 2))
+            assert recibidas == [1]
+
+    enrutador.registrar(1, buzon)
+    enrutador.publicar(_orden(1, 1))
+    assert recibidas == [1, 2]
+
+
+def test_emision_concurrente_llega_en_orden_de_secuencia():
+    capataz = AgenteCapataz(num_agentes=1)
+    recibidas = []
+    capataz.enrutador.registrar(1, lambda orden: recibidas.append(orden.secuencia))
+
+    def emitir():
+        for _ in range(200):
+            capataz._emitir_orden(1, TipoOrden.CONTINUA, "prueba")
+
+    hilos = [threading.Thread(target=emitir) for _ in range(4)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert recibidas == list(range(1, 801))
+    assert capataz.enrutador.duplicadas == 0
+
+
+def test_memoria_de_secuencias_acotada_por_la_ventana():
+    enrutador = EnrutadorOrdenes(ventana=8)
+    recibidas = []
+    enrutador.registrar(1, recibidas.append)
+    for secuencia in range(1, 1001):
+        assert enrutador.publicar(_orden(1, secuencia))
+    assert len(enrutador.secuencias_recientes[1]) <= 2 * 8 + 1
+    # Dentro de la ventana: la republicacion se detecta
+    assert not enrutador.publicar(_orden(1, 995))
+    # Mas vieja que la ventana: se descarta como re-publicacion
+    assert not enrutador.publicar(_orden(1, 10))
+    assert enrutador.duplicadas == 2 and len(recibidas) == 1000
+
+
+def test_secuencia_tardia_dentro_de_la_ventana_se_entrega():
+    enrutador = EnrutadorOrdenes(ventana=8)
+    recibidas = []
+    enrutador.registrar(1, recibidas.append)
+    for secuencia in (2, 4, 9):
+        assert enrutador.publicar(_orden(1, secuencia))
+    assert enrutador.publicar(_orden(1, 3))
+    assert not enrutador.publicar(_orden(1, 1))  # 9 - 8 = 1: fuera de la ventana
+    assert [o.secuencia for o in recibidas] == [2, 4, 9, 3]
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de los focos espaciales (focos_espaciales.py) contra el calculo directo"""
+
+import math
+
+import numpy as np
+
+from focos_espaciales import FocosEspaciales
+
+
+def _gi_fuerza_bruta(valores, presente, radio):
+    filas, columnas = valores.shape
+    n = int(presente.sum())
+    x = valores[presente]
+    media, s = x.mean(), math.sqrt((x * x).mean() - x.mean() ** 2)
+    gi = np.full(valores.shape, np.nan)
+    for i in range(filas):
+        for j in range(columnas):
+            if not presente[i, j]:
+                continue
+            ventana = (slice(max(0, i - radio), i + radio + 1), slice(max(0, j - radio), j + radio + 1))
+            w = int(presente[ventana].sum())
+            suma = valores[ventana][presente[ventana]].sum()
+            if w < n:
+                gi[i, j] = (suma - media * w) / (s * math.sqrt((n * w - w * w) / (n - 1)))
+    return gi
+
+
+def test_incremental_y_recalculo_igual_a_fuerza_bruta():
+    rng = np.random.default_rng(4)
+    filas, columnas = 9, 11
+    focos = FocosEspaciales(filas, columnas, radio=1)
+    valores = np.zeros((filas, columnas))
+    presente = np.zeros((filas, columnas), dtype=bool)
+    for _ in range(150):
+        x, y = int(rng.integers(filas)), int(rng.integers(columnas))
+        valor = float(rng.uniform(0, 10))
+        focos.actualizar((x, y), valor)
+        valores[x, y], presente[x, y] = valor, True
+
+    esperado = _gi_fuerza_bruta(valores, presente, 1)
+    assert np.allclose(focos.gi_estrella(), esperado, equal_nan=True)
+    focos.recalcular()
+    assert np.allclose(focos.gi_estrella(), esperado, equal_nan=True)
+    x, y = map(int, np.argwhere(presente)[0])
+    assert math.isclose(focos.gi_celda((x, y)), esperado[x, y])
+
+
+def test_lote_grande_igual_a_lecturas_sueltas():
+    rng = np.random.default_rng(6)
+    indices = rng.integers(0, 36, 80)
+    valores = rng.uniform(0, 10, 80)
+    lote, sueltas = FocosEspaciales(6, 6, radio=2), FocosEspaciales(6, 6, radio=2)
+    lote.actualizar_lote(indices, valores)
+    for i, v in zip(indices, valores):
+        sueltas.actualizar(divmod(int(i), 6), v)
+    assert np.allclose(lote.gi_estrella(), sueltas.gi_estrella(), equal_nan=True)
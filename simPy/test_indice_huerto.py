@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del indice de sumas por rectangulo (indice_huerto.py) contra sumas directas"""
+
+import random
+
+import numpy as np
+
+from indice_huerto import CAPAS, IndiceHuerto
+
+
+FILAS, COLUMNAS = 9, 13
+
+
+def _rectangulos(rng, n):
+    for _ in range(n):
+        x0, x1 = sorted(rng.randrange(-1, FILAS + 2) for _ in range(2))
+        y0, y1 = sorted(rng.randrange(-1, COLUMNAS + 2) for _ in range(2))
+        yield x0, x1, y0, y1
+
+
+def _comparar(indice, grillas, rng, n=40):
+    for x0, x1, y0, y1 in _rectangulos(rng, n):
+        esperado = {c: int(g[max(0, x0):max(0, x1), max(0, y0):max(0, y1)].sum()) for c, g in grillas.items()}
+        assert indice.sumas(x0, x1, y0, y1) == esperado
+    for capa, grilla in grillas.items():
+        assert indice.total(capa) == int(grilla.sum())
+        assert np.array_equal(indice.grilla(capa), grilla)
+
+
+def test_sumar_y_fijar_coinciden_con_la_grilla():
+    rng = random.Random(3)
+    indice = IndiceHuerto(FILAS, COLUMNAS)
+    grillas = {c: np.zeros((FILAS, COLUMNAS), dtype=np.int64) for c in CAPAS}
+    for paso in range(400):
+        celda = (rng.randrange(FILAS), rng.randrange(COLUMNAS))
+        capa = rng.choice(CAPAS)
+        if rng.random() < 0.5:
+            delta = rng.randint(-3, 5)
+            indice.sumar(celda, **{capa: delta})
+            grillas[capa][celda] += delta
+        else:
+            valor = rng.randint(0, 6)
+            indice.fijar(celda, **{capa: valor})
+            grillas[capa][celda] = valor
+        assert indice.valor(celda, capa) == grillas[capa][celda]
+        if paso % 20 == 0:
+            _comparar(indice, grillas, rng)
+    _comparar(indice, grillas, rng, 300)
+
+
+def test_construir_equivale_a_sumar_celda_por_celda():
+    rng = np.random.default_rng(8)
+    grillas = {'frutos': rng.integers(0, 6, (FILAS, COLUMNAS)), 'gusanos': rng.integers(0, 2, (FILAS, COLUMNAS))}
+    construido = IndiceHuerto(FILAS, COLUMNAS)
+    construido.construir(**grillas)
+    celda_a_celda = IndiceHuerto(FILAS, COLUMNAS)
+    for (x, y), frutos in np.ndenumerate(grillas['frutos']):
+        celda_a_celda.sumar((x, y), frutos=int(frutos), gusanos=int(grillas['gusanos'][x, y]))
+    assert np.array_equal(construido._arbol, celda_a_celda._arbol)
+    grillas['maduros'] = grillas['exploradas'] = np.zeros((FILAS, COLUMNAS), dtype=np.int64)
+    _comparar(construido, grillas, random.Random(1), 300)
+    # Despues de construir, las actualizaciones siguen siendo consistentes
+    construido.sumar((4, 5), frutos=3)
+    assert construido.suma_caja('frutos', (4, 5, 4, 5)) == grillas['frutos'][4, 5] + 3
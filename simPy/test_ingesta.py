@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la cola e hilo de ingesta (ingesta.py) y su uso desde el Capataz"""
+
+import threading
+
+from ingesta import ColaIngesta, HiloIngesta, PoliticaContrapresion
+from manager import AgenteCapataz
+
+
+def _nombres(cola):
+    return [args[0] for _, _, args, *_ in cola.tomar(100)]
+
+
+def test_descartar_antiguo_solo_descarta_telemetria():
+    cola = ColaIngesta(3, PoliticaContrapresion.DESCARTAR_ANTIGUO)
+    cola.encolar(print, "tratamiento")
+    cola.encolar(print, "lectura 1", descartable=True)
+    cola.encolar(print, "cosecha")
+    cola.encolar(print, "lectura 2", descartable=True)
+    cola.encolar(print, "captura")
+    assert cola.descartadas == 2
+    assert _nombres(cola) == ["tratamiento", "cosecha", "captura"]
+
+
+def test_descartar_antiguo_espera_si_todo_es_de_control():
+    cola = ColaIngesta(1, PoliticaContrapresion.DESCARTAR_ANTIGUO)
+    cola.encolar(print, "tratamiento")
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(cola.encolar(print, "lectura", descartable=True)))
+    hilo.start()
+    hilo.join(0.2)
+    assert hilo.is_alive() and cola.descartadas == 0
+    assert _nombres(cola) == ["tratamiento"]
+    hilo.join(1.0)
+    assert resultado == [True] and _nombres(cola) == ["lectura"]
+
+
+def test_urgente_adelanta_lo_pendiente_de_su_productor_en_orden():
+    cola = ColaIngesta(16)
+    barrera = threading.Barrier(2)
+
+    def agente_1():
+        cola.encolar(print, "a1 lote 1", descartable=True)
+        cola.encolar(print, "a1 lote 2", descartable=True)
+        barrera.wait()
+        barrera.wait()
+        cola.encolar(print, "a1 gusano", urgente=True)
+
+    hilo = threading.Thread(target=agente_1)
+    hilo.start()
+    barrera.wait()
+    cola.encolar(print, "a2 lote 1", descartable=True)
+    barrera.wait()
+    hilo.join()
+    # Los lotes viejos del agente 1 no quedan detras de su gusano
+    assert _nombres(cola) == ["a1 lote 1", "a1 lote 2", "a1 gusano", "a2 lote 1"]
+
+
+def test_urgente_nunca_se_descarta():
+    cola = ColaIngesta(1, PoliticaContrapresion.DESCARTAR_ANTIGUO)
+    cola.encolar(print, "lectura", descartable=True)
+    cola.encolar(print, "gusano", urgente=True)
+    cola.encolar(print, "otra lectura", descartable=True)
+    assert _nombres(cola) == ["gusano", "otra lectura"]
+
+
+def test_ejecutar_corre_en_el_hilo_de_ingesta_despues_de_lo_encolado():
+    hilo = HiloIngesta(8)
+    hilo.iniciar()
+    vistos = []
+    try:
+        hilo.encolar(vistos.append, 1)
+        hilo.encolar(vistos.append, 2)
+        nombre = hilo.ejecutar(lambda: (list(vistos), threading.current_thread().name))
+    finally:
+        hilo.detener()
+    assert nombre == ([1, 2], "manager-ingesta")
+
+
+def test_iniciar_jornada_activa_la_ingesta():
+    capataz = AgenteCapataz(grid_filas=3, grid_columnas=3, num_agentes=1)
+    capataz.sembrar(5)
+    capataz.crear_agentes_fisicos()
+    capataz.distribuir_trabajo()
+    capataz.agentes_fisicos[0].iniciar_trabajo = lambda: None
+    for hilo in capataz.iniciar_jornada():
+        hilo.join()
+    try:
+        assert capataz.ingesta is not None
+        assert capataz.ingesta.metricas()['politica'] == 'bloquear'
+    finally:
+        capataz.detener_ingesta()
+
+
+def test_coalescer_reemplaza_lecturas_dentro_de_los_lotes_pendientes():
+    cola = ColaIngesta(8, PoliticaContrapresion.COALESCER)
+    cola.encolar(print, ["a@1", "b@1"], None, claves=["a", "b"], descartable=True)
+    # La ultima de cada celda dentro del lote; 'a' y 'b' ya estaban pendientes
+    cola.encolar(print, ["c@2", "a@2", "c@3", "b@2"], None, claves=["c", "a", "c", "b"], descartable=True)
+    # Todo pendiente y sin estado: no se encola nada
+    cola.encolar(print, ["a@3"], None, claves=["a"], descartable=True)
+    # Con estado el lote se encola aunque sus lecturas se coalescan
+    cola.encolar(print, ["c@4"], {'estado': 'parado'}, claves=["c"], descartable=True)
+    assert len(cola) == 3 and cola.coalescidas == 5
+    lotes = [args for _, _, args, *_ in cola.tomar(100)]
+    assert lotes == [
+        (["a@3", "b@2"], None),
+        (["c@4"], None),
+        ([], {'estado': 'parado'}),
+    ]
+    # Lo ya tomado no se toca: una lectura nueva abre otro lote
+    cola.encolar(print, ["a@5"], None, claves=["a"], descartable=True)
+    assert [args for _, _, args, *_ in cola.tomar(100)] == [(["a@5"], None)]
+
+
+def test_urgente_usa_su_propia_cola_sin_recorrer_la_normal():
+    cola = ColaIngesta(10000)
+    for i in range(5000):
+        cola.encolar(print, f"otro {i}", descartable=True)
+    barrera = threading.Barrier(2)
+
+    def agente():
+        cola.encolar(print, "propio", descartable=True)
+        barrera.wait()
+        barrera.wait()
+        cola.encolar(print, "gusano", urgente=True)
+
+    hilo = threading.Thread(target=agente)
+    hilo.start()
+    barrera.wait()
+    cola.encolar(print, "otro final", descartable=True)
+    barrera.wait()
+    hilo.join()
+    assert len(cola._urgentes) == 2 and len(cola) == 5003
+    nombres = _nombres(cola)
+    assert nombres[:3] == ["propio", "gusano", "otro 0"]
+    # La copia marcada en la cola normal se salta
+    nombres += [args[0] for _, _, args, *_ in cola.tomar(10000)]
+    assert nombres.count("propio") == 1 and nombres[-1] == "otro final" and not len(cola)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del mapa de celdas (mapa_celdas.py) contra un set de tuplas"""
+
+import pickle
+import random
+
+import numpy as np
+
+from mapa_celdas import MapaCeldas
+
+
+FILAS, COLUMNAS = 7, 11
+
+
+def _celda(rng):
+    return rng.randrange(FILAS), rng.randrange(COLUMNAS)
+
+
+def _igual(mapa, conjunto):
+    assert len(mapa) == len(conjunto)
+    assert sorted(mapa) == sorted(conjunto)
+    assert mapa.cobertura() == len(conjunto) / (FILAS * COLUMNAS)
+
+
+def test_api_de_conjunto_coincide_con_set():
+    rng = random.Random(4)
+    mapa, conjunto = MapaCeldas(FILAS, COLUMNAS), set()
+    for _ in range(2000):
+        op = rng.random()
+        if op < 0.5:
+            c = _celda(rng)
+            mapa.add(c)
+            conjunto.add(c)
+        elif op < 0.7:
+            c = _celda(rng)
+            mapa.discard(c)
+            conjunto.discard(c)
+        elif op < 0.9:
+            lote = [_celda(rng) for _ in range(rng.randrange(6))]
+            mapa.update(lote)
+            conjunto.update(lote)
+        elif op < 0.99:
+            indices = np.array([rng.randrange(FILAS * COLUMNAS) for _ in range(5)])
+            nuevos = {divmod(int(i), COLUMNAS) for i in indices} - conjunto
+            assert mapa.agregar_indices(indices) == len(nuevos)
+            conjunto |= nuevos
+        else:
+            mapa.clear()
+            conjunto.clear()
+        c = _celda(rng)
+        assert (c in mapa) == (c in conjunto)
+        _igual(mapa, conjunto)
+    assert (-1, 0) not in mapa and (0, COLUMNAS) not in mapa
+
+
+def test_operaciones_en_bloque_y_regiones():
+    rng = random.Random(9)
+    for _ in range(50):
+        a = {_celda(rng) for _ in range(rng.randrange(40))}
+        b = {_celda(rng) for _ in range(rng.randrange(40))}
+        ma, mb = MapaCeldas(FILAS, COLUMNAS, a), MapaCeldas(FILAS, COLUMNAS, b)
+        _igual(ma | mb, a | b)
+        _igual(ma & mb, a & b)
+        _igual(ma - mb, a - b)
+
+        x0, x1 = sorted(rng.sample(range(FILAS + 1), 2))
+        y0, y1 = sorted(rng.sample(range(COLUMNAS + 1), 2))
+        region = [(x, y) for x in range(x0, x1) for y in range(y0, y1)]
+        assert ma.contar(x0, x1, y0, y1) == sum(c in a for c in region)
+        assert ma.sin_marcar(x0, x1, y0, y1) == [c for c in region if c not in a]
+        assert ma.filtrar_sin_marcar(region[::-1]) == [c for c in region[::-1] if c not in a]
+
+        ma |= mb
+        _igual(ma, a | b)
+        copia = ma.copia()
+        copia.clear()
+        _igual(ma, a | b)
+
+
+def test_empaquetado_y_pickle_conservan_las_marcas():
+    conjunto = {(0, 0), (3, 7), (FILAS - 1, COLUMNAS - 1)}
+    mapa = MapaCeldas(FILAS, COLUMNAS, conjunto)
+    assert len(mapa.empaquetar()) == (FILAS * COLUMNAS + 7) // 8
+    _igual(MapaCeldas.desempaquetar(FILAS, COLUMNAS, mapa.empaquetar()), conjunto)
+    restaurado = pickle.loads(pickle.dumps(mapa))
+    _igual(restaurado, conjunto)
+    restaurado.add((1, 1))
+    assert (1, 1) in restaurado and (1, 1) not in mapa
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del microclima del invernadero (modelo_clima.py)"""
+
+import sys
+import threading
+
+from modelo_clima import ModeloClima
+
+
+def test_la_hora_avanza_con_las_lecturas():
+    clima = ModeloClima(6, 6, lecturas_por_hora=4.0)
+    for _ in range(8):
+        clima.medir((2, 2))
+    assert clima.hora == clima.hora_inicio + 2.0
+    assert clima.pasos == int(2.0 / clima.dt)
+
+
+def test_misma_cuenta_de_lecturas_mismo_estado():
+    mapas = []
+    for _ in range(2):
+        clima = ModeloClima(6, 6, lecturas_por_hora=2.0)
+        for i in range(30):
+            clima.medir((i % 6, 0))
+        mapas.append(clima.mapas())
+    assert all((a == b).all() for a, b in zip(*mapas))
+
+
+def test_dia_precalculado_nunca_retrocede_con_hilos():
+    clima = ModeloClima(6, 6, lecturas_por_hora=10.0)
+    clima.precalcular_dia(muestras=8, dias_calentamiento=0)
+
+    def leer():
+        for _ in range(200):
+            clima.medir((0, 0))
+
+    hilos = [threading.Thread(target=leer) for _ in range(4)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    assert clima.hora == clima.hora_inicio + 800 / 10.0
+
+
+def test_lecturas_durante_un_paso_no_ven_estados_intermedios():
+    # Sin riego cada paso es una combinacion convexa de las vecinas y el
+    # exterior (mas el sol): nada puede quedar bajo el minimo exterior
+    clima = ModeloClima(8, 8, separacion_riego=0, lecturas_por_hora=None)
+    minimo_t = clima.t_media - clima.t_amplitud
+    minimo_h, maximo_h = clima.h_media - clima.h_amplitud, clima.h_media + clima.h_amplitud
+    fin = threading.Event()
+
+    def avanzar():
+        hora = clima.hora
+        while not fin.is_set():
+            hora += clima.dt
+            clima.avanzar_a(hora)
+
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)     # Cambios de hilo frecuentes: entre las operaciones de un paso
+    hilo = threading.Thread(target=avanzar)
+    hilo.start()
+    try:
+        lecturas = [clima.valores(27) for _ in range(20000)]
+    finally:
+        fin.set()
+        hilo.join()
+        sys.setswitchinterval(intervalo)
+    assert min(float(t) for t, _ in lecturas) >= minimo_t - 1e-3
+    assert all(minimo_h - 1e-3 <= float(h) <= maximo_h + 1e-3 for _, h in lecturas)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del modelo de propagacion de plagas (modelo_plagas.py)"""
+
+import random
+import sys
+import threading
+
+import numpy as np
+
+from aleatorio import FlujosAleatorios, MODELO_PLAGAS
+from modelo_plagas import ModeloPlagas
+
+
+def _modelo(semilla, **parametros):
+    return ModeloPlagas(12, 12, rng=FlujosAleatorios(semilla).campo(MODELO_PLAGAS),
+                        focos_iniciales=0.1, **parametros)
+
+
+def test_misma_semilla_mismas_lecturas():
+    lecturas = []
+    for _ in range(2):
+        modelo = _modelo(42, lecturas_por_paso=3)
+        rng = random.Random(1)
+        lecturas.append([modelo.medir((i % 12, (5 * i) % 12), rng) for i in range(300)])
+    assert lecturas[0] == lecturas[1]
+    assert not np.array_equal(_modelo(42).mapa(), _modelo(43).mapa())
+
+
+def test_un_paso_cada_lecturas_por_paso_aun_con_hilos():
+    modelo = _modelo(7, lecturas_por_paso=4)
+    referencia = _modelo(7, lecturas_por_paso=None)
+
+    def leer():
+        for _ in range(250):
+            modelo.medir((0, 0))
+
+    hilos = [threading.Thread(target=leer) for _ in range(4)]
+    for h in hilos:
+        h.start()
+    for h in hilos:
+        h.join()
+    referencia.paso(250)
+    assert modelo.lecturas == 1000 and modelo.pasos == 250
+    # Sin tratamientos, el estado no depende del intercalado de los hilos
+    assert np.array_equal(modelo.mapa(), referencia.mapa())
+
+
+def test_restaurar_sigue_el_reloj_desde_la_lectura_guardada():
+    modelo = _modelo(3, lecturas_por_paso=5)
+    for _ in range(12):
+        modelo.medir((1, 1))
+    estado = modelo.estado()
+    for _ in range(13):
+        modelo.medir((1, 1))
+    esperado = modelo.mapa()
+
+    otro = _modelo(99, lecturas_por_paso=5)
+    otro.restaurar(estado)
+    for _ in range(13):
+        otro.medir((1, 1))
+    assert otro.pasos == modelo.pasos == 5
+    assert np.array_equal(otro.mapa(), esperado)
+
+
+def test_tratar_baja_la_carga_del_vecindario():
+    modelo = _modelo(5, lecturas_por_paso=None)
+    modelo._niveles[:] = 200
+    modelo.tratar((5, 5), radio=1, eficacia=0.9)
+    mapa = modelo.mapa()
+    assert (mapa[4:7, 4:7] < 1.0).all()
+    assert mapa[0, 0] == 8.0
+
+
+def test_lecturas_durante_un_paso_no_ven_estados_intermedios():
+    modelo = ModeloPlagas(100, 100, rng=np.random.default_rng(8), lecturas_por_paso=None, aparicion=0.0)
+    modelo._niveles[3, 3] = 250     # En el tope la transicion deja la celda igual
+    fin = threading.Event()
+
+    def avanzar():
+        while not fin.is_set():
+            modelo.paso()
+
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)     # Cambios de hilo frecuentes: entre las operaciones de un paso
+    hilo = threading.Thread(target=avanzar)
+    hilo.start()
+    try:
+        vistos = {modelo.nivel((3, 3)) for _ in range(20000)}
+        vistos |= {float(modelo.niveles(np.array([3 * 100 + 3]))[0]) for _ in range(5000)}
+    finally:
+        fin.set()
+        hilo.join()
+        sys.setswitchinterval(intervalo)
+    assert vistos == {10.0}
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del motor lockstep (motor_lockstep.py)"""
+
+import numpy as np
+
+from cuarentena import GestorCuarentena
+from motor_lockstep import (
+    ConfiguracionLockstep, MotorLockstep, ORDEN_PARAR, TERMINADO,
+)
+
+
+def _motor(filas=12, columnas=12, agentes=5, semilla=2, **kwargs):
+    return MotorLockstep(filas, columnas, agentes, rng=np.random.default_rng(semilla), **kwargs)
+
+
+def test_jornada_explora_todo_y_descarga_lo_cosechado():
+    motor = _motor()
+    frutos = int(motor.campo.frutos.sum())
+    motor.ejecutar(max_ticks=5000)
+    m = motor.metricas()
+    assert m['agentes_activos'] == 0 and m['cobertura'] == 1.0
+    assert m['frutos_cosechados'] == m['frutos_descargados']
+    assert frutos - int(motor.campo.frutos.sum()) == m['frutos_cosechados']
+    assert np.all(motor.x == motor.base_x) and np.all(motor.y == motor.base_y)
+
+
+def test_misma_semilla_misma_jornada():
+    a, b = _motor(semilla=9), _motor(semilla=9)
+    a.ejecutar(max_ticks=5000)
+    b.ejecutar(max_ticks=5000)
+    assert {k: v for k, v in a.metricas().items() if k != 'ms_por_tick'} == \
+        {k: v for k, v in b.metricas().items() if k != 'ms_por_tick'}
+
+
+def test_bateria_baja_obliga_a_volver_a_la_estacion():
+    config = ConfiguracionLockstep(bateria_inicial=20.0, consumo_exploracion=2.0)
+    motor = _motor(config=config, agentes=1)
+    motor.ejecutar(max_ticks=20000)
+    assert motor.metricas()['cobertura'] == 1.0
+    assert motor.visitas_base > 2
+    assert motor.bateria.min() > 0.0
+
+
+def test_parate_congela_y_los_eventos_ven_cada_llegada():
+    motor = _motor()
+    llegadas, ordenes = [], []
+    motor.suscribir('llegada', lambda ids, celdas, resultado: llegadas.extend(celdas.tolist()))
+    motor.suscribir('orden', lambda orden, ids: ordenes.append((orden, len(ids))))
+    for _ in range(10):
+        motor.paso()
+    motor.ordenar('PARATE')
+    x, y = motor.x.copy(), motor.y.copy()
+    for _ in range(10):
+        motor.paso()
+    assert np.array_equal(x, motor.x) and np.array_equal(y, motor.y)
+    assert np.all(motor.orden == ORDEN_PARAR)
+    motor.ordenar('CONTINUA')
+    motor.ejecutar(max_ticks=5000)
+    assert sorted(llegadas) == list(range(12 * 12))
+    assert ordenes == [('PARATE', 5), ('CONTINUA', 5)]
+
+
+def test_abandona_termina_en_la_estacion():
+    motor = _motor()
+    for _ in range(15):
+        motor.paso()
+    motor.ordenar('ABANDONA')
+    motor.ejecutar(max_ticks=500)
+    assert np.all(motor.estado == TERMINADO)
+    assert np.all(motor.x == motor.base_x) and np.all(motor.y == motor.base_y)
+    assert motor.metricas()['cobertura'] < 1.0
+
+
+def test_celdas_en_cuarentena_se_difieren_y_se_pierden():
+    cuarentena = GestorCuarentena(12, 12, radio=0)
+    cuarentena.reportar_gusano((5, 5))
+    motor = _motor(cuarentena=cuarentena)
+    gusanos = []
+    motor.suscribir('gusano', lambda agente, celda: gusanos.append(celda))
+    motor.ejecutar(max_ticks=5000)
+    assert (5, 5) not in motor.celdas_exploradas
+    assert cuarentena.celdas_diferidas >= 1 and cuarentena.celdas_perdidas >= 1
+    # Sin tratamientos ninguna zona se cierra: cada celda se explora o se pierde
+    assert len(motor.celdas_exploradas) + cuarentena.celdas_perdidas == 12 * 12
+    assert all(cuarentena.prohibida(c) for c in gusanos)
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""Pruebas del motor de reglas compilado (motor_reglas.py) con la tabla del capataz"""
+
+import random
+
+import numpy as np
+import pytest
+
+from capataz import CAMPOS_DERIVADOS_CAPATAZ, REGLAS_CAPATAZ, EstadoAgente, TipoOrden
+from motor_reglas import MotorReglas, Regla, Umbral
+
+
+UMBRALES = {
+    'bateria_baja': 15.0, 'bateria_critica': 5.0, 'capacidad_llena': 0.9, 'capacidad_maxima': 50,
+    'bateria_recuperada': 50.0, 'eficiencia_minima': 5.0, 'eficiencia_abandono': 2.0,
+}
+
+
+def _a_mano(e, u, ultima):
+    """La cadena if/return que reemplaza la tabla: (orden, avisos)"""
+    avisos = []
+    if e.bateria <= u['bateria_critica']:
+        return TipoOrden.ABANDONA, avisos
+    if e.bateria <= u['bateria_baja'] and e.estado == 'recolectando':
+        return TipoOrden.PARATE, avisos
+    if e.bateria > u['bateria_recuperada'] and e.estado == 'parado' and ultima == TipoOrden.PARATE:
+        return TipoOrden.CONTINUA, avisos
+    if e.frutos_cargados / u['capacidad_maxima'] >= u['capacidad_llena'] and e.estado == 'recolectando':
+        return TipoOrden.PARATE, avisos
+    if e.eficiencia < u['eficiencia_minima'] and e.celdas_exploradas > 20:
+        avisos.append("eficiencia_baja")
+        if e.eficiencia < u['eficiencia_abandono']:
+            return TipoOrden.ABANDONA, avisos
+    return None, avisos
+
+
+def _estados(n, semilla=5):
+    rng = random.Random(semilla)
+    estados, ultimas = [], []
+    for i in range(n):
+        estados.append(EstadoAgente(
+            agente_id=i, posicion=(0, 0), bateria=rng.choice([2.0, 5.0, 10.0, 15.0, 40.0, 80.0]),
+            frutos_cargados=rng.choice([0, 30, 45, 50]), estado=rng.choice(['recolectando', 'parado', 'abandonado']),
+            celdas_exploradas=rng.choice([5, 21, 40]), cosechas_completadas=0,
+            eficiencia=rng.choice([1.0, 3.0, 8.0])))
+        ultimas.append(rng.choice([None, TipoOrden.PARATE, TipoOrden.CONTINUA]))
+    return estados, ultimas
+
+
+def _motor():
+    return MotorReglas(REGLAS_CAPATAZ, derivados=CAMPOS_DERIVADOS_CAPATAZ, extras=('ultima_orden',))
+
+
+def test_compilado_igual_a_la_cadena_escrita_a_mano():
+    motor = _motor()
+    estados, ultimas = _estados(500)
+    for estado, ultima in zip(estados, ultimas):
+        regla, avisos = motor.evaluar(estado, UMBRALES, {'ultima_orden': ultima})
+        orden, avisos_esperados = _a_mano(estado, UMBRALES, ultima)
+        assert (regla.orden if regla else None) == orden
+        assert [a.nombre for a in avisos] == avisos_esperados
+
+
+def test_lote_igual_a_evaluar_cada_agente():
+    motor = _motor()
+    estados, ultimas = _estados(300, semilla=9)
+    columnas = {campo: np.array([getattr(e, campo) for e in estados])
+                for campo in ('bateria', 'frutos_cargados', 'estado', 'celdas_exploradas', 'eficiencia')}
+    columnas['ultima_orden'] = np.array(ultimas, dtype=object)
+    resultado = motor.evaluar_lote(columnas, UMBRALES)
+    for i, (estado, ultima) in enumerate(zip(estados, ultimas)):
+        regla, avisos = motor.evaluar(estado, UMBRALES, {'ultima_orden': ultima})
+        indice = motor.reglas.index(regla) if regla else -1
+        assert resultado.ganadora[i] == indice
+        assert [j for j, m in resultado.avisos.items() if m[i]] == [motor.reglas.index(a) for a in avisos]
+
+
+def test_umbral_se_lee_al_evaluar_sin_recompilar():
+    motor = MotorReglas([Regla("alta", (('x', '>', Umbral('limite')),), "ALTA", 1, "x={x}")])
+    estado = type("E", (), {'x': 5})()
+    assert motor.evaluar(estado, {'limite': 3})[0].nombre == "alta"
+    assert motor.evaluar(estado, {'limite': 7})[0] is None
+    assert motor.estadisticas[0].disparos == 1
+
+
+def test_operador_invalido():
+    with pytest.raises(ValueError):
+        MotorReglas([Regla("mala", (('x', '=>', 1),), "X", 1, "")])
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de los nucleos (nucleos.py) contra una version de fuerza bruta"""
+
+import numpy as np
+import pytest
+
+import nucleos
+
+
+def _vecinos_fuerza_bruta(mascara, radio):
+    filas, columnas = mascara.shape
+    conteo = np.zeros(mascara.shape, dtype=np.int32)
+    for x in range(filas):
+        for y in range(columnas):
+            conteo[x, y] = mascara[max(0, x - radio):x + radio + 1, max(0, y - radio):y + radio + 1].sum()
+    return conteo
+
+
+def _paso_fuerza_bruta(x, y, destino_x, destino_y, moviendo):
+    x, y = x.copy(), y.copy()
+    movidos = np.zeros(len(x), dtype=np.bool_)
+    for i in range(len(x)):
+        if not moviendo[i]:
+            continue
+        if x[i] != destino_x[i]:
+            x[i] += 1 if destino_x[i] > x[i] else -1
+            movidos[i] = True
+        elif y[i] != destino_y[i]:
+            y[i] += 1 if destino_y[i] > y[i] else -1
+            movidos[i] = True
+    return x, y, movidos
+
+
+def _casos_paso(rng, n=500, lado=20):
+    return (rng.integers(0, lado, n).astype(np.int32), rng.integers(0, lado, n).astype(np.int32),
+            rng.integers(0, lado, n).astype(np.int32), rng.integers(0, lado, n).astype(np.int32),
+            rng.random(n) < 0.8)
+
+
+@pytest.mark.parametrize("forma,radio", [((1, 1), 1), ((7, 13), 1), ((20, 9), 2), ((5, 5), 4)])
+def test_contar_vecinos_igual_a_fuerza_bruta(forma, radio):
+    rng = np.random.default_rng(sum(forma) + radio)
+    mascara = rng.random(forma) < 0.3
+    esperado = _vecinos_fuerza_bruta(mascara, radio)
+    assert np.array_equal(nucleos.contar_vecinos(mascara, radio), esperado)
+    # El bucle es el codigo que compila Numba
+    conteo = np.empty(forma, dtype=np.int32)
+    nucleos._vecinos_bucle(mascara, radio, conteo)
+    assert np.array_equal(conteo, esperado)
+
+
+def test_paso_manhattan_igual_a_fuerza_bruta():
+    rng = np.random.default_rng(8)
+    x, y, dx, dy, moviendo = _casos_paso(rng)
+    ex, ey, emovidos = _paso_fuerza_bruta(x, y, dx, dy, moviendo)
+
+    movidos = nucleos.paso_manhattan(x, y, dx, dy, moviendo)
+    assert np.array_equal(x, ex) and np.array_equal(y, ey) and np.array_equal(movidos, emovidos)
+
+    x, y, dx, dy, moviendo = _casos_paso(np.random.default_rng(8))
+    movidos = np.empty(len(x), dtype=np.bool_)
+    nucleos._paso_manhattan_bucle(x, y, dx, dy, moviendo, movidos)
+    assert np.array_equal(x, ex) and np.array_equal(y, ey) and np.array_equal(movidos, emovidos)
+
+
+@pytest.mark.skipif(not nucleos.NUMBA_DISPONIBLE, reason="numba no esta instalado")
+def test_version_numba_igual_a_numpy():
+    rng = np.random.default_rng(3)
+    mascara = rng.random((40, 30)) < 0.2
+    conteo = np.empty(mascara.shape, dtype=np.int32)
+    nucleos._vecinos_jit(mascara, 2, conteo)
+    assert np.array_equal(conteo, _vecinos_fuerza_bruta(mascara, 2))
+
+    x, y, dx, dy, moviendo = _casos_paso(rng)
+    ex, ey, emovidos = _paso_fuerza_bruta(x, y, dx, dy, moviendo)
+    movidos = np.empty(len(x), dtype=np.bool_)
+    nucleos._paso_manhattan_jit(x, y, dx, dy, moviendo, movidos)
+    assert np.array_equal(x, ex) and np.array_equal(y, ey) and np.array_equal(movidos, emovidos)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de los temporizadores por fase y perfiles (perfilador.py)"""
+
+import json
+import time
+
+import pytest
+
+import perfilador
+
+
+@pytest.fixture
+def activo():
+    perfilador.reiniciar()
+    perfilador.activar(trace=True)
+    yield
+    perfilador.desactivar()
+    perfilador.reiniciar()
+
+
+def _estadisticas():
+    return {e.nombre: e for e in perfilador.resumen()}
+
+
+def test_desactivado_no_registra_nada():
+    perfilador.reiniciar()
+    with perfilador.fase("x"):
+        pass
+    assert perfilador.resumen() == []
+
+
+def test_tiempo_propio_descuenta_las_fases_anidadas(activo):
+    @perfilador.medir_fase("hija")
+    def hija():
+        time.sleep(0.02)
+
+    with perfilador.fase("padre"):
+        hija()
+        hija()
+    fases = _estadisticas()
+    assert fases["hija"].llamadas == 2 and fases["padre"].llamadas == 1
+    assert fases["padre"].total_ns >= fases["hija"].total_ns
+    assert fases["padre"].propio_ns == fases["padre"].total_ns - fases["hija"].total_ns
+    assert "padre" in perfilador.tabla_resumen()
+
+
+def test_excepcion_cierra_la_fase(activo):
+    with pytest.raises(ValueError):
+        with perfilador.fase("falla"):
+            raise ValueError()
+    assert _estadisticas()["falla"].llamadas == 1
+    assert perfilador._pila() == []
+
+
+def test_chrome_trace_tiene_un_evento_por_ocurrencia(activo, tmp_path):
+    for _ in range(3):
+        with perfilador.fase("manager.paso"):
+            pass
+    ruta = tmp_path / "trace.json"
+    perfilador.exportar_chrome_trace(str(ruta))
+    eventos = json.loads(ruta.read_text())['traceEvents']
+    completos = [e for e in eventos if e['ph'] == 'X']
+    assert len(completos) == 3
+    assert all(e['name'] == 'manager.paso' and e['cat'] == 'manager' for e in completos)
+
+
+def test_perfil_por_muestreo_exporta_pilas_plegadas(tmp_path):
+    ruta = tmp_path / "perfil.folded"
+    perfilador.iniciar_perfil('muestreo', intervalo=0.001)
+    fin = time.perf_counter() + 0.05
+    while time.perf_counter() < fin:
+        pass
+    perfilador.detener_perfil(str(ruta))
+    lineas = ruta.read_text().splitlines()
+    assert lineas and all(linea.rsplit(" ", 1)[1].isdigit() for linea in lineas)
+    assert any("test_perfilador.py" in linea for linea in lineas)
+
+
+def test_modo_desconocido():
+    with pytest.raises(ValueError):
+        perfilador.iniciar_perfil('otro')
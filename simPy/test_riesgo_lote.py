@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la evaluacion de riesgo por lotes (riesgo_lote.py) contra el Manager"""
+
+import numpy as np
+
+import riesgo_lote
+from manager import AgenteCapataz, DatosExploracion
+
+
+def _lecturas(n=2000, semilla=11):
+    rng = np.random.default_rng(semilla)
+    columnas = [
+        rng.uniform(10.0, 35.0, n),
+        rng.uniform(30.0, 90.0, n),
+        rng.uniform(0.0, 10.0, n),
+        rng.uniform(2.0, 9.0, n),
+        rng.uniform(0.0, 10.0, n),
+        rng.integers(0, 4, n),
+    ]
+    # Bordes exactos de los umbrales del Manager
+    columnas[2][:6] = [8.0, 8.0, np.nextafter(8.0, 9.0), 7.0, 0.0, 10.0]
+    columnas[4][:6] = [7.0, np.nextafter(7.0, 8.0), 9.0, 7.0, 7.0, 9.5]
+    columnas[5][:6] = [3, 3, 3, 0, 1, 2]
+    return columnas
+
+
+def _datos(t, h, p, n, m, f):
+    return DatosExploracion(x=0, y=0, temperatura=float(t), humedad=float(h), nivel_plagas=float(p),
+                            nivel_nutrientes=float(n), nivel_maduracion=float(m),
+                            frutos_disponibles=int(f), agente_id=1)
+
+
+def test_lote_y_escalar_coinciden_con_el_manager():
+    capataz = AgenteCapataz(grid_filas=2, grid_columnas=2, num_agentes=1)
+    columnas = _lecturas()
+    lote = riesgo_lote.evaluar_lote(*columnas)
+    for i, fila in enumerate(zip(*columnas)):
+        nivel, gusano, listo = capataz._evaluar_riesgo(_datos(*fila))
+        escalar = riesgo_lote.evaluar_lectura(*fila)
+        assert (escalar.nivel_riesgo, escalar.tiene_gusano, escalar.listo_para_cosechar) == \
+            (nivel.value, gusano, listo)
+        assert escalar == lote.fila(i)
+
+
+def test_clasificacion_de_amenaza_no_cambia_el_nivel():
+    r = riesgo_lote.evaluar_lectura(temperatura=40.0, humedad=20.0, nivel_plagas=7.5,
+                                    nivel_nutrientes=1.0, nivel_maduracion=5.0, frutos_disponibles=0)
+    assert r.tipo_amenaza == riesgo_lote.PLAGA
+    assert r.requiere_tratamiento
+    assert r.nivel_riesgo == riesgo_lote.NIVEL_BAJO
+
+
+def test_recibir_lote_evalua_el_riesgo_una_vez_con_el_mismo_resultado(monkeypatch):
+    columnas = _lecturas(n=300, semilla=4)
+    lecturas = [
+        DatosExploracion(x=i % 6, y=(i // 6) % 6, temperatura=float(t), humedad=float(h), nivel_plagas=float(p),
+                         nivel_nutrientes=float(n), nivel_maduracion=float(m), frutos_disponibles=int(f),
+                         agente_id=1)
+        for i, (t, h, p, n, m, f) in enumerate(zip(*columnas))
+    ]
+    escalar = AgenteCapataz(grid_filas=6, grid_columnas=6, num_agentes=1)
+    for datos in lecturas:
+        escalar.recibir_datos(datos)
+
+    lote = AgenteCapataz(grid_filas=6, grid_columnas=6, num_agentes=1)
+    llamadas = []
+    original = riesgo_lote.evaluar_lecturas
+    monkeypatch.setattr(riesgo_lote, 'evaluar_lecturas', lambda l: llamadas.append(len(l)) or original(l))
+    monkeypatch.setattr(lote, '_evaluar_riesgo', lambda datos: (_ for _ in ()).throw(AssertionError("escalar")))
+    lote.recibir_lote(lecturas)
+
+    assert llamadas == [300]
+    assert {c: (e.nivel_riesgo, e.tiene_gusano, e.listo_para_cosechar) for c, e in lote.mapa_estados.items()} == \
+        {c: (e.nivel_riesgo, e.tiene_gusano, e.listo_para_cosechar) for c, e in escalar.mapa_estados.items()}
+    assert lote.contador_gusanos == escalar.contador_gusanos
+    assert [i.celda_objetivo for i in lote.cola_cosechas] == [i.celda_objetivo for i in escalar.cola_cosechas]
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de las series por celda (series_celdas.py) contra deques por celda"""
+
+import random
+from collections import deque
+
+import numpy as np
+
+from manager import DatosExploracion
+from series_celdas import CANALES, SeriesCeldas
+
+
+FILAS, COLUMNAS, CAPACIDAD = 3, 4, 5
+
+
+def _llenar(semilla):
+    """SeriesCeldas y su referencia: un deque de (t, valores) por celda"""
+    rng = random.Random(semilla)
+    series = SeriesCeldas(FILAS, COLUMNAS, capacidad=CAPACIDAD, origen=1000.0)
+    referencia = {i: deque(maxlen=CAPACIDAD) for i in range(FILAS * COLUMNAS)}
+    t = 1000.0
+    for _ in range(60):
+        t += 1.0
+        if rng.random() < 0.5:
+            i = rng.randrange(FILAS * COLUMNAS)
+            valores = [round(rng.uniform(0, 50), 2) for _ in CANALES]
+            series.registrar(DatosExploracion(i // COLUMNAS, i % COLUMNAS, *valores,
+                                              frutos_disponibles=0, agente_id=1), t)
+            referencia[i].append((t - 1000.0, valores))
+        else:
+            # Lote con celdas repetidas (a veces mas lecturas que la capacidad)
+            indices = [rng.randrange(FILAS * COLUMNAS) for _ in range(rng.randrange(1, 9))]
+            if rng.random() < 0.2:
+                indices += [indices[0]] * (CAPACIDAD + 2)
+            valores = [[round(rng.uniform(0, 50), 2) for _ in CANALES] for _ in indices]
+            tiempos = [t + 0.01 * k for k in range(len(indices))]
+            series.registrar_lote(np.array(indices), np.array(valores), np.array(tiempos))
+            for i, v, tk in zip(indices, valores, tiempos):
+                referencia[i].append((tk - 1000.0, v))
+    return series, referencia
+
+
+def test_consultas_de_ventana_coinciden_con_la_referencia():
+    for semilla in range(5):
+        series, referencia = _llenar(semilla)
+        assert series.lecturas_por_celda().ravel().tolist() == [len(referencia[i]) for i in range(FILAS * COLUMNAS)]
+        for canal, nombre in enumerate(CANALES):
+            for k in (1, 3, CAPACIDAD):
+                ultimas = series.ultimas(nombre, k).reshape(-1, k)
+                media = series.media(canal, k).ravel()
+                pendiente = series.pendiente(canal, k).ravel()
+                for i, lecturas in referencia.items():
+                    ventana = list(lecturas)[-k:]
+                    v = np.array([valores[canal] for _, valores in ventana], dtype=np.float32)
+                    esperadas = np.concatenate([np.full(k - len(v), np.nan, dtype=np.float32), v])
+                    np.testing.assert_array_equal(ultimas[i], esperadas)
+                    if not len(v):
+                        assert np.isnan(media[i]) and np.isnan(pendiente[i])
+                        continue
+                    assert abs(media[i] - v.mean()) < 1e-4
+                    if len(v) < 2:
+                        assert np.isnan(pendiente[i])
+                    else:
+                        t = np.array([tk for tk, _ in ventana], dtype=np.float32)
+                        assert abs(pendiente[i] - np.polyfit(t, v, 1)[0]) < 1e-3
+
+
+def test_serie_y_consulta_por_celdas():
+    series, referencia = _llenar(7)
+    for i, lecturas in referencia.items():
+        tiempos, valores = series.serie(divmod(i, COLUMNAS), 'humedad')
+        assert np.allclose(tiempos, [1000.0 + t for t, _ in lecturas])
+        assert np.allclose(valores, [v[1] for _, v in lecturas])
+    celdas = [0, 5, 11]
+    np.testing.assert_array_equal(series.media('humedad', 3, celdas),
+                                  series.media('humedad', 3).ravel()[celdas])
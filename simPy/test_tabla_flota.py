@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la tabla de estado de la flota (tabla_flota.py)"""
+
+import threading
+
+from tabla_flota import TablaFlota
+
+
+ORDENES = ('CONTINUAR', 'PARAR', 'ABANDONAR')
+
+
+def test_crece_y_conserva_las_filas():
+    tabla = TablaFlota(ORDENES, capacidad=2)
+    for i in range(1, 11):
+        tabla.registrar(i, x=i, y=2 * i)
+    assert tabla.registrar(3) == 2
+    assert len(tabla) == 10
+    assert tabla.posiciones() == [(i, i, 2 * i) for i in range(1, 11)]
+
+
+def test_escribir_solo_cambia_los_campos_dados():
+    tabla = TablaFlota(ORDENES)
+    fila = tabla.registrar(7, bateria=80.0)
+    antes = tabla.instantanea()
+    tabla.escribir(fila, posicion=(3, 4), orden='PARAR')
+    ahora = tabla.instantanea()
+    (agente,) = list(ahora)
+    assert (agente.id, agente.x, agente.y, agente.orden_actual, agente.bateria) == (7, 3, 4, 'PARAR', 80.0)
+    assert ahora.version > antes.version
+    # La instantanea anterior es una copia: no cambio
+    assert (int(antes.x[0]), antes.orden_de(0)) == (0, 'CONTINUAR')
+
+
+def test_instantanea_consistente_con_escritores_en_paralelo():
+    tabla = TablaFlota(ORDENES)
+    filas = [tabla.registrar(i) for i in range(4)]
+
+    def escribir(fila):
+        for k in range(2000):
+            tabla.escribir(fila, posicion=(k, k), carga=k)
+
+    hilos = [threading.Thread(target=escribir, args=(f,)) for f in filas]
+    for h in hilos:
+        h.start()
+    for _ in range(200):
+        s = tabla.instantanea()
+        # Cada fila se escribe entera bajo el lock: x, y y carga siempre coinciden
+        assert (s.x == s.y).all() and (s.x == s.carga).all()
+    for h in hilos:
+        h.join()
+    assert tabla.instantanea().x.tolist() == [1999] * 4
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Pruebas de la telemetria por lotes (telemetria.py) y su entrada al Capataz"""
+
+from manager import AgenteCapataz, DatosExploracion
+from telemetria import LoteTelemetria
+
+
+class Reloj:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+def _lectura(x, plagas=1.0):
+    return DatosExploracion(x=x, y=0, temperatura=22.0, humedad=60.0, nivel_plagas=plagas,
+                            nivel_nutrientes=5.0, nivel_maduracion=8.0, frutos_disponibles=2,
+                            agente_id=1)
+
+
+def _lote(**parametros):
+    envios = []
+    reloj = Reloj()
+    lote = LoteTelemetria(lambda lecturas, estado, urgente: envios.append((lecturas, estado, urgente)),
+                          reloj=reloj, **parametros)
+    return lote, envios, reloj
+
+
+def test_envia_al_llenar_el_lote():
+    lote, envios, _ = _lote(tamano_maximo=3)
+    for x in range(7):
+        lote.agregar_lectura(_lectura(x))
+    assert [[d.x for d in l] for l, _, _ in envios] == [[0, 1, 2], [3, 4, 5]]
+    lote.vaciar()
+    assert [d.x for d in envios[-1][0]] == [6]
+    assert lote.lecturas_enviadas == 7
+
+
+def test_envia_cuando_la_lectura_mas_vieja_agota_la_latencia():
+    lote, envios, reloj = _lote(tamano_maximo=100, latencia_maxima=0.25)
+    lote.agregar_lectura(_lectura(0))
+    reloj.t = 0.2
+    lote.agregar_lectura(_lectura(1))
+    assert envios == []
+    reloj.t = 0.3
+    lote.revisar()
+    assert [d.x for d in envios[0][0]] == [0, 1] and envios[0][2] is False
+
+
+def test_gusano_y_cambio_de_estado_salen_en_el_acto_con_lo_pendiente():
+    lote, envios, _ = _lote(tamano_maximo=100)
+    lote.agregar_lectura(_lectura(0))
+    lote.agregar_lectura(_lectura(1, plagas=9.0))
+    assert [d.x for d in envios[0][0]] == [0, 1] and envios[0][2] is True
+
+    lote.actualizar_estado(estado='recolectando', bateria=90.0)
+    lote.actualizar_estado(estado='recolectando', bateria=80.0)
+    assert len(envios) == 2
+    lote.actualizar_estado(estado='parado', bateria=79.0)
+    assert envios[-1] == ([], {'estado': 'parado', 'bateria': 79.0}, True)
+
+
+def test_un_lote_notifica_a_la_ui_una_sola_vez():
+    capataz = AgenteCapataz(grid_filas=4, grid_columnas=4, num_agentes=1)
+    llamadas = []
+    capataz.registrar_agente_ui(lambda *args: llamadas.append(args))
+    capataz.entrada_lote([_lectura(x) for x in range(4)])
+    assert len(llamadas) == 1
+    assert len(capataz.celdas_exploradas) == 4
+
+
+def test_estado_del_agente_llega_al_supervisor_y_su_orden_vuelve():
+    capataz = AgenteCapataz(grid_filas=4, grid_columnas=4, num_agentes=1)
+    capataz.crear_agentes_fisicos()
+    agente = capataz.agentes_fisicos[0]
+
+    agente._reportar_estado()  # Primer estado: se envia en el acto
+    assert capataz.capataz.estados_agentes[1].estado == 'recolectando'
+
+    agente.bateria = 10.0
+    agente._reportar_estado()
+    agente.telemetria.vaciar()
+    # Regla de bateria baja: el supervisor lo para por su buzon
+    assert capataz.capataz.estados_agentes[1].bateria == 10.0
+    assert not capataz.controles_agentes[1]['evento'].is_set()
+    assert agente._estado_capataz() == 'parado'
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""
+VISOR DE REPETICION
+===================
+
+Reproduce una bitacora grabada (ver bitacora.py) reutilizando el dibujo
+de AgenteUI. Permite saltar a cualquier minuto de la jornada sin
+reproducir desde el inicio.
+
+CONTROLES:
+    ESPACIO        Play / Pausa
+    ARRIBA/ABAJO   Velocidad 1x - 1000x
+    DERECHA        Avanzar un evento (en pausa)
+    IZQUIERDA      Retroceder 10 s de simulacion
+    INICIO         Volver al inicio
+    CLICK barra    Saltar al tiempo seleccionado
+    ESC            Salir
+
+USO:
+    python visor_repeticion.py jornada.bitacora [filas] [columnas]
+
+Sin filas y columnas se usa el grid guardado en los metadatos de la corrida.
+"""
+
+import sys
+import pygame
+
+from bitacora import LectorBitacora
+from manager import EstadoCelda, EstadoAgenteVisibilidad, MetricasSistema, OrdenCapataz, NivelRiesgo
+from ui import AgenteUI, CELL_SIZE, MARGIN_TOP
+
+# Velocidades disponibles (multiplicador del tiempo de simulacion)
+VELOCIDADES = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000]
+
+ALTO_BARRA = 40
+COLOR_BARRA = (70, 70, 70)
+COLOR_PROGRESO = (255, 215, 0)
+
+
+class VisorRepeticion:
+    """Controla la reproduccion de una bitacora sobre AgenteUI"""
+
+    def __init__(self, ruta_bitacora: str, grid_filas: int = None, grid_columnas: int = None):
+        self.lector = LectorBitacora(ruta_bitacora)
+        filas, columnas = self.lector.metadatos.get('grid', (10, 10))
+        grid_filas = grid_filas or filas
+        grid_columnas = grid_columnas or columnas
+        self.ui = AgenteUI(grid_filas=grid_filas, grid_columnas=grid_columnas)
+        self.ui.height += ALTO_BARRA
+
+        # Estado de la reproduccion
+        self.reproduciendo = False
+        self.indice_velocidad = 0
+        self.t_reproduccion = self.lector.t_actual
+
+    @property
+    def velocidad(self) -> int:
+        return VELOCIDADES[self.indice_velocidad]
+
+    # ========================================================================
+    # CONVERSION ESTADO -> OBJETOS DE LA UI
+    # ========================================================================
+
+    def _sincronizar_ui(self):
+        """Entrega el estado reconstruido a AgenteUI con sus propios tipos"""
+        estado = self.lector.estado
+
+        celdas = [
+            EstadoCelda(
+                x=c['x'], y=c['y'],
+                nivel_riesgo=NivelRiesgo[c['nivel_riesgo']],
+                tipo_amenaza=c['tipo_amenaza'],
+                frutos_disponibles=c['frutos_disponibles'],
+                listo_para_cosechar=c['listo_para_cosechar'],
+                tiene_gusano=c.get('tiene_gusano', False),
+                foco_plagas=c.get('foco_plagas', 0.0)
+            )
+            for c in estado['celdas'].values()
+        ]
+        agentes = [
+            EstadoAgenteVisibilidad(
+                id=a['id'], x=a['x'], y=a['y'],
+                orden_actual=OrdenCapataz[a['orden_actual']],
+                bateria=a['bateria'],
+                cargando_frutos=a['cargando_frutos']
+            )
+            for a in estado['agentes'].values()
+        ]
+        metricas = MetricasSistema(**estado['metricas']) if estado['metricas'] else None
+
+        self.ui.actualizar(celdas, agentes, metricas)
+
+    # ========================================================================
+    # CONTROLES
+    # ========================================================================
+
+    def _manejar_evento(self, event):
+        if event.type == pygame.QUIT:
+            self.ui.running = False
+
+        elif event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.ui.running = False
+            elif event.key == pygame.K_SPACE:
+                self.reproduciendo = not self.reproduciendo
+            elif event.key == pygame.K_UP:
+                self.indice_velocidad = min(self.indice_velocidad + 1, len(VELOCIDADES) - 1)
+            elif event.key == pygame.K_DOWN:
+                self.indice_velocidad = max(self.indice_velocidad - 1, 0)
+            elif event.key == pygame.K_RIGHT and not self.reproduciendo:
+                if self.lector.siguiente_evento() is not None:
+                    self.t_reproduccion = self.lector.t_actual
+            elif event.key == pygame.K_LEFT:
+                self._saltar_a(self.t_reproduccion - 10.0)
+            elif event.key == pygame.K_HOME:
+                self._saltar_a(0.0)
+
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            x, y = event.pos
+            if y >= self.ui.height - ALTO_BARRA:
+                fraccion = (x - 20) / max(1, self.ui.width - 40)
+                self._saltar_a(fraccion * self.lector.duracion)
+
+    def _saltar_a(self, t: float):
+        t = min(max(t, 0.0), self.lector.duracion)
+        self.lector.buscar(t)
+        self.t_reproduccion = t
+
+    # ========================================================================
+    # DIBUJO
+    # ========================================================================
+
+    def _dibujar_barra(self):
+        """Linea de tiempo con la posicion actual y los controles"""
+        y = self.ui.height - ALTO_BARRA + 10
+        ancho = self.ui.width - 40
+        pygame.draw.rect(self.ui.screen, COLOR_BARRA, (20, y, ancho, 8))
+
+        if self.lector.duracion > 0:
+            progreso = int(ancho * self.t_reproduccion / self.lector.duracion)
+            pygame.draw.rect(self.ui.screen, COLOR_PROGRESO, (20, y, progreso, 8))
+
+        mins = int(self.t_reproduccion // 60)
+        segs = self.t_reproduccion % 60
+        estado = "PLAY" if self.reproduciendo else "PAUSA"
+        texto = self.ui.font.render(
+            f"{estado}  {mins:02d}:{segs:05.2f}  x{self.velocidad}", True, (200, 200, 200)
+        )
+        self.ui.screen.blit(texto, (20, y + 10))
+
+    def ejecutar(self):
+        """Loop principal del visor (hilo principal, como AgenteUI)"""
+        self.ui.inicializar_pygame()
+        pygame.display.set_caption("Sistema Capataz - Repeticion")
+
+        while self.ui.running:
+            dt = self.ui.clock.tick(30) / 1000.0
+
+            for event in pygame.event.get():
+                self._manejar_evento(event)
+
+            if self.reproduciendo:
+                self.t_reproduccion = min(self.t_reproduccion + dt * self.velocidad, self.lector.duracion)
+                self.lector.avanzar_hasta(self.t_reproduccion)
+                if self.t_reproduccion >= self.lector.duracion:
+                    self.reproduciendo = False
+
+            self._sincronizar_ui()
+
+            self.ui.screen.fill((30, 30, 30))
+            self.ui._dibujar_capataz()
+            self.ui._dibujar_grid()
+            self.ui._dibujar_agentes()
+            self.ui._dibujar_panel()
+            self._dibujar_barra()
+            pygame.display.flip()
+
+        self.lector.cerrar()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python visor_repeticion.py <archivo_bitacora> [filas] [columnas]")
+        sys.exit(1)
+
+    filas = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    columnas = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    VisorRepeticion(sys.argv[1], filas, columnas).ejecutar()